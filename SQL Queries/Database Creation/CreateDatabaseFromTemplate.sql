@@ -0,0 +1,5 @@
+CREATE DATABASE {DatabaseName} WITH
+    TEMPLATE = {TemplateName}
+    OWNER = {OwnerName}
+    CONNECTION LIMIT = -1
+    IS_TEMPLATE = False;
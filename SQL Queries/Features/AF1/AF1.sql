@@ -1,12 +1,4 @@
 WITH 
-    cancelledBookingIDs AS (
-        SELECT
-            C."bookingID"
-        FROM (SELECT "bookingID" FROM "Booking" B1 WHERE B1."userID" = %(userId)s) B
-        JOIN "Cancellation" C
-            ON B."bookingID" = C."bookingID"
-    ),
-
     targetUser AS (
         SELECT U1."userID" FROM "User" U1 WHERE U1."userID" = %(userId)s
     ),
@@ -20,9 +12,9 @@ WITH
         JOIN "Booking" B1
             ON B1."roomID" = R."roomID"
         WHERE B1."userID" = %(userId)s AND
-              B1."bookingID" NOT IN (SELECT * FROM cancelledBookingIDs) AND
-              (%(startDateTime)s IS NULL OR B1."bookEndDateTime" >= %(startDateTime)s) AND
-              (%(endDateTime)s IS NULL OR B1."bookStartDateTime" <= %(endDateTime)s)
+              NOT B1."isCancelled" AND
+              (%(startDateTime)s::TIMESTAMP IS NULL OR B1."bookEndDateTime" >= %(startDateTime)s) AND
+              (%(endDateTime)s::TIMESTAMP IS NULL OR B1."bookStartDateTime" <= %(endDateTime)s)
     )
 
 SELECT
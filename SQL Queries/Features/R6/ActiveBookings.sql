@@ -0,0 +1,4 @@
+-- time slots of all the bookings that have not been cancelled
+select bo."roomID", bo."bookStartDateTime", bo."bookEndDateTime"
+from "Booking" as bo
+where not bo."isCancelled";
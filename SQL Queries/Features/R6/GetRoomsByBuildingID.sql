@@ -3,5 +3,5 @@ select r."roomID", b."buildingName", r."roomName", r."capacity", b."addressLine1
 from 
     "Building" as b,
     "Room" as r
-WHERE (%(building_id)s IS NULL OR r."buildingID" = %(building_id)s) AND r."buildingID"=b."buildingID"
+WHERE (%(building_id)s::UUID IS NULL OR r."buildingID" = %(building_id)s) AND r."buildingID"=b."buildingID"
 ;
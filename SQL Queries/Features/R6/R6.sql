@@ -6,14 +6,8 @@ with bookingCount as (
   from "Room" as r 
   left outer join "Booking" as bo 
     on bo."roomID" = r."roomID"
-  and (
-	  not exists ( -- disregard cancelled bookings and join bookings that overlap with [start_time, end_time]
-		select 1 
-		from "Cancellation" as c
-		where c."bookingID" = bo."bookingID" -- cancelled
-	  )
-	  and not (bo."bookStartDateTime" >= %(end_time)s or bo."bookEndDateTime" <= %(start_time)s) -- overlap
-  )
+  and not bo."isCancelled" -- disregard cancelled bookings
+  and bo."bookStartDateTime" < %(end_time)s and bo."bookEndDateTime" > %(start_time)s -- overlap with [start_time, end_time]
   group by r."roomID"
 )
 
@@ -24,6 +18,6 @@ from bookingCount as bc
 join "Room" as r on r."roomID" = bc."roomID"
 join "Building" as b on b."buildingID" = r."buildingID"
 WHERE TRUE
-    AND (%(room_name)s IS NULL OR r."roomName" ILIKE %(room_name)s)
-    AND (%(min_capacity)s IS NULL OR r."capacity" >= %(min_capacity)s)
-    AND (%(max_capacity)s IS NULL OR r."capacity" <= %(max_capacity)s);
+    AND (%(room_name)s::TEXT IS NULL OR r."roomName" ILIKE %(room_name)s)
+    AND (%(min_capacity)s::INT IS NULL OR r."capacity" >= %(min_capacity)s)
+    AND (%(max_capacity)s::INT IS NULL OR r."capacity" <= %(max_capacity)s);
@@ -6,10 +6,7 @@ valid_booking AS (
     SELECT 1
     FROM "Booking" AS b
     WHERE b."roomID" = %(roomID)s
-      AND NOT EXISTS (
-          SELECT 1 FROM "Cancellation" AS c
-          WHERE c."bookingID" = b."bookingID"
-      )
+      AND NOT b."isCancelled"
       AND NOT (
           %(startTime)s >= b."bookEndDateTime"
           OR %(endTime)s <= b."bookStartDateTime"
@@ -25,4 +22,4 @@ SELECT
     %(startTime)s, %(endTime)s, %(participants)s
 WHERE EXISTS (SELECT 1 FROM valid_room)
   AND NOT EXISTS (SELECT 1 FROM valid_booking)
-RETURNING "bookingID";
+RETURNING "bookingID", "roomID", "bookStartDateTime", "bookEndDateTime";
@@ -1,6 +1,13 @@
-INSERT INTO "Cancellation"  
-(SELECT "bookingID", "userID", %(cancel_date)s
-FROM "Booking"
-WHERE "bookingID" = %(booking_id)s AND "userID" = %(user_id)s 
- AND "bookingID" NOT IN (SELECT "bookingID" FROM "Cancellation"))
-RETURNING "bookingID";
\ No newline at end of file
+WITH cancelled AS (
+  INSERT INTO "Cancellation" ("bookingID", "userID", "cancelDateTime", "bookStartDateTime")
+  (SELECT "bookingID", "userID", %(cancel_date)s, "bookStartDateTime"
+  FROM "Booking"
+  WHERE "bookingID" = %(booking_id)s AND "userID" = %(user_id)s 
+   AND NOT "isCancelled")
+  RETURNING "bookingID", "bookStartDateTime"
+)
+
+-- also return the time slot that was freed up by the cancellation
+SELECT c."bookingID", b."roomID", b."bookStartDateTime", b."bookEndDateTime"
+FROM cancelled AS c
+JOIN "Booking" AS b ON b."bookingID" = c."bookingID" AND b."bookStartDateTime" = c."bookStartDateTime";
\ No newline at end of file
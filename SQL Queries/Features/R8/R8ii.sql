@@ -9,8 +9,7 @@ SELECT  b."bookingID",
 FROM "Booking" b
 JOIN "Room" r ON b."roomID" = r."roomID"
 JOIN "Building" bl ON r."buildingID" = bl."buildingID"
-LEFT JOIN "Cancellation" c ON b."bookingID" = c."bookingID"
 WHERE b."userID" = %(user_id)s 
   AND b."bookStartDateTime" > %(now)s
-  AND c."bookingID" IS NULL
+  AND NOT b."isCancelled"
 ORDER BY b."bookStartDateTime";
@@ -0,0 +1,11 @@
+CREATE EXTENSION IF NOT EXISTS btree_gist;
+
+ALTER TABLE {BookingTable}
+    ADD COLUMN IF NOT EXISTS "bookRange" TSRANGE
+        GENERATED ALWAYS AS (tsrange("bookStartDateTime", "bookEndDateTime", '[)')) STORED;
+
+-- no 2 active bookings of the same room can overlap
+ALTER TABLE {BookingTable}
+    ADD CONSTRAINT noRoomDoubleBooking
+    EXCLUDE USING gist ("roomID" WITH =, "bookRange" WITH &&)
+    WHERE (NOT "isCancelled");
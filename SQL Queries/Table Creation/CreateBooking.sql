@@ -6,6 +6,7 @@ CREATE TABLE {BookingTable} (
     "bookStartDateTime" TIMESTAMP WITHOUT TIME ZONE,
     "bookEndDateTime" TIMESTAMP WITHOUT TIME ZONE,
     "participants" INT,
+    "isCancelled" BOOLEAN NOT NULL DEFAULT FALSE,
 
     PRIMARY KEY("bookingID"),
     FOREIGN KEY("userID") REFERENCES {UserTable}("userID")
@@ -28,4 +29,13 @@ CREATE INDEX IF NOT EXISTS idx_user
 ON {BookingTable}("userID");
 
 CREATE INDEX IF NOT EXISTS idx_room
-ON {BookingTable}("roomID");
\ No newline at end of file
+ON {BookingTable}("roomID");
+
+-- indexes over only the bookings that are not cancelled
+CREATE INDEX IF NOT EXISTS idx_active_room_time
+ON {BookingTable}("roomID", "bookStartDateTime", "bookEndDateTime")
+WHERE NOT "isCancelled";
+
+CREATE INDEX IF NOT EXISTS idx_active_user_time
+ON {BookingTable}("userID", "bookStartDateTime")
+WHERE NOT "isCancelled";
\ No newline at end of file
@@ -2,6 +2,7 @@ CREATE TABLE {CancellationTable} (
     "bookingID" UUID NOT NULL,
     "userID" UUID NOT NULL,
     "cancelDateTime" TIMESTAMP WITHOUT TIME ZONE,
+    "bookStartDateTime" TIMESTAMP WITHOUT TIME ZONE,
 
     PRIMARY KEY ("bookingID"),
     FOREIGN KEY ("bookingID") REFERENCES {BookingTable}("bookingID")
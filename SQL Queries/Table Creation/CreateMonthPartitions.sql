@@ -0,0 +1,24 @@
+-- the partitions are filled and validated before they are attached, so any bookings and cancellations of the month
+--   that were already routed to the default partitions can be moved over
+CREATE TABLE {BookingPartition} (LIKE {BookingTable} INCLUDING DEFAULTS INCLUDING CONSTRAINTS);
+CREATE TABLE {CancellationPartition} (LIKE {CancellationTable} INCLUDING DEFAULTS INCLUDING CONSTRAINTS);
+
+INSERT INTO {BookingPartition}
+SELECT * FROM {BookingDefaultPartition}
+WHERE "bookStartDateTime" >= %(start)s AND "bookStartDateTime" < %(end)s;
+
+INSERT INTO {CancellationPartition}
+SELECT * FROM {CancellationDefaultPartition}
+WHERE "bookStartDateTime" >= %(start)s AND "bookStartDateTime" < %(end)s;
+
+DELETE FROM {CancellationDefaultPartition}
+WHERE "bookStartDateTime" >= %(start)s AND "bookStartDateTime" < %(end)s;
+
+DELETE FROM {BookingDefaultPartition}
+WHERE "bookStartDateTime" >= %(start)s AND "bookStartDateTime" < %(end)s;
+
+ALTER TABLE {BookingTable}
+ATTACH PARTITION {BookingPartition} FOR VALUES FROM (%(start)s) TO (%(end)s);
+
+ALTER TABLE {CancellationTable}
+ATTACH PARTITION {CancellationPartition} FOR VALUES FROM (%(start)s) TO (%(end)s);
\ No newline at end of file
@@ -0,0 +1,50 @@
+CREATE TABLE {BookingTable} (
+    "bookingID" UUID NOT NULL DEFAULT uuid_generate_v4(),
+    "userID" UUID NOT NULL,
+    "roomID" UUID NOT NULL,
+    "bookDateTime" TIMESTAMP WITHOUT TIME ZONE,
+    "bookStartDateTime" TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+    "bookEndDateTime" TIMESTAMP WITHOUT TIME ZONE,
+    "participants" INT,
+    "isCancelled" BOOLEAN NOT NULL DEFAULT FALSE,
+
+    -- the primary key of a partitioned table needs to include the column the table is partitioned on
+    PRIMARY KEY("bookingID", "bookStartDateTime"),
+    FOREIGN KEY("userID") REFERENCES {UserTable}("userID")
+        ON DELETE CASCADE
+        ON UPDATE CASCADE,
+    FOREIGN KEY("roomID") REFERENCES {RoomTable}("roomID")
+        ON DELETE CASCADE
+        ON UPDATE CASCADE,
+
+    CONSTRAINT validBookingCommitDate CHECK({BookingTable}."bookDateTime" < {BookingTable}."bookStartDateTime"),
+    CONSTRAINT validBookingRange CHECK({BookingTable}."bookStartDateTime" < {BookingTable}."bookEndDateTime"),
+    CONSTRAINT bookingStartWindow CHECK ("bookStartDateTime"::time >= TIME '07:00'),
+    CONSTRAINT bookingEndWindow CHECK ("bookEndDateTime"::time <= TIME '23:00')
+) PARTITION BY RANGE ("bookStartDateTime");
+
+-- catches the bookings of the months that do not have a partition yet
+CREATE TABLE IF NOT EXISTS {BookingDefaultPartition}
+PARTITION OF {BookingTable} DEFAULT;
+
+CREATE INDEX IF NOT EXISTS idx_user_start_time
+ON {BookingTable}("userID", "bookStartDateTime");
+
+CREATE INDEX IF NOT EXISTS idx_user
+ON {BookingTable}("userID");
+
+CREATE INDEX IF NOT EXISTS idx_room
+ON {BookingTable}("roomID");
+
+-- the bookings of a partition are mostly inserted in order of time, so a small BRIN index is enough for the time ranges
+CREATE INDEX IF NOT EXISTS idx_booking_time_brin
+ON {BookingTable} USING brin ("bookStartDateTime", "bookEndDateTime");
+
+-- indexes over only the bookings that are not cancelled
+CREATE INDEX IF NOT EXISTS idx_active_room_time
+ON {BookingTable}("roomID", "bookStartDateTime", "bookEndDateTime")
+WHERE NOT "isCancelled";
+
+CREATE INDEX IF NOT EXISTS idx_active_user_time
+ON {BookingTable}("userID", "bookStartDateTime")
+WHERE NOT "isCancelled";
\ No newline at end of file
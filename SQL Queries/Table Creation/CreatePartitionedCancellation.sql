@@ -0,0 +1,19 @@
+CREATE TABLE {CancellationTable} (
+    "bookingID" UUID NOT NULL,
+    "userID" UUID NOT NULL,
+    "cancelDateTime" TIMESTAMP WITHOUT TIME ZONE,
+    "bookStartDateTime" TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+
+    -- partitioned on the start time of the booking, so a cancellation is in the same month as its booking
+    PRIMARY KEY ("bookingID", "bookStartDateTime"),
+    FOREIGN KEY ("bookingID", "bookStartDateTime") REFERENCES {BookingTable}("bookingID", "bookStartDateTime")
+        ON DELETE CASCADE
+        ON UPDATE CASCADE
+) PARTITION BY RANGE ("bookStartDateTime");
+
+-- catches the cancellations of the months that do not have a partition yet
+CREATE TABLE IF NOT EXISTS {CancellationDefaultPartition}
+PARTITION OF {CancellationTable} DEFAULT;
+
+CREATE INDEX IF NOT EXISTS idx_cancellation_time_brin
+ON {CancellationTable} USING brin ("bookStartDateTime");
\ No newline at end of file
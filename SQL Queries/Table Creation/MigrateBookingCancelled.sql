@@ -0,0 +1,23 @@
+-- Updates the bookings and cancellations of a database built before the bookings kept whether they are cancelled
+--   and the cancellations kept the start times of their bookings. Safe to run more than once
+ALTER TABLE {BookingTable} ADD COLUMN IF NOT EXISTS "isCancelled" BOOLEAN NOT NULL DEFAULT FALSE;
+ALTER TABLE {CancellationTable} ADD COLUMN IF NOT EXISTS "bookStartDateTime" TIMESTAMP WITHOUT TIME ZONE;
+
+UPDATE {BookingTable} AS b
+SET "isCancelled" = NOT b."isCancelled"
+WHERE b."isCancelled" <> EXISTS (SELECT 1 FROM {CancellationTable} AS c WHERE c."bookingID" = b."bookingID");
+
+UPDATE {CancellationTable} AS c
+SET "bookStartDateTime" = b."bookStartDateTime"
+FROM {BookingTable} AS b
+WHERE b."bookingID" = c."bookingID"
+  AND c."bookStartDateTime" IS DISTINCT FROM b."bookStartDateTime";
+
+-- indexes over only the bookings that are not cancelled
+CREATE INDEX IF NOT EXISTS idx_active_room_time
+ON {BookingTable}("roomID", "bookStartDateTime", "bookEndDateTime")
+WHERE NOT "isCancelled";
+
+CREATE INDEX IF NOT EXISTS idx_active_user_time
+ON {BookingTable}("userID", "bookStartDateTime")
+WHERE NOT "isCancelled";
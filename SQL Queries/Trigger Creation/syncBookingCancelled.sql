@@ -0,0 +1,23 @@
+DROP TRIGGER IF EXISTS syncBookingCancelled ON {CancellationTable};
+DROP FUNCTION IF EXISTS {BookingCancelledSyncFunc}();
+
+CREATE FUNCTION {BookingCancelledSyncFunc}()
+    RETURNS trigger
+    LANGUAGE plpgsql AS $func$
+BEGIN
+    IF (TG_OP = 'DELETE' OR TG_OP = 'UPDATE') THEN
+        UPDATE {BookingTable} SET "isCancelled" = FALSE WHERE "bookingID" = OLD."bookingID" AND "isCancelled";
+    END IF;
+
+    IF (TG_OP = 'INSERT' OR TG_OP = 'UPDATE') THEN
+        UPDATE {BookingTable} SET "isCancelled" = TRUE WHERE "bookingID" = NEW."bookingID" AND NOT "isCancelled";
+    END IF;
+
+    RETURN NULL;
+END; $func$;
+
+
+CREATE TRIGGER syncBookingCancelled
+AFTER INSERT OR DELETE OR UPDATE OF "bookingID" ON {CancellationTable}
+FOR EACH ROW
+    EXECUTE FUNCTION {BookingCancelledSyncFunc}();
@@ -22,7 +22,7 @@ END; $func$;
 
 
 CREATE TRIGGER validBooking
-BEFORE INSERT OR UPDATE ON {BookingTable}
+BEFORE INSERT OR UPDATE OF "roomID", "participants" ON {BookingTable}
 FOR EACH ROW
     EXECUTE FUNCTION {BookingParticipantsCheckFunc}();
 
@@ -41,10 +41,7 @@ BEGIN
               NEW."bookStartDateTime" < b."bookEndDateTime"
               AND NEW."bookEndDateTime" > b."bookStartDateTime"
           )
-          AND NOT EXISTS (
-              SELECT 1 FROM {CancellationTable} c
-              WHERE c."bookingID" = b."bookingID"
-          )
+          AND NOT b."isCancelled"
     ) THEN
         RAISE EXCEPTION 'User already has an overlapping booking on this day.';
     END IF;
@@ -54,6 +51,6 @@ END;
 $func$;
 
 CREATE TRIGGER preventUserOverlap
-BEFORE INSERT OR UPDATE ON {BookingTable}
+BEFORE INSERT OR UPDATE OF "userID", "bookStartDateTime", "bookEndDateTime" ON {BookingTable}
 FOR EACH ROW
 EXECUTE FUNCTION {BookingUserOverlapCheckFunc}();
\ No newline at end of file
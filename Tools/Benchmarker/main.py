@@ -0,0 +1,10 @@
+import Benchmarker as BM
+
+
+def main():
+    benchmarker = BM.Benchmarker.create()
+    benchmarker.run()
+
+
+if __name__ == "__main__":
+    main()
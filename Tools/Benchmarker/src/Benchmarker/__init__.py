@@ -0,0 +1,22 @@
+from .constants.Commands import Commands
+from .constants.ConfigKeys import ConfigKeys
+from .constants.CommandOpts import CommandOpts
+from .constants.ShortCommandOpts import ShortCommandOpts
+
+from .exceptions.InvalidCommand import InvalidCommand
+
+from .benchmarks.BaseBenchmark import BaseBenchmark
+from .benchmarks.RowAdapterBenchmark import RowAdapterBenchmark
+from .benchmarks.AvailabilityIndexBenchmark import AvailabilityIndexBenchmark
+from .benchmarks.ServerThroughputBenchmark import ServerThroughputBenchmark
+from .benchmarks.DateTimeParsingBenchmark import DateTimeParsingBenchmark
+
+from .benchmarker import Benchmarker
+from .commandBuilder import CommandBuilder
+from .config import Config
+
+
+__all__ = ["Commands", "ConfigKeys", "CommandOpts", "ShortCommandOpts",
+           "InvalidCommand",
+           "BaseBenchmark", "RowAdapterBenchmark", "AvailabilityIndexBenchmark", "ServerThroughputBenchmark", "DateTimeParsingBenchmark",
+           "Benchmarker", "CommandBuilder", "Config"]
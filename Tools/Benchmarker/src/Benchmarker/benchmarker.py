@@ -0,0 +1,123 @@
+import os
+import sys
+import traceback
+
+from typing import Optional
+
+import PyUtils as PU
+import Backend as BK
+import DataImporter as DI
+from Backend.Config import Config as BackendConfig
+
+from .config import Config
+from .commandBuilder import CommandBuilder
+from .constants.Commands import Commands
+from .constants.ConfigKeys import ConfigKeys
+from .benchmarks.RowAdapterBenchmark import RowAdapterBenchmark
+from .benchmarks.AvailabilityIndexBenchmark import AvailabilityIndexBenchmark
+from .benchmarks.ServerThroughputBenchmark import ServerThroughputBenchmark
+from .benchmarks.DateTimeParsingBenchmark import DateTimeParsingBenchmark
+
+
+# Benchmarker: Runs the performance benchmarks for the app
+class Benchmarker():
+    Singleton = None
+
+    DatasetFolders = {
+        PU.DBNames.Toy.value: PU.Paths.ToyDatasetFolder.value,
+        PU.DBNames.Dev.value: PU.Paths.SampleDatasetFolder.value,
+        PU.DBNames.Prod.value: PU.Paths.ProdDatasetFolder.value,
+        PU.DBNames.XL.value: PU.Paths.XLDatasetFolder.value
+    }
+
+    def __init__(self):
+        envPath = os.path.join(PU.Paths.ProjectFolder.value, ".env")
+        Config[ConfigKeys.UserDBSecrets] = PU.DBSecrets.load() if (os.path.isfile(envPath)) else PU.DBSecrets()
+
+        self._commandBuilder = CommandBuilder("Runs the performance benchmarks for the app", Config)
+        self._dbTool = None
+        self._ephemeralDB: Optional[PU.EphemeralPostgres] = None
+
+    @classmethod
+    def create(cls):
+        if (cls.Singleton is None):
+            cls.Singleton = cls()
+
+        return cls.Singleton
+    
+    # _getDBTool(): Retrieves the tool for connecting to the database of the live benchmarks
+    def _getDBTool(self) -> PU.DBTool:
+        if (self._dbTool is None):
+            self._dbTool = PU.DBTool(Config[ConfigKeys.UserDBSecrets], database = Config[ConfigKeys.Database], useConnPool = True)
+
+        return self._dbTool
+
+    # _startEphemeralDB(database): Starts a temporary Postgres server and imports the dataset of some database into the server.
+    #   The importer prints out the throughput of loading each table
+    def _startEphemeralDB(self, database: str):
+        datasetFolder = self.DatasetFolders.get(database)
+        if (datasetFolder is None):
+            raise KeyError(f"No dataset available for the database ({database})")
+
+        self._ephemeralDB = PU.EphemeralPostgres()
+        Config[ConfigKeys.UserDBSecrets] = self._ephemeralDB.start()
+        print(f"Started a temporary Postgres server at port {self._ephemeralDB.port}")
+
+        importer = DI.Importer(Config[ConfigKeys.UserDBSecrets], database = database)
+        importer.importData(datasetFolder, buildLevel = DI.ImportLevel.Database)
+
+    def _run(self):
+        self._commandBuilder.parse()
+
+        command = Config[ConfigKeys.Command]
+        serverEnv = None
+
+        if (Config[ConfigKeys.Ephemeral] and command == Commands.ServerThroughput):
+            env = BK.EnvironmentModes.find(Config[ConfigKeys.Env])
+            self._startEphemeralDB(BackendConfig.load(env).database if (env is not None) else Config[ConfigKeys.Database])
+            serverEnv = self._ephemeralDB.getEnv()
+        elif (Config[ConfigKeys.Ephemeral]):
+            self._startEphemeralDB(Config[ConfigKeys.Database])
+
+        dbTool = self._getDBTool() if (Config[ConfigKeys.Live]) else None
+
+        rows = Config[ConfigKeys.Rows]
+        rowsKwargs = {} if (rows is None) else {"rows": rows}
+
+        if (command == Commands.RowAdapter):
+            benchmark = RowAdapterBenchmark(iterations = Config[ConfigKeys.Iterations], dbTool = dbTool, **rowsKwargs)
+        elif (command == Commands.AvailabilityIndex):
+            bookingsKwargs = {} if (rows is None) else {"bookings": rows}
+            benchmark = AvailabilityIndexBenchmark(iterations = Config[ConfigKeys.Iterations], dbTool = dbTool, **bookingsKwargs)
+        elif (command == Commands.ServerThroughput):
+            env = BK.EnvironmentModes.find(Config[ConfigKeys.Env])
+            if (env is None):
+                raise KeyError(f"No environment available for the name ({Config[ConfigKeys.Env]})")
+
+            benchmark = ServerThroughputBenchmark(iterations = Config[ConfigKeys.Iterations], clients = Config[ConfigKeys.Clients], env = env, serverEnv = serverEnv)
+        elif (command == Commands.DateTimeParsing):
+            benchmark = DateTimeParsingBenchmark(iterations = Config[ConfigKeys.Iterations], **rowsKwargs)
+
+        benchmark.run()
+
+    def tearDown(self):
+        if (self._dbTool is not None):
+            self._dbTool.closeDBPools()
+
+        if (self._ephemeralDB is not None):
+            self._ephemeralDB.stop()
+            self._ephemeralDB = None
+
+    def run(self):
+        error = None
+
+        try:
+            self._run()
+        except Exception as e:
+            print(traceback.format_exc())
+            error = e
+        finally:
+            self.tearDown()
+
+        if (error is not None):
+            sys.exit(1)
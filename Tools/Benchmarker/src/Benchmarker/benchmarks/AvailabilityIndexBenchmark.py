@@ -0,0 +1,133 @@
+import uuid
+import random
+from datetime import datetime, timedelta
+from typing import Optional, List, Tuple, Dict, Any
+
+import PyUtils as PU
+import Backend as BK
+
+from .BaseBenchmark import BaseBenchmark
+
+
+# AvailabilityIndexBenchmark: Compares finding the available rooms from the in-memory availability index
+#   against scanning through all the bookings
+class AvailabilityIndexBenchmark(BaseBenchmark):
+    StartTime = datetime(2025, 1, 1)
+    Days = 730
+
+    def __init__(self, iterations: int = 20, bookings: int = 1000000, rooms: int = 2000, checks: int = 200,
+                 dbTool: Optional[PU.DBTool] = None, seed: int = 0):
+        super().__init__(iterations = iterations)
+        self.bookings = bookings
+        self.rooms = rooms
+        self.checks = checks
+        self._dbTool = dbTool
+        self._rng = random.Random(seed)
+
+    # makeRooms(): Creates some synthetic rooms that look like the rooms returned from GetRoomsByBuildingID
+    def makeRooms(self) -> List[Dict[str, Any]]:
+        rooms = []
+        for i in range(self.rooms):
+            rooms.append({"roomID": uuid.UUID(int = self._rng.getrandbits(128)), "buildingName": f"Building {i // 20}", "roomName": f"Room {i}",
+                          "capacity": self._rng.randint(1, 300), "addressLine1": f"{i // 20} University Ave W", "addressLine2": "",
+                          "city": "Waterloo", "province": "ON", "country": "Canada", "postalCode": "N2L 3G1"})
+        return rooms
+
+    # makeTimeSlot(): Creates a random time slot between 7:00 AM and 11:00 PM of some day
+    def makeTimeSlot(self) -> Tuple[datetime, datetime]:
+        day = self.StartTime + timedelta(days = self._rng.randrange(self.Days))
+        startTime = day + timedelta(hours = 7, minutes = 15 * self._rng.randrange(60))
+        endTime = startTime + timedelta(minutes = 15 * self._rng.randint(1, 8))
+        return (startTime, endTime)
+
+    # makeBookings(rooms): Creates some synthetic (roomID, bookStartDateTime, bookEndDateTime) rows
+    def makeBookings(self, rooms: List[Dict[str, Any]]) -> List[Tuple[uuid.UUID, datetime, datetime]]:
+        roomIds = [room["roomID"] for room in rooms]
+
+        bookings = []
+        for i in range(self.bookings):
+            startTime, endTime = self.makeTimeSlot()
+            bookings.append((self._rng.choice(roomIds), startTime, endTime))
+
+        return bookings
+
+    # buildIndex(rooms, bookings): Builds the availability index from the rooms and bookings
+    @classmethod
+    def buildIndex(cls, rooms: List[Dict[str, Any]], bookings: List[Tuple[uuid.UUID, datetime, datetime]]) -> BK.RoomAvailabilityIndex:
+        index = BK.RoomAvailabilityIndex()
+        index.setRooms(rooms)
+        index.setBookings(bookings)
+        return index
+
+    # scanBookings(rooms, bookings, startTime, endTime): Counts the bookings overlapping [startTime, endTime] of each room
+    #   by going through all the bookings
+    @classmethod
+    def scanBookings(cls, rooms: List[Dict[str, Any]], bookings: List[Tuple[uuid.UUID, datetime, datetime]],
+                     startTime: datetime, endTime: datetime) -> Dict[uuid.UUID, int]:
+        result = {room["roomID"]: 0 for room in rooms}
+        for roomId, bookStartTime, bookEndTime in bookings:
+            if (not (bookStartTime >= endTime or bookEndTime <= startTime)):
+                result[roomId] += 1
+
+        return result
+
+    # checkConsistency(index, rooms, bookings): Compares the overlap counts from the index against scanning the bookings
+    #   for some random time slots and retrieves the number of mismatched rooms
+    def checkConsistency(self, index: BK.RoomAvailabilityIndex, rooms: List[Dict[str, Any]], bookings: List[Tuple[uuid.UUID, datetime, datetime]]) -> int:
+        mismatches = 0
+        for i in range(self.checks):
+            startTime, endTime = self.makeTimeSlot()
+            expected = self.scanBookings(rooms, bookings, startTime, endTime)
+
+            for room in index.fetchAvailableRooms(startTime, endTime):
+                if (expected[room["roomID"]] != room["overlappingBookings"]):
+                    mismatches += 1
+
+        return mismatches
+
+    # runSynthetic(): Benchmarks the index against scanning some synthetic bookings
+    def runSynthetic(self):
+        rooms = self.makeRooms()
+        bookings = self.makeBookings(rooms)
+
+        index = self.buildIndex(rooms, bookings)
+        buildResults = {"build index": self.summarize(self.timeFunc(lambda: self.buildIndex(rooms, bookings), iterations = max(1, self.iterations // 10)))}
+        buildMemory = {"build index": self.measurePeakMemory(lambda: self.buildIndex(rooms, bookings))}
+        self.printResults(f"Build Index ({self.bookings} bookings, {self.rooms} rooms)", buildResults, peakMemory = buildMemory)
+
+        startTime, endTime = self.makeTimeSlot()
+        queryResults = {"index": self.summarize(self.timeFunc(lambda: index.fetchAvailableRooms(startTime, endTime))),
+                        "scan": self.summarize(self.timeFunc(lambda: self.scanBookings(rooms, bookings, startTime, endTime)))}
+        self.printResults(f"Available Rooms ({self.bookings} bookings, {self.iterations} iterations)", queryResults)
+
+        mismatches = self.checkConsistency(index, rooms, bookings)
+        print(f"Consistency check: {mismatches} mismatched rooms over {self.checks} random time slots\n")
+
+    # runLive(): Benchmarks the index against R6 on the database
+    def runLive(self):
+        index = BK.RoomAvailabilityIndex()
+        loadResults = {"load index": self.summarize(self.timeFunc(lambda: index.load(self._dbTool), iterations = max(1, self.iterations // 10)))}
+        self.printResults(f"Load Index from '{self._dbTool.database}' ({index.bookingCount()} active bookings)", loadResults)
+
+        startTime, endTime = self.makeTimeSlot()
+        params = {"room_name": None, "min_capacity": None, "max_capacity": None, "start_time": startTime, "end_time": endTime}
+
+        queryResults = {"index": self.summarize(self.timeFunc(lambda: index.fetchAvailableRooms(startTime, endTime))),
+                        "R6": self.summarize(self.timeFunc(lambda: self._dbTool.fetchRecords(PU.StatementNames.R6.value, vars = params)))}
+        self.printResults(f"Available Rooms on '{self._dbTool.database}' ({self.iterations} iterations)", queryResults)
+
+        inconsistencies = []
+        for i in range(self.checks):
+            startTime, endTime = self.makeTimeSlot()
+            inconsistencies += index.findInconsistencies(self._dbTool, startTime, endTime)
+
+        print(f"Consistency check: {len(inconsistencies)} inconsistencies against R6 over {self.checks} random time slots")
+        for inconsistency in inconsistencies[:10]:
+            print(f"  - {inconsistency}")
+        print("")
+
+    def run(self):
+        self.runSynthetic()
+
+        if (self._dbTool is not None):
+            self.runLive()
@@ -0,0 +1,68 @@
+import time
+import statistics
+import tracemalloc
+from typing import Callable, Any, List, Dict, Optional
+
+
+# BaseBenchmark: Base class for timing different ways of doing the same operation
+class BaseBenchmark():
+    def __init__(self, iterations: int = 20):
+        self.iterations = iterations
+
+    # timeFunc(func, iterations): Retrieves the time in seconds of each run of some function
+    def timeFunc(self, func: Callable[[], Any], iterations: Optional[int] = None) -> List[float]:
+        if (iterations is None):
+            iterations = self.iterations
+
+        # warm up any caches before recording the times
+        func()
+
+        times = []
+        for i in range(iterations):
+            startTime = time.perf_counter()
+            func()
+            times.append(time.perf_counter() - startTime)
+
+        return times
+
+    # measurePeakMemory(func): Retrieves the peak number of bytes allocated while running some function
+    def measurePeakMemory(self, func: Callable[[], Any]) -> int:
+        tracemalloc.start()
+        try:
+            func()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        return peak
+
+    # summarize(times): Retrieves the summary statistics of the times for some function
+    @classmethod
+    def summarize(cls, times: List[float]) -> Dict[str, float]:
+        sortedTimes = sorted(times)
+        p95Ind = min(len(sortedTimes) - 1, int(round(0.95 * (len(sortedTimes) - 1))))
+
+        return {"min": sortedTimes[0],
+                "median": statistics.median(sortedTimes),
+                "mean": statistics.fmean(sortedTimes),
+                "p95": sortedTimes[p95Ind]}
+
+    # printResults(title, results, peakMemory): Prints out the results of the benchmark
+    def printResults(self, title: str, results: Dict[str, Dict[str, float]], peakMemory: Optional[Dict[str, int]] = None):
+        if (peakMemory is None):
+            peakMemory = {}
+
+        nameWidth = max(map(len, results.keys()))
+        print(f"===== {title} =====")
+        print(f"{'':<{nameWidth}}  {'min (ms)':>10}  {'median (ms)':>12}  {'mean (ms)':>10}  {'p95 (ms)':>10}  {'peak mem (KiB)':>15}")
+
+        for name, stats in results.items():
+            memory = peakMemory.get(name)
+            memoryStr = "" if (memory is None) else f"{memory / 1024:.1f}"
+            print(f"{name:<{nameWidth}}  {stats['min'] * 1000:>10.3f}  {stats['median'] * 1000:>12.3f}  {stats['mean'] * 1000:>10.3f}  {stats['p95'] * 1000:>10.3f}  {memoryStr:>15}")
+
+        print("")
+
+    # run(): Runs the benchmark
+    def run(self):
+        pass
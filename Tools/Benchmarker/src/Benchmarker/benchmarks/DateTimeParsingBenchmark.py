@@ -0,0 +1,88 @@
+import random
+from datetime import datetime, timedelta
+import pandas as pd
+from typing import List, Optional
+
+import PyUtils as PU
+
+from .BaseBenchmark import BaseBenchmark
+
+
+# DateTimeParsingBenchmark: Compares trying each datetime format until one fits against the format detection
+#   cached by the DateTimeParser, for the strings of single requests and for whole columns of the dataset
+class DateTimeParsingBenchmark(BaseBenchmark):
+    StartTime = datetime(2025, 1, 1)
+    Days = 730
+
+    # the format of the times sent by the frontend and the format of the times in the generated datasets
+    RequestFormat = '%Y-%m-%dT%H:%M'
+    ColumnFormat = '%Y-%m-%d %H:%M:%S'
+
+    def __init__(self, iterations: int = 20, rows: int = 1000000, requests: int = 10000, seed: int = 0):
+        super().__init__(iterations = iterations)
+        self.rows = rows
+        self.requests = requests
+        self._rng = random.Random(seed)
+
+    # makeStrs(count, format): Creates some random datetime strings in some format
+    def makeStrs(self, count: int, format: str) -> List[str]:
+        seconds = self.Days * 24 * 60 * 60
+        return [(self.StartTime + timedelta(seconds = self._rng.randrange(seconds))).strftime(format) for i in range(count)]
+
+    # strptimeLoop(dateTimeStr, formats): Converts a string to a datetime by trying each format until one fits
+    @classmethod
+    def strptimeLoop(cls, dateTimeStr: str, formats: Optional[List[str]] = None) -> datetime:
+        if (formats is None):
+            formats = PU.DateTimeTool.StrFormats
+
+        for format in formats:
+            try:
+                return datetime.strptime(dateTimeStr, format)
+            except ValueError:
+                continue
+
+        raise ValueError(f"The following datetime string ({dateTimeStr}) cannot be converted using any of the following formats: {formats}")
+
+    # formatLoop(column, formats): Converts a column to datetimes by trying each format over the whole column until one fits
+    @classmethod
+    def formatLoop(cls, column: pd.Series, formats: Optional[List[str]] = None) -> pd.Series:
+        if (formats is None):
+            formats = PU.DateTimeTool.StrFormats
+
+        for format in formats:
+            try:
+                return pd.to_datetime(column, format = format)
+            except ValueError:
+                continue
+
+        return column
+
+    # runRequests(): Benchmarks converting the start and end times of single requests
+    def runRequests(self):
+        dateTimeStrs = self.makeStrs(self.requests, self.RequestFormat)
+        parser = PU.DateTimeTool.getParser()
+
+        results = {"strptime loop": self.summarize(self.timeFunc(lambda: [self.strptimeLoop(dateTimeStr) for dateTimeStr in dateTimeStrs])),
+                   "DateTimeParser": self.summarize(self.timeFunc(lambda: [parser.parse(dateTimeStr) for dateTimeStr in dateTimeStrs]))}
+
+        # the time of every 1000 strings, since a single string takes microseconds
+        results = {name: {stat: value * 1000 / self.requests for stat, value in stats.items()} for name, stats in results.items()}
+        self.printResults(f"Request Times to Datetimes (per 1000 strings, '{self.RequestFormat}', {self.iterations} iterations)", results)
+
+    # runColumns(): Benchmarks converting a whole column of the dataset
+    def runColumns(self):
+        strs = self.makeStrs(self.rows, self.ColumnFormat)
+        parser = PU.DateTimeTool.getParser()
+
+        # the default string type is the type of the columns read by 'pd.read_csv' (Arrow strings with pandas 3 and pyarrow)
+        columns = {"default strings": pd.Series(strs), "object strings": pd.Series(strs, dtype = object)}
+
+        for columnType, column in columns.items():
+            results = {"format loop": self.summarize(self.timeFunc(lambda: self.formatLoop(column))),
+                       "DateTimeParser": self.summarize(self.timeFunc(lambda: parser.parseColumn(column)))}
+
+            self.printResults(f"Column to Datetimes ({self.rows} rows of {columnType}, '{self.ColumnFormat}', {self.iterations} iterations)", results)
+
+    def run(self):
+        self.runRequests()
+        self.runColumns()
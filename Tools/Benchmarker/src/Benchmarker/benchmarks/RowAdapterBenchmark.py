@@ -0,0 +1,79 @@
+import uuid
+import random
+from datetime import datetime, timezone
+import pandas as pd
+from typing import Optional, List, Tuple, Any, Dict
+
+import PyUtils as PU
+
+from .BaseBenchmark import BaseBenchmark
+
+
+# RowAdapterBenchmark: Compares turning query rows into records through a pandas dataframe
+#   against building the records straight from the cursor rows
+class RowAdapterBenchmark(BaseBenchmark):
+    # columns returned by the R6 feature, the busiest read endpoint
+    Columns = ("roomID", "buildingName", "roomName", "overlappingBookings", "capacity", 
+               "addressLine1", "addressLine2", "city", "province", "country", "postalCode")
+
+    def __init__(self, iterations: int = 20, rows: int = 5000, dbTool: Optional[PU.DBTool] = None, seed: int = 0):
+        super().__init__(iterations = iterations)
+        self.rows = rows
+        self._dbTool = dbTool
+        self._rng = random.Random(seed)
+
+    # makeRows(): Creates some synthetic rows that look like the rows returned from R6
+    def makeRows(self) -> List[Tuple[Any, ...]]:
+        rows = []
+        for i in range(self.rows):
+            rows.append((uuid.UUID(int = self._rng.getrandbits(128)), f"Building {i // 20}", f"Room {i}", self._rng.randint(0, 3), 
+                         self._rng.randint(1, 300), f"{i} University Ave W", "", "Waterloo", "ON", "Canada", "N2L 3G1"))
+        return rows
+
+    # pandasRecords(rows): Turns the rows into records the way pd.read_sql(...).to_dict('records') does
+    @classmethod
+    def pandasRecords(cls, rows: List[Tuple[Any, ...]]) -> List[Dict[str, Any]]:
+        return pd.DataFrame.from_records(rows, columns = cls.Columns, coerce_float = True).to_dict('records')
+    
+    # adapterRecords(rows): Turns the rows into records with the row adapter of the DBTool
+    @classmethod
+    def adapterRecords(cls, rows: List[Tuple[Any, ...]]) -> List[Dict[str, Any]]:
+        return PU.DBTool.toRecords(cls.Columns, rows)
+    
+    # runSynthetic(): Benchmarks turning synthetic rows into records
+    def runSynthetic(self):
+        rows = self.makeRows()
+
+        results = {"pandas": self.summarize(self.timeFunc(lambda: self.pandasRecords(rows))),
+                   "row adapter": self.summarize(self.timeFunc(lambda: self.adapterRecords(rows)))}
+        
+        peakMemory = {"pandas": self.measurePeakMemory(lambda: self.pandasRecords(rows)),
+                      "row adapter": self.measurePeakMemory(lambda: self.adapterRecords(rows))}
+        
+        self.printResults(f"Rows to Records ({self.rows} synthetic rows, {self.iterations} iterations)", results, peakMemory = peakMemory)
+
+    # runLive(): Benchmarks running R6 against the database
+    def runLive(self):
+        registry = self._dbTool.sqlRegistry
+        currentTime = datetime.now(timezone.utc)
+        params = {"room_name": None, "min_capacity": None, "max_capacity": None, "start_time": currentTime, "end_time": currentTime}
+
+        sql = registry.getSQL(PU.StatementNames.R6.value)
+        sqlEngine = self._dbTool.getSQLEngine()
+
+        pandasFunc = lambda: pd.read_sql(sql, sqlEngine, params = params).to_dict('records')
+        adapterFunc = lambda: self._dbTool.fetchRecords(PU.StatementNames.R6.value, vars = params)
+
+        results = {"pd.read_sql": self.summarize(self.timeFunc(pandasFunc)),
+                   "fetchRecords": self.summarize(self.timeFunc(adapterFunc))}
+        
+        peakMemory = {"pd.read_sql": self.measurePeakMemory(pandasFunc),
+                      "fetchRecords": self.measurePeakMemory(adapterFunc)}
+
+        self.printResults(f"R6 on '{self._dbTool.database}' ({self.iterations} iterations)", results, peakMemory = peakMemory)
+
+    def run(self):
+        self.runSynthetic()
+
+        if (self._dbTool is not None):
+            self.runLive()
@@ -0,0 +1,156 @@
+import os
+import sys
+import time
+import socket
+import asyncio
+import subprocess
+from typing import Optional, List, Dict, Any
+
+import PyUtils as PU
+import Backend as BK
+from Backend.Config import Config as BackendConfig
+
+from .BaseBenchmark import BaseBenchmark
+
+
+# ServerThroughputBenchmark: Compares the throughput and latency of the backend served by waitress against the asyncio server
+#   with many clients sending requests at the same time.
+#
+#   Each server mode is started in its own process and every client keeps a single connection open,
+#   sending its requests one after the other
+class ServerThroughputBenchmark(BaseBenchmark):
+    Host = "127.0.0.1"
+    Paths = ["/", "/viewBuildings"]
+    ServerModes = [BK.ServerModes.Waitress, BK.ServerModes.Async]
+
+    StartTimeout = 60
+    RequestTimeout = 30
+
+    def __init__(self, iterations: int = 20, clients: int = 1000, env: BK.EnvironmentModes = BK.EnvironmentModes.Toy,
+                 paths: Optional[List[str]] = None, serverModes: Optional[List[BK.ServerModes]] = None, serverEnv: Optional[Dict[str, str]] = None):
+        super().__init__(iterations = iterations)
+        self.clients = clients
+        self.env = env
+        self.paths = self.Paths if (paths is None) else paths
+        self.serverModes = self.ServerModes if (serverModes is None) else serverModes
+        self.serverEnv = {} if (serverEnv is None) else serverEnv
+
+    # raiseFileLimit(): Raises the limit on the number of open files, so every client can have its own connection
+    def raiseFileLimit(self):
+        try:
+            import resource
+        except ImportError:
+            return
+
+        softLimit, hardLimit = resource.getrlimit(resource.RLIMIT_NOFILE)
+        neededLimit = self.clients + 256
+        if (softLimit != resource.RLIM_INFINITY and softLimit < neededLimit):
+            newLimit = neededLimit if (hardLimit == resource.RLIM_INFINITY) else min(neededLimit, hardLimit)
+            resource.setrlimit(resource.RLIMIT_NOFILE, (newLimit, hardLimit))
+
+    # startServer(serverMode): Starts the backend with some server mode in a new process.
+    #   'serverEnv' adds environment variables to the process (eg. the secrets of a temporary database server)
+    def startServer(self, serverMode: BK.ServerModes) -> subprocess.Popen:
+        mainFile = os.path.join(PU.Paths.ProjectFolder.value, "backend", "main.py")
+        return subprocess.Popen([sys.executable, mainFile, "-e", self.env.value, "-s", serverMode.value],
+                                stdout = subprocess.DEVNULL, stderr = subprocess.DEVNULL, env = {**os.environ, **self.serverEnv})
+
+    # waitForServer(server, port): Waits until the server accepts connections
+    def waitForServer(self, server: subprocess.Popen, port: int):
+        deadline = time.monotonic() + self.StartTimeout
+
+        while (time.monotonic() < deadline):
+            if (server.poll() is not None):
+                raise RuntimeError(f"The server exited with code {server.returncode} before it started")
+
+            try:
+                with socket.create_connection((self.Host, port), timeout = 1):
+                    return
+            except OSError:
+                time.sleep(0.25)
+
+        raise TimeoutError(f"The server did not start within {self.StartTimeout}s")
+
+    # stopServer(server): Stops the process of some server
+    def stopServer(self, server: subprocess.Popen):
+        server.terminate()
+
+        try:
+            server.wait(timeout = 10)
+        except subprocess.TimeoutExpired:
+            server.kill()
+            server.wait()
+
+    # _runClient(port, path, latencies, errors): Sends requests to some path one after the other through a single connection,
+    #   reconnecting if the server closes the connection
+    async def _runClient(self, port: int, path: str, latencies: List[float], errors: Dict[str, int]):
+        client = PU.AsyncHTTPClient(self.Host, port, timeout = self.RequestTimeout)
+
+        for i in range(self.iterations):
+            startTime = time.perf_counter()
+
+            try:
+                response = await client.get(path)
+            except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, ValueError) as e:
+                errorName = type(e).__name__
+                errors[errorName] = errors.get(errorName, 0) + 1
+                continue
+
+            latencies.append(time.perf_counter() - startTime)
+            if (response.status >= 400):
+                errorName = f"HTTP {response.status}"
+                errors[errorName] = errors.get(errorName, 0) + 1
+
+        client.close()
+
+    # runLoad(port, path): Sends the requests of all the clients at the same time and retrieves the throughput and latencies
+    async def runLoad(self, port: int, path: str) -> Dict[str, Any]:
+        latencies: List[float] = []
+        errors: Dict[str, int] = {}
+
+        startTime = time.perf_counter()
+        await asyncio.gather(*[self._runClient(port, path, latencies, errors) for i in range(self.clients)])
+        duration = time.perf_counter() - startTime
+
+        sortedLatencies = sorted(latencies)
+        percentile = lambda fraction: sortedLatencies[int(fraction * (len(sortedLatencies) - 1))] if (sortedLatencies) else 0.0
+        successCount = len(latencies) - sum(count for name, count in errors.items() if (name.startswith("HTTP")))
+
+        return {"requests": self.clients * self.iterations,
+                "throughput": successCount / duration,
+                "p50": percentile(0.5),
+                "p95": percentile(0.95),
+                "p99": percentile(0.99),
+                "errors": errors}
+
+    # printThroughput(title, results): Prints out the throughput and latencies of each server mode
+    def printThroughput(self, title: str, results: Dict[str, Dict[str, Any]]):
+        nameWidth = max(map(len, results.keys()))
+        print(f"===== {title} =====")
+        print(f"{'':<{nameWidth}}  {'requests':>9}  {'req/s':>9}  {'p50 (ms)':>9}  {'p95 (ms)':>9}  {'p99 (ms)':>9}  errors")
+
+        for name, result in results.items():
+            errors = ", ".join(f"{errorName}: {count}" for errorName, count in sorted(result["errors"].items())) or "none"
+            print(f"{name:<{nameWidth}}  {result['requests']:>9}  {result['throughput']:>9.1f}  {result['p50'] * 1000:>9.2f}  "
+                  f"{result['p95'] * 1000:>9.2f}  {result['p99'] * 1000:>9.2f}  {errors}")
+
+        print("")
+
+    def run(self):
+        self.raiseFileLimit()
+        port = BackendConfig.load(self.env).port
+        results = {path: {} for path in self.paths}
+
+        for serverMode in self.serverModes:
+            server = self.startServer(serverMode)
+
+            try:
+                self.waitForServer(server, port)
+
+                for path in self.paths:
+                    results[path][serverMode.value] = asyncio.run(self.runLoad(port, path))
+            finally:
+                self.stopServer(server)
+
+        for path, pathResults in results.items():
+            self.printThroughput(f"{path} ({self.clients} concurrent clients, {self.iterations} requests each)", pathResults)
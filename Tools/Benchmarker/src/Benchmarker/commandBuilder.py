@@ -0,0 +1,100 @@
+import argparse
+from typing import Dict, Any, Optional
+
+import PyUtils as PU
+
+from .constants.Commands import Commands
+from .constants.ConfigKeys import ConfigKeys
+from .constants.CommandOpts import CommandOpts
+from .constants.ShortCommandOpts import ShortCommandOpts
+from .exceptions.InvalidCommand import InvalidCommand
+
+
+# CommandBuilder: Class for building the command for the benchmarker
+class CommandBuilder(PU.BaseCommandBuilder):
+    def __init__(self, description: str, configs: Dict[ConfigKeys, Any], 
+                 argParser: Optional[argparse.ArgumentParser] = None, argParserKwargs: Optional[Dict[str, Any]] = None,
+                 epilog: str = ""):
+
+        if (argParserKwargs is None):
+            argParserKwargs = {}
+
+        self._configs = configs
+        super().__init__(argParser = argParser, argParserKwargs = {"description": description, "epilog": epilog, **argParserKwargs})
+
+    def _addArguments(self):
+        allCommands = sorted(map(lambda command: f"  - {command}", Commands.getAll()))
+        allCommands = "\n".join(allCommands)
+
+        self._argParser.add_argument(ShortCommandOpts.Iterations.value, CommandOpts.Iterations.value, action='store', type=int, 
+                                     help=f"The number of times to run each benchmarked operation. Default is {self._configs[ConfigKeys.Iterations]}")
+        self._argParser.add_argument(ShortCommandOpts.Rows.value, CommandOpts.Rows.value, action='store', type=int, 
+                                     help=f"The number of synthetic rows used by the benchmark. Default depends on the benchmark")
+        self._argParser.add_argument(ShortCommandOpts.Live.value, CommandOpts.Live.value, action='store_true', 
+                                     help=f"Also run the benchmark against a running database")
+        self._argParser.add_argument(ShortCommandOpts.Database.value, CommandOpts.Database.value, action='store', type=str, 
+                                     help=f"The database to run the live benchmarks against. Default is '{self._configs[ConfigKeys.Database]}'")
+        self._argParser.add_argument(ShortCommandOpts.DBUserName.value, CommandOpts.DBUserName.value, action='store', type=str, help=f"Override the username to the database")
+        self._argParser.add_argument(ShortCommandOpts.DBPassword.value, CommandOpts.DBPassword.value, action='store', type=str, help=f"Override the password to the database")
+        self._argParser.add_argument(ShortCommandOpts.DBHost.value, CommandOpts.DBHost.value, action='store', type=str, help=f"Override the host to the database")
+        self._argParser.add_argument(ShortCommandOpts.DBPort.value, CommandOpts.DBPort.value, action='store', type=str, help=f"Override the port to the database")
+
+        self._argParser.add_argument(ShortCommandOpts.Clients.value, CommandOpts.Clients.value, action='store', type=int, 
+                                     help=f"The number of clients sending requests at the same time for '{Commands.ServerThroughput}'. Default is {self._configs[ConfigKeys.Clients]}")
+        self._argParser.add_argument(ShortCommandOpts.Env.value, CommandOpts.Env.value, action='store', type=str, 
+                                     help=f"The environment mode of the backend servers started by '{Commands.ServerThroughput}'. Default is '{self._configs[ConfigKeys.Env]}'")
+
+        self._argParser.add_argument(ShortCommandOpts.Ephemeral.value, CommandOpts.Ephemeral.value, action='store_true', 
+                                     help=f"Run the live benchmarks against a new temporary Postgres server with the dataset of the database imported into it, instead of the database in the secrets. Implies '{CommandOpts.Live.value}'")
+
+        self._argParser.add_argument("command", type=str, help=f"The benchmark to run.\n\nThe available benchmarks are:\n{allCommands}")
+
+    def _parseCommand(self):
+        commandName = self._args.command
+        command = Commands.match(commandName)
+
+        if (command is None):
+            raise InvalidCommand(commandName)
+        else:
+            self._configs[ConfigKeys.Command] = command
+
+    def _parseOptions(self):
+        if (self._args.iterations is not None):
+            self._configs[ConfigKeys.Iterations] = self._args.iterations
+
+        if (self._args.rows is not None):
+            self._configs[ConfigKeys.Rows] = self._args.rows
+
+        if (self._args.database is not None):
+            self._configs[ConfigKeys.Database] = self._args.database
+
+        if (self._args.clients is not None):
+            self._configs[ConfigKeys.Clients] = self._args.clients
+
+        if (self._args.env is not None):
+            self._configs[ConfigKeys.Env] = self._args.env
+
+        self._configs[ConfigKeys.Ephemeral] = self._args.ephemeral
+        self._configs[ConfigKeys.Live] = self._args.live or self._args.ephemeral
+
+    def _parseDBSecrets(self):
+        secrets = self._configs[ConfigKeys.UserDBSecrets]
+
+        if (self._args.username is not None):
+            secrets.username = self._args.username
+
+        if (self._args.password is not None):
+            secrets.password = self._args.password
+
+        if (self._args.host is not None):
+            secrets.host = self._args.host
+
+        if (self._args.port is not None):
+            secrets.port = self._args.port
+
+    def parseArgs(self) -> argparse.Namespace:
+        super().parseArgs()
+        self._parseCommand()
+        self._parseOptions()
+        self._parseDBSecrets()
+        return self._args
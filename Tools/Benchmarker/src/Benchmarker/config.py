@@ -0,0 +1,16 @@
+import PyUtils as PU
+
+from .constants.Commands import Commands
+from .constants.ConfigKeys import ConfigKeys
+
+
+# Configurations for the benchmarks
+Config = {ConfigKeys.Command: Commands.RowAdapter,
+          ConfigKeys.Iterations: 20,
+          ConfigKeys.Rows: None,
+          ConfigKeys.Live: False,
+          ConfigKeys.Database: PU.DBNames.Toy.value,
+          ConfigKeys.UserDBSecrets: PU.DBSecrets(),
+          ConfigKeys.Clients: 1000,
+          ConfigKeys.Env: "toy",
+          ConfigKeys.Ephemeral: False}
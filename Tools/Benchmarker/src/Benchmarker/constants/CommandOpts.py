@@ -0,0 +1,15 @@
+from enum import Enum
+
+
+class CommandOpts(Enum):
+    Iterations = "--iterations"
+    Rows = "--rows"
+    Live = "--live"
+    Database = "--database"
+    DBUserName = "--username"
+    DBPassword = "--password"
+    DBHost = "--host"
+    DBPort = "--port"
+    Clients = "--clients"
+    Env = "--env"
+    Ephemeral = "--ephemeral"
@@ -0,0 +1,8 @@
+import PyUtils as PU
+
+
+class Commands(PU.StrEnum):
+    RowAdapter = "rowAdapter"
+    AvailabilityIndex = "availabilityIndex"
+    ServerThroughput = "serverThroughput"
+    DateTimeParsing = "dateTimeParsing"
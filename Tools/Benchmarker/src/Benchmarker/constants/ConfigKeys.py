@@ -0,0 +1,13 @@
+import PyUtils as PU
+
+
+class ConfigKeys(PU.StrEnum):
+    Command = "command"
+    Iterations = "iterations"
+    Rows = "rows"
+    Live = "live"
+    Database = "database"
+    UserDBSecrets = "userDBSecrets"
+    Clients = "clients"
+    Env = "env"
+    Ephemeral = "ephemeral"
@@ -0,0 +1,15 @@
+from enum import Enum
+
+
+class ShortCommandOpts(Enum):
+    Iterations = "-i"
+    Rows = "-r"
+    Live = "-l"
+    Database = "-d"
+    DBUserName = "-u"
+    DBPassword = "-p"
+    DBHost = "-ho"
+    DBPort = "-po"
+    Clients = "-c"
+    Env = "-e"
+    Ephemeral = "-eph"
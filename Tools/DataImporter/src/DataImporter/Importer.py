@@ -2,38 +2,75 @@ import pandas as pd
 import numpy as np
 import os
 import sys
+import time
 import uuid
-from typing import Optional, Union, List, Dict
+from typing import Optional, Union, List, Dict, Tuple
 
 from .constants.Paths import UtilsPath
 from .constants.ImportLevel import ImportLevel
 
 sys.path.insert(1, UtilsPath)
 
-from PyUtils import DBSecrets, ColNames, TableNames, DBNames, DBTool, DBBuilder, DBCleaner, DateTimeTool
+from psycopg2.sql import SQL, Identifier
+
+from PyUtils import DBSecrets, ColNames, TableNames, DBNames, DBTool, DBBuilder, DBCleaner, DBPartitioner, DateTimeTool, DatasetFormats
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
 
 
 # Importer: The importer for adding data into the database
 class Importer(DBTool):
+    # where the 32 hex digits of a UUID go between its dashes
+    UUIDHexPositions = [i for i in range(36) if (i not in (8, 13, 18, 23))]
+
     def __init__(self, secrets: DBSecrets, database: str = DBNames.Toy.value, useConnPool: bool = False):
         super().__init__(secrets, database, useConnPool = useConnPool)
 
-    # toDateTime(data, cols, formats): Converts certain columns in the data to a datetime
+    # toDateTime(data, cols, formats): Converts certain columns in the data to a datetime.
+    #   The format of each column is detected from its first value, and typed timestamp columns (eg. from Parquet or Arrow files) are kept as they are
     def toDateTime(self, data: pd.DataFrame, cols: List[str], formats: Optional[List[str]] = None) -> pd.DataFrame:
-        if (formats is None):
-            formats = DateTimeTool.StrFormats
+        parser = DateTimeTool.getParser(formats)
 
         for col in cols:
-            for format in formats:
-                try:
-                    data[col] = pd.to_datetime(data[col], format = format)
-                except ValueError:
-                    continue
-                else:
-                    break
+            data[col] = parser.parseColumn(data[col])
 
         return data
     
+    # getTableFile(dataFolder, tableName): Retrieves the file a table of the dataset is saved in and the format of the file
+    @classmethod
+    def getTableFile(cls, dataFolder: str, tableName: str) -> Tuple[str, DatasetFormats]:
+        files = [(os.path.join(dataFolder, f"{tableName}{format.ext}"), format) for format in DatasetFormats]
+        files = [(file, format) for file, format in files if (os.path.isfile(file))]
+
+        if (not files):
+            raise FileNotFoundError(f"No file for the table, {tableName}, in the dataset folder: {dataFolder}")
+        elif (len(files) > 1):
+            raise ValueError(f"More than one file for the table, {tableName}, in the dataset folder: {', '.join(file for file, format in files)}")
+
+        return files[0]
+
+    # readTable(dataFolder, tableName): Reads a table of the dataset from its CSV, zstd compressed CSV, Parquet or Arrow file.
+    #   Parquet and Arrow files are memory mapped and keep the types of their columns, so their timestamps do not need to be parsed
+    def readTable(self, dataFolder: str, tableName: str) -> pd.DataFrame:
+        file, format = self.getTableFile(dataFolder, tableName)
+
+        if (format in (DatasetFormats.Parquet, DatasetFormats.Arrow) and pa is None):
+            raise ModuleNotFoundError(f"Reading {format.value} files needs pyarrow. Install it with: pip install pyarrow")
+
+        if (format == DatasetFormats.CSV):
+            return pd.read_csv(file)
+        elif (format == DatasetFormats.CSVZstd):
+            return pd.read_csv(file, compression = "zstd")
+        elif (format == DatasetFormats.Parquet):
+            return pq.read_table(file, memory_map = True).to_pandas()
+
+        with pa.memory_map(file) as source:
+            return pa.ipc.open_file(source).read_all().to_pandas()
+
     # convertUUID(id): Transforms 'id' to a UUID
     def convertUUID(self, id: Union[str, int]):
         try:
@@ -83,13 +120,30 @@ class Importer(DBTool):
         data = data.drop(columns = [tempIdColName, oldIdColName, idExistsColName])
         return data
     
-    # insertAndReplaceIds(dataToInsert, insertTableName, dataNeedingReplace, idColName): Inserts the data and replaces the foreign ids of the other
+    # load(data, tableName, returnCols, useCopy): Inserts the data into a table and prints out the throughput of the insertion
+    def load(self, data: pd.DataFrame, tableName: str, returnCols: Optional[List[str]] = None, useCopy: bool = True) -> Optional[pd.DataFrame]:
+        startTime = time.perf_counter()
+
+        if (useCopy):
+            result = self.copyFrom(data, tableName, returnCols = returnCols)
+        else:
+            result = self.insert(data, tableName, returnCols = returnCols)
+
+        duration = time.perf_counter() - startTime
+        rows = len(data)
+        rowsPerSec = rows / duration if (duration > 0) else float("inf")
+        print(f"  {rows} rows into {tableName} in {duration:.3f}s ({rowsPerSec:,.0f} rows/s)")
+
+        return result
+
+    # insertAndReplaceIds(dataToInsert, insertTableName, dataNeedingReplace, idColName, useCopy): Inserts the data and replaces the foreign ids of the other
     #   tables with the newly generated ids after the data insertion
-    def insertAndReplaceIds(self, dataToInsert: pd.DataFrame, insertTableName: str, dataNeedingReplace: List[pd.DataFrame], idColName: str) -> Optional[Union[List[pd.DataFrame], pd.DataFrame]]:
+    def insertAndReplaceIds(self, dataToInsert: pd.DataFrame, insertTableName: str, dataNeedingReplace: List[pd.DataFrame], idColName: str,
+                            useCopy: bool = True) -> Optional[Union[List[pd.DataFrame], pd.DataFrame]]:
         originalIds = dataToInsert[[idColName]]
         dataToInsert = dataToInsert.drop(idColName, axis = 1)
 
-        generatedIds = self.insert(dataToInsert, tableName = insertTableName, returnCols = [idColName])
+        generatedIds = self.load(dataToInsert, insertTableName, returnCols = [idColName], useCopy = useCopy)
 
         if (not dataNeedingReplace):
             return
@@ -102,6 +156,133 @@ class Importer(DBTool):
             return dataNeedingReplace[0]
         return dataNeedingReplace
     
+    # generateUUIDBytes(count): Generates the 16 bytes of random version 4 UUIDs in bulk
+    @classmethod
+    def generateUUIDBytes(cls, count: int) -> np.ndarray:
+        rawBytes = np.frombuffer(os.urandom(16 * count), dtype = np.uint8).reshape(count, 16).copy()
+
+        # set the version and variant bits the same way as uuid.uuid4()
+        rawBytes[:, 6] = (rawBytes[:, 6] & 0x0F) | 0x40
+        rawBytes[:, 8] = (rawBytes[:, 8] & 0x3F) | 0x80
+        return rawBytes
+
+    # toUUIDStrings(rawBytes): Formats the 16 bytes of many UUIDs as their text form (eg. 12345678-1234-1234-1234-123456789abc),
+    #   without creating a UUID object for each of them
+    @classmethod
+    def toUUIDStrings(cls, rawBytes: np.ndarray) -> np.ndarray:
+        count = len(rawBytes)
+        hexChars = np.frombuffer(rawBytes.tobytes().hex().encode("ascii"), dtype = "S1").reshape(count, 32)
+
+        result = np.full((count, 36), b"-", dtype = "S1")
+        result[:, cls.UUIDHexPositions] = hexChars
+        return result.view("S36").ravel().astype(str)
+
+    # intUUIDStrings(ids): Retrieves the text form of the UUIDs made from integer ids, the same as convertUUID(...)
+    @classmethod
+    def intUUIDStrings(cls, ids: np.ndarray) -> np.ndarray:
+        rawBytes = np.zeros((len(ids), 16), dtype = np.uint8)
+        rawBytes[:, 8:] = np.asarray(ids, dtype = ">u8").view(np.uint8).reshape(-1, 8)
+        return cls.toUUIDStrings(rawBytes)
+
+    # generateUUIDs(count): Generates random version 4 UUIDs in bulk
+    @classmethod
+    def generateUUIDs(cls, count: int) -> np.ndarray:
+        rawBytes = cls.generateUUIDBytes(count)
+        result = np.empty(count, dtype = object)
+        result[:] = [uuid.UUID(bytes = idBytes) for idBytes in map(bytes, rawBytes)]
+        return result
+
+    # mapIds(ids, originalIds, newIds): Maps the original ids to the new ids. Ids without a new id are left the same
+    @classmethod
+    def mapIds(cls, ids: pd.Series, originalIds: pd.Series, newIds: np.ndarray) -> np.ndarray:
+        if (ids.dtype != originalIds.dtype):
+            ids = ids.astype(str)
+            originalIds = originalIds.astype(str)
+
+        codes = pd.Categorical(ids, categories = pd.Index(originalIds)).codes
+        isMapped = codes >= 0
+
+        result = ids.to_numpy(dtype = object, copy = True)
+        result[isMapped] = newIds[codes[isMapped]]
+        return result
+
+    # assignIds(data, dataNeedingReplace, idColName): Generates a new id for every row of the data and replaces the foreign ids of the
+    #   other tables with the new ids, without needing to insert anything into the database.
+    #
+    #   Only the foreign ids that are marked as not already existing in the database (the '_exists' column is 0) are replaced
+    def assignIds(self, data: pd.DataFrame, dataNeedingReplace: List[pd.DataFrame], idColName: str) -> Tuple[pd.DataFrame, List[pd.DataFrame]]:
+        idExistsColName = f"{idColName}_exists"
+        originalIds = data[idColName]
+        newIds = self.generateUUIDs(len(data))
+
+        data = data.copy()
+        data[idColName] = newIds
+
+        result = []
+        for otherData in dataNeedingReplace:
+            otherData = otherData.copy()
+            isNew = otherData[idExistsColName].to_numpy() == 0
+            mappedIds = self.mapIds(otherData[idColName], originalIds, newIds)
+
+            otherData[idColName] = np.where(isNew, mappedIds, otherData[idColName].to_numpy(dtype = object))
+            result.append(otherData.drop(columns = [idExistsColName]))
+
+        return (data, result)
+
+    # fetchBookingStartTimes(bookingIds): Retrieves the start times of some bookings that are already in the database
+    def fetchBookingStartTimes(self, bookingIds: List[str]) -> pd.Series:
+        sql = SQL('SELECT "bookingID"::TEXT, "bookStartDateTime" FROM {table} WHERE "bookingID" = ANY(%(bookingIds)s::UUID[]);').format(table = Identifier(TableNames.Booking.value))
+        connData, cursor, error = self.executeSQL(sql, vars = {"bookingIds": bookingIds}, closeConn = False, raiseException = False)
+
+        try:
+            if (error is not None):
+                raise error
+
+            rows = cursor.fetchall()
+        finally:
+            connData.putConn()
+
+        return pd.Series(dict(rows), dtype = "datetime64[ns]")
+
+    # fillBookingStartTimes(cancellationData, bookingData): Copies the start times of the cancelled bookings being imported into the cancellations,
+    #   so each cancellation goes into the same monthly partition as its booking
+    def fillBookingStartTimes(self, cancellationData: pd.DataFrame, bookingData: pd.DataFrame) -> pd.DataFrame:
+        bookingIds = cancellationData[ColNames.BookingId.value].astype(str)
+        isNewBooking = cancellationData[ColNames.BookingIdExists.value] == 0
+
+        startTimes = pd.Series(bookingData[ColNames.BookingStartTime.value].values, index = bookingData[ColNames.BookingId.value].astype(str))
+        startTimes = startTimes[~startTimes.index.duplicated()]
+        result = bookingIds.map(startTimes).where(isNewBooking)
+
+        cancellationData[ColNames.BookingStartTime.value] = pd.to_datetime(result)
+        return cancellationData
+
+    # fillExistingBookingStartTimes(cancellationData, isExistingBooking): Copies the start times of the cancelled bookings that are already in the database
+    #   into the cancellations. The tables need to be built before this is called.
+    #
+    #   'isExistingBooking' marks the cancellations of the bookings already in the database. It is taken separately since the '_exists'
+    #   columns are dropped once the ids are assigned (see 'assignIds')
+    def fillExistingBookingStartTimes(self, cancellationData: pd.DataFrame, isExistingBooking: np.ndarray) -> pd.DataFrame:
+        if (not isExistingBooking.any()):
+            return cancellationData
+
+        bookingIds = cancellationData.loc[isExistingBooking, ColNames.BookingId.value].astype(str)
+        startTimes = self.fetchBookingStartTimes(bookingIds.unique().tolist())
+
+        cancellationData.loc[isExistingBooking, ColNames.BookingStartTime.value] = pd.to_datetime(bookingIds.map(startTimes))
+        return cancellationData
+
+    # createPartitions(bookingData): Creates the monthly partitions for all the bookings to be inserted, if the bookings table is partitioned
+    def createPartitions(self, bookingData: pd.DataFrame):
+        partitioner = DBPartitioner(self)
+        startTimes = bookingData[ColNames.BookingStartTime.value].dropna()
+
+        if (startTimes.empty or not partitioner.isPartitioned(TableNames.Booking.value)):
+            return
+
+        createdMonths = partitioner.createPartitions(startTimes.min().to_pydatetime(), startTimes.max().to_pydatetime())
+        print(f"  Created {len(createdMonths)} monthly partitions")
+
     # clean(isSure, cleanLevel): Cleans up a particular dataset
     def clean(self, isSure: bool = False, cleanLevel: ImportLevel = ImportLevel.Tuples):
         dbCleaner = DBCleaner(self)
@@ -121,20 +302,27 @@ class Importer(DBTool):
             print(f"Clearing all tables...")
             dbCleaner.clearAll(isSure = isSure)
 
-    # importData(dataFolder, buildLevel, clearLevel, randomIDs): Inserts all the data from a particular dataset
+    # importData(dataFolder, buildLevel, clearLevel, randomIDs, useCopy, clientIDs, bookingExclusion, partitioned): Inserts all the data from a particular dataset.
+    #   By default, the data is bulk loaded with COPY. Set 'useCopy' to False to insert the data with INSERT statements instead.
+    #
+    #   When 'randomIDs' is set, the random ids are generated by the database and read back after each table is inserted.
+    #   Set 'clientIDs' to generate the random ids in Python up front instead, so that all the tables are inserted in one pass.
+    #
+    #   Set 'bookingExclusion' when the bookings table has the exclusion constraint against overlapping bookings of the same room.
+    #   Set 'partitioned' to build the bookings and cancellations tables with monthly partitions. The bookings and cancellations
+    #   are routed into the partitions of their months, which are created as needed
+    #
+    #   Each table of the dataset can be saved as a CSV, zstd compressed CSV, Parquet or Arrow file (see 'readTable')
     def importData(self, dataFolder: str, buildLevel: ImportLevel = ImportLevel.Tuples, cleanLevel: Optional[ImportLevel] = None,
-                   randomIDs: bool = True):
-        userFile = os.path.join(dataFolder, "User.csv")
-        buildingFile = os.path.join(dataFolder, "Building.csv")
-        roomFile = os.path.join(dataFolder, "Room.csv")
-        bookingFile = os.path.join(dataFolder, "Booking.csv")
-        cancellationFile = os.path.join(dataFolder, "Cancellation.csv")
-
-        userData = pd.read_csv(userFile)
-        buildingData = pd.read_csv(buildingFile)
-        roomData = pd.read_csv(roomFile)
-        bookingData = pd.read_csv(bookingFile)
-        cancellationData = pd.read_csv(cancellationFile)
+                   randomIDs: bool = True, useCopy: bool = True, clientIDs: bool = False, bookingExclusion: bool = False, partitioned: bool = False):
+        if (bookingExclusion and partitioned):
+            raise ValueError("The exclusion constraint against overlapping bookings cannot be built on the partitioned bookings table")
+
+        userData = self.readTable(dataFolder, "User")
+        buildingData = self.readTable(dataFolder, "Building")
+        roomData = self.readTable(dataFolder, "Room")
+        bookingData = self.readTable(dataFolder, "Booking")
+        cancellationData = self.readTable(dataFolder, "Cancellation")
 
         # clean the datatypes of the raw datasets
         buildingData = self.fillNaN(buildingData, {ColNames.BuildingName.value: "",
@@ -148,6 +336,13 @@ class Importer(DBTool):
 
         bookingData = self.toDateTime(bookingData, [ColNames.BookingStartTime.value, ColNames.BookingEndTime.value, ColNames.BookingTime.value])
 
+        # mark the cancelled bookings before they are inserted, so the trigger on the cancellations does not need to update every cancelled booking
+        #   and the bookings are not rejected by the exclusion constraint when they overlap with other bookings of the same room
+        cancelledIds = cancellationData.loc[cancellationData[ColNames.BookingIdExists.value] == 0, ColNames.BookingId.value]
+        bookingData[ColNames.BookingIsCancelled.value] = bookingData[ColNames.BookingId.value].astype(str).isin(cancelledIds.astype(str))
+        cancellationData = self.fillBookingStartTimes(cancellationData, bookingData)
+        isExistingBooking = cancellationData[ColNames.BookingIdExists.value].to_numpy() != 0
+
         if (not randomIDs):
             userData = self.toUUID(userData, [ColNames.UserId.value])
             buildingData = self.toUUID(buildingData, [ColNames.BuildingId.value])
@@ -155,6 +350,15 @@ class Importer(DBTool):
             bookingData = self.toUUID(bookingData, [ColNames.BookingId.value, ColNames.UserId.value, ColNames.RoomId.value])
             cancellationData = self.toUUID(cancellationData, [ColNames.BookingId.value, ColNames.UserId.value])
 
+        if (randomIDs and clientIDs):
+            userData, [bookingData, cancellationData] = self.assignIds(userData, [bookingData, cancellationData], ColNames.UserId.value)
+            buildingData, [roomData] = self.assignIds(buildingData, [roomData], ColNames.BuildingId.value)
+            roomData, [bookingData] = self.assignIds(roomData, [bookingData], ColNames.RoomId.value)
+            bookingData, [cancellationData] = self.assignIds(bookingData, [cancellationData], ColNames.BookingId.value)
+
+        # ids generated by the database need to be read back to replace the foreign ids
+        readBackIds = randomIDs and not clientIDs
+
         dbBuilder = DBBuilder(self)
 
         if (cleanLevel is not None):
@@ -166,37 +370,41 @@ class Importer(DBTool):
 
         if (buildLevel.value >= ImportLevel.Tables.value):
             print(f"Constructing all tables and views...")
-            dbBuilder.build()
+            dbBuilder.build(withBookingExclusion = bookingExclusion, partitioned = partitioned)
+
+        # the bookings that are already in the database can only be read once the tables exist
+        cancellationData = self.fillExistingBookingStartTimes(cancellationData, isExistingBooking)
 
         print(f"Inserting User Data...")
-        if (randomIDs):
-            bookingData, cancellationData = self.insertAndReplaceIds(userData, TableNames.User.value, [bookingData, cancellationData], ColNames.UserId.value)
+        if (readBackIds):
+            bookingData, cancellationData = self.insertAndReplaceIds(userData, TableNames.User.value, [bookingData, cancellationData], ColNames.UserId.value, useCopy = useCopy)
         else:
-            self.insert(userData, TableNames.User.value)
+            self.load(userData, TableNames.User.value, useCopy = useCopy)
 
         print(f"Inserting Building Data...")
-        if (randomIDs):
-            roomData = self.insertAndReplaceIds(buildingData, TableNames.Buiding.value, [roomData], ColNames.BuildingId.value)
+        if (readBackIds):
+            roomData = self.insertAndReplaceIds(buildingData, TableNames.Buiding.value, [roomData], ColNames.BuildingId.value, useCopy = useCopy)
         else:
-            self.insert(buildingData, TableNames.Buiding.value)
+            self.load(buildingData, TableNames.Buiding.value, useCopy = useCopy)
 
         print(f"Inserting Room Data...")
-        if (randomIDs):
-            bookingData = self.insertAndReplaceIds(roomData, TableNames.Room.value, [bookingData], ColNames.RoomId.value)
+        if (readBackIds):
+            bookingData = self.insertAndReplaceIds(roomData, TableNames.Room.value, [bookingData], ColNames.RoomId.value, useCopy = useCopy)
         else:
-            roomData = roomData.drop([ColNames.BuildingIdExists.value], axis = 1)
-            self.insert(roomData, TableNames.Room.value)
+            roomData = roomData.drop([ColNames.BuildingIdExists.value], axis = 1, errors = "ignore")
+            self.load(roomData, TableNames.Room.value, useCopy = useCopy)
 
         print(f"Inserting Booking Data...")
-        if (randomIDs):
-            cancellationData = self.insertAndReplaceIds(bookingData, TableNames.Booking.value, [cancellationData], ColNames.BookingId.value)
+        self.createPartitions(bookingData)
+
+        if (readBackIds):
+            cancellationData = self.insertAndReplaceIds(bookingData, TableNames.Booking.value, [cancellationData], ColNames.BookingId.value, useCopy = useCopy)
         else:
-            bookingData = bookingData.drop([ColNames.UserIdExists.value, ColNames.RoomIdExists.value], axis=1)
-            self.insert(bookingData, TableNames.Booking.value)
+            bookingData = bookingData.drop([ColNames.UserIdExists.value, ColNames.RoomIdExists.value], axis = 1, errors = "ignore")
+            self.load(bookingData, TableNames.Booking.value, useCopy = useCopy)
 
         print(f"Inserting Cancellation Data...")
-        if (not randomIDs):
-            cancellationData = cancellationData.drop([ColNames.BookingIdExists.value, ColNames.UserIdExists.value], axis = 1)
+        if (not readBackIds):
+            cancellationData = cancellationData.drop([ColNames.BookingIdExists.value, ColNames.UserIdExists.value], axis = 1, errors = "ignore")
 
-        self.insert(cancellationData, TableNames.Cancellation.value)
-        
\ No newline at end of file
+        self.load(cancellationData, TableNames.Cancellation.value, useCopy = useCopy)
@@ -0,0 +1,219 @@
+import queue
+import threading
+import time
+import numpy as np
+import pandas as pd
+from typing import Optional, Dict, List, Tuple
+
+from PyUtils import ColNames, TableNames, DBPartitioner
+
+from .Importer import Importer
+
+
+# TableStream: The rows of a single table that are sent to a StreamLoader, one chunk at a time
+class TableStream():
+    def __init__(self, loader: "StreamLoader", tableName: str):
+        self.loader = loader
+        self.tableName = tableName
+        self.rows = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        pass
+
+    # write(chunk): Queues a chunk of rows to be copied into the table
+    def write(self, chunk: pd.DataFrame):
+        self.loader.put(self.tableName, chunk)
+        self.rows += len(chunk)
+
+
+# StreamLoader: Loads chunks of rows straight into the database with COPY while the chunks are still being generated.
+#
+#   The chunks are copied by a separate thread, so generating the next chunk overlaps with loading the last one.
+#   At most 'maxChunks' chunks wait in the queue at a time, which makes the generator wait when the database falls behind.
+#
+#   The rows keep the integer ids of the generator. The ids of the users, buildings and rooms become random UUIDs (or the UUIDs made from
+#   the integers when 'randomIDs' is False). The ids of the bookings are only looked up by the cancellations of the same chunk,
+#   so only the ids of the last chunk of bookings are kept
+class StreamLoader():
+    Columns = {TableNames.User.value: [ColNames.UserId.value, ColNames.UserName.value, "email", ColNames.UserPassword.value, "permissionLevel"],
+               TableNames.Buiding.value: [ColNames.BuildingId.value, ColNames.BuildingName.value, ColNames.BuildingAddressLine1.value, ColNames.BuildingAddressLine2.value,
+                                          ColNames.BuildingCity.value, ColNames.BuildingProvince.value, ColNames.BuildingCountry.value, ColNames.BuildingPostalCode.value],
+               TableNames.Room.value: [ColNames.RoomId.value, ColNames.RoomName.value, ColNames.RoomCapacity.value, ColNames.BuildingId.value],
+               TableNames.Booking.value: [ColNames.BookingId.value, ColNames.UserId.value, ColNames.RoomId.value, ColNames.BookingTime.value, ColNames.BookingStartTime.value,
+                                          ColNames.BookingEndTime.value, "participants", ColNames.BookingIsCancelled.value],
+               TableNames.Cancellation.value: [ColNames.BookingId.value, ColNames.UserId.value, "cancelDateTime", ColNames.BookingStartTime.value]}
+
+    # the id column of each table and the foreign id columns that point to it
+    IdCols = {TableNames.User.value: ColNames.UserId.value,
+              TableNames.Buiding.value: ColNames.BuildingId.value,
+              TableNames.Room.value: ColNames.RoomId.value,
+              TableNames.Booking.value: ColNames.BookingId.value}
+
+    ForeignIdCols = {TableNames.Room.value: [(ColNames.BuildingId.value, TableNames.Buiding.value)],
+                     TableNames.Booking.value: [(ColNames.UserId.value, TableNames.User.value), (ColNames.RoomId.value, TableNames.Room.value)],
+                     TableNames.Cancellation.value: [(ColNames.BookingId.value, TableNames.Booking.value), (ColNames.UserId.value, TableNames.User.value)]}
+
+    def __init__(self, importer: Importer, randomIDs: bool = True, maxChunks: int = 4):
+        self.importer = importer
+        self.randomIDs = randomIDs
+
+        self._queue = queue.Queue(maxsize = maxChunks)
+        self._thread: Optional[threading.Thread] = None
+        self._error: Optional[BaseException] = None
+        self._partitioner = DBPartitioner(importer)
+        self._partitioned = False
+
+        # table name -> (first integer id, UUIDs of the ids from the first id onwards)
+        self._ids: Dict[str, Tuple[int, np.ndarray]] = {}
+
+        # table name -> [rows, seconds spent copying]
+        self.stats: Dict[str, List[float]] = {}
+        self.waitTime = 0
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close(failed = exc_type is not None)
+
+    # getWriter(tableName): Retrieves the stream to write the chunks of some table to
+    def getWriter(self, tableName: str) -> TableStream:
+        return TableStream(self, tableName)
+
+    # start(): Starts the thread that copies the chunks into the database
+    def start(self):
+        self._partitioned = self._partitioner.isPartitioned(TableNames.Booking.value)
+        self._thread = threading.Thread(target = self._run, name = "StreamLoader", daemon = True)
+        self._thread.start()
+
+    # put(tableName, chunk): Queues a chunk of rows. Waits while the queue is full
+    def put(self, tableName: str, chunk: pd.DataFrame):
+        startTime = time.perf_counter()
+
+        while (True):
+            self._raiseError()
+            try:
+                self._queue.put((tableName, chunk), timeout = 1)
+                break
+            except queue.Full:
+                continue
+
+        self.waitTime += time.perf_counter() - startTime
+
+    # close(failed): Waits for all the queued chunks to be copied and stops the thread
+    def close(self, failed: bool = False):
+        if (self._thread is None):
+            return
+
+        if (failed):
+            self._error = self._error or RuntimeError("The generation of the rows failed")
+
+        # the sentinel is always queued, even when the queue is full, so the thread always stops
+        while (self._thread.is_alive()):
+            try:
+                self._queue.put(None, timeout = 1)
+                break
+            except queue.Full:
+                continue
+
+        self._thread.join()
+        self._thread = None
+
+        if (not failed):
+            self._raiseError()
+
+    def _raiseError(self):
+        if (self._error is not None):
+            raise self._error
+
+    def _run(self):
+        try:
+            while (True):
+                item = self._queue.get()
+                if (item is None):
+                    return
+
+                # after the generator fails, the rest of the queue is drained without loading anything
+                if (self._error is None):
+                    self.loadChunk(*item)
+        except BaseException as e:
+            # the rest of the queue is drained, so the generator is never stuck waiting on a full queue
+            self._error = e
+            while (self._queue.get() is not None):
+                pass
+
+    # _getUUIDs(ids): Generates the UUIDs for the integer ids of the rows of some table
+    def _getUUIDs(self, ids: np.ndarray) -> np.ndarray:
+        if (self.randomIDs):
+            return Importer.toUUIDStrings(Importer.generateUUIDBytes(len(ids)))
+
+        return Importer.intUUIDStrings(ids)
+
+    # _storeIds(tableName, ids, uuids): Remembers the UUIDs of the rows of some table, so the rows of the later tables can point to them
+    def _storeIds(self, tableName: str, ids: np.ndarray, uuids: np.ndarray):
+        if (len(ids) == 0):
+            return
+
+        firstId = int(ids[0])
+        if (not np.array_equal(ids, np.arange(firstId, firstId + len(ids)))):
+            raise ValueError(f"The ids of each chunk of the table, {tableName}, need to be consecutive integers")
+
+        previous = self._ids.get(tableName)
+        if (tableName != TableNames.Booking.value and previous is not None and previous[0] + len(previous[1]) == firstId):
+            uuids = np.concatenate([previous[1], uuids])
+            firstId = previous[0]
+
+        self._ids[tableName] = (firstId, uuids)
+
+    # _lookupIds(tableName, ids): Retrieves the UUIDs that were given to some integer ids of a table
+    def _lookupIds(self, tableName: str, ids: np.ndarray) -> np.ndarray:
+        firstId, uuids = self._ids.get(tableName, (0, np.empty(0, dtype = object)))
+        positions = np.asarray(ids, dtype = np.int64) - firstId
+
+        if (len(positions) > 0 and (positions.min() < 0 or positions.max() >= len(uuids))):
+            raise ValueError(f"Some ids do not point to a row of the table, {tableName}, that was already loaded")
+
+        return uuids[positions]
+
+    # replaceIds(tableName, chunk): Replaces the integer ids and foreign ids of a chunk with their UUIDs
+    def replaceIds(self, tableName: str, chunk: pd.DataFrame) -> pd.DataFrame:
+        chunk = chunk[self.Columns[tableName]].copy()
+
+        for col, foreignTableName in self.ForeignIdCols.get(tableName, []):
+            chunk[col] = self._lookupIds(foreignTableName, chunk[col].to_numpy())
+
+        idCol = self.IdCols.get(tableName)
+        if (idCol is not None):
+            ids = chunk[idCol].to_numpy()
+            uuids = self._getUUIDs(ids)
+            self._storeIds(tableName, ids, uuids)
+            chunk[idCol] = uuids
+
+        return chunk
+
+    # loadChunk(tableName, chunk): Copies a chunk of rows into its table and commits it
+    def loadChunk(self, tableName: str, chunk: pd.DataFrame):
+        startTime = time.perf_counter()
+        chunk = self.replaceIds(tableName, chunk)
+
+        if (tableName == TableNames.Booking.value and self._partitioned and not chunk.empty):
+            startTimes = chunk[ColNames.BookingStartTime.value]
+            self._partitioner.createPartitions(startTimes.min().to_pydatetime(), startTimes.max().to_pydatetime())
+
+        self.importer.copyFrom(chunk, tableName)
+
+        stats = self.stats.setdefault(tableName, [0, 0])
+        stats[0] += len(chunk)
+        stats[1] += time.perf_counter() - startTime
+
+    # printStats(): Prints out the number of rows loaded into each table and the throughput of the loading
+    def printStats(self):
+        for tableName, (rows, duration) in self.stats.items():
+            rowsPerSec = rows / duration if (duration > 0) else float("inf")
+            print(f"  {rows} rows into {tableName} in {duration:.3f}s ({rowsPerSec:,.0f} rows/s)")
+
+        print(f"  The generator waited {self.waitTime:.3f}s for the database")
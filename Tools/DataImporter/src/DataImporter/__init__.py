@@ -5,10 +5,11 @@ from .constants.Paths import UtilsPath
 sys.path.insert(1, UtilsPath)
 
 
-from PyUtils import ColNames, TableNames, DBNames, DBSecrets, AreYouSureError, Paths, DBBuilder
+from PyUtils import ColNames, TableNames, DBNames, DBSecrets, AreYouSureError, Paths, DBBuilder, DBCleaner, DBPartitioner
 
 from .Importer import Importer
+from .StreamLoader import StreamLoader, TableStream
 from .constants.ImportLevel import ImportLevel
 
 
-__all__ = ["DBSecrets", "AreYouSureError", "Importer", "ColNames", "TableNames", "DBNames", "ImportLevel", "Paths", "DBBuilder"]
\ No newline at end of file
+__all__ = ["DBSecrets", "AreYouSureError", "Importer", "StreamLoader", "TableStream", "ColNames", "TableNames", "DBNames", "ImportLevel", "Paths", "DBBuilder", "DBCleaner", "DBPartitioner"]
\ No newline at end of file
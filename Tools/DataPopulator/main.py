@@ -9,6 +9,8 @@ from DataPopulator.data_generators.RoomGenerator import RoomGenerator
 from DataPopulator.data_generators.UserGenerator import UserGenerator
 from DataPopulator.data_generators.BookingGenerator import BookingGenerator
 from DataPopulator.data_generators.CancellationGenerator import CancellationGenerator
+from DataPopulator.dataset_generators.VectorizedDatasetGenerator import VectorizedDatasetGenerator
+from DataPopulator.utils.ResourceFiles import get_dataset_folder
 from DataPopulator.utils.CmdMessages import print_header
 
 def main():
@@ -25,7 +27,15 @@ def main():
     if args.scrape:
         print_header('INIT: WEB SCRAPING')
         print_header('DONE: WEB SCRAPING')
-    if args.generate:
+    if args.generate and args.vectorized:
+        print_header('INIT: GENERATE DATASET')
+
+        vdg = VectorizedDatasetGenerator(args.environment, args.directory, args.random_seed, args.overwrite,
+                                         chunk_size=args.chunk_size, workers=args.workers, format=args.format, profile=args.profile)
+        vdg.generate(args.num_buildings, args.num_rooms, args.num_users, args.num_bookings, args.num_cancellations)
+
+        print_header('DONE: GENERATE DATASET')
+    elif args.generate:
         print_header('INIT: GENERATE DATASET')
         
         bug = BuildingGenerator(args.environment, args.directory, rng, args.overwrite)
@@ -44,10 +54,21 @@ def main():
         cancellations = cag.generate_cancellations(args.num_cancellations)
 
         print_header('DONE: GENERATE DATASET')
+    if args.stream:
+        print_header('INIT: STREAM DATASET INTO DATABASE')
+
+        importer.clean(isSure=True, cleanLevel=DI.ImportLevel.Tuples)
+        vdg = VectorizedDatasetGenerator(args.environment, args.directory, args.random_seed, args.overwrite, chunk_size=args.chunk_size,
+                                         profile=args.profile)
+        with DI.StreamLoader(importer) as loader:
+            vdg.generate(args.num_buildings, args.num_rooms, args.num_users, args.num_bookings, args.num_cancellations, loader=loader)
+        loader.printStats()
+
+        print_header('DONE: STREAM DATASET INTO DATABASE')
     if args.populate:
         print_header('INIT: POPULATE DATABASE')
 
-        importer.importData(dataFolder=Path(PU.Paths.DataFolder.value) / f'{args.environment.lower().capitalize()} Dataset', cleanLevel=DI.ImportLevel.Tuples)
+        importer.importData(dataFolder=Path(PU.Paths.DataFolder.value) / get_dataset_folder(args.environment), cleanLevel=DI.ImportLevel.Tuples)
 
         print_header('DONE: POPULATE DATABASE')
 
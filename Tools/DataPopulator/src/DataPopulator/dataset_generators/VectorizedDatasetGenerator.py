@@ -0,0 +1,470 @@
+import os
+import shutil
+import string
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from itertools import repeat
+
+import numpy as np
+import pandas as pd
+
+import PyUtils as PU
+
+from ..data_generators import BuildingGenerator, RoomGenerator, UserGenerator
+from ..utils.ResourceFiles import init_resource_files, load_resource_file_data, get_dataset_folder
+from ..utils.DatasetWriter import DatasetWriter
+from ..utils.GenerationProfile import GenerationProfile
+from ..utils.CmdMessages import TagTypes, print_tagged_message
+
+BUILDING_COLUMNS = {'buildingID': 'int64', 'buildingName': 'str', 'addressLine1': 'str', 'addressLine2': 'str', 'city': 'str', 'province': 'str',
+                    'country': 'str', 'postalCode': 'str'}
+ROOM_COLUMNS = {'roomID': 'int64', 'roomName': 'str', 'capacity': 'int64', 'buildingID': 'int64', 'buildingID_exists': 'int64'}
+USER_COLUMNS = {'userID': 'int64', 'username': 'str', 'email': 'str', 'password': 'str', 'permissionLevel': 'int64'}
+BOOKING_COLUMNS = {'bookingID': 'int64', 'userID': 'int64', 'roomID': 'int64', 'bookDateTime': 'datetime64[s]', 'bookStartDateTime': 'datetime64[s]',
+                   'bookEndDateTime': 'datetime64[s]', 'participants': 'int64', 'userID_exists': 'int64', 'roomID_exists': 'int64'}
+CANCELLATION_COLUMNS = {'bookingID': 'int64', 'userID': 'int64', 'cancelDateTime': 'datetime64[s]', 'bookingID_exists': 'int64', 'userID_exists': 'int64'}
+
+# ids of the independent random streams, so adding draws to one table never changes the other tables
+BUILDING_STREAM = 0
+ROOM_STREAM = 1
+USER_STREAM = 2
+BOOKING_STREAM = 3
+CANCELLATION_STREAM = 4
+PROFILE_STREAM = 5
+
+SECONDS_PER_DAY = 24 * 60 * 60
+
+@dataclass
+class RoomBlock:
+    index: int
+    room_ids: np.ndarray
+    capacities: np.ndarray
+    user_ids: np.ndarray
+    bookings_per_slot: int
+    room_weights: np.ndarray = None
+    user_weights: np.ndarray = None
+    num_bookings: int = 0
+    num_cancellations: int = 0
+    first_booking_id: int = 0
+
+@dataclass
+class Shard:
+    booking_file: str
+    cancellation_file: str
+    num_bookings: int
+    num_cancellations: int
+
+# Generates whole datasets with NumPy instead of one row at a time, for benchmark datasets with tens of millions of bookings.
+#
+# The bookings and cancellations are streamed to their files in chunks, so the memory used does not grow with the number of bookings.
+# Every room and every user only belongs to a single block of rooms. Each day from 7:00 to 23:00 is cut into slots, and in every
+# slot a block picks distinct rooms and distinct users for its bookings, with each booking inside of its slot. This keeps the bookings
+# of a room and the bookings of a user from ever overlapping, without having to look at the earlier bookings.
+#
+# With more than 1 worker, the blocks are generated as shards in a pool of processes and then appended to the dataset files in
+# the order of the blocks. A block always draws from the same random streams, so the dataset is the same for any number of workers.
+#
+# Given a loader (see DataImporter.StreamLoader), the chunks of every table are loaded straight into the database instead of being written to files.
+#
+# A profile (see GenerationProfile) makes some rooms, buildings and users more popular than others and books some hours and weekdays more than others.
+# The popular rooms and users of a block are picked more often in every slot (weighted sampling without replacement), and the
+# busiest slot of the week books 'occupancy' of the rooms of the block while the other slots book less, by the weights of their hours and weekday.
+class VectorizedDatasetGenerator:
+    def __init__(self, env, dir, seed=None, overwrite=False, chunk_size=1000000, room_block_size=1024, slots_per_day=6,
+                 occupancy=0.5, start_date='2025-07-01', workers=1,
+                 format=PU.DatasetFormats.CSV, profile=None):
+        self.env = env
+        self.profile = profile if profile is not None else GenerationProfile()
+        self.workers = workers
+        self.format = format
+        self.loader = None
+        self.dir = dir
+        self.overwrite = overwrite
+        self.seed = seed if seed is not None else int(np.random.SeedSequence().entropy % (2 ** 63))
+        self.chunk_size = chunk_size
+        self.room_block_size = room_block_size
+        self.slots_per_day = slots_per_day if self.profile.slots_per_day is None else self.profile.slots_per_day
+        self.occupancy = occupancy if self.profile.occupancy is None else self.profile.occupancy
+        self.start_date = np.datetime64(start_date, 's')
+
+        self.window_start_seconds = 7 * 60 * 60
+        self.window_end_seconds = 23 * 60 * 60
+        self.slot_seconds = (self.window_end_seconds - self.window_start_seconds) // self.slots_per_day
+
+        self.booking_min_seconds = 60 * 30
+        self.booking_max_seconds = min(60 * 60 * 3, self.slot_seconds)
+        self.booking_ahead_seconds_min = 60 * 3
+        self.booking_ahead_seconds_max = 60 * 60 * 24 * 7
+        self.max_participants = 20
+
+        if self.slot_seconds < self.booking_min_seconds:
+            raise ValueError(f'{self.slots_per_day} slots per day leaves less than {self.booking_min_seconds // 60} minutes for each booking')
+
+        # the share of the bookings of the busiest slot that each slot of each weekday books (7 x slots_per_day)
+        slot_weights = self.profile.get_slot_weights(self.window_start_seconds, self.slots_per_day, self.slot_seconds)
+        self.slot_intensities = np.array(self.profile.weekday_weights, dtype=np.float64)[:, None] * slot_weights[None, :]
+        if self.slot_intensities.max() == 0:
+            raise ValueError(f'The profile, {self.profile.name}, has no weight in any slot from 7:00 to 23:00')
+        self.slot_intensities /= self.slot_intensities.max()
+        self.first_weekday = (self.start_date.astype('datetime64[D]').astype(np.int64) + 3) % 7
+
+        self.dataset_folder = get_dataset_folder(self.env)
+        init_resource_files(self.dir, BuildingGenerator.FILES, BuildingGenerator.FILE_DEFAULTS, self.overwrite)
+        init_resource_files(self.dir, RoomGenerator.FILES, RoomGenerator.FILE_DEFAULTS, self.overwrite)
+        init_resource_files(self.dir, UserGenerator.FILES, UserGenerator.FILE_DEFAULTS, self.overwrite)
+
+        self.data = {
+            **load_resource_file_data(self.dir, BuildingGenerator.FILES, BuildingGenerator.FILE_DEFAULTS),
+            **load_resource_file_data(self.dir, RoomGenerator.FILES, RoomGenerator.FILE_DEFAULTS),
+            **load_resource_file_data(self.dir, UserGenerator.FILES, UserGenerator.FILE_DEFAULTS),
+        }
+
+    def _rng(self, *stream):
+        return np.random.default_rng([self.seed, *stream])
+
+    def _dataset_file(self, name):
+        return os.path.join(self.dataset_folder, name)
+
+    def _open_writer(self, name, columns):
+        # with a loader, the chunks go straight into the database instead of into the dataset files
+        if self.loader is not None:
+            return self.loader.getWriter(name)
+        return DatasetWriter(self.dir, self._dataset_file(name), columns, format=self.format)
+
+    def _write_table(self, name, columns, table):
+        with self._open_writer(name, columns) as writer:
+            for start in range(0, len(table), self.chunk_size):
+                writer.write(table.iloc[start:start + self.chunk_size])
+
+    @staticmethod
+    def _occurrences(keys):
+        # 1 for the first row with some key, 2 for the second row with the same key, ...
+        return pd.Series(keys).groupby(keys).cumcount().to_numpy() + 1
+
+    @staticmethod
+    def _join(*parts):
+        result = np.asarray(parts[0]).astype(str)
+        for part in parts[1:]:
+            result = np.char.add(result, np.asarray(part).astype(str))
+        return result
+
+    def _random_strings(self, rng, alphabet, count, length):
+        codes = np.frombuffer(alphabet.encode('ascii'), dtype=np.uint8)
+        chars = codes[rng.integers(0, len(codes), size=(count, length))]
+        return chars.view(f'S{length}').ravel().astype(str)
+
+    def _generate_postal_codes(self, rng, count):
+        # HARDCODED ONTARIO
+        valid_ontario_first_letters = np.array(list('KLMNP'))
+        valid_letters = np.array(list('ABCEGHJKLMNPRSTVXY'))
+        digits = rng.integers(0, 10, size=(3, count))
+        return self._join(
+            rng.choice(valid_ontario_first_letters, count), digits[0], rng.choice(valid_letters, count), ' ',
+            digits[1], rng.choice(valid_letters, count), digits[2])
+
+    def generate_buildings(self, num_buildings):
+        rng = self._rng(BUILDING_STREAM)
+        prefixes = np.array(self.data['building_name_prefix'], dtype=object)
+        suffixes = np.array(self.data['building_name_suffix'], dtype=object)
+
+        prefix_ids = rng.integers(0, len(prefixes), num_buildings)
+        suffix_ids = rng.integers(0, len(suffixes), num_buildings)
+        occurrences = self._occurrences(prefix_ids * len(suffixes) + suffix_ids)
+        building_names = self._join(prefixes[prefix_ids], ' ', suffixes[suffix_ids], ' ', occurrences)
+
+        # the tag is made of the first letter of every word in the name, including the number at the end
+        initials = lambda name: ''.join(word[0] for word in name.split())
+        prefix_initials = np.array([initials(prefix) for prefix in prefixes], dtype=object)
+        suffix_initials = np.array([initials(suffix) for suffix in suffixes], dtype=object)
+        building_tags = self._join(prefix_initials[prefix_ids], suffix_initials[suffix_ids], occurrences.astype(str).astype('U1'))
+
+        address_line1 = self._join(
+            rng.integers(100, 1000, num_buildings), ' ', rng.choice(self.data['street_names'], num_buildings), ' ',
+            rng.choice(self.data['street_types'], num_buildings), ' ', rng.choice(self.data['directional_prefixes'], num_buildings))
+
+        buildings = pd.DataFrame({
+            'buildingID': np.arange(num_buildings),
+            'buildingName': building_names,
+            'buildingTag': building_tags,
+            'addressLine1': address_line1,
+            'addressLine2': '',
+            'city': rng.choice(self.data['cities'], num_buildings),
+            # HARDCODED ONTARIO CANADA
+            'province': 'Ontario',
+            'country': 'Canada',
+            'postalCode': self._generate_postal_codes(rng, num_buildings),
+        })
+
+        self._write_table('Building', BUILDING_COLUMNS, buildings)
+        return buildings
+
+    def generate_rooms(self, num_rooms, buildings):
+        rng = self._rng(ROOM_STREAM)
+        building_ids = rng.integers(0, len(buildings), num_rooms)
+        building_tags = buildings['buildingTag'].to_numpy()[building_ids]
+        capacities = np.array(self.data['room_capacities'], dtype=np.int64)
+
+        rooms = pd.DataFrame({
+            'roomID': np.arange(num_rooms),
+            'roomName': self._join(building_tags, ' ', self._occurrences(building_tags)),
+            'capacity': rng.choice(capacities, num_rooms),
+            'buildingID': building_ids,
+            'buildingID_exists': 0,
+        })
+
+        self._write_table('Room', ROOM_COLUMNS, rooms)
+        return rooms
+
+    def generate_users(self, num_users):
+        rng = self._rng(USER_STREAM)
+        first_names = np.array(self.data['user_first_names'], dtype=object)
+        last_names = np.array(self.data['user_last_names'], dtype=object)
+
+        first_ids = rng.integers(0, len(first_names), num_users)
+        last_ids = rng.integers(0, len(last_names), num_users)
+        occurrences = self._occurrences(first_ids * len(last_names) + last_ids)
+        user_names = self._join(first_names[first_ids], occurrences, last_names[last_ids])
+
+        users = pd.DataFrame({
+            'userID': np.arange(num_users),
+            'username': user_names,
+            'email': self._join(user_names, '@', rng.choice(self.data['emails'], num_users)),
+            'password': self._random_strings(rng, string.ascii_letters + string.digits + string.punctuation, num_users, 12),
+            'permissionLevel': rng.choice(np.array(self.data['permission_levels'], dtype=np.int64), num_users),
+        })
+
+        self._write_table('User', USER_COLUMNS, users)
+        return users
+
+    def get_popularities(self, rooms, users):
+        if self.profile.is_uniform():
+            return None, None
+
+        rng = self._rng(PROFILE_STREAM)
+        building_ids = rooms['buildingID'].to_numpy()
+        building_weights = self.profile.get_zipf_weights(rng, int(building_ids.max()) + 1, self.profile.building_zipf)
+        room_weights = building_weights[building_ids] * self.profile.get_zipf_weights(rng, len(rooms), self.profile.room_zipf)
+        user_weights = self.profile.get_user_weights(rng, len(users))
+        return room_weights, user_weights
+
+    def get_room_blocks(self, rooms, users, num_bookings, num_cancellations):
+        room_ids = rooms['roomID'].to_numpy()
+        capacities = rooms['capacity'].to_numpy()
+        user_ids = users['userID'].to_numpy()
+        room_weights, user_weights = self.get_popularities(rooms, users)
+        num_blocks = max(1, -(-len(room_ids) // self.room_block_size))
+        user_splits = np.array_split(np.arange(len(user_ids)), num_blocks)
+
+        blocks = []
+        for i, user_ind in enumerate(user_splits):
+            room_ind = slice(i * self.room_block_size, (i + 1) * self.room_block_size)
+            block_room_ids = room_ids[room_ind]
+            bookings_per_slot = int(self.occupancy * min(len(block_room_ids), len(user_ind)))
+            if bookings_per_slot == 0 and len(block_room_ids) > 0 and len(user_ind) > 0:
+                bookings_per_slot = 1
+
+            blocks.append(RoomBlock(i, block_room_ids, capacities[room_ind], user_ids[user_ind], bookings_per_slot,
+                                    room_weights=None if room_weights is None else room_weights[room_ind],
+                                    user_weights=None if user_weights is None else user_weights[user_ind]))
+
+        # share the bookings and the cancellations between the blocks by how many bookings each block can make in a slot
+        self._share(blocks, num_bookings, 'num_bookings')
+        self._share(blocks, num_cancellations, 'num_cancellations', limit=lambda block: block.num_bookings)
+
+        next_booking_id = 0
+        for block in blocks:
+            block.first_booking_id = next_booking_id
+            next_booking_id += block.num_bookings
+        return blocks
+
+    def _share(self, blocks, total, attribute, limit=None):
+        weights = np.array([block.bookings_per_slot for block in blocks], dtype=np.float64)
+        if total > 0 and weights.sum() == 0:
+            raise ValueError('No room block has both rooms and users to make bookings with')
+        if total == 0:
+            return
+
+        shares = np.floor(total * weights / weights.sum()).astype(np.int64)
+        remaining = total - shares.sum()
+        for i in np.argsort(-weights, kind='stable')[:remaining]:
+            shares[i] += 1
+
+        if limit is not None:
+            limits = np.array([limit(block) for block in blocks], dtype=np.int64)
+            shares = np.minimum(shares, limits)
+            remaining = total - shares.sum()
+            for i in range(len(blocks)):
+                extra = min(remaining, limits[i] - shares[i])
+                shares[i] += extra
+                remaining -= extra
+
+        for block, share in zip(blocks, shares):
+            setattr(block, attribute, int(share))
+
+    @staticmethod
+    def _pick(rng, slots, per_slot, weights, count, sort):
+        # the 'per_slot' smallest keys of every slot. With weights, the keys are exponential draws divided by the weights,
+        # so the heavier ids are more likely to be picked (sampling without replacement by the weights)
+        keys = rng.random((slots, count))
+        if weights is not None:
+            keys = -np.log1p(-keys) / weights
+        ind = np.argpartition(keys, per_slot - 1, axis=1)[:, :per_slot]
+
+        # sorted by their keys, so the first ids of a slot that books less than 'per_slot' are still picked by the weights
+        if sort:
+            ind = np.take_along_axis(ind, np.argsort(np.take_along_axis(keys, ind, axis=1), axis=1), axis=1)
+        return ind
+
+    def generate_day_bookings(self, block, day):
+        rng = self._rng(BOOKING_STREAM, block.index, day)
+        slots, per_slot = self.slots_per_day, block.bookings_per_slot
+
+        # how many bookings each slot of the day makes, by the weights of its hours and its weekday
+        slot_counts = np.rint(per_slot * self.slot_intensities[(self.first_weekday + day) % 7]).astype(np.int64)
+        is_busiest = bool((slot_counts == per_slot).all())
+        kept = None if is_busiest else (np.arange(per_slot)[None, :] < slot_counts[:, None]).ravel()
+
+        # distinct rooms and distinct users in every slot
+        room_ind = self._pick(rng, slots, per_slot, block.room_weights, len(block.room_ids), not is_busiest)
+        user_ind = self._pick(rng, slots, per_slot, block.user_weights, len(block.user_ids), not is_busiest)
+
+        durations = rng.integers(self.booking_min_seconds, self.booking_max_seconds + 1, size=(slots, per_slot))
+        offsets = np.floor(rng.random((slots, per_slot)) * (self.slot_seconds - durations + 1)).astype(np.int64)
+        slot_starts = day * SECONDS_PER_DAY + self.window_start_seconds + np.arange(slots, dtype=np.int64)[:, None] * self.slot_seconds
+
+        start_seconds = (slot_starts + offsets).ravel()
+        end_seconds = start_seconds + durations.ravel()
+        ahead_seconds = rng.integers(self.booking_ahead_seconds_min, self.booking_ahead_seconds_max + 1, size=start_seconds.size)
+
+        room_ind = room_ind.ravel()
+        max_participants = np.minimum(block.capacities[room_ind], self.max_participants)
+        participants = 1 + np.floor(rng.random(start_seconds.size) * max_participants).astype(np.int64)
+
+        bookings = {
+            'userID': block.user_ids[user_ind.ravel()],
+            'roomID': block.room_ids[room_ind],
+            'bookDateTime': start_seconds - ahead_seconds,
+            'bookStartDateTime': start_seconds,
+            'bookEndDateTime': end_seconds,
+            'participants': participants,
+        }
+        if kept is not None:
+            bookings = {name: values[kept] for name, values in bookings.items()}
+        return bookings
+
+    def _to_bookings_frame(self, parts, first_booking_id):
+        columns = {name: np.concatenate([part[name] for part in parts]) for name in parts[0]}
+        for name in ['bookDateTime', 'bookStartDateTime', 'bookEndDateTime']:
+            columns[name] = self.start_date + columns[name].astype('timedelta64[s]')
+
+        bookings = pd.DataFrame({'bookingID': first_booking_id + np.arange(len(columns['userID'])), **columns})
+        bookings['userID_exists'] = 0
+        bookings['roomID_exists'] = 0
+        return bookings
+
+    def _get_cancellations(self, block, bookings, cancelled_ind, cancel_draws):
+        first_local_id = bookings['bookingID'].iat[0] - block.first_booking_id
+        lo = np.searchsorted(cancelled_ind, first_local_id)
+        hi = np.searchsorted(cancelled_ind, first_local_id + len(bookings))
+        rows = bookings.iloc[cancelled_ind[lo:hi] - first_local_id]
+
+        book_times = rows['bookDateTime'].to_numpy()
+        start_times = rows['bookStartDateTime'].to_numpy()
+        ahead_seconds = (start_times - book_times).astype(np.int64)
+
+        if self.profile.cancellation_lead_hours is None:
+            # anywhere between making the booking and its start
+            cancel_times = book_times + np.floor(cancel_draws[lo:hi] * ahead_seconds).astype('timedelta64[s]')
+        else:
+            # an exponential number of seconds before the start, but never before making the booking
+            lead_seconds = np.minimum(cancel_draws[lo:hi].astype(np.int64), ahead_seconds)
+            cancel_times = start_times - lead_seconds.astype('timedelta64[s]')
+
+        return pd.DataFrame({
+            'bookingID': rows['bookingID'].to_numpy(),
+            'userID': rows['userID'].to_numpy(),
+            'cancelDateTime': cancel_times,
+            'bookStartDateTime': start_times,
+            'bookingID_exists': 0,
+            'userID_exists': 0,
+        })
+
+    def generate_block(self, block, booking_writer, cancellation_writer):
+        if block.num_bookings == 0:
+            return
+
+        cancel_rng = self._rng(CANCELLATION_STREAM, block.index)
+        cancelled_ind = np.sort(cancel_rng.choice(block.num_bookings, block.num_cancellations, replace=False))
+        if self.profile.cancellation_lead_hours is None:
+            cancel_draws = cancel_rng.random(block.num_cancellations)
+        else:
+            cancel_draws = cancel_rng.exponential(self.profile.cancellation_lead_hours * 60 * 60, block.num_cancellations)
+
+        parts = []
+        part_rows = 0
+        written = 0
+        day = 0
+
+        while written + part_rows < block.num_bookings:
+            part = self.generate_day_bookings(block, day)
+            day += 1
+
+            # only keep as many bookings as the block still needs
+            keep = min(len(part['userID']), block.num_bookings - written - part_rows)
+            parts.append({name: values[:keep] for name, values in part.items()})
+            part_rows += keep
+
+            if part_rows >= self.chunk_size or written + part_rows >= block.num_bookings:
+                bookings = self._to_bookings_frame(parts, block.first_booking_id + written)
+                cancellations = self._get_cancellations(block, bookings, cancelled_ind, cancel_draws)
+                bookings['isCancelled'] = bookings['bookingID'].isin(cancellations['bookingID'])
+
+                booking_writer.write(bookings)
+                cancellation_writer.write(cancellations)
+
+                written += part_rows
+                parts = []
+                part_rows = 0
+
+    def generate_shard(self, block, shard_dir):
+        with DatasetWriter(shard_dir, f'Booking-{block.index}', BOOKING_COLUMNS, verbose=False, format=self.format) as booking_writer, \
+             DatasetWriter(shard_dir, f'Cancellation-{block.index}', CANCELLATION_COLUMNS, verbose=False, format=self.format) as cancellation_writer:
+            self.generate_block(block, booking_writer, cancellation_writer)
+
+        return Shard(booking_writer.full_path, cancellation_writer.full_path, booking_writer.rows, cancellation_writer.rows)
+
+    def generate_bookings_and_cancellations(self, rooms, users, num_bookings, num_cancellations):
+        blocks = self.get_room_blocks(rooms, users, num_bookings, num_cancellations)
+
+        with self._open_writer('Booking', BOOKING_COLUMNS) as booking_writer, \
+             self._open_writer('Cancellation', CANCELLATION_COLUMNS) as cancellation_writer:
+            if self.workers <= 1 or self.loader is not None:
+                for block in blocks:
+                    self.generate_block(block, booking_writer, cancellation_writer)
+                return
+
+            print_tagged_message(TagTypes.Success, 'INFO', f'Generating {len(blocks)} room blocks with {self.workers} workers')
+            shard_dir = tempfile.mkdtemp(prefix='Shards-', dir=os.path.dirname(booking_writer.full_path))
+            try:
+                with ProcessPoolExecutor(max_workers=self.workers) as executor:
+                    # the shards come back in the order of the blocks, so they are appended in the same order as with 1 worker
+                    for shard in executor.map(self.generate_shard, blocks, repeat(shard_dir)):
+                        booking_writer.write_file(shard.booking_file, shard.num_bookings)
+                        cancellation_writer.write_file(shard.cancellation_file, shard.num_cancellations)
+                        os.remove(shard.booking_file)
+                        os.remove(shard.cancellation_file)
+            finally:
+                shutil.rmtree(shard_dir, ignore_errors=True)
+
+    def generate(self, num_buildings, num_rooms, num_users, num_bookings, num_cancellations, loader=None):
+        if num_cancellations > num_bookings:
+            raise ValueError('There cannot be more cancellations than bookings')
+
+        self.loader = loader
+
+        print_tagged_message(TagTypes.Success, 'INFO', f'Generating the dataset with seed {self.seed}')
+        buildings = self.generate_buildings(num_buildings)
+        rooms = self.generate_rooms(num_rooms, buildings)
+        users = self.generate_users(num_users)
+        self.generate_bookings_and_cancellations(rooms, users, num_bookings, num_cancellations)
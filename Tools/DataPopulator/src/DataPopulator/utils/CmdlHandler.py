@@ -5,6 +5,8 @@ from pathlib import Path
 
 import PyUtils as PU
 
+from ..utils.GenerationProfile import load_profile
+
 # --- Individual argument validation ---
 def _positive_int(val):
     int_val = int(val)
@@ -18,6 +20,18 @@ def _non_negative_int(val):
         raise argparse.ArgumentTypeError(f'{val} is not a non-negative integer')
     return int_val
 
+def _dataset_format(val):
+    format_val = PU.DatasetFormats.find(str(val))
+    if format_val is None:
+        raise argparse.ArgumentTypeError(f'Invalid dataset format: {val}')
+    return format_val
+
+def _profile(val):
+    try:
+        return load_profile(str(val))
+    except (ValueError, TypeError, OSError) as e:
+        raise argparse.ArgumentTypeError(str(e))
+
 def _dir_path(val):
     path_val = Path(val)
     if not path_val.exists():
@@ -46,6 +60,8 @@ def _database_env(val):
         env_val = PU.DBNames.Dev.value
     elif str_val == 'prod':
         env_val = PU.DBNames.Prod.value
+    elif str_val == 'xl':
+        env_val = PU.DBNames.XL.value
     elif str_val == 'toyunittest':
         env_val = PU.DBNames.ToyUnitTest.value
     elif str_val == 'devunittest':
@@ -59,20 +75,52 @@ def _database_env(val):
             
     return env_val
 
+# --- Generator sizes of the XL environment, used for the sizes not given by the user ---
+XL_GENERATOR_DEFAULTS = {
+    'num_buildings': (['-nbu', '--num-buildings'], 5000),
+    'num_rooms': (['-nro', '--num-rooms'], 50000),
+    'num_users': (['-nus', '--num-users'], 200000),
+    'num_bookings': (['-nbo', '--num-bookings'], 20000000),
+    'num_cancellations': (['-nca', '--num-cancellations'], 400000),
+}
+
+def _apply_xl_defaults(args):
+    if args.environment != PU.DBNames.XL.value:
+        return
+
+    for dest, (arg_names, default) in XL_GENERATOR_DEFAULTS.items():
+        if not any(arg in sys.argv for arg in arg_names):
+            setattr(args, dest, default)
+
+    # the row by row generators cannot make a dataset of this size
+    args.vectorized = True
+
+def _apply_vectorized_options(args):
+    # only the vectorized generator splits its bookings into shards with their own random streams and writes typed columns
+    if args.workers > 1 or args.format != PU.DatasetFormats.CSV or args.stream or args.profile is not None:
+        args.vectorized = True
+
 # --- Post-parse cross-argument validation ---
-def _cross_arg_validate_args(args):
+def _cross_arg_validate_args(parser, args):
     if args.num_cancellations > args.num_bookings:
         parser.error('-nca (--num-cancellations) must be less than or equal to -nbo (--num-bookings)')
+    if args.stream and args.workers > 1:
+        parser.error('--stream loads the rows from a single process and cannot be combined with -w (--workers)')
+    if args.stream and (args.generate or args.populate):
+        parser.error('--stream already generates and populates the dataset and cannot be combined with -g (--generate) or -p (--populate)')
 
 # --- Post-parse validation ---
-def _post_parse_validate_args(args):
-    generator_args = ['-nbu', '--num-buildings', '-nro', '--num-rooms', '-nus', '--num-users', '-nbo', '--num-bookings', '-nca', '--num-cancellations']
+def _post_parse_validate_args(parser, args):
+    generator_args = ['-nbu', '--num-buildings', '-nro', '--num-rooms', '-nus', '--num-users', '-nbo', '--num-bookings', '-nca', '--num-cancellations',
+                      '-v', '--vectorized', '--chunk-size', '-w', '--workers', '-f', '--format', '--profile']
     user_set_generator_args = any(arg in sys.argv for arg in generator_args)
 
-    if user_set_generator_args and not args.generate:
+    if user_set_generator_args and not args.generate and not args.stream:
         print('WARNING: Generator parameters have been specified but generator mode (-g / --generate) was not enabled. These parameters will be ignored.', file=sys.stderr)
 
-    _cross_arg_validate_args(args)
+    _apply_xl_defaults(args)
+    _apply_vectorized_options(args)
+    _cross_arg_validate_args(parser, args)
 
 # --- Argument parsing ---
 def parse_args():
@@ -81,7 +129,7 @@ def parse_args():
         description='DataPopulator populates the database :D',
         epilog='¯\\_(ツ)_/¯')
     
-    parser.add_argument('-e', '--environment', type=_database_env, default='postgres', help='database environment: toy, dev, prod, toyunittest, devunittest, produnittest, or postgres')
+    parser.add_argument('-e', '--environment', type=_database_env, default='postgres', help='database environment: toy, dev, prod, xl, toyunittest, devunittest, produnittest, or postgres')
     parser.add_argument('-d', '--directory', type=_dir_path, default='./Data', help='path of data directory (local storage of web scraped data and dataset subdirectories)')
     parser.add_argument('-r', '--random-seed', type=_positive_int, help='seed for randomizer')
     parser.add_argument('-o', '--overwrite', action='store_true', help='overwrite local generator resource (and web scraped files)')
@@ -96,12 +144,20 @@ def parse_args():
     arg_group_generator.add_argument('-nus', '--num-users', type=_positive_int, default=1500, help='number of users to generate')
     arg_group_generator.add_argument('-nbo', '--num-bookings', type=_positive_int, default=100000, help='number of bookings to generate')
     arg_group_generator.add_argument('-nca', '--num-cancellations', type=_non_negative_int, default=2000, help='number of cancellations to generate')
+    arg_group_generator.add_argument('-v', '--vectorized', action='store_true', help='generate the dataset with numpy in chunks of rows (always on for the xl environment)')
+    arg_group_generator.add_argument('--chunk-size', type=_positive_int, default=1000000, help='number of rows the vectorized generator writes at a time')
+    arg_group_generator.add_argument('-w', '--workers', type=_positive_int, default=1, help='number of processes generating the bookings and cancellations, sharded by room range (uses the vectorized generator)')
+    arg_group_generator.add_argument('-f', '--format', type=_dataset_format, default=PU.DatasetFormats.CSV.value,
+                                     help='file format of the dataset: csv, csv.zst, parquet or arrow (other formats than csv use the vectorized generator)')
+    arg_group_generator.add_argument('--profile', type=_profile,
+                                     help='name of a profile in the profiles folder (eg. campus) or path of a profile JSON file with the popularity of the rooms and users, the busy hours and weekdays and the cancellation lead times (uses the vectorized generator)')
 
     arg_group_populator = parser.add_argument_group('database populator options')
     arg_group_populator.add_argument('-p', '--populate', action='store_true', help='enable database population mode')
+    arg_group_populator.add_argument('--stream', action='store_true', help='generate the dataset and load it straight into the database with COPY, without writing the dataset files (uses the vectorized generator)')
 
     args = parser.parse_args()
-    _post_parse_validate_args(args)
+    _post_parse_validate_args(parser, args)
     return args
 
 # --- Here be dragons ---
@@ -112,13 +168,20 @@ def summarize_args(args):
     print(f"{'directory: ':<20}{args.directory}")
     print(f"{'overwrite: ':<20}{args.overwrite}")
     print(f"{'scrape: ':<20}{args.scrape}")
-    print(f"{'generate: ':<20}{args.generate}")
+    print(f"{'generate: ':<20}{args.generate or args.stream}")
     print(f"{'  buildings: ':<20}{args.num_buildings}")
     print(f"{'  rooms: ':<20}{args.num_rooms}")
     print(f"{'  users: ':<20}{args.num_users}")
     print(f"{'  bookings: ':<20}{args.num_bookings}")
     print(f"{'  cancellations: ':<20}{args.num_cancellations}")
-    print(f"{'populate: ':<20}{args.populate}")
+    print(f"{'  vectorized: ':<20}{args.vectorized}")
+    if args.vectorized:
+        print(f"{'  chunk size: ':<20}{args.chunk_size}")
+        print(f"{'  workers: ':<20}{args.workers}")
+        print(f"{'  format: ':<20}{args.format.value}")
+        print(f"{'  profile: ':<20}{args.profile.name if args.profile is not None else 'uniform'}")
+    print(f"{'populate: ':<20}{args.populate or args.stream}")
+    print(f"{'stream: ':<20}{args.stream}")
     
 def confirm_or_exit(prompt="Continue? [y/N]: "):
     try:
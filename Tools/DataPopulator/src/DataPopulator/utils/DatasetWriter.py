@@ -0,0 +1,136 @@
+import os
+import shutil
+
+import PyUtils as PU
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+from ..utils.CmdMessages import TagTypes, print_tagged_message
+
+ARROW_TYPES = {
+    'int64': lambda: pa.int64(),
+    'str': lambda: pa.string(),
+    'datetime64[s]': lambda: pa.timestamp('s'),
+}
+
+# Streams the rows of a dataset file to disk one chunk (DataFrame) at a time,
+# so a large table never has to be held in memory as a whole
+#
+# columns maps the name of each column to its dtype, so Parquet and Arrow files get typed integer and timestamp columns
+class DatasetWriter:
+    def __init__(self, parent_dir, file, columns, verbose=True, format=PU.DatasetFormats.CSV):
+        self.parent_dir = parent_dir
+        self.file = file
+        self.full_path = os.path.join(parent_dir, file + format.ext)
+        self.columns = columns
+        self.verbose = verbose
+        self.format = format
+        self.rows = 0
+        self._file = None
+        self._writer = None
+        self._schema = None
+
+        if format == PU.DatasetFormats.CSVZstd and zstandard is None:
+            raise ModuleNotFoundError('Writing zstd compressed CSV files needs zstandard. Install it with: pip install zstandard')
+        if format in (PU.DatasetFormats.Parquet, PU.DatasetFormats.Arrow) and pa is None:
+            raise ModuleNotFoundError(f'Writing {format.value} files needs pyarrow. Install it with: pip install pyarrow')
+
+    def __enter__(self):
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _is_csv(self):
+        return self.format in (PU.DatasetFormats.CSV, PU.DatasetFormats.CSVZstd)
+
+    def _get_schema(self):
+        return pa.schema([(name, ARROW_TYPES[dtype]()) for name, dtype in self.columns.items()])
+
+    # removes the files of the same table in the other formats, so the importer only finds the file written here
+    def _remove_other_formats(self):
+        for format in PU.DatasetFormats:
+            path = os.path.join(self.parent_dir, self.file + format.ext)
+            if format == self.format or not os.path.isfile(path):
+                continue
+
+            os.remove(path)
+            if self.verbose:
+                print_tagged_message(TagTypes.Warning, 'REMOVED', f'Removed the {format.value} file of the table: {path}')
+
+    def open(self):
+        os.makedirs(os.path.dirname(self.full_path), exist_ok=True)
+        self._remove_other_formats()
+
+        if self.format == PU.DatasetFormats.CSV:
+            self._file = open(self.full_path, 'w', newline='', encoding='utf-8')
+        elif self.format == PU.DatasetFormats.CSVZstd:
+            self._file = zstandard.open(self.full_path, 'wt', encoding='utf-8', newline='')
+        elif self.format == PU.DatasetFormats.Parquet:
+            self._schema = self._get_schema()
+            self._writer = pq.ParquetWriter(self.full_path, self._schema)
+        elif self.format == PU.DatasetFormats.Arrow:
+            self._schema = self._get_schema()
+            self._file = pa.OSFile(self.full_path, 'wb')
+            self._writer = pa.ipc.new_file(self._file, self._schema)
+
+        if self._is_csv():
+            self._file.write(','.join(self.columns) + '\n')
+
+    def write(self, chunk):
+        chunk = chunk[list(self.columns)]
+
+        if self._is_csv():
+            # datetime columns are written as 'YYYY-MM-DD HH:MM:SS'
+            chunk.to_csv(self._file, header=False, index=False)
+        else:
+            self._writer.write_table(pa.Table.from_pandas(chunk, schema=self._schema, preserve_index=False))
+
+        self.rows += len(chunk)
+
+    # appends the rows of another file with the same columns and format (eg. a shard written by another process)
+    def write_file(self, path, rows):
+        if self.format == PU.DatasetFormats.CSV:
+            with open(path, 'r', newline='', encoding='utf-8') as f:
+                f.readline()
+                shutil.copyfileobj(f, self._file)
+        elif self.format == PU.DatasetFormats.CSVZstd:
+            with zstandard.open(path, 'rt', encoding='utf-8', newline='') as f:
+                f.readline()
+                shutil.copyfileobj(f, self._file)
+        elif self.format == PU.DatasetFormats.Parquet:
+            parquet_file = pq.ParquetFile(path, memory_map=True)
+            for i in range(parquet_file.num_row_groups):
+                # parquet stores the timestamps in milliseconds
+                self._writer.write_table(parquet_file.read_row_group(i).cast(self._schema))
+        elif self.format == PU.DatasetFormats.Arrow:
+            with pa.memory_map(path) as source:
+                reader = pa.ipc.open_file(source)
+                for i in range(reader.num_record_batches):
+                    self._writer.write_batch(reader.get_batch(i))
+
+        self.rows += rows
+
+    def close(self):
+        if self._file is None and self._writer is None:
+            return
+
+        if self._writer is not None:
+            self._writer.close()
+        if self._file is not None:
+            self._file.close()
+
+        self._file = None
+        self._writer = None
+        if self.verbose:
+            print_tagged_message(TagTypes.Success, 'INFO', f'Wrote {self.rows} rows to: {self.full_path}')
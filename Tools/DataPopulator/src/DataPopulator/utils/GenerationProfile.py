@@ -0,0 +1,94 @@
+import os
+import json
+from dataclasses import dataclass, field, fields
+from typing import List, Optional
+
+import numpy as np
+
+import PyUtils as PU
+
+PROFILES_FOLDER = os.path.join(PU.Paths.DataPopulatorFolder.value, 'profiles')
+
+# How the bookings of a generated dataset are spread over the rooms, users and times, declared in a JSON profile file.
+# The default profile is the uniform spread of the generators without a profile
+#
+# room_zipf and building_zipf are the exponents of the Zipf popularity of the rooms and buildings (0 for the same popularity)
+# hour_weights has a weight for every hour of the day (only the hours from 7:00 to 23:00 are booked) and
+# weekday_weights has a weight for every day of the week, starting on Monday
+# heavy_user_share of the users book heavy_user_weight times more often than the other users
+# cancellation_lead_hours is the mean number of hours between a cancellation and the start of its booking
+# (None to cancel at any time between making the booking and its start)
+# occupancy is the share of the rooms booked in the busiest slot of the week and slots_per_day is the number of slots the hours
+# from 7:00 to 23:00 are cut into (more slots follow the hour weights more closely, but make shorter bookings). None keeps the value of the generator
+@dataclass
+class GenerationProfile:
+    name: str = 'uniform'
+    room_zipf: float = 0
+    building_zipf: float = 0
+    hour_weights: List[float] = field(default_factory=lambda: [1.0] * 24)
+    weekday_weights: List[float] = field(default_factory=lambda: [1.0] * 7)
+    heavy_user_share: float = 0
+    heavy_user_weight: float = 1
+    cancellation_lead_hours: Optional[float] = None
+    occupancy: Optional[float] = None
+    slots_per_day: Optional[int] = None
+
+    def __post_init__(self):
+        if self.room_zipf < 0 or self.building_zipf < 0:
+            raise ValueError(f'The zipf exponents of the profile, {self.name}, cannot be negative')
+        if len(self.hour_weights) != 24:
+            raise ValueError(f'The profile, {self.name}, needs a weight for each of the 24 hours of the day')
+        if len(self.weekday_weights) != 7:
+            raise ValueError(f'The profile, {self.name}, needs a weight for each of the 7 days of the week')
+        if min(self.hour_weights) < 0 or min(self.weekday_weights) < 0:
+            raise ValueError(f'The hour and weekday weights of the profile, {self.name}, cannot be negative')
+        if max(self.hour_weights[7:23]) == 0 or max(self.weekday_weights) == 0:
+            raise ValueError(f'The profile, {self.name}, needs some hour from 7:00 to 23:00 and some weekday with a weight above 0')
+        if not 0 <= self.heavy_user_share <= 1:
+            raise ValueError(f'The heavy user share of the profile, {self.name}, needs to be between 0 and 1')
+        if self.heavy_user_weight <= 0:
+            raise ValueError(f'The heavy user weight of the profile, {self.name}, needs to be above 0')
+        if self.cancellation_lead_hours is not None and self.cancellation_lead_hours <= 0:
+            raise ValueError(f'The cancellation lead hours of the profile, {self.name}, need to be above 0')
+        if self.occupancy is not None and not 0 < self.occupancy <= 1:
+            raise ValueError(f'The occupancy of the profile, {self.name}, needs to be above 0 and at most 1')
+        if self.slots_per_day is not None and self.slots_per_day <= 0:
+            raise ValueError(f'The slots per day of the profile, {self.name}, need to be above 0')
+
+    def is_uniform(self):
+        return self.room_zipf == 0 and self.building_zipf == 0 and (self.heavy_user_share == 0 or self.heavy_user_weight == 1)
+
+    def get_slot_weights(self, window_start_seconds, slots_per_day, slot_seconds):
+        # the mean weight of the minutes in each slot
+        minutes = np.arange(slots_per_day * (slot_seconds // 60))
+        minute_weights = np.array(self.hour_weights, dtype=np.float64)[(window_start_seconds // 60 + minutes) // 60 % 24]
+        return minute_weights.reshape(slots_per_day, -1).mean(axis=1)
+
+    def get_zipf_weights(self, rng, count, exponent):
+        # the ranks of the popularity are shuffled, so the most popular ids are not always the first ids
+        ranks = rng.permutation(count) + 1
+        return ranks.astype(np.float64) ** -exponent
+
+    def get_user_weights(self, rng, count):
+        weights = np.ones(count)
+        weights[rng.random(count) < self.heavy_user_share] = self.heavy_user_weight
+        return weights
+
+# loads a profile from a JSON file, or from the profiles folder by its name (eg. 'campus')
+def load_profile(profile):
+    path = profile
+    if not os.path.isfile(path):
+        path = os.path.join(PROFILES_FOLDER, f'{profile}.json')
+    if not os.path.isfile(path):
+        raise ValueError(f'No profile file or profile named {profile} in: {PROFILES_FOLDER}')
+
+    with open(path, 'r', encoding=PU.FileEncodings.UTF8.value) as f:
+        values = json.load(f)
+
+    known_keys = {profile_field.name for profile_field in fields(GenerationProfile)}
+    unknown_keys = set(values) - known_keys
+    if unknown_keys:
+        raise ValueError(f'Unknown keys in the profile file, {path}: {", ".join(sorted(unknown_keys))}')
+
+    values.setdefault('name', os.path.splitext(os.path.basename(path))[0])
+    return GenerationProfile(**values)
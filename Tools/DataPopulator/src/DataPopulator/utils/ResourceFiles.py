@@ -1,8 +1,15 @@
 import os
 import csv
 
+import PyUtils as PU
+
 from ..utils.CmdMessages import TagTypes, print_tagged_message
 
+def get_dataset_folder(env):
+    if env == PU.DBNames.XL.value:
+        return os.path.basename(PU.Paths.XLDatasetFolder.value)
+    return env.lower().capitalize() + ' ' + 'Dataset'
+
 def init_resource_files(parent_dir, files, file_defaults=None, overwrite=False):
     for key, fname in files.items():
         full_path = os.path.join(parent_dir, fname)
@@ -0,0 +1,10 @@
+import LoadTester as LT
+
+
+def main():
+    loadTester = LT.LoadTester.create()
+    loadTester.run()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,26 @@
+from .constants.Commands import Commands
+from .constants.ConfigKeys import ConfigKeys
+from .constants.CommandOpts import CommandOpts
+from .constants.ShortCommandOpts import ShortCommandOpts
+from .constants.Endpoints import Endpoints
+from .constants.Mixes import Mixes
+
+from .exceptions.InvalidCommand import InvalidCommand
+from .exceptions.InvalidMix import InvalidMix
+
+from .workload.DataSet import DataSet
+from .workload.TargetData import TargetData, TargetUser, TargetRoom
+from .workload.Workload import Workload, LoadRequest
+from .workload.LoadStats import LoadStats
+from .workload.LoadRunner import LoadRunner
+from .workload.LoadReport import LoadReport
+
+from .loadTester import LoadTester
+from .commandBuilder import CommandBuilder
+from .config import Config
+
+
+__all__ = ["Commands", "ConfigKeys", "CommandOpts", "ShortCommandOpts", "Endpoints", "Mixes",
+           "InvalidCommand", "InvalidMix",
+           "DataSet", "TargetData", "TargetUser", "TargetRoom", "Workload", "LoadRequest", "LoadStats", "LoadRunner", "LoadReport",
+           "LoadTester", "CommandBuilder", "Config"]
@@ -0,0 +1,114 @@
+import argparse
+from typing import Dict, Any, Optional
+
+import PyUtils as PU
+
+from .constants.Commands import Commands
+from .constants.ConfigKeys import ConfigKeys
+from .constants.CommandOpts import CommandOpts
+from .constants.ShortCommandOpts import ShortCommandOpts
+from .constants.Endpoints import Endpoints
+from .constants.Mixes import Mixes
+from .exceptions.InvalidCommand import InvalidCommand
+
+
+# CommandBuilder: Class for building the command for the load tester
+class CommandBuilder(PU.BaseCommandBuilder):
+    def __init__(self, description: str, configs: Dict[ConfigKeys, Any],
+                 argParser: Optional[argparse.ArgumentParser] = None, argParserKwargs: Optional[Dict[str, Any]] = None,
+                 epilog: str = ""):
+
+        if (argParserKwargs is None):
+            argParserKwargs = {}
+
+        self._configs = configs
+        super().__init__(argParser = argParser, argParserKwargs = {"description": description, "epilog": epilog, **argParserKwargs})
+
+    def _addArguments(self):
+        allCommands = sorted(map(lambda command: f"  - {command}", Commands.getAll()))
+        allCommands = "\n".join(allCommands)
+
+        allMixes = ", ".join(sorted(Mixes.getAll()))
+        allEndpoints = ", ".join(sorted(Endpoints.getAll()))
+
+        self._argParser.add_argument(ShortCommandOpts.Env.value, CommandOpts.Env.value, action='store', type=str,
+                                     help=f"The environment mode of the backend. The users, buildings and rooms of the requests are taken from the dataset of this environment. Default is '{self._configs[ConfigKeys.Env]}'")
+        self._argParser.add_argument(ShortCommandOpts.URL.value, CommandOpts.URL.value, action='store', type=str,
+                                     help=f"The url of the running backend. Default is the local backend on the port of the environment")
+        self._argParser.add_argument(ShortCommandOpts.Mix.value, CommandOpts.Mix.value, action='store', type=str,
+                                     help=f"The mix of endpoints to send requests to. Either the name of a preset mix ({allMixes}) or weights in the form 'endpoint=weight,endpoint=weight,...'.\n\nThe available endpoints are: {allEndpoints}.\n\nDefault is '{self._configs[ConfigKeys.Mix]}'")
+        self._argParser.add_argument(ShortCommandOpts.Concurrency.value, CommandOpts.Concurrency.value, action='store', type=int,
+                                     help=f"The number of virtual users sending requests at the same time. Default is {self._configs[ConfigKeys.Concurrency]}")
+        self._argParser.add_argument(ShortCommandOpts.Duration.value, CommandOpts.Duration.value, action='store', type=float,
+                                     help=f"The number of seconds the requests are recorded for. Default is {self._configs[ConfigKeys.Duration]}")
+        self._argParser.add_argument(ShortCommandOpts.WarmUp.value, CommandOpts.WarmUp.value, action='store', type=float,
+                                     help=f"The number of seconds requests are sent for before they are recorded. Default is {self._configs[ConfigKeys.WarmUp]}")
+        self._argParser.add_argument(ShortCommandOpts.Users.value, CommandOpts.Users.value, action='store', type=int,
+                                     help=f"The number of users from the dataset that send the requests. Default is {self._configs[ConfigKeys.Users]}")
+        self._argParser.add_argument(ShortCommandOpts.Seed.value, CommandOpts.Seed.value, action='store', type=int,
+                                     help=f"The seed for picking the requests, so runs can be repeated. Default is {self._configs[ConfigKeys.Seed]}")
+        self._argParser.add_argument(ShortCommandOpts.Timeout.value, CommandOpts.Timeout.value, action='store', type=float,
+                                     help=f"The number of seconds to wait for a response before the request fails. Default is {self._configs[ConfigKeys.Timeout]}")
+        self._argParser.add_argument(ShortCommandOpts.Output.value, CommandOpts.Output.value, action='store', type=str,
+                                     help=f"The JSON file to save the results to. Default is a new file in the 'Results' folder of the load tester")
+        self._argParser.add_argument(ShortCommandOpts.Ephemeral.value, CommandOpts.Ephemeral.value, action='store_true',
+                                     help=f"Start a local backend against a new temporary Postgres server with the dataset of the environment imported into it, instead of sending the requests to a running backend")
+
+        self._argParser.add_argument("command", type=str, help=f"The command to run.\n\nThe available commands are:\n{allCommands}")
+        self._argParser.add_argument("results", type=str, nargs="*", help=f"For '{Commands.Compare}', the JSON files of the baseline run and of the run to compare against the baseline")
+
+    def _parseCommand(self):
+        commandName = self._args.command
+        command = Commands.match(commandName)
+
+        if (command is None):
+            raise InvalidCommand(commandName)
+        else:
+            self._configs[ConfigKeys.Command] = command
+
+        if (command == Commands.Compare and len(self._args.results) != 2):
+            self._argParser.error(f"'{Commands.Compare}' needs the JSON files of exactly 2 runs")
+
+        self._configs[ConfigKeys.Results] = self._args.results
+
+    def _parseOptions(self):
+        if (self._args.env is not None):
+            self._configs[ConfigKeys.Env] = self._args.env
+
+        if (self._args.url is not None):
+            self._configs[ConfigKeys.URL] = self._args.url
+
+        if (self._args.mix is not None):
+            self._configs[ConfigKeys.Mix] = self._args.mix
+
+        if (self._args.concurrency is not None):
+            self._configs[ConfigKeys.Concurrency] = self._args.concurrency
+
+        if (self._args.duration is not None):
+            self._configs[ConfigKeys.Duration] = self._args.duration
+
+        if (self._args.warmUp is not None):
+            self._configs[ConfigKeys.WarmUp] = self._args.warmUp
+
+        if (self._args.users is not None):
+            self._configs[ConfigKeys.Users] = self._args.users
+
+        if (self._args.seed is not None):
+            self._configs[ConfigKeys.Seed] = self._args.seed
+
+        if (self._args.timeout is not None):
+            self._configs[ConfigKeys.Timeout] = self._args.timeout
+
+        if (self._args.output is not None):
+            self._configs[ConfigKeys.Output] = self._args.output
+
+        if (self._args.ephemeral and self._args.url is not None):
+            self._argParser.error(f"'{CommandOpts.Ephemeral.value}' starts its own local backend, so it cannot be used with '{CommandOpts.URL.value}'")
+
+        self._configs[ConfigKeys.Ephemeral] = self._args.ephemeral
+
+    def parseArgs(self) -> argparse.Namespace:
+        super().parseArgs()
+        self._parseCommand()
+        self._parseOptions()
+        return self._args
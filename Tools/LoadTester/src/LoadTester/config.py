@@ -0,0 +1,19 @@
+from .constants.Commands import Commands
+from .constants.ConfigKeys import ConfigKeys
+from .constants.Mixes import Mixes
+
+
+# Configurations for the load tests
+Config = {ConfigKeys.Command: Commands.Run,
+          ConfigKeys.Env: "toy",
+          ConfigKeys.URL: None,
+          ConfigKeys.Mix: Mixes.Mixed.value,
+          ConfigKeys.Concurrency: 50,
+          ConfigKeys.Duration: 30,
+          ConfigKeys.WarmUp: 5,
+          ConfigKeys.Users: 100,
+          ConfigKeys.Seed: 0,
+          ConfigKeys.Timeout: 30,
+          ConfigKeys.Output: None,
+          ConfigKeys.Results: [],
+          ConfigKeys.Ephemeral: False}
@@ -0,0 +1,15 @@
+from enum import Enum
+
+
+class CommandOpts(Enum):
+    Env = "--env"
+    URL = "--url"
+    Mix = "--mix"
+    Concurrency = "--concurrency"
+    Duration = "--duration"
+    WarmUp = "--warmUp"
+    Users = "--users"
+    Seed = "--seed"
+    Timeout = "--timeout"
+    Output = "--output"
+    Ephemeral = "--ephemeral"
@@ -0,0 +1,6 @@
+import PyUtils as PU
+
+
+class Commands(PU.StrEnum):
+    Run = "run"
+    Compare = "compare"
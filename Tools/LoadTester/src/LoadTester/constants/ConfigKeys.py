@@ -0,0 +1,17 @@
+import PyUtils as PU
+
+
+class ConfigKeys(PU.StrEnum):
+    Command = "command"
+    Env = "env"
+    URL = "url"
+    Mix = "mix"
+    Concurrency = "concurrency"
+    Duration = "duration"
+    WarmUp = "warmUp"
+    Users = "users"
+    Seed = "seed"
+    Timeout = "timeout"
+    Output = "output"
+    Results = "results"
+    Ephemeral = "ephemeral"
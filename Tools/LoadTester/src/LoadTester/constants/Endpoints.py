@@ -0,0 +1,15 @@
+import PyUtils as PU
+
+
+class Endpoints(PU.StrEnum):
+    Index = "index"
+    ViewBuildings = "viewBuildings"
+    ViewAvailableRooms = "viewAvailableRooms"
+    ViewRoomsByBuildingID = "viewRoomsByBuildingID"
+    BookRoom = "bookRoom"
+    CancelBooking = "cancelBooking"
+    GetFutureBookings = "getFutureBookings"
+    GetBookingsAndCancellations = "getBookingsAndCancellations"
+    GetDashboardMetrics = "getDashboardMetrics"
+    GetBookingFrequency = "getBookingFrequency"
+    Login = "login"
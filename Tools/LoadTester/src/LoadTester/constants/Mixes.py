@@ -0,0 +1,7 @@
+import PyUtils as PU
+
+
+class Mixes(PU.StrEnum):
+    Browse = "browse"
+    Booking = "booking"
+    Mixed = "mixed"
@@ -0,0 +1,15 @@
+from enum import Enum
+
+
+class ShortCommandOpts(Enum):
+    Env = "-e"
+    URL = "-u"
+    Mix = "-m"
+    Concurrency = "-c"
+    Duration = "-d"
+    WarmUp = "-w"
+    Users = "-n"
+    Seed = "-s"
+    Timeout = "-t"
+    Output = "-o"
+    Ephemeral = "-eph"
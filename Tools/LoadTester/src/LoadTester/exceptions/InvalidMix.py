@@ -0,0 +1,4 @@
+# InvalidMix: Exception when the mix of the endpoints for the load test cannot be read
+class InvalidMix(Exception):
+    def __init__(self, mix: str, reason: str):
+        super().__init__(f"Unable to read the endpoint mix '{mix}': {reason}")
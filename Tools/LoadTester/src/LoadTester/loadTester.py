@@ -0,0 +1,175 @@
+import os
+import sys
+import time
+import socket
+import random
+import asyncio
+import traceback
+import subprocess
+import urllib.parse
+from typing import Tuple, Optional
+
+import PyUtils as PU
+import Backend as BK
+import DataImporter as DI
+from Backend.Config import Config as BackendConfig
+
+from .config import Config
+from .commandBuilder import CommandBuilder
+from .constants.Commands import Commands
+from .constants.ConfigKeys import ConfigKeys
+from .workload.DataSet import DataSet
+from .workload.TargetData import TargetData
+from .workload.Workload import Workload
+from .workload.LoadRunner import LoadRunner
+from .workload.LoadReport import LoadReport
+
+
+# LoadTester: Generates load against the endpoints of a running backend and reports the throughput, latencies and errors of each endpoint
+class LoadTester():
+    Singleton = None
+    StartTimeout = 60
+
+    def __init__(self):
+        self._commandBuilder = CommandBuilder("Generates load against the endpoints of a running backend", Config)
+        self._ephemeralDB: Optional[PU.EphemeralPostgres] = None
+        self._backend: Optional[subprocess.Popen] = None
+
+    @classmethod
+    def create(cls):
+        if (cls.Singleton is None):
+            cls.Singleton = cls()
+
+        return cls.Singleton
+
+    # _getEnv(): Retrieves the environment mode of the backend
+    def _getEnv(self) -> BK.EnvironmentModes:
+        env = BK.EnvironmentModes.find(Config[ConfigKeys.Env])
+        if (env is None):
+            raise KeyError(f"No environment available for the name ({Config[ConfigKeys.Env]})")
+
+        return env
+
+    # _getURL(env): Retrieves the url of the backend
+    def _getURL(self, env: BK.EnvironmentModes) -> str:
+        url = Config[ConfigKeys.URL]
+        if (url is None):
+            url = f"http://127.0.0.1:{BackendConfig.load(env).port}"
+
+        return url
+
+    # parseURL(url): Retrieves the host and the port of the backend from its url
+    @classmethod
+    def parseURL(cls, url: str) -> Tuple[str, int]:
+        parsedURL = urllib.parse.urlsplit(url if ("://" in url) else f"http://{url}")
+        if (parsedURL.scheme != "http"):
+            raise ValueError(f"Only http urls are supported: {url}")
+
+        return (parsedURL.hostname, 80 if (parsedURL.port is None) else parsedURL.port)
+
+    # _waitForBackend(port): Waits until the local backend accepts connections
+    def _waitForBackend(self, port: int):
+        deadline = time.monotonic() + self.StartTimeout
+
+        while (time.monotonic() < deadline):
+            if (self._backend.poll() is not None):
+                raise RuntimeError(f"The backend exited with code {self._backend.returncode} before it started")
+
+            try:
+                with socket.create_connection(("127.0.0.1", port), timeout = 1):
+                    return
+            except OSError:
+                time.sleep(0.25)
+
+        raise TimeoutError(f"The backend did not start within {self.StartTimeout}s")
+
+    # _startEphemeralBackend(env): Starts a local backend against a temporary Postgres server with the dataset of the environment imported into it
+    def _startEphemeralBackend(self, env: BK.EnvironmentModes):
+        backendConfig = BackendConfig.load(env)
+
+        self._ephemeralDB = PU.EphemeralPostgres()
+        secrets = self._ephemeralDB.start()
+        print(f"Started a temporary Postgres server at port {secrets.port}")
+
+        importer = DI.Importer(secrets, database = backendConfig.database)
+        importer.importData(DataSet.Folders[env], buildLevel = DI.ImportLevel.Database)
+
+        # the .env files do not override the secrets of the temporary server passed through the environment variables
+        mainFile = os.path.join(PU.Paths.ProjectFolder.value, "backend", "main.py")
+        self._backend = subprocess.Popen([sys.executable, mainFile, "-e", env.value], env = {**os.environ, **self._ephemeralDB.getEnv()},
+                                         stdout = subprocess.DEVNULL, stderr = subprocess.DEVNULL)
+        self._waitForBackend(backendConfig.port)
+
+    # _runLoad(): Runs a load test against the backend
+    async def _runLoad(self):
+        weights = Workload.parseMix(Config[ConfigKeys.Mix])
+        env = self._getEnv()
+        url = self._getURL(env)
+        host, port = self.parseURL(url)
+
+        dataSet = DataSet.loadEnv(env)
+
+        client = PU.AsyncHTTPClient(host, port, timeout = Config[ConfigKeys.Timeout])
+        try:
+            targets = await TargetData.resolve(client, dataSet, Config[ConfigKeys.Users], random.Random(Config[ConfigKeys.Seed]))
+        finally:
+            client.close()
+
+        workload = Workload(targets, weights)
+        runner = LoadRunner(host, port, workload, concurrency = Config[ConfigKeys.Concurrency], duration = Config[ConfigKeys.Duration],
+                            warmUp = Config[ConfigKeys.WarmUp], seed = Config[ConfigKeys.Seed], timeout = Config[ConfigKeys.Timeout])
+        runResult = await runner.run()
+
+        config = {"env": env.value,
+                  "url": url,
+                  "mix": Config[ConfigKeys.Mix],
+                  "weights": {endpoint.value: weight for endpoint, weight in weights.items()},
+                  "concurrency": Config[ConfigKeys.Concurrency],
+                  "duration": Config[ConfigKeys.Duration],
+                  "warmUp": Config[ConfigKeys.WarmUp],
+                  "users": Config[ConfigKeys.Users],
+                  "seed": Config[ConfigKeys.Seed]}
+
+        report = LoadReport.create(config, targets.toDict(), runResult)
+        report.printSummary()
+
+        file = report.save(Config[ConfigKeys.Output])
+        print(f"Results saved to {file}")
+
+    def _run(self):
+        self._commandBuilder.parse()
+        command = Config[ConfigKeys.Command]
+
+        if (command == Commands.Run):
+            if (Config[ConfigKeys.Ephemeral]):
+                self._startEphemeralBackend(self._getEnv())
+
+            asyncio.run(self._runLoad())
+        elif (command == Commands.Compare):
+            baselineFile, candidateFile = Config[ConfigKeys.Results]
+            LoadReport.printComparison(LoadReport.load(baselineFile), LoadReport.load(candidateFile))
+
+    def tearDown(self):
+        if (self._backend is not None):
+            self._backend.terminate()
+
+            try:
+                self._backend.wait(timeout = 10)
+            except subprocess.TimeoutExpired:
+                self._backend.kill()
+                self._backend.wait()
+
+            self._backend = None
+
+        if (self._ephemeralDB is not None):
+            self._ephemeralDB.stop()
+            self._ephemeralDB = None
+
+    def run(self):
+        try:
+            self._run()
+        except Exception as e:
+            print(traceback.format_exc())
+            sys.exit(1)
+        finally:
+            self.tearDown()
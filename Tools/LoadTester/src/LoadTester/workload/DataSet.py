@@ -0,0 +1,52 @@
+import os
+import pandas as pd
+from typing import List, Dict, Any, Set, Tuple
+
+import PyUtils as PU
+import Backend as BK
+
+
+# DataSet: The users, buildings and rooms of one of the datasets in the 'Data' folder.
+#   The load test picks the targets of its requests from these rows
+class DataSet():
+    Folders = {BK.EnvironmentModes.Toy: PU.Paths.ToyDatasetFolder.value,
+               BK.EnvironmentModes.Dev: PU.Paths.SampleDatasetFolder.value,
+               BK.EnvironmentModes.Prod: PU.Paths.ProdDatasetFolder.value}
+
+    def __init__(self, users: List[Dict[str, Any]], buildings: List[Dict[str, Any]], rooms: List[Dict[str, Any]]):
+        self.users = users
+        self.buildings = buildings
+        self.rooms = rooms
+
+    # load(dataFolder): Reads the users, buildings and rooms of the dataset in some folder
+    @classmethod
+    def load(cls, dataFolder: str) -> "DataSet":
+        userData = pd.read_csv(os.path.join(dataFolder, "User.csv"), dtype = {PU.ColNames.UserName.value: str, PU.ColNames.UserPassword.value: str})
+        buildingData = pd.read_csv(os.path.join(dataFolder, "Building.csv"), dtype = {PU.ColNames.BuildingName.value: str})
+        roomData = pd.read_csv(os.path.join(dataFolder, "Room.csv"), dtype = {PU.ColNames.RoomName.value: str})
+
+        users = userData[[PU.ColNames.UserName.value, PU.ColNames.UserPassword.value]].dropna().to_dict("records")
+        buildings = buildingData[[PU.ColNames.BuildingId.value, PU.ColNames.BuildingName.value]].dropna().to_dict("records")
+        rooms = roomData[[PU.ColNames.RoomName.value, PU.ColNames.RoomCapacity.value, PU.ColNames.BuildingId.value]].dropna().to_dict("records")
+        return cls(users, buildings, rooms)
+
+    # loadEnv(env): Reads the dataset imported into the database of some environment
+    @classmethod
+    def loadEnv(cls, env: BK.EnvironmentModes) -> "DataSet":
+        dataFolder = cls.Folders.get(env)
+        if (dataFolder is None):
+            raise KeyError(f"No dataset available for the environment ({env.value})")
+
+        return cls.load(dataFolder)
+
+    # getRoomKeys(): Retrieves the building name and room name of every room in the dataset
+    def getRoomKeys(self) -> Set[Tuple[str, str]]:
+        buildingNames = {building[PU.ColNames.BuildingId.value]: building[PU.ColNames.BuildingName.value] for building in self.buildings}
+        result = set()
+
+        for room in self.rooms:
+            buildingName = buildingNames.get(room[PU.ColNames.BuildingId.value])
+            if (buildingName is not None):
+                result.add((buildingName, room[PU.ColNames.RoomName.value]))
+
+        return result
@@ -0,0 +1,138 @@
+import os
+import json
+import subprocess
+from datetime import datetime, timezone
+from typing import Dict, Any, Optional
+
+import PyUtils as PU
+
+from ..constants.Mixes import Mixes
+
+
+# LoadReport: Saves, prints and compares the results of the load tests.
+#
+#   The results are stored as JSON together with the git commit they were ran on, so runs of different commits can be compared
+class LoadReport():
+    Version = 1
+    ResultsFolder = os.path.join(PU.Paths.ProjectFolder.value, "Tools", "LoadTester", "Results")
+
+    def __init__(self, result: Dict[str, Any]):
+        self.result = result
+
+    # getCommit(): Retrieves the git commit of the project and whether the project has changes that are not committed
+    @classmethod
+    def getCommit(cls) -> Dict[str, Any]:
+        try:
+            commit = subprocess.run(["git", "rev-parse", "HEAD"], cwd = PU.Paths.ProjectFolder.value, capture_output = True, text = True, check = True).stdout.strip()
+            changes = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd = PU.Paths.ProjectFolder.value,
+                                     capture_output = True, text = True, check = True).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return {"commit": None, "dirty": None}
+
+        return {"commit": commit, "dirty": changes != ""}
+
+    # create(config, targets, runResult): Creates the report for a load test that finished running
+    @classmethod
+    def create(cls, config: Dict[str, Any], targets: Dict[str, int], runResult: Dict[str, Any]) -> "LoadReport":
+        result = {"version": cls.Version,
+                  "createdAt": datetime.now(timezone.utc).isoformat(timespec = "seconds"),
+                  **cls.getCommit(),
+                  "config": config,
+                  "targets": targets,
+                  **runResult}
+
+        return cls(result)
+
+    # load(file): Reads a report saved by 'save'
+    @classmethod
+    def load(cls, file: str) -> "LoadReport":
+        with open(file, "r", encoding = PU.FileEncodings.UTF8.value) as f:
+            return cls(json.load(f))
+
+    # getDefaultFile(): Retrieves the file in the results folder the report is saved to when no file is given
+    def getDefaultFile(self) -> str:
+        createdAt = datetime.fromisoformat(self.result["createdAt"]).strftime("%Y%m%d-%H%M%S")
+        commit = (self.result.get("commit") or "nocommit")[:8]
+        config = self.result["config"]
+        mix = config["mix"] if (Mixes.match(config["mix"]) is not None) else "custom"
+        return os.path.join(self.ResultsFolder, f"{createdAt}-{commit}-{config['env']}-{mix}.json")
+
+    # save(file): Saves the report as JSON and retrieves the file it was saved to
+    def save(self, file: Optional[str] = None) -> str:
+        if (file is None):
+            file = self.getDefaultFile()
+
+        folder = os.path.dirname(os.path.abspath(file))
+        os.makedirs(folder, exist_ok = True)
+
+        with open(file, "w", encoding = PU.FileEncodings.UTF8.value) as f:
+            json.dump(self.result, f, indent = 4)
+            f.write("\n")
+
+        return file
+
+    # printSummary(): Prints out the throughput, latencies and errors of each endpoint
+    def printSummary(self):
+        config = self.result["config"]
+        commit = self.result.get("commit") or "unknown commit"
+        if (self.result.get("dirty")):
+            commit += " (with uncommitted changes)"
+
+        print(f"===== Load test on {config['url']}, {commit} =====")
+        print(f"mix: {config['mix']}, concurrency: {config['concurrency']}, duration: {self.result['duration']:.1f}s, warm up: {config['warmUp']}s, seed: {config['seed']}")
+        print(f"targets: {', '.join(f'{count} {name}' for name, count in self.result['targets'].items())}\n")
+
+        rows = {**self.result["endpoints"], "TOTAL": self.result["total"]}
+        nameWidth = max(map(len, rows.keys()))
+        print(f"{'':<{nameWidth}}  {'requests':>9}  {'req/s':>9}  {'errors':>7}  {'mean (ms)':>10}  {'p50 (ms)':>9}  {'p95 (ms)':>9}  {'p99 (ms)':>9}  {'max (ms)':>9}")
+
+        for name, stats in rows.items():
+            latency = stats["latencyMs"]
+            print(f"{name:<{nameWidth}}  {stats['requests']:>9}  {stats['throughput']:>9.1f}  {stats['errorRate']:>7.1%}  {latency['mean']:>10.2f}  "
+                  f"{latency['p50']:>9.2f}  {latency['p95']:>9.2f}  {latency['p99']:>9.2f}  {latency['max']:>9.2f}")
+
+        errors = {name: stats["errors"] for name, stats in self.result["endpoints"].items() if (stats["errors"])}
+        if (errors):
+            print("\nErrors:")
+
+        for name, endpointErrors in errors.items():
+            for failure, count in endpointErrors.items():
+                print(f"  {name}: {count} x {failure}")
+
+        print("")
+
+    # _getChange(baseline, candidate): Retrieves the relative change from some baseline value
+    @classmethod
+    def _getChange(cls, baseline: float, candidate: float) -> str:
+        if (baseline == 0):
+            return "n/a"
+
+        return f"{(candidate - baseline) / baseline:+.1%}"
+
+    # printComparison(baseline, candidate): Prints out the change in throughput, latencies and errors of each endpoint between two reports
+    @classmethod
+    def printComparison(cls, baseline: "LoadReport", candidate: "LoadReport"):
+        baselineName = (baseline.result.get("commit") or "baseline")[:8]
+        candidateName = (candidate.result.get("commit") or "candidate")[:8]
+        print(f"===== {baselineName} -> {candidateName} =====")
+
+        if (baseline.result["config"]["mix"] != candidate.result["config"]["mix"] or
+            baseline.result["config"]["concurrency"] != candidate.result["config"]["concurrency"]):
+            print("Warning: the runs used different mixes or concurrencies\n")
+
+        baselineRows = {**baseline.result["endpoints"], "TOTAL": baseline.result["total"]}
+        candidateRows = {**candidate.result["endpoints"], "TOTAL": candidate.result["total"]}
+        names = [name for name in baselineRows if (name in candidateRows)]
+
+        nameWidth = max(map(len, names))
+        print(f"{'':<{nameWidth}}  {'req/s':>20}  {'change':>7}  {'p95 (ms)':>20}  {'change':>7}  {'p99 (ms)':>20}  {'change':>7}  {'errors':>16}")
+
+        for name in names:
+            old, new = baselineRows[name], candidateRows[name]
+            oldLatency, newLatency = old["latencyMs"], new["latencyMs"]
+            print(f"{name:<{nameWidth}}  {old['throughput']:>9.1f} -> {new['throughput']:>7.1f}  {cls._getChange(old['throughput'], new['throughput']):>7}  "
+                  f"{oldLatency['p95']:>9.2f} -> {newLatency['p95']:>7.2f}  {cls._getChange(oldLatency['p95'], newLatency['p95']):>7}  "
+                  f"{oldLatency['p99']:>9.2f} -> {newLatency['p99']:>7.2f}  {cls._getChange(oldLatency['p99'], newLatency['p99']):>7}  "
+                  f"{old['errorRate']:>6.1%} -> {new['errorRate']:>6.1%}")
+
+        print("")
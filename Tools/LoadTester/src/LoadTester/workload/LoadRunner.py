@@ -0,0 +1,89 @@
+import time
+import random
+import asyncio
+from typing import Dict, Any
+
+import PyUtils as PU
+
+from ..constants.Endpoints import Endpoints
+from .LoadStats import LoadStats
+from .Workload import Workload
+
+
+# LoadRunner: Sends the requests of a workload to the backend from many virtual users at the same time.
+#
+#   Every virtual user keeps its own connection open and sends its next request as soon as the response to its last request arrives.
+#   The requests sent during the warm up are not recorded
+class LoadRunner():
+    def __init__(self, host: str, port: int, workload: Workload, concurrency: int = 50, duration: float = 30, warmUp: float = 5,
+                 seed: int = 0, timeout: float = 30):
+        self.host = host
+        self.port = port
+        self.workload = workload
+        self.concurrency = concurrency
+        self.duration = duration
+        self.warmUp = warmUp
+        self.seed = seed
+        self.timeout = timeout
+
+        self._stats: Dict[Endpoints, LoadStats] = {}
+
+    # _getStats(endpoint): Retrieves the statistics of some endpoint
+    def _getStats(self, endpoint: Endpoints) -> LoadStats:
+        stats = self._stats.get(endpoint)
+        if (stats is None):
+            stats = LoadStats()
+            self._stats[endpoint] = stats
+
+        return stats
+
+    # _runUser(userInd, recordTime, stopTime): Sends the requests of a single virtual user until the load test stops
+    async def _runUser(self, userInd: int, recordTime: float, stopTime: float):
+        rng = random.Random(self.seed * 1000003 + userInd)
+        client = PU.AsyncHTTPClient(self.host, self.port, timeout = self.timeout)
+
+        try:
+            while (time.monotonic() < stopTime):
+                request = self.workload.nextRequest(rng)
+                startTime = time.perf_counter()
+
+                try:
+                    response = await client.request(request.method, request.path, jsonBody = request.jsonBody)
+                except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, ValueError) as e:
+                    latency = time.perf_counter() - startTime
+                    if (time.monotonic() >= recordTime):
+                        self._getStats(request.endpoint).add(latency, failure = type(e).__name__)
+                    continue
+
+                latency = time.perf_counter() - startTime
+
+                try:
+                    result = response.json()
+                except ValueError:
+                    result = None
+
+                failure = self.workload.getFailure(request, response.status, result)
+                if (time.monotonic() >= recordTime):
+                    self._getStats(request.endpoint).add(latency, failure = failure, responseBytes = len(response.body))
+        finally:
+            client.close()
+
+    # run(): Runs the load test and retrieves the statistics of each endpoint and of all the endpoints together
+    async def run(self) -> Dict[str, Any]:
+        self._stats = {}
+
+        startTime = time.monotonic()
+        recordTime = startTime + self.warmUp
+        stopTime = recordTime + self.duration
+
+        await asyncio.gather(*[self._runUser(i, recordTime, stopTime) for i in range(self.concurrency)])
+        duration = time.monotonic() - recordTime
+
+        total = LoadStats()
+        for stats in self._stats.values():
+            total.merge(stats)
+
+        endpoints = {endpoint.value: self._stats[endpoint].toDict(duration) for endpoint in sorted(self._stats.keys(), key = lambda endpoint: endpoint.value)}
+        return {"duration": duration,
+                "total": total.toDict(duration),
+                "endpoints": endpoints}
@@ -0,0 +1,54 @@
+from typing import Optional, List, Dict, Any
+
+
+# LoadStats: The latencies and failures of the requests sent to a single endpoint during a load test
+class LoadStats():
+    Percentiles = {"p50": 0.5, "p90": 0.9, "p95": 0.95, "p99": 0.99}
+
+    def __init__(self):
+        self.count = 0
+        self.failed = 0
+        self.bytes = 0
+        self.latencies: List[float] = []
+        self.errors: Dict[str, int] = {}
+
+    # add(latency, failure, responseBytes): Adds a request that finished to the statistics.
+    #   'failure' is the reason the request failed, or None if the request succeeded
+    def add(self, latency: float, failure: Optional[str] = None, responseBytes: int = 0):
+        self.count += 1
+        self.bytes += responseBytes
+        self.latencies.append(latency)
+
+        if (failure is not None):
+            self.failed += 1
+            self.errors[failure] = self.errors.get(failure, 0) + 1
+
+    # merge(other): Adds the requests of other statistics to these statistics
+    def merge(self, other: "LoadStats"):
+        self.count += other.count
+        self.failed += other.failed
+        self.bytes += other.bytes
+        self.latencies += other.latencies
+
+        for failure, count in other.errors.items():
+            self.errors[failure] = self.errors.get(failure, 0) + count
+
+    # toDict(duration): Retrieves the statistics as a dictionary, with the latencies in milliseconds
+    def toDict(self, duration: float) -> Dict[str, Any]:
+        latencies = sorted(self.latencies)
+        latencyCount = len(latencies)
+        percentile = lambda fraction: latencies[int(fraction * (latencyCount - 1))] * 1000 if (latencyCount > 0) else 0.0
+
+        latency = {"mean": sum(latencies) / latencyCount * 1000 if (latencyCount > 0) else 0.0}
+        for name, fraction in self.Percentiles.items():
+            latency[name] = percentile(fraction)
+        latency["max"] = latencies[-1] * 1000 if (latencyCount > 0) else 0.0
+
+        return {"requests": self.count,
+                "succeeded": self.count - self.failed,
+                "failed": self.failed,
+                "errorRate": self.failed / self.count if (self.count > 0) else 0.0,
+                "throughput": self.count / duration if (duration > 0) else 0.0,
+                "bytes": self.bytes,
+                "latencyMs": latency,
+                "errors": dict(sorted(self.errors.items(), key = lambda item: item[1], reverse = True))}
@@ -0,0 +1,98 @@
+import random
+from typing import List, Dict, Any, Optional
+
+import PyUtils as PU
+
+from .DataSet import DataSet
+
+
+# TargetUser: A user of the dataset that has logged into the backend
+class TargetUser():
+    def __init__(self, userId: str, username: str, password: str):
+        self.userId = userId
+        self.username = username
+        self.password = password
+
+
+# TargetRoom: A room of the dataset with its id in the database of the backend
+class TargetRoom():
+    def __init__(self, roomId: str, buildingId: Optional[str], roomName: str, capacity: int):
+        self.roomId = roomId
+        self.buildingId = buildingId
+        self.roomName = roomName
+        self.capacity = capacity
+
+
+# TargetData: The users, buildings and rooms the requests of the load test are sent for.
+#
+#   The databases are imported with random ids, so the rows of the dataset are matched to their ids in the database through the backend itself:
+#   the users by logging them in, the buildings by their names and the rooms by their building and room names
+class TargetData():
+    def __init__(self, users: List[TargetUser], buildingIds: List[str], rooms: List[TargetRoom]):
+        self.users = users
+        self.buildingIds = buildingIds
+        self.rooms = rooms
+
+    # fetchJSON(client, path): Sends a GET request to the backend and retrieves its JSON response
+    @classmethod
+    async def fetchJSON(cls, client: PU.AsyncHTTPClient, path: str) -> Any:
+        response = await client.get(path)
+        if (response.status != 200):
+            raise ConnectionError(f"The backend responded to '{path}' with the status {response.status}")
+
+        return response.json()
+
+    # resolveUsers(client, dataSet, userCount, rng): Logs in a random sample of the users of the dataset to retrieve their ids
+    @classmethod
+    async def resolveUsers(cls, client: PU.AsyncHTTPClient, dataSet: DataSet, userCount: int, rng: random.Random) -> List[TargetUser]:
+        users = dataSet.users if (userCount >= len(dataSet.users)) else rng.sample(dataSet.users, userCount)
+        result = []
+
+        for user in users:
+            username = user[PU.ColNames.UserName.value]
+            password = user[PU.ColNames.UserPassword.value]
+
+            response = await client.post("/login", jsonBody = {"username": username, "password": password})
+            loginResult = response.json() if (response.status == 200) else {}
+
+            if (loginResult.get("loginStatus")):
+                result.append(TargetUser(loginResult["userId"], username, password))
+
+        return result
+
+    # resolve(client, dataSet, userCount, rng): Retrieves the ids in the database of the backend for the rows of the dataset
+    @classmethod
+    async def resolve(cls, client: PU.AsyncHTTPClient, dataSet: DataSet, userCount: int, rng: random.Random) -> "TargetData":
+        buildingNames = set(map(lambda building: building[PU.ColNames.BuildingName.value], dataSet.buildings))
+        roomKeys = dataSet.getRoomKeys()
+
+        buildings = await cls.fetchJSON(client, "/viewBuildings")
+        buildingIds: Dict[str, str] = {}
+        for building in buildings:
+            if (building[PU.ColNames.BuildingName.value] in buildingNames):
+                buildingIds[building[PU.ColNames.BuildingName.value]] = building[PU.ColNames.BuildingId.value]
+
+        # all the rooms are listed when no filter is given
+        rooms = []
+        for room in await cls.fetchJSON(client, "/viewAvailableRooms"):
+            buildingName = room[PU.ColNames.BuildingName.value]
+            roomName = room[PU.ColNames.RoomName.value]
+
+            if ((buildingName, roomName) in roomKeys):
+                rooms.append(TargetRoom(room[PU.ColNames.RoomId.value], buildingIds.get(buildingName), roomName, int(room[PU.ColNames.RoomCapacity.value])))
+
+        users = await cls.resolveUsers(client, dataSet, userCount, rng)
+
+        if (not users):
+            raise ValueError("None of the users of the dataset could log in. Check that the backend runs on the database of the chosen environment")
+
+        if (not rooms):
+            raise ValueError("None of the rooms of the dataset were found. Check that the backend runs on the database of the chosen environment")
+
+        return cls(users, list(buildingIds.values()), rooms)
+
+    # toDict(): Retrieves the number of targets of each kind
+    def toDict(self) -> Dict[str, int]:
+        return {"users": len(self.users),
+                "buildings": len(self.buildingIds),
+                "rooms": len(self.rooms)}
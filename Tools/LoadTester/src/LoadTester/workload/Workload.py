@@ -0,0 +1,216 @@
+import random
+import urllib.parse
+from datetime import datetime, timedelta
+from typing import Dict, Any, Optional, List, Tuple, Union
+
+from ..constants.Endpoints import Endpoints
+from ..constants.Mixes import Mixes
+from ..exceptions.InvalidMix import InvalidMix
+from .TargetData import TargetData, TargetUser
+
+
+# LoadRequest: A request sent by the load test to one of the endpoints of the backend
+class LoadRequest():
+    def __init__(self, endpoint: Endpoints, method: str, path: str, jsonBody: Any = None, user: Optional[TargetUser] = None):
+        self.endpoint = endpoint
+        self.method = method
+        self.path = path
+        self.jsonBody = jsonBody
+        self.user = user
+
+
+# Workload: Builds the requests of the load test, picking the endpoint of each request from a weighted mix
+#   and the users, buildings and rooms of the request from the target data.
+#
+#   The bookings made by 'bookRoom' are remembered so that 'cancelBooking' cancels real bookings.
+#   When no booking is left to cancel, a 'bookRoom' request is sent instead
+class Workload():
+    MixWeights = {Mixes.Browse: {Endpoints.Index: 1,
+                                 Endpoints.ViewBuildings: 2,
+                                 Endpoints.ViewAvailableRooms: 4,
+                                 Endpoints.ViewRoomsByBuildingID: 2,
+                                 Endpoints.GetFutureBookings: 1},
+
+                  Mixes.Booking: {Endpoints.ViewAvailableRooms: 3,
+                                  Endpoints.BookRoom: 3,
+                                  Endpoints.CancelBooking: 1,
+                                  Endpoints.GetFutureBookings: 2,
+                                  Endpoints.GetBookingsAndCancellations: 1},
+
+                  Mixes.Mixed: {Endpoints.ViewBuildings: 2,
+                                Endpoints.ViewAvailableRooms: 5,
+                                Endpoints.ViewRoomsByBuildingID: 2,
+                                Endpoints.BookRoom: 2,
+                                Endpoints.CancelBooking: 1,
+                                Endpoints.GetFutureBookings: 2,
+                                Endpoints.GetBookingsAndCancellations: 1,
+                                Endpoints.GetDashboardMetrics: 1,
+                                Endpoints.GetBookingFrequency: 1,
+                                Endpoints.Login: 1}}
+
+    DateTimeFormat = "%Y-%m-%dT%H:%M"
+
+    # bookings are made between 8 AM and 10 PM, inside the booking window of the database
+    BookingDaysAhead = 365
+    BookingStartHours = (8, 20)
+    BookingMinutes = (30, 120)
+
+    def __init__(self, targets: TargetData, weights: Dict[Endpoints, float]):
+        self.targets = targets
+        self.weights = weights
+
+        self._endpoints = list(weights.keys())
+        self._cumWeights = []
+        totalWeight = 0
+        for endpoint in self._endpoints:
+            totalWeight += weights[endpoint]
+            self._cumWeights.append(totalWeight)
+
+        self._bookings: List[Tuple[str, TargetUser]] = []
+        self._builders = {Endpoints.Index: self._buildIndex,
+                          Endpoints.ViewBuildings: self._buildViewBuildings,
+                          Endpoints.ViewAvailableRooms: self._buildViewAvailableRooms,
+                          Endpoints.ViewRoomsByBuildingID: self._buildViewRoomsByBuildingID,
+                          Endpoints.BookRoom: self._buildBookRoom,
+                          Endpoints.CancelBooking: self._buildCancelBooking,
+                          Endpoints.GetFutureBookings: self._buildGetFutureBookings,
+                          Endpoints.GetBookingsAndCancellations: self._buildGetBookingsAndCancellations,
+                          Endpoints.GetDashboardMetrics: self._buildGetDashboardMetrics,
+                          Endpoints.GetBookingFrequency: self._buildGetBookingFrequency,
+                          Endpoints.Login: self._buildLogin}
+
+    # parseMix(mix): Retrieves the weights of the endpoints for either the name of a preset mix
+    #   or a list of weights in the form 'endpoint=weight,endpoint=weight,...'
+    @classmethod
+    def parseMix(cls, mix: Union[str, Mixes]) -> Dict[Endpoints, float]:
+        if (isinstance(mix, Mixes)):
+            return dict(cls.MixWeights[mix])
+
+        preset = Mixes.match(mix.strip())
+        if (preset is not None):
+            return dict(cls.MixWeights[preset])
+
+        result = {}
+        for part in filter(lambda part: part.strip() != "", mix.split(",")):
+            endpointName, sep, weight = part.partition("=")
+            endpoint = Endpoints.match(endpointName.strip())
+
+            if (endpoint is None):
+                raise InvalidMix(mix, f"unknown endpoint '{endpointName.strip()}'. The available endpoints are: {', '.join(sorted(Endpoints.getAll()))}")
+
+            try:
+                weight = float(weight) if (sep) else 1
+            except ValueError:
+                raise InvalidMix(mix, f"the weight of '{endpoint.value}' is not a number")
+
+            if (weight < 0):
+                raise InvalidMix(mix, f"the weight of '{endpoint.value}' is negative")
+
+            if (weight > 0):
+                result[endpoint] = weight
+
+        if (not result):
+            raise InvalidMix(mix, f"no endpoints were given. The available mixes are: {', '.join(sorted(Mixes.getAll()))}")
+
+        return result
+
+    # toQuery(path, params): Adds the query parameters to some path
+    @classmethod
+    def toQuery(cls, path: str, params: Dict[str, Any]) -> str:
+        return f"{path}?{urllib.parse.urlencode(params)}"
+
+    # randomTimeRange(rng): Retrieves a random future time range inside the booking window
+    def randomTimeRange(self, rng: random.Random) -> Tuple[datetime, datetime]:
+        day = datetime.now().replace(hour = 0, minute = 0, second = 0, microsecond = 0) + timedelta(days = rng.randint(1, self.BookingDaysAhead))
+        startTime = day + timedelta(hours = rng.randint(*self.BookingStartHours), minutes = rng.choice([0, 15, 30, 45]))
+        endTime = startTime + timedelta(minutes = rng.randint(*self.BookingMinutes))
+        return (startTime, endTime)
+
+    def _buildIndex(self, rng: random.Random, user: TargetUser) -> LoadRequest:
+        return LoadRequest(Endpoints.Index, "GET", "/")
+
+    def _buildViewBuildings(self, rng: random.Random, user: TargetUser) -> LoadRequest:
+        return LoadRequest(Endpoints.ViewBuildings, "GET", "/viewBuildings")
+
+    # _buildViewAvailableRooms(rng, user): Searches the rooms available in some time range, sometimes with a capacity filter
+    def _buildViewAvailableRooms(self, rng: random.Random, user: TargetUser) -> LoadRequest:
+        startTime, endTime = self.randomTimeRange(rng)
+        params = {"db_operation": "filter",
+                  "start_time": startTime.strftime(self.DateTimeFormat),
+                  "end_time": endTime.strftime(self.DateTimeFormat)}
+
+        if (rng.random() < 0.5):
+            params["min_capacity"] = rng.choice(self.targets.rooms).capacity
+
+        return LoadRequest(Endpoints.ViewAvailableRooms, "GET", self.toQuery("/viewAvailableRooms", params))
+
+    def _buildViewRoomsByBuildingID(self, rng: random.Random, user: TargetUser) -> LoadRequest:
+        room = rng.choice(self.targets.rooms)
+        buildingId = room.buildingId if (room.buildingId is not None or not self.targets.buildingIds) else rng.choice(self.targets.buildingIds)
+        return LoadRequest(Endpoints.ViewRoomsByBuildingID, "GET", self.toQuery("/viewRoomsByBuildingID", {"building_id": buildingId}))
+
+    def _buildBookRoom(self, rng: random.Random, user: TargetUser) -> LoadRequest:
+        room = rng.choice(self.targets.rooms)
+        startTime, endTime = self.randomTimeRange(rng)
+
+        return LoadRequest(Endpoints.BookRoom, "POST", "/bookRoom", user = user,
+                           jsonBody = {"user_id": user.userId,
+                                       "room_id": room.roomId,
+                                       "start_time": startTime.strftime(self.DateTimeFormat),
+                                       "end_time": endTime.strftime(self.DateTimeFormat),
+                                       "participants": rng.randint(1, max(1, min(room.capacity, 10)))})
+
+    def _buildCancelBooking(self, rng: random.Random, user: TargetUser) -> LoadRequest:
+        if (not self._bookings):
+            return self._buildBookRoom(rng, user)
+
+        bookingInd = rng.randrange(len(self._bookings))
+        self._bookings[bookingInd], self._bookings[-1] = self._bookings[-1], self._bookings[bookingInd]
+        bookingId, bookingUser = self._bookings.pop()
+
+        return LoadRequest(Endpoints.CancelBooking, "POST", "/cancelBooking", user = bookingUser,
+                           jsonBody = {"booking_id": bookingId, "user_id": bookingUser.userId})
+
+    def _buildGetFutureBookings(self, rng: random.Random, user: TargetUser) -> LoadRequest:
+        return LoadRequest(Endpoints.GetFutureBookings, "GET", self.toQuery("/getFutureBookings", {"userId": user.userId}), user = user)
+
+    def _buildGetBookingsAndCancellations(self, rng: random.Random, user: TargetUser) -> LoadRequest:
+        return LoadRequest(Endpoints.GetBookingsAndCancellations, "GET", self.toQuery("/getBookingsAndCancellations", {"userId": user.userId}), user = user)
+
+    def _buildGetDashboardMetrics(self, rng: random.Random, user: TargetUser) -> LoadRequest:
+        return LoadRequest(Endpoints.GetDashboardMetrics, "GET", self.toQuery("/getDashboardMetrics", {"userId": user.userId}), user = user)
+
+    def _buildGetBookingFrequency(self, rng: random.Random, user: TargetUser) -> LoadRequest:
+        return LoadRequest(Endpoints.GetBookingFrequency, "POST", "/getBookingFrequency", user = user,
+                           jsonBody = {"userId": user.userId, "queryLimit": rng.choice([None, 5, 10])})
+
+    def _buildLogin(self, rng: random.Random, user: TargetUser) -> LoadRequest:
+        return LoadRequest(Endpoints.Login, "POST", "/login", user = user,
+                           jsonBody = {"username": user.username, "password": user.password})
+
+    # nextRequest(rng): Builds the next request of a virtual user
+    def nextRequest(self, rng: random.Random) -> LoadRequest:
+        endpoint = rng.choices(self._endpoints, cum_weights = self._cumWeights)[0]
+        user = rng.choice(self.targets.users)
+        return self._builders[endpoint](rng, user)
+
+    # getFailure(request, status, result): Retrieves the reason the backend refused some request,
+    #   or None if the request succeeded. Remembers the bookings made by the load test
+    def getFailure(self, request: LoadRequest, status: int, result: Any) -> Optional[str]:
+        message = None
+
+        # the services report their failures as '[False, message]' or with a flag in the response
+        if (isinstance(result, list) and len(result) == 2 and result[0] is False):
+            message = result[1]
+        elif (isinstance(result, dict) and (result.get("success") is False or result.get("loginStatus") is False)):
+            message = result.get("message", result.get("errorMessage"))
+        elif (status >= 400):
+            message = f"HTTP {status}"
+
+        if (message is None and request.endpoint == Endpoints.BookRoom and isinstance(result, dict) and result.get("booking_id") is not None):
+            self._bookings.append((result["booking_id"], request.user))
+
+        if (message is None):
+            return None
+
+        return f"{message}" if (status < 400 or f"{message}".startswith("HTTP")) else f"HTTP {status}: {message}"
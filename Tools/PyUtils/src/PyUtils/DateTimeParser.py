@@ -0,0 +1,148 @@
+import numpy as np
+import pandas as pd
+from datetime import datetime
+from typing import Optional, List, Dict, Tuple
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+except ImportError:
+    pa = None
+
+
+# DateTimeParser: Converts strings to datetimes with the first format out of a list of formats that fits the string.
+#
+#   The format that fits is detected once for each shape of the strings (the string with all its digits replaced by '0') and then cached,
+#   so strings with the same shape (eg. every '2025-07-01T10:00' from the frontend) do not try all the formats again.
+#   Strings with the fixed width shape of an ISO format are parsed with 'datetime.fromisoformat' instead of 'strptime'.
+#
+#   Columns are parsed all at once with the format detected from their first string, instead of trying each format over the whole column.
+#   Columns of Arrow strings (eg. from 'pd.read_csv' with pyarrow installed) are parsed by Arrow and the other columns by 'pd.to_datetime'
+class DateTimeParser():
+    # formats whose fixed width strings are parsed the same by 'datetime.fromisoformat' and by 'strptime'
+    ISOFormats = {'%Y-%m-%d %H:%M:%S', '%Y-%m-%d %H:%M', '%Y-%m-%dT%H:%M', '%Y-%m-%dT%H:%M:%S'}
+
+    # the most number of shapes cached before the cache is emptied
+    MaxShapes = 1024
+
+    ShapeTable = str.maketrans("0123456789", "0000000000")
+
+    def __init__(self, formats: List[str]):
+        self.formats = list(formats)
+
+        # shape -> (format, whether strings of the shape can be parsed with the ISO fast path)
+        self._shapes: Dict[str, Tuple[str, bool]] = {}
+
+    # getShape(dateTimeStr): Retrieves the shape of some string
+    @classmethod
+    def getShape(cls, dateTimeStr: str) -> str:
+        return dateTimeStr.translate(cls.ShapeTable)
+
+    # _scanFormats(dateTimeStr, shape): Tries all the formats on some string and caches the first format that fits its shape
+    def _scanFormats(self, dateTimeStr: str, shape: str) -> Optional[datetime]:
+        for format in self.formats:
+            try:
+                result = datetime.strptime(dateTimeStr, format)
+            except ValueError:
+                continue
+
+            isISO = False
+            if (format in self.ISOFormats):
+                try:
+                    isISO = datetime.fromisoformat(dateTimeStr) == result
+                except ValueError:
+                    pass
+
+            # a string that no format fits is never cached, since other strings of the same shape may still be valid datetimes
+            if (len(self._shapes) >= self.MaxShapes):
+                self._shapes.clear()
+
+            self._shapes[shape] = (format, isISO)
+            return result
+
+        return None
+
+    # _detect(dateTimeStr): Retrieves the first format that fits some string and whether strings of its shape can be parsed with the ISO fast path
+    def _detect(self, dateTimeStr: str) -> Optional[Tuple[str, bool]]:
+        shape = self.getShape(dateTimeStr)
+        cached = self._shapes.get(shape)
+
+        if (cached is None and self._scanFormats(dateTimeStr, shape) is not None):
+            cached = self._shapes.get(shape)
+
+        return cached
+
+    # detectFormat(dateTimeStr): Retrieves the first format that fits some string
+    def detectFormat(self, dateTimeStr: str) -> Optional[str]:
+        detected = self._detect(dateTimeStr)
+        return None if (detected is None) else detected[0]
+
+    # parse(dateTimeStr): Converts a string to a datetime
+    def parse(self, dateTimeStr: str) -> datetime:
+        shape = self.getShape(dateTimeStr)
+        cached = self._shapes.get(shape)
+
+        if (cached is not None):
+            format, isISO = cached
+            try:
+                return datetime.fromisoformat(dateTimeStr) if (isISO) else datetime.strptime(dateTimeStr, format)
+            except ValueError:
+                pass
+
+        result = self._scanFormats(dateTimeStr, shape)
+        if (result is None):
+            raise ValueError(f"The following datetime string ({dateTimeStr}) cannot be converted using any of the following formats: {self.formats}")
+
+        return result
+
+    # _parseArrowColumn(column, format): Parses a column of Arrow strings with Arrow. Retrieves None if the column does not hold Arrow strings
+    #   or some string does not fit the format
+    @classmethod
+    def _parseArrowColumn(cls, column: pd.Series, format: str) -> Optional[np.ndarray]:
+        if (pa is None or not hasattr(column.array, "__arrow_array__")):
+            return None
+
+        try:
+            result = pc.strptime(pa.array(column.array), format = format, unit = "s")
+        except (pa.ArrowInvalid, pa.ArrowNotImplementedError, pa.ArrowTypeError):
+            return None
+
+        return result.to_numpy(zero_copy_only = False)
+
+    # parseColumn(column): Converts a column of strings to datetimes.
+    #   The column is left unchanged if it already holds datetimes or if no format fits all of its strings
+    def parseColumn(self, column: pd.Series) -> pd.Series:
+        if (pd.api.types.is_datetime64_any_dtype(column)):
+            return column
+
+        notNull = column.dropna() if (column.hasnans) else column
+        sample = notNull.iat[0] if (len(notNull) > 0) else None
+        formats = self.formats
+
+        if (isinstance(sample, str)):
+            detected = self._detect(sample)
+
+            # no format fits the first string, so no format fits the whole column
+            if (detected is None):
+                return column
+
+            # the formats before the detected format do not fit the first string, so they cannot fit the whole column
+            format = detected[0]
+            formats = self.formats[self.formats.index(format) + 1:]
+
+            result = self._parseArrowColumn(column, format)
+            if (result is not None):
+                return pd.Series(result, index = column.index, name = column.name)
+
+            try:
+                return pd.to_datetime(column, format = format, cache = True)
+            except ValueError:
+                pass
+
+        for format in formats:
+            try:
+                return pd.to_datetime(column, format = format, cache = True)
+            except ValueError:
+                continue
+
+        return column
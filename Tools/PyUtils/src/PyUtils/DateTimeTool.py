@@ -1,7 +1,8 @@
 from datetime import datetime
 from tzlocal import get_localzone
-from typing import Optional, List
+from typing import Optional, List, Dict, Tuple
 
+from .DateTimeParser import DateTimeParser
 
 # DateTimeTool: Utility class for datetime functions
 class DateTimeTool():
@@ -15,33 +16,38 @@ class DateTimeTool():
                   # Used by Javascript
                   '%Y-%m-%dT%H:%M',
                   '%Y-%m-%dT%H:%M:%S']
+
+    # formats -> the parser that caches the detected format of each shape of string for those formats
+    _parsers: Dict[Tuple[str, ...], DateTimeParser] = {}
     
     @classmethod
     def getLocalDateTime(cls, dateTime: datetime):
         tzinfo = get_localzone()
         return dateTime.replace(tzinfo = tzinfo)
 
-    # strToDateTime(dateTimeStr, formats, tzinfo, localize): Converts a string to a datetime
+    # getParser(formats): Retrieves the parser for some list of formats
     @classmethod
-    def strToDateTime(cls, dateTimeStr: str, formats: Optional[List[str]] = None, tzinfo: Optional[str] = None, localize: bool = False) -> datetime:
-        if (formats is None):
-            formats = cls.StrFormats
+    def getParser(cls, formats: Optional[List[str]] = None) -> DateTimeParser:
+        key = tuple(cls.StrFormats if (formats is None) else formats)
+        parser = cls._parsers.get(key)
+
+        if (parser is None):
+            parser = DateTimeParser(list(key))
+            cls._parsers[key] = parser
 
-        for format in formats:
-            result = None
-            try:
-                result = datetime.strptime(dateTimeStr, format)
-            except ValueError as e:
-                continue
+        return parser
 
-            if (localize):
-                result = cls.getLocalDateTime(result)
+    # strToDateTime(dateTimeStr, formats, tzinfo, localize): Converts a string to a datetime
+    @classmethod
+    def strToDateTime(cls, dateTimeStr: str, formats: Optional[List[str]] = None, tzinfo: Optional[str] = None, localize: bool = False) -> datetime:
+        result = cls.getParser(formats).parse(dateTimeStr)
 
-            if (tzinfo is None):
-                return result
-            elif (not localize):
-                return result.replace(tzinfo = tzinfo)
+        if (localize):
+            result = cls.getLocalDateTime(result)
 
-            return result.astimezone(tz = tzinfo)
+        if (tzinfo is None):
+            return result
+        elif (not localize):
+            return result.replace(tzinfo = tzinfo)
 
-        raise ValueError(f"The following datetime string ({dateTimeStr}) cannot be converted using any of the following formats: {formats}")
\ No newline at end of file
+        return result.astimezone(tz = tzinfo)
\ No newline at end of file
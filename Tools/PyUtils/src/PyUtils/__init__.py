@@ -1,24 +1,42 @@
 from .constants.ColNames import ColNames
 from .constants.DBNames import DBNames
 from .constants.DBFuncNames import DBFuncNames
+from .constants.DatasetFormats import DatasetFormats
 from .constants.FileEncodings import FileEncodings
 from .constants.FileExts import FileExts
 from .constants.GenericTypes import GenericTypes
 from .constants.Paths import Paths
 from .constants.TableNames import TableNames
+from .constants.StatementNames import StatementNames
 
 from .commands.BaseCommandBuilder import BaseCommandBuilder
 from .commands.CommandFormatter import CommandFormatter
 
 from .exceptions.AreYouSureError import AreYouSureError
 from .exceptions.TesterFailed import TesterFailed
+from .exceptions.PoolTimeout import PoolTimeout
+from .exceptions.PostgresLaunchError import PostgresLaunchError
 
+from .database.AsyncDBConnPool import AsyncDBConnPool
+from .database.AsyncDBTool import AsyncDBTool
 from .database.DBBuilder import DBBuilder
 from .database.DBCleaner import DBCleaner
 from .database.DBConnData import DBConnData
+from .database.DBConnPool import DBConnPool
+from .database.DBPartitioner import DBPartitioner
+from .database.DBPoolConfig import DBPoolConfig
 from .database.DBSecrets import DBSecrets
 from .database.DBTool import DBTool
+from .database.EphemeralPostgres import EphemeralPostgres
+from .database.QueryMonitor import QueryMonitor, QueryStats
+from .database.QueryRecord import QueryRecord
+from .database.SQLRegistry import SQLRegistry, SQLStatement
+from .database.SavepointConnection import SavepointConnection
+from .database.SharedConnPool import SharedConnPool
 
+from .network.AsyncHTTPClient import AsyncHTTPClient, HTTPResponse
+
+from .DateTimeParser import DateTimeParser
 from .DateTimeTool import DateTimeTool
 
 from .testing.BaseTestProgram import BaseTestProgram
@@ -26,10 +44,11 @@ from .testing.BaseTestProgram import BaseTestProgram
 from .enums.StrEnum import StrEnum
 
 
-__all__ = ["ColNames", "DBNames", "DBFuncNames", "FileEncodings", "FileExts", "GenericTypes", "Paths", "TableNames",
+__all__ = ["ColNames", "DBNames", "DBFuncNames", "DatasetFormats", "FileEncodings", "FileExts", "GenericTypes", "Paths", "TableNames", "StatementNames",
            "BaseCommandBuilder", "CommandFormatter",
-           "AreYouSureError", "TesterFailed",
-           "DBBuilder", "DBCleaner", "DBConnData", "DBSecrets", "DBTool",
-           "DateTimeTool",
+           "AreYouSureError", "TesterFailed", "PoolTimeout", "PostgresLaunchError",
+           "AsyncDBConnPool", "AsyncDBTool", "DBBuilder", "DBCleaner", "DBConnData", "DBConnPool", "DBPartitioner", "DBPoolConfig", "DBSecrets", "DBTool", "EphemeralPostgres", "QueryMonitor", "QueryStats", "QueryRecord", "SQLRegistry", "SQLStatement", "SavepointConnection", "SharedConnPool",
+           "AsyncHTTPClient", "HTTPResponse",
+           "DateTimeParser", "DateTimeTool",
            "BaseTestProgram",
            "StrEnum"]
\ No newline at end of file
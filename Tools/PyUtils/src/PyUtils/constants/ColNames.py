@@ -4,6 +4,8 @@ from enum import Enum
 class ColNames(Enum):
     UserId = "userID"
     UserIdExists = "userID_exists"
+    UserName = "username"
+    UserPassword = "password"
     BuildingId = "buildingID"
     BuildingName = "buildingName"
     BuildingAddressLine1 = "addressLine1"
@@ -15,8 +17,11 @@ class ColNames(Enum):
     BuildingIdExists = "buildingID_exists"
     RoomId = "roomID"
     RoomIdExists = "roomID_exists"
+    RoomName = "roomName"
+    RoomCapacity = "capacity"
     BookingId = "bookingID"
     BookingTime = "bookDateTime"
     BookingStartTime = "bookStartDateTime"
     BookingEndTime = "bookEndDateTime"
+    BookingIsCancelled = "isCancelled"
     BookingIdExists = "bookingID_exists"
\ No newline at end of file
@@ -5,4 +5,5 @@ class DBFuncNames(Enum):
     CheckBookingParticipants = "checkBookingParticipants"
     CheckCancellationDateTime = "checkCancellationDateTime"
     CheckBookingUserOverlap = "checkBookingUserOverlap"
-    CheckAdminOnly = "checkAdminOnly"
\ No newline at end of file
+    CheckAdminOnly = "checkAdminOnly"
+    SyncBookingCancelled = "syncBookingCancelled"
\ No newline at end of file
@@ -5,6 +5,7 @@ class DBNames(Enum):
     Toy = "toy"
     Dev = "development"
     Prod = "production"
+    XL = "xl"
 
     Default = "postgres"
 
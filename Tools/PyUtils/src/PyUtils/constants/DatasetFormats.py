@@ -0,0 +1,25 @@
+from enum import Enum
+from typing import Optional
+
+
+# DatasetFormats: The file formats the tables of a dataset can be stored in
+class DatasetFormats(Enum):
+    CSV = "csv"
+    CSVZstd = "csv.zst"
+    Parquet = "parquet"
+    Arrow = "arrow"
+
+    # ext: The file extension of the format
+    @property
+    def ext(self) -> str:
+        return f".{self.value}"
+
+    # find(name): Retrieves the format with the given name
+    @classmethod
+    def find(cls, name: str) -> Optional["DatasetFormats"]:
+        name = name.lower().lstrip(".")
+        for format in cls:
+            if (format.value == name):
+                return format
+
+        return None
@@ -4,4 +4,5 @@ from enum import Enum
 class FileExts(Enum):
     In = ".in"
     Out = ".out"
-    Args = ".args"
\ No newline at end of file
+    Args = ".args"
+    Plan = ".plan"
\ No newline at end of file
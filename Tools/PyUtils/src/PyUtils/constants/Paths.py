@@ -12,6 +12,7 @@ class Paths(Enum):
     ToyDatasetFolder = os.path.abspath(os.path.join(DataFolder, "Toy Dataset"))
     SampleDatasetFolder = os.path.abspath(os.path.join(DataFolder, "Sample Dataset"))
     ProdDatasetFolder = os.path.abspath(os.path.join(DataFolder, "Production Dataset"))
+    XLDatasetFolder = os.path.abspath(os.path.join(DataFolder, "XL Dataset"))
 
     SQLQueriesFolder = os.path.abspath(os.path.join(ProjectFolder, "SQL Queries"))
     SQLTableCreationFolder = os.path.abspath(os.path.join(SQLQueriesFolder, "Table Creation"))
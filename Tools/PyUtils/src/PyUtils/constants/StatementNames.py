@@ -0,0 +1,23 @@
+from enum import Enum
+
+
+class StatementNames(Enum):
+    GetBuildings = "GetBuildings"
+    GetRoomsByBuildingID = "GetRoomsByBuildingID"
+    R6 = "R6"
+    ActiveBookings = "ActiveBookings"
+    R7 = "R7"
+    R8i = "R8i"
+    R8ii = "R8ii"
+    R9 = "R9"
+    R10a = "R10a"
+    R10b = "R10b"
+    AF1 = "AF1"
+    AF1Limited = "AF1Limited"
+    AF2 = "AF2"
+    AF3AddRoom = "AF3AddRoom"
+    AF3EditRoom = "AF3EditRoom"
+    AF3DeleteRoom = "AF3DeleteRoom"
+    AF4AdminLog = "AF4AdminLog"
+    AF5a = "AF5a"
+    AF5b = "AF5b"
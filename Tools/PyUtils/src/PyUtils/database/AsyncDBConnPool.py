@@ -0,0 +1,310 @@
+import time
+import asyncio
+import logging
+import collections
+import psycopg2
+import psycopg2.extensions
+from psycopg2.extensions import connection
+from psycopg2.pool import PoolError
+from typing import Optional, Dict, Any, List, Deque
+
+from ..exceptions.PoolTimeout import PoolTimeout
+
+
+Logger = logging.getLogger(__name__)
+
+
+# AsyncDBConnPool: Connection pool for asyncio that makes callers wait for a free connection,
+#   with the same settings and stats as DBConnPool.
+#
+#   The connections are psycopg2 connections in asynchronous mode, so they never block the event loop.
+#   Asynchronous connections are always in autocommit mode
+class AsyncDBConnPool():
+    # number of the most recent acquire latencies kept for the latency percentiles
+    LatencyWindow = 1024
+
+    def __init__(self, minConn: int, maxConn: int, maxWaiting: Optional[int] = None, acquireTimeout: float = 30,
+                 maxAge: Optional[float] = None, prePing: bool = False, **connKwargs):
+        self.minconn = int(minConn)
+        self.maxconn = int(maxConn)
+        self.maxWaiting = maxWaiting
+        self.acquireTimeout = acquireTimeout
+        self.maxAge = maxAge
+        self.prePing = prePing
+        self.closed = False
+
+        self._connKwargs = connKwargs
+        self._cond: Optional[asyncio.Condition] = None
+        self._pool: List[connection] = []
+        self._used = 0
+        self._pending = 0
+        self._waiting = 0
+        self._createdAt: Dict[int, float] = {}
+
+        self._acquires = 0
+        self._timeouts = 0
+        self._rejected = 0
+        self._recycled = 0
+        self._latencies: Deque[float] = collections.deque(maxlen = self.LatencyWindow)
+        self._maxLatency = 0.0
+
+    # wait(conn): Waits until some asynchronous connection finished its current operation, without blocking the event loop
+    @classmethod
+    async def wait(cls, conn: connection):
+        loop = asyncio.get_running_loop()
+
+        while (True):
+            state = conn.poll()
+            if (state == psycopg2.extensions.POLL_OK):
+                return
+
+            fileno = conn.fileno()
+            ready = loop.create_future()
+            onReady = lambda: ready.done() or ready.set_result(None)
+
+            if (state == psycopg2.extensions.POLL_READ):
+                loop.add_reader(fileno, onReady)
+                removeWatch = loop.remove_reader
+            elif (state == psycopg2.extensions.POLL_WRITE):
+                loop.add_writer(fileno, onReady)
+                removeWatch = loop.remove_writer
+            else:
+                raise psycopg2.OperationalError(f"bad state from poll: {state}")
+
+            try:
+                await ready
+            finally:
+                removeWatch(fileno)
+
+    # _getCond(): Retrieves the condition the callers wait on. Created lazily, so the pool belongs to the event loop that first uses it
+    def _getCond(self) -> asyncio.Condition:
+        if (self._cond is None):
+            self._cond = asyncio.Condition()
+
+        return self._cond
+
+    # _total(): The number of connections that are idle, in use or being opened/checked
+    def _total(self) -> int:
+        return len(self._pool) + self._used + self._pending
+
+    # _newConn(): Opens a new connection to the database
+    async def _newConn(self) -> connection:
+        conn = psycopg2.connect(async_ = 1, **self._connKwargs)
+
+        try:
+            await self.wait(conn)
+        except BaseException:
+            conn.close()
+            raise
+
+        self._createdAt[id(conn)] = time.monotonic()
+        return conn
+
+    # _discard(conn): Closes some connection that will not be used anymore
+    def _discard(self, conn: connection):
+        self._createdAt.pop(id(conn), None)
+
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    # _isExpired(conn): Whether some connection has been opened for too long
+    def _isExpired(self, conn: connection) -> bool:
+        if (self.maxAge is None):
+            return False
+
+        createdAt = self._createdAt.get(id(conn))
+        return createdAt is not None and time.monotonic() - createdAt >= self.maxAge
+
+    # _isUsable(conn): Whether some idle connection can still be handed out
+    async def _isUsable(self, conn: connection) -> bool:
+        if (conn.closed != 0 or self._isExpired(conn)):
+            return False
+
+        if (not self.prePing):
+            return True
+
+        try:
+            cursor = conn.cursor()
+            cursor.execute("SELECT 1")
+            await self.wait(conn)
+            cursor.close()
+        except psycopg2.Error:
+            return False
+
+        return True
+
+    # fill(): Opens enough connections to have at least the minimum number of connections
+    async def fill(self):
+        cond = self._getCond()
+
+        while (True):
+            async with cond:
+                if (self.closed or self._total() >= min(self.minconn, self.maxconn)):
+                    return
+                self._pending += 1
+
+            try:
+                conn = await self._newConn()
+            except BaseException:
+                async with cond:
+                    self._pending -= 1
+                    cond.notify()
+                raise
+
+            async with cond:
+                self._pending -= 1
+                self._pool.append(conn)
+                cond.notify()
+
+    # _reserve(deadline): Waits until either an idle connection or room for a new connection is available
+    async def _reserve(self, deadline: float) -> Optional[connection]:
+        cond = self._getCond()
+
+        while (True):
+            if (self.closed):
+                raise PoolError("connection pool is closed")
+
+            if (self._pool):
+                self._pending += 1
+                return self._pool.pop()
+
+            if (self._total() < self.maxconn):
+                self._pending += 1
+                return None
+
+            if (self.maxWaiting is not None and self._waiting >= self.maxWaiting):
+                self._rejected += 1
+                raise PoolTimeout(f"connection pool exhausted: {self._waiting} callers are already waiting for a connection")
+
+            remaining = deadline - time.monotonic()
+            if (remaining <= 0):
+                self._timeouts += 1
+                raise PoolTimeout(f"timed out after {self.acquireTimeout}s waiting for a connection from the pool")
+
+            self._waiting += 1
+            try:
+                await asyncio.wait_for(cond.wait(), remaining)
+            except asyncio.TimeoutError:
+                pass
+            finally:
+                self._waiting -= 1
+
+    # getconn(): Retrieves a free connection from the pool
+    async def getconn(self) -> connection:
+        cond = self._getCond()
+        startTime = time.monotonic()
+        deadline = startTime + self.acquireTimeout
+
+        async with cond:
+            conn = await self._reserve(deadline)
+
+        # check or open the connection outside the lock, so other callers are not held up by the network
+        try:
+            if (conn is not None and not await self._isUsable(conn)):
+                self._discard(conn)
+                conn = None
+                self._recycled += 1
+
+            if (conn is None):
+                conn = await self._newConn()
+        except BaseException:
+            async with cond:
+                self._pending -= 1
+                cond.notify()
+            raise
+
+        latency = time.monotonic() - startTime
+        async with cond:
+            self._pending -= 1
+            self._used += 1
+
+            self._acquires += 1
+            self._latencies.append(latency)
+            self._maxLatency = max(self._maxLatency, latency)
+
+        return conn
+
+    # putconn(conn, close): Puts back a connection retrieved by 'getconn'
+    async def putconn(self, conn: connection, close: bool = False):
+        cond = self._getCond()
+
+        # a connection still running a query (eg. the caller got cancelled) or stuck in a transaction cannot be reused
+        keep = (not close and not self.closed and conn.closed == 0 and not self._isExpired(conn) and not conn.isexecuting() and
+                conn.info.transaction_status == psycopg2.extensions.TRANSACTION_STATUS_IDLE)
+
+        async with cond:
+            self._used -= 1
+            keep = keep and self._total() < self.maxconn
+
+            if (keep):
+                self._pool.append(conn)
+
+            cond.notify()
+
+        if (not keep):
+            self._discard(conn)
+            await self._refill()
+
+    # _refill(): Tops the pool back up to its minimum number of connections after a connection got discarded,
+    #   without replacing the error of a caller that puts back its connection in a 'finally'
+    async def _refill(self):
+        try:
+            await self.fill()
+        except Exception as e:
+            Logger.warning(f"Unable to refill the connection pool: {e}")
+
+    # closeall(): Closes all the idle connections. The connections in use are closed once they are put back
+    def closeall(self):
+        if (self.closed):
+            raise PoolError("connection pool is closed")
+
+        conns = self._pool
+        self._pool = []
+        self.closed = True
+
+        for conn in conns:
+            self._discard(conn)
+
+    # resize(minConn, maxConn): Changes the number of connections the pool keeps open and can open
+    async def resize(self, minConn: Optional[int] = None, maxConn: Optional[int] = None):
+        cond = self._getCond()
+        extraConns = []
+
+        async with cond:
+            if (minConn is not None):
+                self.minconn = int(minConn)
+
+            if (maxConn is not None):
+                self.maxconn = int(maxConn)
+
+            # connections in use are closed once they are put back
+            while (self._pool and self._total() > self.maxconn):
+                extraConns.append(self._pool.pop(0))
+
+            cond.notify_all()
+
+        for conn in extraConns:
+            self._discard(conn)
+
+        await self.fill()
+
+    # stats(): Retrieves the live gauges and counters of the pool
+    def stats(self) -> Dict[str, Any]:
+        latencies = sorted(self._latencies)
+        latencyCount = len(latencies)
+
+        return {"inUse": self._used,
+                "idle": len(self._pool),
+                "waiting": self._waiting,
+                "pending": self._pending,
+                "minConn": self.minconn,
+                "maxConn": self.maxconn,
+                "acquires": self._acquires,
+                "timeouts": self._timeouts,
+                "rejected": self._rejected,
+                "recycled": self._recycled,
+                "acquireLatencyAvg": sum(latencies) / latencyCount if (latencyCount > 0) else 0.0,
+                "acquireLatencyP95": latencies[int(0.95 * (latencyCount - 1))] if (latencyCount > 0) else 0.0,
+                "acquireLatencyMax": self._maxLatency}
@@ -0,0 +1,246 @@
+import time
+import psycopg2
+import psycopg2.sql
+import psycopg2.errors
+import psycopg2.extensions
+from psycopg2.extensions import connection
+from contextlib import asynccontextmanager
+from typing import Union, Optional, List, Any, Dict, Tuple, Callable, AsyncIterator
+
+from ..constants.DBNames import DBNames
+from ..constants.StatementNames import StatementNames
+from .AsyncDBConnPool import AsyncDBConnPool
+from .DBSecrets import DBSecrets
+from .DBPoolConfig import DBPoolConfig
+from .DBTool import DBTool
+from .QueryRecord import QueryRecord
+from .SQLRegistry import SQLRegistry, SQLStatement
+
+
+# AsyncDBTool: The asyncio counterpart of DBTool for running the SQL queries of the app without blocking the event loop.
+#   Runs on psycopg2 connections in asynchronous mode, taken from an AsyncDBConnPool.
+#
+#   Asynchronous connections are always in autocommit mode, so each query commits by itself
+#   unless it is ran inside of 'transaction()'
+class AsyncDBTool():
+    def __init__(self, secrets: DBSecrets, database: str = DBNames.Toy.value, sqlRegistry: Optional[SQLRegistry] = None,
+                 poolConfig: Optional[DBPoolConfig] = None):
+        self._secrets = secrets
+        self._database = database
+        self._sqlRegistry = sqlRegistry
+        self._poolConfig = poolConfig if (poolConfig is not None) else DBPoolConfig()
+        self._executeListeners: List[Callable[[QueryRecord], None]] = []
+        self.connPool = self.createConnPool()
+
+    @property
+    def database(self) -> str:
+        return self._database
+
+    @property
+    def sqlRegistry(self) -> SQLRegistry:
+        if (self._sqlRegistry is None):
+            self._sqlRegistry = SQLRegistry.getDefault()
+
+        return self._sqlRegistry
+
+    @property
+    def poolConfig(self) -> DBPoolConfig:
+        return self._poolConfig
+
+    # addExecuteListener(listener): Adds a function that gets called with the record of every SQL query ran by 'executeSQL'
+    def addExecuteListener(self, listener: Callable[[QueryRecord], None]):
+        self._executeListeners.append(listener)
+
+    # removeExecuteListener(listener): Removes a function added by 'addExecuteListener'
+    def removeExecuteListener(self, listener: Callable[[QueryRecord], None]):
+        if (listener in self._executeListeners):
+            self._executeListeners.remove(listener)
+
+    # _notifyExecute(record): Tells all the listeners about a SQL query that finished running
+    def _notifyExecute(self, record: QueryRecord):
+        for listener in self._executeListeners:
+            listener(record)
+
+    # createConnPool(): Creates a connection pool with the sizes in the pool config of this object
+    def createConnPool(self) -> AsyncDBConnPool:
+        return AsyncDBConnPool(self._poolConfig.minConn, self._poolConfig.maxConn, maxWaiting = self._poolConfig.maxWaiting,
+                               acquireTimeout = self._poolConfig.acquireTimeout, maxAge = self._poolConfig.maxAge,
+                               prePing = self._poolConfig.prePing, database = self.database, user = self._secrets.username,
+                               password = self._secrets.password, host = self._secrets.host, port = self._secrets.port)
+
+    # open(): Opens the minimum number of connections of the pool. Needs to be called from the event loop that will run the queries
+    async def open(self):
+        await self.connPool.fill()
+
+    # close(): Closes the connection pool
+    def close(self):
+        if (not self.connPool.closed):
+            self.connPool.closeall()
+
+    # resizeConnPool(poolConfig): Applies new pool settings to the existing connection pool without closing it
+    async def resizeConnPool(self, poolConfig: DBPoolConfig):
+        self._poolConfig = poolConfig
+
+        self.connPool.maxWaiting = poolConfig.maxWaiting
+        self.connPool.acquireTimeout = poolConfig.acquireTimeout
+        self.connPool.maxAge = poolConfig.maxAge
+        self.connPool.prePing = poolConfig.prePing
+        await self.connPool.resize(minConn = poolConfig.minConn, maxConn = poolConfig.maxConn)
+
+    # getPoolStats(): Retrieves the live gauges of the connection pool
+    def getPoolStats(self) -> Dict[str, Dict[str, Any]]:
+        if (self.connPool.closed):
+            return {}
+
+        return {self.database: self.connPool.stats()}
+
+    # getConn(): Retrieves a connection from the connection pool
+    async def getConn(self) -> connection:
+        return await self.connPool.getconn()
+
+    # putConn(conn): Puts a connection back into the connection pool
+    async def putConn(self, conn: connection):
+        await self.connPool.putconn(conn)
+
+    # connection(): Holds on to a single connection from the pool for running several queries
+    @asynccontextmanager
+    async def connection(self) -> AsyncIterator[connection]:
+        conn = await self.getConn()
+        try:
+            yield conn
+        finally:
+            await self.putConn(conn)
+
+    # transaction(): Runs all the queries given the yielded connection inside of a single transaction.
+    #   The transaction is committed at the end, or rolled back if an exception is raised
+    @asynccontextmanager
+    async def transaction(self) -> AsyncIterator[connection]:
+        async with self.connection() as conn:
+            await self.executeSQL("BEGIN", conn = conn)
+
+            try:
+                yield conn
+            except BaseException:
+                if (conn.closed == 0 and not conn.isexecuting()):
+                    await self.executeSQL("ROLLBACK", conn = conn, raiseException = False)
+                raise
+
+            await self.executeSQL("COMMIT", conn = conn)
+
+    # executeSQL(sql, vars, conn, raiseException, castUUIDs, statement): Execute some SQL query.
+    #   The query runs on a connection from the pool if no connection is given.
+    #   The rows of the query are kept in the returned cursor, so the cursor can still be read after the connection is put back.
+    #   'statement' is the registered statement that the SQL runs, if any
+    async def executeSQL(self, sql: Union[str, psycopg2.sql.Composable], vars: Optional[Union[List[Any], Dict[str, Any]]] = None,
+                         conn: Optional[connection] = None, raiseException: bool = True, castUUIDs: bool = False,
+                         statement: Optional[SQLStatement] = None) -> Tuple[Optional[psycopg2.extensions.cursor], Optional[Exception]]:
+        if (conn is None):
+            async with self.connection() as conn:
+                return await self.executeSQL(sql, vars = vars, conn = conn, raiseException = raiseException, castUUIDs = castUUIDs,
+                                             statement = statement)
+
+        cursor = None
+        error = None
+        startTime = time.perf_counter()
+
+        try:
+            cursor = conn.cursor()
+            if (castUUIDs):
+                psycopg2.extensions.register_type(DBTool.UUIDType, cursor)
+
+            cursor.execute(sql, vars = vars)
+            await AsyncDBConnPool.wait(conn)
+        except Exception as e:
+            error = e
+        finally:
+            if (self._executeListeners):
+                duration = time.perf_counter() - startTime
+                sqlText = sql if (isinstance(sql, str)) else sql.as_string(conn)
+                rowCount = -1 if (cursor is None or error is not None) else cursor.rowcount
+                self._notifyExecute(QueryRecord(sqlText, vars = vars, duration = duration, rowCount = rowCount, error = error,
+                                                statement = statement, database = self.database))
+
+        if (error is not None and raiseException):
+            raise error
+
+        return (cursor, error)
+
+    # _prepare(conn, statement): Prepares a statement on some connection, if it has not been prepared already.
+    #   An older version of the statement on the connection gets deallocated first
+    async def _prepare(self, conn: connection, statement: SQLStatement):
+        if (self.sqlRegistry.isPrepared(conn, statement)):
+            return
+
+        cursor = conn.cursor()
+        if (self.sqlRegistry.isStale(conn, statement)):
+            cursor.execute(statement.deallocateSQL)
+            await AsyncDBConnPool.wait(conn)
+            self.sqlRegistry.markDeallocated(conn, statement)
+
+        cursor.execute(statement.prepareSQL)
+        await AsyncDBConnPool.wait(conn)
+        cursor.close()
+
+        self.sqlRegistry.markPrepared(conn, statement)
+
+    # executeStatement(name, vars, conn, raiseException, castUUIDs): Execute some statement registered in the SQL registry.
+    #   The connections from the pool will have the statement prepared on them, so the statement is only planned once per connection
+    async def executeStatement(self, name: Union[str, StatementNames], vars: Optional[Dict[str, Any]] = None, conn: Optional[connection] = None,
+                               raiseException: bool = True, castUUIDs: bool = False) -> Tuple[Optional[psycopg2.extensions.cursor], Optional[Exception]]:
+        statement = self.sqlRegistry.get(name)
+        self.sqlRegistry.recordHit(statement)
+
+        # the filters skipped on NULL parameters are only planned with the parameters that are given
+        statement = self.sqlRegistry.getVariant(statement, vars)
+
+        if (conn is None):
+            async with self.connection() as conn:
+                return await self._executeStatement(statement, vars, conn, raiseException, castUUIDs)
+
+        return await self._executeStatement(statement, vars, conn, raiseException, castUUIDs)
+
+    # _executeStatement(statement, vars, conn, raiseException, castUUIDs): Prepares and executes some registered statement on some connection
+    async def _executeStatement(self, statement: SQLStatement, vars: Optional[Dict[str, Any]], conn: connection,
+                                raiseException: bool, castUUIDs: bool) -> Tuple[Optional[psycopg2.extensions.cursor], Optional[Exception]]:
+        values = statement.toValues(vars)
+        inTransaction = conn.info.transaction_status != psycopg2.extensions.TRANSACTION_STATUS_IDLE
+
+        try:
+            await self._prepare(conn, statement)
+        except psycopg2.Error as e:
+            self.sqlRegistry.forget(conn)
+            if (raiseException):
+                raise e
+            return (None, e)
+
+        result = await self.executeSQL(statement.executeSQL, vars = values, conn = conn, raiseException = False, castUUIDs = castUUIDs,
+                                       statement = statement)
+        error = result[1]
+
+        # the session lost its prepared statements (eg. the server reset the session), so prepare again
+        if (isinstance(error, psycopg2.errors.InvalidSqlStatementName) and not inTransaction):
+            self.sqlRegistry.forget(conn)
+            await self._prepare(conn, statement)
+            result = await self.executeSQL(statement.executeSQL, vars = values, conn = conn, raiseException = False, castUUIDs = castUUIDs,
+                                           statement = statement)
+            error = result[1]
+
+        if (error is not None and raiseException):
+            raise error
+
+        return result
+
+    # fetchRecords(name, vars, conn): Runs some statement registered in the SQL registry and retrieves
+    #   its resulting rows as records
+    async def fetchRecords(self, name: Union[str, StatementNames], vars: Optional[Dict[str, Any]] = None,
+                           conn: Optional[connection] = None) -> List[Dict[str, Any]]:
+        statement = self.sqlRegistry.get(name)
+        cursor, error = await self.executeStatement(statement.name, vars = vars, conn = conn, castUUIDs = True)
+
+        # the columns of a statement do not change, so only look them up once
+        columns = statement.columns
+        if (columns is None):
+            columns = tuple(map(lambda column: column.name, cursor.description))
+            statement.columns = columns
+
+        return DBTool.toRecords(columns, cursor.fetchall())
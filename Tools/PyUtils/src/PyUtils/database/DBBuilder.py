@@ -9,6 +9,7 @@ from ..constants.DBFuncNames import DBFuncNames
 from ..constants.Paths import Paths
 from .DBTool import DBTool
 from .DBConnData import DBConnData
+from .DBPartitioner import DBPartitioner
 
 
 # DBBuilder: Class to build tables and databases
@@ -21,11 +22,14 @@ class DBBuilder():
                        "AdminAddLogTable": Identifier(TableNames.AdminAddLog.value),
                        "AdminEditLogTable": Identifier(TableNames.AdminEditLog.value),
                        "AdminDeleteLogTable": Identifier(TableNames.AdminDeleteLog.value),
+                       "BookingDefaultPartition": Identifier(DBPartitioner.defaultPartitionName(TableNames.Booking.value)),
+                       "CancellationDefaultPartition": Identifier(DBPartitioner.defaultPartitionName(TableNames.Cancellation.value)),
                         
                        "BookingParticipantsCheckFunc": Identifier(DBFuncNames.CheckBookingParticipants.value),
                        "CancellationDateTimeCheckFunc": Identifier(DBFuncNames.CheckCancellationDateTime.value),
                        "BookingUserOverlapCheckFunc": Identifier(DBFuncNames.CheckBookingUserOverlap.value),
-                       "AdminOnlyFunc": Identifier(DBFuncNames.CheckAdminOnly.value)}
+                       "AdminOnlyFunc": Identifier(DBFuncNames.CheckAdminOnly.value),
+                       "BookingCancelledSyncFunc": Identifier(DBFuncNames.SyncBookingCancelled.value)}
 
     def __init__(self, dbTool: DBTool):
         self._dbTool = dbTool
@@ -115,6 +119,11 @@ class DBBuilder():
         checkCancelDateTriggerFile = os.path.join(Paths.SQLTriggerCreationFolder.value, "validCancellation.sql")
         self._buildTriggerFromFile(checkCancelDateTriggerFile, identifiers = self.NameIdentifiers, connData = connData, closeConn = closeConn)
 
+    # buildSyncBookingCancelledTrigger(connData): Build the trigger for marking the bookings that got cancelled
+    def buildSyncBookingCancelledTrigger(self, connData: Optional[DBConnData] = None, closeConn: bool = True):
+        sqlFile = os.path.join(Paths.SQLTriggerCreationFolder.value, "syncBookingCancelled.sql")
+        self._buildTriggerFromFile(sqlFile, identifiers = self.NameIdentifiers, connData = connData, closeConn = closeConn)
+
     # buildAdminOnlyTriggerFunc(connData): Build the trigger function to check whether 
     def buildAdminOnlyTriggerFunc(self, connData: Optional[DBConnData] = None, closeConn: bool = True):
         sqlFile = os.path.join(Paths.SQLTriggerCreationFolder.value, "adminOnly.sql")
@@ -135,6 +144,16 @@ class DBBuilder():
         sqlFile = os.path.join(Paths.SQLTriggerCreationFolder.value, "adminOnlyInsert.sql")
         self._buildTriggerFromFile(sqlFile, identifiers = self.NameIdentifiers, connData = connData, closeConn = closeConn)
 
+    # ============================================================
+    # ================= Constraints ==============================
+
+    # buildBookingExclusion(connData, closeConn): Build the constraint that stops 2 active bookings of the same room from overlapping
+    def buildBookingExclusion(self, connData: Optional[DBConnData] = None, closeConn: bool = True):
+        sqlFile = os.path.join(Paths.SQLTableCreationFolder.value, "BookingExclusion.sql")
+        sql = self._dbTool.readSQLFile(sqlFile)
+        sql = SQL(sql).format(**self.NameIdentifiers)
+        self._dbTool.executeSQL(sql, commit = True, connData = connData, closeConn = closeConn)
+
     # ============================================================
     # ================= Views ====================================
 
@@ -162,18 +181,29 @@ class DBBuilder():
         sqlFile = os.path.join(Paths.SQLTableCreationFolder.value, "CreateRoom.sql")
         self._buildTableFromFile(TableNames.Room.value, sqlFile, identifiers = self.NameIdentifiers, installExtensions = installExtensions)
 
-    # buildBookingTable(installExtensions): Builds the table for the bookings
-    def buildBookingTable(self, installExtensions: bool = True, withTriggers: bool = True):
-        sqlFile = os.path.join(Paths.SQLTableCreationFolder.value, "CreateBooking.sql")
-        connData, cursor = self._buildTableFromFile(TableNames.Room.value, sqlFile, identifiers = self.NameIdentifiers, installExtensions = installExtensions, closeConn = not withTriggers)
+    # buildBookingTable(installExtensions, withTriggers, withExclusion, partitioned): Builds the table for the bookings.
+    #   'withExclusion' makes the database reject overlapping bookings of the same room with an exclusion constraint (needs the btree_gist extension)
+    #   'partitioned' splits the table into monthly partitions on the start time of the bookings
+    def buildBookingTable(self, installExtensions: bool = True, withTriggers: bool = True, withExclusion: bool = False, partitioned: bool = False):
+        if (withExclusion and partitioned):
+            raise ValueError("The exclusion constraint against overlapping bookings cannot be built on the partitioned bookings table")
+
+        sqlFile = os.path.join(Paths.SQLTableCreationFolder.value, "CreatePartitionedBooking.sql" if (partitioned) else "CreateBooking.sql")
+        connData, cursor = self._buildTableFromFile(TableNames.Room.value, sqlFile, identifiers = self.NameIdentifiers, installExtensions = installExtensions, closeConn = not (withTriggers or withExclusion))
+
+        if (withExclusion):
+            self.buildBookingExclusion(connData = connData, closeConn = not withTriggers)
 
         if (withTriggers):
             self.buildCheckParticipantTrigger(connData = connData)
 
-    # buildCancellationTable(installExtensions, withTriggers): Builds the table for the cancellations
-    def buildCancellationTable(self, installExtensions: bool = True, withTriggers: bool = True):
-        sqlFile = os.path.join(Paths.SQLTableCreationFolder.value, "CreateCancellation.sql")
-        connData, cursor = self._buildTableFromFile(TableNames.Room.value, sqlFile, identifiers = self.NameIdentifiers, installExtensions = installExtensions, closeConn = not withTriggers)
+    # buildCancellationTable(installExtensions, withTriggers, partitioned): Builds the table for the cancellations.
+    #   The "isCancelled" column of the bookings is always kept in sync with the cancellations.
+    #   'partitioned' splits the table into monthly partitions on the start time of the cancelled bookings (needs the partitioned bookings table)
+    def buildCancellationTable(self, installExtensions: bool = True, withTriggers: bool = True, partitioned: bool = False):
+        sqlFile = os.path.join(Paths.SQLTableCreationFolder.value, "CreatePartitionedCancellation.sql" if (partitioned) else "CreateCancellation.sql")
+        connData, cursor = self._buildTableFromFile(TableNames.Room.value, sqlFile, identifiers = self.NameIdentifiers, installExtensions = installExtensions, closeConn = False)
+        self.buildSyncBookingCancelledTrigger(connData = connData, closeConn = not withTriggers)
 
         if (withTriggers):
             self.buildValidCancellationTrigger(connData = connData)
@@ -211,13 +241,13 @@ class DBBuilder():
         if (withTriggers):
             self.buildAdminOnlyDeleteTrigger(connData = connData)
 
-    # buildTables(): Builds all the necessary tables
-    def buildTables(self, withTriggers: bool = True):
+    # buildTables(withTriggers, withBookingExclusion, partitioned): Builds all the necessary tables
+    def buildTables(self, withTriggers: bool = True, withBookingExclusion: bool = False, partitioned: bool = False):
         self.buildUserTable()
         self.buildBuildingTable(installExtensions = False)
         self.buildRoomTable(installExtensions = False)
-        self.buildBookingTable(installExtensions = False, withTriggers = withTriggers)
-        self.buildCancellationTable(installExtensions = False, withTriggers = withTriggers)
+        self.buildBookingTable(installExtensions = False, withTriggers = withTriggers, withExclusion = withBookingExclusion, partitioned = partitioned)
+        self.buildCancellationTable(installExtensions = False, withTriggers = withTriggers, partitioned = partitioned)
 
         self.buildAdminAddLogTable(installExtensions = False, withTriggers = withTriggers, withTriggerFunc = withTriggers)
         self.buildAdminEditLogTable(installExtensions = False, withTriggers = withTriggers, withTriggerFunc = False)
@@ -233,18 +263,22 @@ class DBBuilder():
         connData = self._dbTool.getConn()
         self.buildCheckParticipantTrigger(connData = connData, closeConn = False)
         self.buildValidCancellationTrigger(connData = connData, closeConn = False)
+        self.buildSyncBookingCancelledTrigger(connData = connData, closeConn = False)
         self.buildAdminOnlyTriggerFunc(connData = connData, closeConn = False)
         self.buildAdminOnlyDeleteTrigger(connData = connData, closeConn = False)
         self.buildAdminOnlyEditTrigger(connData = connData, closeConn = False)
         self.buildAdminOnlyInsertTrigger(connData = connData)
 
-    # buildDB(database): Creates a database
-    def buildDB(self, database: Optional[str] = None):
+    # buildDB(database, template): Creates a database. Given a template, the database is created as a copy of the template database,
+    #   which needs to have no other connections open to it
+    def buildDB(self, database: Optional[str] = None, template: Optional[str] = None):
         if (database is None):
             database = self._dbTool.database
 
-        sqlFile = os.path.join(Paths.SQLDBCreationFolder.value, "CreateDatabase.sql")
+        sqlFile = os.path.join(Paths.SQLDBCreationFolder.value, "CreateDatabase.sql" if (template is None) else "CreateDatabaseFromTemplate.sql")
         identifiers = {"DatabaseName": Identifier(database), "OwnerName": Identifier(self._dbTool._secrets.username)}
+        if (template is not None):
+            identifiers["TemplateName"] = Identifier(template)
 
         sql = self._dbTool.readSQLFile(sqlFile)
         sql = SQL(sql).format(**identifiers)
@@ -254,12 +288,31 @@ class DBBuilder():
 
         self._dbTool.executeSQL(sql, vars = vars, connData = connData)
 
-    # build(createDatabase): Build the all the required database and tabless
-    def build(self, createDB: bool = False):
+    # buildPartitions(monthsAhead): Builds the monthly partitions of the bookings and the cancellations up to some number of months ahead
+    def buildPartitions(self, monthsAhead: Optional[int] = None):
+        DBPartitioner(self._dbTool).ensureFuturePartitions(monthsAhead = monthsAhead)
+
+    # migrate(): Updates the bookings and cancellations of a database built before the bookings kept whether they are cancelled.
+    #   Adds and fills the "isCancelled" column of the bookings and the "bookStartDateTime" column of the cancellations, then
+    #   rebuilds the triggers that read or keep these columns. Can be ran more than once
+    def migrate(self):
+        sqlFile = os.path.join(Paths.SQLTableCreationFolder.value, "MigrateBookingCancelled.sql")
+        sql = self._dbTool.readSQLFile(sqlFile)
+        sql = SQL(sql).format(**self.NameIdentifiers)
+
+        connData, cursor, error = self._dbTool.executeSQL(sql, commit = True, closeConn = False)
+        self.buildCheckParticipantTrigger(connData = connData, closeConn = False)
+        self.buildSyncBookingCancelledTrigger(connData = connData)
+
+    # build(createDatabase, withBookingExclusion, partitioned): Build the all the required database and tabless
+    def build(self, createDB: bool = False, withBookingExclusion: bool = False, partitioned: bool = False):
         if (createDB):
             self.buildDB()
 
-        self.buildTables()
+        self.buildTables(withBookingExclusion = withBookingExclusion, partitioned = partitioned)
         self.buildViews()
 
+        if (partitioned):
+            self.buildPartitions()
+
     # ============================================================
\ No newline at end of file
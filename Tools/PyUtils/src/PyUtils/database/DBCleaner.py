@@ -1,9 +1,11 @@
 from psycopg2.sql import SQL, Identifier
 from psycopg2.extensions import ISOLATION_LEVEL_AUTOCOMMIT
-from typing import Optional
+from datetime import datetime
+from typing import Optional, List
 
 from .DBTool import DBTool
 from .DBConnData import DBConnData
+from .DBPartitioner import DBPartitioner
 from ..constants.TableNames import TableNames
 from ..constants.DBFuncNames import DBFuncNames
 from ..exceptions.AreYouSureError import AreYouSureError
@@ -46,6 +48,24 @@ class DBCleaner():
         for table in TableNames:
             self.deleteTable(table.value, isSure = True)
 
+    # dropPartitionsBefore(beforeTime, isSure): Drops the monthly partitions of the bookings and the cancellations for all the months
+    #   that ended before some time, instead of deleting their rows one by one. Retrieves the months of the partitions that got dropped
+    def dropPartitionsBefore(self, beforeTime: datetime, isSure: bool = False) -> List[datetime]:
+        if (not isSure):
+            raise AreYouSureError(f"DROP ALL THE BOOKINGS AND CANCELLATIONS BEFORE {beforeTime} FOR THE DATABASE, '{self._dbTool.database}'")
+
+        partitioner = DBPartitioner(self._dbTool)
+        result = []
+
+        for month in sorted(partitioner.getPartitions(TableNames.Booking.value)):
+            if (partitioner.addMonths(month, 1) > beforeTime):
+                continue
+
+            partitioner.dropPartition(month)
+            result.append(month)
+
+        return result
+
     # deleteFunc(funcName, isSure): Deletes a function in the database
     def deleteFunc(self, funcName: str, isSure: bool = False):
         if (not isSure):
@@ -62,15 +82,15 @@ class DBCleaner():
         for dbFunc in DBFuncNames:
             self.deleteFunc(dbFunc.value, isSure = True)
 
-    # deleteDB(database, isSure): Deletes a database
-    def deleteDB(self, database: Optional[str] = None, isSure: bool = False):
+    # deleteDB(database, isSure, ifExists): Deletes a database
+    def deleteDB(self, database: Optional[str] = None, isSure: bool = False, ifExists: bool = False):
         if (not isSure):
             raise AreYouSureError(f"DELETE THE DATABASE BY THE NAME '{self.database}'")
         
         if (database is None):
             database = self._dbTool.database
         
-        sql = SQL("DROP DATABASE {dbName} WITH (FORCE);").format(dbName = Identifier(database))
+        sql = SQL("DROP DATABASE {ifExists}{dbName} WITH (FORCE);").format(ifExists = SQL("IF EXISTS " if (ifExists) else ""), dbName = Identifier(database))
 
         connData = DBConnData(conn = self._dbTool.connectDB(defaultDB = True))
         connData.conn.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT) # Needed for creating/deleting databases
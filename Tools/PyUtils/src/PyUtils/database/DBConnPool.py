@@ -0,0 +1,283 @@
+import time
+import logging
+import threading
+import collections
+import psycopg2
+import psycopg2.extensions
+from psycopg2.extensions import connection
+from psycopg2.pool import AbstractConnectionPool, PoolError
+from typing import Optional, Dict, Any, Deque
+
+from ..exceptions.PoolTimeout import PoolTimeout
+
+
+Logger = logging.getLogger(__name__)
+
+
+# DBConnPool: Thread-safe connection pool that makes callers wait for a free connection,
+#   instead of failing right away when all the connections are in use
+class DBConnPool(AbstractConnectionPool):
+    # number of the most recent acquire latencies kept for the latency percentiles
+    LatencyWindow = 1024
+
+    def __init__(self, minConn: int, maxConn: int, *args, maxWaiting: Optional[int] = None, acquireTimeout: float = 30,
+                 maxAge: Optional[float] = None, prePing: bool = False, **kwargs):
+        self._cond = threading.Condition()
+        self._pending = 0
+        self._waiting = 0
+
+        self._createdAt: Dict[int, float] = {}
+
+        self.maxWaiting = maxWaiting
+        self.acquireTimeout = acquireTimeout
+        self.maxAge = maxAge
+        self.prePing = prePing
+
+        self._acquires = 0
+        self._timeouts = 0
+        self._rejected = 0
+        self._recycled = 0
+        self._latencies: Deque[float] = collections.deque(maxlen = self.LatencyWindow)
+        self._maxLatency = 0.0
+
+        super().__init__(0, maxConn, *args, **kwargs)
+        self.minconn = int(minConn)
+        self._fill()
+
+    # _total(): The number of connections that are idle, in use or being opened/checked
+    def _total(self) -> int:
+        return len(self._pool) + len(self._used) + self._pending
+
+    # _newConn(): Opens a new connection to the database
+    def _newConn(self) -> connection:
+        conn = psycopg2.connect(*self._args, **self._kwargs)
+        self._createdAt[id(conn)] = time.monotonic()
+        return conn
+
+    # _discard(conn): Closes some connection that will not be used anymore
+    def _discard(self, conn: connection):
+        self._createdAt.pop(id(conn), None)
+
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    # _isExpired(conn): Whether some connection has been opened for too long
+    def _isExpired(self, conn: connection) -> bool:
+        if (self.maxAge is None):
+            return False
+
+        createdAt = self._createdAt.get(id(conn))
+        return createdAt is not None and time.monotonic() - createdAt >= self.maxAge
+
+    # _isUsable(conn): Whether some idle connection can still be handed out
+    def _isUsable(self, conn: connection) -> bool:
+        if (conn.closed != 0 or self._isExpired(conn)):
+            return False
+
+        if (not self.prePing):
+            return True
+
+        try:
+            cursor = conn.cursor()
+            cursor.execute("SELECT 1")
+            cursor.close()
+            conn.rollback()
+        except psycopg2.Error:
+            return False
+
+        return True
+
+    # _fill(): Opens enough connections to have at least the minimum number of connections
+    def _fill(self):
+        while (True):
+            with self._cond:
+                if (self.closed or self._total() >= min(self.minconn, self.maxconn)):
+                    return
+                self._pending += 1
+
+            try:
+                conn = self._newConn()
+            except BaseException:
+                with self._cond:
+                    self._pending -= 1
+                raise
+
+            with self._cond:
+                self._pending -= 1
+                self._pool.append(conn)
+                self._cond.notify()
+
+    # _reserve(deadline): Waits until either an idle connection or room for a new connection is available
+    def _reserve(self, deadline: float) -> Optional[connection]:
+        while (True):
+            if (self.closed):
+                raise PoolError("connection pool is closed")
+
+            if (self._pool):
+                self._pending += 1
+                conn = self._pool.pop()
+                return conn
+
+            if (self._total() < self.maxconn):
+                self._pending += 1
+                return None
+
+            if (self.maxWaiting is not None and self._waiting >= self.maxWaiting):
+                self._rejected += 1
+                raise PoolTimeout(f"connection pool exhausted: {self._waiting} callers are already waiting for a connection")
+
+            remaining = deadline - time.monotonic()
+            if (remaining <= 0):
+                self._timeouts += 1
+                raise PoolTimeout(f"timed out after {self.acquireTimeout}s waiting for a connection from the pool")
+
+            self._waiting += 1
+            try:
+                self._cond.wait(remaining)
+            finally:
+                self._waiting -= 1
+
+    def getconn(self, key = None) -> connection:
+        startTime = time.monotonic()
+        deadline = startTime + self.acquireTimeout
+
+        with self._cond:
+            if (key is not None and key in self._used):
+                return self._used[key]
+
+            conn = self._reserve(deadline)
+
+        # check or open the connection outside the lock, so other callers are not blocked by the network
+        try:
+            if (conn is not None and not self._isUsable(conn)):
+                self._discard(conn)
+                conn = None
+
+                with self._cond:
+                    self._recycled += 1
+
+            if (conn is None):
+                conn = self._newConn()
+        except BaseException:
+            with self._cond:
+                self._pending -= 1
+                self._cond.notify()
+            raise
+
+        latency = time.monotonic() - startTime
+        with self._cond:
+            self._pending -= 1
+
+            if (key is None):
+                key = self._getkey()
+
+            self._used[key] = conn
+            self._rused[id(conn)] = key
+
+            self._acquires += 1
+            self._latencies.append(latency)
+            self._maxLatency = max(self._maxLatency, latency)
+
+        return conn
+
+    def putconn(self, conn: connection, key = None, close: bool = False):
+        with self._cond:
+            if (key is None):
+                key = self._rused.get(id(conn))
+                if (key is None):
+                    raise PoolError("trying to put unkeyed connection")
+
+            self._used.pop(key, None)
+            self._rused.pop(id(conn), None)
+            self._pending += 1
+
+        # return the connection into a consistent state before putting it back into the pool
+        keep = not close and not self.closed and conn.closed == 0 and not self._isExpired(conn)
+        if (keep):
+            status = conn.info.transaction_status
+            try:
+                if (status == psycopg2.extensions.TRANSACTION_STATUS_UNKNOWN):
+                    keep = False
+                elif (status != psycopg2.extensions.TRANSACTION_STATUS_IDLE):
+                    conn.rollback()
+            except psycopg2.Error:
+                keep = False
+
+        with self._cond:
+            self._pending -= 1
+            keep = keep and not self.closed and self._total() < self.maxconn
+
+            if (keep):
+                self._pool.append(conn)
+
+            self._cond.notify()
+
+        if (not keep):
+            self._discard(conn)
+            self._refill()
+
+    # _refill(): Tops the pool back up to its minimum number of connections after a connection got discarded.
+    #   Callers put back their connection in a 'finally', so a failed refill (eg. the database is down) must not
+    #   replace the error they are handling. The missing connections are opened later by getconn
+    def _refill(self):
+        try:
+            self._fill()
+        except Exception as e:
+            Logger.warning(f"Unable to refill the connection pool: {e}")
+
+    def closeall(self):
+        with self._cond:
+            if (self.closed):
+                raise PoolError("connection pool is closed")
+
+            conns = self._pool + list(self._used.values())
+            self._pool = []
+            self.closed = True
+            self._cond.notify_all()
+
+        for conn in conns:
+            self._discard(conn)
+
+    # resize(minConn, maxConn): Changes the number of connections the pool keeps open and can open
+    def resize(self, minConn: Optional[int] = None, maxConn: Optional[int] = None):
+        extraConns = []
+
+        with self._cond:
+            if (minConn is not None):
+                self.minconn = int(minConn)
+
+            if (maxConn is not None):
+                self.maxconn = int(maxConn)
+
+            # connections in use are closed once they are put back
+            while (self._pool and self._total() > self.maxconn):
+                extraConns.append(self._pool.pop(0))
+
+            self._cond.notify_all()
+
+        for conn in extraConns:
+            self._discard(conn)
+
+        self._fill()
+
+    # stats(): Retrieves the live gauges and counters of the pool
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            latencies = sorted(self._latencies)
+            latencyCount = len(latencies)
+
+            return {"inUse": len(self._used),
+                    "idle": len(self._pool),
+                    "waiting": self._waiting,
+                    "pending": self._pending,
+                    "minConn": self.minconn,
+                    "maxConn": self.maxconn,
+                    "acquires": self._acquires,
+                    "timeouts": self._timeouts,
+                    "rejected": self._rejected,
+                    "recycled": self._recycled,
+                    "acquireLatencyAvg": sum(latencies) / latencyCount if (latencyCount > 0) else 0.0,
+                    "acquireLatencyP95": latencies[int(0.95 * (latencyCount - 1))] if (latencyCount > 0) else 0.0,
+                    "acquireLatencyMax": self._maxLatency}
@@ -0,0 +1,149 @@
+import os
+import re
+from datetime import datetime
+from psycopg2.sql import SQL, Identifier
+from typing import Union, Optional, List, Any, Dict, Tuple
+
+from ..constants.TableNames import TableNames
+from ..constants.Paths import Paths
+from .DBTool import DBTool
+
+
+# DBPartitioner: Class to manage the monthly partitions of the bookings and the cancellations.
+#   Both tables are partitioned on the start time of the bookings, so a cancellation is always in the partition
+#   of the same month as its booking
+class DBPartitioner():
+    PartitionedTables = [TableNames.Booking.value, TableNames.Cancellation.value]
+    DefaultPartitionSuffix = "default"
+    MonthsAhead = 12
+
+    def __init__(self, dbTool: DBTool):
+        self._dbTool = dbTool
+
+    # toMonth(dateTime): Retrieves the start of the month of some datetime
+    @classmethod
+    def toMonth(cls, dateTime: datetime) -> datetime:
+        return datetime(dateTime.year, dateTime.month, 1)
+
+    # addMonths(month, months): Retrieves the start of the month that is some number of months after some month
+    @classmethod
+    def addMonths(cls, month: datetime, months: int) -> datetime:
+        monthInd = month.year * 12 + month.month - 1 + months
+        return datetime(monthInd // 12, monthInd % 12 + 1, 1)
+
+    # getMonths(startTime, endTime): Retrieves the start of every month from the month of 'startTime' up to the month of 'endTime'
+    @classmethod
+    def getMonths(cls, startTime: datetime, endTime: datetime) -> List[datetime]:
+        result = []
+        month = cls.toMonth(startTime)
+        endMonth = cls.toMonth(endTime)
+
+        while (month <= endMonth):
+            result.append(month)
+            month = cls.addMonths(month, 1)
+
+        return result
+
+    # partitionName(tableName, month): Retrieves the name of the partition of some table for some month
+    @classmethod
+    def partitionName(cls, tableName: str, month: datetime) -> str:
+        return f"{tableName}_{month.year:04d}_{month.month:02d}"
+
+    # defaultPartitionName(tableName): Retrieves the name of the partition that holds the rows of the months without a partition
+    @classmethod
+    def defaultPartitionName(cls, tableName: str) -> str:
+        return f"{tableName}_{cls.DefaultPartitionSuffix}"
+
+    # _fetchAll(sql, vars): Runs some SQL query and retrieves all of its rows
+    def _fetchAll(self, sql: Union[str, SQL], vars: Optional[Union[List[Any], Dict[str, Any]]] = None) -> List[Tuple[Any, ...]]:
+        connData, cursor, error = self._dbTool.executeSQL(sql, vars = vars, closeConn = False, raiseException = False)
+
+        try:
+            if (error is not None):
+                raise error
+
+            return cursor.fetchall()
+        finally:
+            connData.putConn()
+
+    # isPartitioned(tableName): Whether some table is partitioned
+    def isPartitioned(self, tableName: str = TableNames.Booking.value) -> bool:
+        sql = "SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(quote_ident(%(table)s));"
+        return len(self._fetchAll(sql, vars = {"table": tableName})) > 0
+
+    # getPartitions(tableName): Retrieves the names of the monthly partitions of some table by their month
+    def getPartitions(self, tableName: str = TableNames.Booking.value) -> Dict[datetime, str]:
+        sql = """SELECT c.relname
+                 FROM pg_inherits AS i
+                 JOIN pg_class AS c ON c.oid = i.inhrelid
+                 WHERE i.inhparent = to_regclass(quote_ident(%(table)s));"""
+
+        namePattern = re.compile(f"{re.escape(tableName)}_(\\d{{4}})_(\\d{{2}})")
+        result = {}
+
+        for row in self._fetchAll(sql, vars = {"table": tableName}):
+            nameMatch = namePattern.fullmatch(row[0])
+            if (nameMatch is not None):
+                result[datetime(int(nameMatch.group(1)), int(nameMatch.group(2)), 1)] = row[0]
+
+        return result
+
+    # createPartition(month): Creates the partitions of the bookings and the cancellations for some month
+    def createPartition(self, month: datetime):
+        month = self.toMonth(month)
+        bookingTable = TableNames.Booking.value
+        cancellationTable = TableNames.Cancellation.value
+
+        identifiers = {"BookingTable": Identifier(bookingTable),
+                       "CancellationTable": Identifier(cancellationTable),
+                       "BookingPartition": Identifier(self.partitionName(bookingTable, month)),
+                       "CancellationPartition": Identifier(self.partitionName(cancellationTable, month)),
+                       "BookingDefaultPartition": Identifier(self.defaultPartitionName(bookingTable)),
+                       "CancellationDefaultPartition": Identifier(self.defaultPartitionName(cancellationTable))}
+
+        sqlFile = os.path.join(Paths.SQLTableCreationFolder.value, "CreateMonthPartitions.sql")
+        sql = SQL(self._dbTool.readSQLFile(sqlFile)).format(**identifiers)
+        self._dbTool.executeSQL(sql, vars = {"start": month, "end": self.addMonths(month, 1)}, commit = True)
+
+    # createPartitions(startTime, endTime): Creates the missing partitions for all the months from 'startTime' up to 'endTime'
+    #   and retrieves the months of the partitions that got created
+    def createPartitions(self, startTime: datetime, endTime: datetime) -> List[datetime]:
+        existingPartitions = self.getPartitions(TableNames.Booking.value)
+        result = []
+
+        for month in self.getMonths(startTime, endTime):
+            if (month in existingPartitions):
+                continue
+
+            self.createPartition(month)
+            result.append(month)
+
+        return result
+
+    # ensureFuturePartitions(monthsAhead, now): Creates the missing partitions from the current month up to some number of months ahead,
+    #   so new bookings do not end up in the default partitions
+    def ensureFuturePartitions(self, monthsAhead: Optional[int] = None, now: Optional[datetime] = None) -> List[datetime]:
+        if (monthsAhead is None):
+            monthsAhead = self.MonthsAhead
+
+        if (now is None):
+            now = datetime.now()
+
+        startMonth = self.toMonth(now)
+        return self.createPartitions(startMonth, self.addMonths(startMonth, monthsAhead))
+
+    # dropPartition(month): Drops the partitions of the bookings and the cancellations for some month,
+    #   which removes all of their rows at once
+    def dropPartition(self, month: datetime):
+        month = self.toMonth(month)
+        bookingPartition = Identifier(self.partitionName(TableNames.Booking.value, month))
+        cancellationPartition = Identifier(self.partitionName(TableNames.Cancellation.value, month))
+
+        # the cancellations reference the bookings, so they need to go first before the bookings can be detached
+        sql = SQL("""DROP TABLE IF EXISTS {cancellationPartition};
+                     ALTER TABLE {bookingTable} DETACH PARTITION {bookingPartition};
+                     DROP TABLE {bookingPartition};""").format(cancellationPartition = cancellationPartition,
+                                                               bookingTable = Identifier(TableNames.Booking.value),
+                                                               bookingPartition = bookingPartition)
+
+        self._dbTool.executeSQL(sql, commit = True)
@@ -0,0 +1,53 @@
+import os
+from dotenv import load_dotenv
+from typing import Optional
+
+
+# DBPoolConfig: Class to hold the settings for the database connection pools
+class DBPoolConfig():
+    def __init__(self, minConn: int = 1, maxConn: int = 20, maxWaiting: Optional[int] = None, acquireTimeout: float = 30,
+                 maxAge: Optional[float] = None, prePing: bool = False):
+        self.minConn = minConn
+        self.maxConn = maxConn
+        self.maxWaiting = maxWaiting
+        self.acquireTimeout = acquireTimeout
+        self.maxAge = maxAge
+        self.prePing = prePing
+
+    # split(parts, index): Retrieves the settings for one of 'parts' pools that share the connections of these settings.
+    #   The max connections are split as evenly as possible, with every pool allowed at least 1 connection
+    def split(self, parts: int, index: int) -> "DBPoolConfig":
+        maxConn = max(1, self.maxConn // parts + (1 if (index < self.maxConn % parts) else 0))
+        return DBPoolConfig(minConn = min(self.minConn, maxConn), maxConn = maxConn, maxWaiting = self.maxWaiting, acquireTimeout = self.acquireTimeout,
+                            maxAge = self.maxAge, prePing = self.prePing)
+
+    # _getEnv(name, default, cast): Retrieves some environment variable as some type
+    @classmethod
+    def _getEnv(cls, name: str, default, cast):
+        value = os.getenv(name)
+        if (value is None or value.strip() == ""):
+            return default
+
+        return cast(value.strip())
+
+    # _toBool(value): Converts a string to a boolean
+    @classmethod
+    def _toBool(cls, value: str) -> bool:
+        return value.lower() in {"1", "true", "yes", "on"}
+
+    # load(envPath, override): Loads the pool settings from a .env environment variable file
+    @classmethod
+    def load(cls, envPath: Optional[str] = None, override: bool = False) -> "DBPoolConfig":
+        if (envPath is not None):
+            load_dotenv(dotenv_path = envPath, override = override)
+
+        default = cls()
+        minConn = cls._getEnv("DB_POOL_MIN_CONN", default.minConn, int)
+        maxConn = cls._getEnv("DB_POOL_MAX_CONN", default.maxConn, int)
+        maxWaiting = cls._getEnv("DB_POOL_MAX_WAITING", default.maxWaiting, int)
+        acquireTimeout = cls._getEnv("DB_POOL_TIMEOUT", default.acquireTimeout, float)
+        maxAge = cls._getEnv("DB_POOL_MAX_AGE", default.maxAge, float)
+        prePing = cls._getEnv("DB_POOL_PRE_PING", default.prePing, cls._toBool)
+
+        return cls(minConn = minConn, maxConn = maxConn, maxWaiting = maxWaiting, acquireTimeout = acquireTimeout,
+                   maxAge = maxAge, prePing = prePing)
@@ -1,33 +1,56 @@
 import psycopg2
 import psycopg2.sql
+import psycopg2.errors
 from psycopg2.extras import execute_values
-from psycopg2.pool import AbstractConnectionPool, SimpleConnectionPool
+from psycopg2.pool import AbstractConnectionPool
 from psycopg2.extensions import connection
 import sqlalchemy
+import sqlalchemy.event
 import pandas as pd
 from functools import lru_cache
 import numpy as np
+import uuid
+import io
+import csv
+import time
 
-from typing import Union, Optional, List, Any, Dict, Tuple, Type
+from typing import Union, Optional, List, Any, Dict, Tuple, Type, Callable
 
 from ..constants.DBNames import DBNames
 from ..constants.FileEncodings import FileEncodings
+from ..constants.StatementNames import StatementNames
 from .DBSecrets import DBSecrets
 from .DBConnData import DBConnData
+from .DBConnPool import DBConnPool
+from .DBPoolConfig import DBPoolConfig
+from .SharedConnPool import SharedConnPool
+from .SQLRegistry import SQLRegistry, SQLStatement
+from .QueryRecord import QueryRecord
 
 
 # DBTools: Class for some useful database operations
 class DBTool():
-    def __init__(self, secrets: DBSecrets, database: str = DBNames.Toy.value, useConnPool: bool = False):
+    # typecaster to read Postgres UUIDs as python UUIDs, the same type the SQLAlchemy engine gives back
+    UUIDType = psycopg2.extensions.new_type((2950,), "UUID", lambda value, cursor: value if (value is None) else uuid.UUID(value))
+
+    # marker for NULL values in the CSVs sent through COPY, so empty strings are not loaded as NULL
+    CopyNull = "\\N"
+    CopyRowNumCol = "copyRowNum"
+
+    def __init__(self, secrets: DBSecrets, database: str = DBNames.Toy.value, useConnPool: bool = False,
+                 sqlRegistry: Optional[SQLRegistry] = None, poolConfig: Optional[DBPoolConfig] = None):
         self._secrets = secrets
         self._database = database
         self._sqlEngine: Optional[sqlalchemy.engine.Engine] = None
         self._useConnPool = useConnPool
+        self._sqlRegistry = sqlRegistry
+        self._poolConfig = poolConfig if (poolConfig is not None) else DBPoolConfig()
+        self._executeListeners: List[Callable[[QueryRecord], None]] = []
+        self._sharedConnPool: Optional[SharedConnPool] = None
         self.connPools = {}
 
         if (useConnPool):
-            self.connPools = {DBNames.Default.value: self.createConnPool(defaultDB = True),
-                              self.database: self.createConnPool()}
+            self.connPools = self._createConnPools()
 
     @property
     def database(self) -> str:
@@ -43,50 +66,189 @@ class DBTool():
         self.connPools[otherDatabase] = self.createConnPool()
         self._sqlEngine = None
 
+    @property
+    def sqlRegistry(self) -> SQLRegistry:
+        if (self._sqlRegistry is None):
+            self._sqlRegistry = SQLRegistry.getDefault()
+
+        return self._sqlRegistry
+
+    @sqlRegistry.setter
+    def sqlRegistry(self, otherSQLRegistry: Optional[SQLRegistry]):
+        self._sqlRegistry = otherSQLRegistry
+
+    @property
+    def poolConfig(self) -> DBPoolConfig:
+        return self._poolConfig
+
     @property
     def useConnPool(self) -> bool:
-        return self._useConnPools
+        return self._useConnPool
     
     @useConnPool.setter
     def useConnPool(self, otherUseConnPool: bool):
         if (self._useConnPool and not otherUseConnPool):
             self.connPools = {}
         elif (not self._useConnPool and otherUseConnPool):
-            self.connPools = {DBNames.Default.value: self.createConnPool(defaultDB = True),
-                              self.database: self.createConnPool()}
+            self.connPools = self._createConnPools()
 
         self._useConnPool = otherUseConnPool
 
-    # connectDB(defaultDB): Creates a connection to a database
-    def connectDB(self, defaultDB: bool = False) -> connection:
+    @property
+    def sharedConn(self) -> Optional[connection]:
+        return None if (self._sharedConnPool is None) else self._sharedConnPool.conn
+
+    # shareConn(conn): Runs all the queries on the database of this object through a single connection owned by the caller,
+    #   instead of the connection pools or new connections. Give None to stop sharing the connection.
+    #
+    #   The queries ran by the SQL engine still use their own connections
+    def shareConn(self, conn: Optional[connection]):
+        if (self._sharedConnPool is not None):
+            self._sharedConnPool.closeall()
+
+        self._sharedConnPool = None if (conn is None) else SharedConnPool(conn)
+
+    # addExecuteListener(listener): Adds a function that gets called with the record of every SQL query ran by 'executeSQL'
+    #   or by the SQL engine
+    def addExecuteListener(self, listener: Callable[[QueryRecord], None]):
+        self._executeListeners.append(listener)
+
+    # removeExecuteListener(listener): Removes a function added by 'addExecuteListener'
+    def removeExecuteListener(self, listener: Callable[[QueryRecord], None]):
+        if (listener in self._executeListeners):
+            self._executeListeners.remove(listener)
+
+    # _notifyExecute(record): Tells all the listeners about a SQL query that finished running
+    def _notifyExecute(self, record: QueryRecord):
+        for listener in self._executeListeners:
+            listener(record)
+
+    # _onEngineBeforeExecute(conn, cursor, statement, parameters, context, executemany): Starts timing a query ran by the SQL engine
+    def _onEngineBeforeExecute(self, conn, cursor, statement, parameters, context, executemany):
+        if (self._executeListeners):
+            context.queryStartTime = time.perf_counter()
+
+    # _onEngineAfterExecute(conn, cursor, statement, parameters, context, executemany): Records a query ran by the SQL engine
+    def _onEngineAfterExecute(self, conn, cursor, statement, parameters, context, executemany):
+        startTime = getattr(context, "queryStartTime", None)
+        if (startTime is None or not self._executeListeners):
+            return
+
+        self._notifyExecute(QueryRecord(statement, vars = parameters, duration = time.perf_counter() - startTime, rowCount = cursor.rowcount,
+                                        database = self.database))
+
+    # _onEngineError(exceptionContext): Records a query ran by the SQL engine that failed
+    def _onEngineError(self, exceptionContext):
+        context = exceptionContext.execution_context
+        startTime = getattr(context, "queryStartTime", None)
+        if (startTime is None or not self._executeListeners):
+            return
+
+        self._notifyExecute(QueryRecord(exceptionContext.statement, vars = exceptionContext.parameters, duration = time.perf_counter() - startTime,
+                                        error = exceptionContext.original_exception, database = self.database))
+
+    # connectDB(defaultDB, connectionFactory): Creates a connection to a database.
+    #   'connectionFactory' is the connection class to create (eg. SavepointConnection), if not the default connection class of psycopg2
+    def connectDB(self, defaultDB: bool = False, connectionFactory: Optional[Type[connection]] = None) -> connection:
         database = DBNames.Default.value if (defaultDB) else self.database
+        connKwargs = {} if (connectionFactory is None) else {"connection_factory": connectionFactory}
 
         return psycopg2.connect(database = database, user = self._secrets.username, password = self._secrets.password, 
-                                host = self._secrets.host, port = self._secrets.port)
+                                host = self._secrets.host, port = self._secrets.port, **connKwargs)
     
     # closeDBPools(): Close all the database connection pools
     def closeDBPools(self):
         for pool in self.connPools:
             self.connPools[pool].closeall()
+
+    # closeSQLEngine(): Closes all the connections of the SQL engine. A new engine is created the next time the engine is needed
+    def closeSQLEngine(self):
+        if (self._sqlEngine is not None):
+            self._sqlEngine.dispose()
+            self._sqlEngine = None
+
+    # resetAfterFork(poolConfig): Replaces the connection pools and the SQL engine copied from the parent process of a forked process with new ones.
+    #   A connection cannot be used by more than one process, so the parent process needs to close its connections before forking
+    #   (see 'closeDBPools' and 'closeSQLEngine'), then each forked process opens its own connections
+    def resetAfterFork(self, poolConfig: Optional[DBPoolConfig] = None):
+        if (poolConfig is not None):
+            self._poolConfig = poolConfig
+
+        # the connections of the copied engine are left to the parent process
+        if (self._sqlEngine is not None):
+            self._sqlEngine.dispose(close = False)
+            self._sqlEngine = None
+
+        self._sharedConnPool = None
+        self.connPools = self._createConnPools() if (self._useConnPool) else {}
     
     # getSQlEngine(flush): Retrievess the SQL engine for executing queries
     def getSQLEngine(self, flush: bool = False) -> sqlalchemy.engine.Engine:
         if (self._sqlEngine is None or flush):
             self._sqlEngine = sqlalchemy.create_engine(f"postgresql+psycopg2://{self._secrets.username}:{self._secrets.password}@{self._secrets.host}/{self.database}")
+            sqlalchemy.event.listen(self._sqlEngine, "before_cursor_execute", self._onEngineBeforeExecute)
+            sqlalchemy.event.listen(self._sqlEngine, "after_cursor_execute", self._onEngineAfterExecute)
+            sqlalchemy.event.listen(self._sqlEngine, "handle_error", self._onEngineError)
 
         return self._sqlEngine
     
-    # createConnPool(minConn, maxConn): Creates a connection pool
-    def createConnPool(self, minConn: int = 1, maxConn: int = 20, defaultDB: bool = False, connPoolCls: Type[AbstractConnectionPool] = SimpleConnectionPool) -> AbstractConnectionPool:
+    # createConnPool(minConn, maxConn, defaultDB, connPoolCls): Creates a connection pool.
+    #   The sizes of the pool default to the sizes in the pool config of this object
+    def createConnPool(self, minConn: Optional[int] = None, maxConn: Optional[int] = None, defaultDB: bool = False, 
+                       connPoolCls: Type[AbstractConnectionPool] = DBConnPool) -> AbstractConnectionPool:
         database = DBNames.Default.value if (defaultDB) else self.database
+
+        if (minConn is None):
+            minConn = self._poolConfig.minConn
+
+        if (maxConn is None):
+            maxConn = self._poolConfig.maxConn
+
+        poolKwargs = {}
+        if (issubclass(connPoolCls, DBConnPool)):
+            poolKwargs = {"maxWaiting": self._poolConfig.maxWaiting, "acquireTimeout": self._poolConfig.acquireTimeout,
+                          "maxAge": self._poolConfig.maxAge, "prePing": self._poolConfig.prePing}
         
         return connPoolCls(minConn, maxConn, user = self._secrets.username, password = self._secrets.password,
-                           host = self._secrets.host, port = self._secrets.port, database = database)
+                           host = self._secrets.host, port = self._secrets.port, database = database, **poolKwargs)
+
+    # _createConnPools(): Creates the connection pools for the default database and for the database of this object
+    def _createConnPools(self) -> Dict[str, AbstractConnectionPool]:
+        return {DBNames.Default.value: self.createConnPool(minConn = 0, defaultDB = True),
+                self.database: self.createConnPool()}
+
+    # resizeConnPools(poolConfig): Applies new pool settings to the existing connection pools without closing them
+    def resizeConnPools(self, poolConfig: DBPoolConfig):
+        self._poolConfig = poolConfig
+
+        for database, connPool in self.connPools.items():
+            if (not isinstance(connPool, DBConnPool)):
+                continue
+
+            connPool.maxWaiting = poolConfig.maxWaiting
+            connPool.acquireTimeout = poolConfig.acquireTimeout
+            connPool.maxAge = poolConfig.maxAge
+            connPool.prePing = poolConfig.prePing
+
+            minConn = 0 if (database == DBNames.Default.value) else poolConfig.minConn
+            connPool.resize(minConn = minConn, maxConn = poolConfig.maxConn)
+
+    # getPoolStats(): Retrieves the live gauges of each connection pool
+    def getPoolStats(self) -> Dict[str, Dict[str, Any]]:
+        result = {}
+        for database, connPool in self.connPools.items():
+            if (isinstance(connPool, DBConnPool) and not connPool.closed):
+                result[database] = connPool.stats()
+
+        return result
     
-    # getConn(defaultDB): Retrieves a connection from the preset connection pool in this object
+    # getConn(defaultDB): Retrieves a connection from the shared connection or the preset connection pool in this object
     def getConn(self, defaultDB: bool = False) -> DBConnData:
         database = DBNames.Default.value if (defaultDB) else self.database
 
+        if (self._sharedConnPool is not None and not defaultDB):
+            return DBConnData(conn = self._sharedConnPool.getconn(), pool = self._sharedConnPool)
+
         if (self._useConnPool):
             connPool = self.connPools[database]
             return DBConnData(conn = connPool.getconn(), pool = connPool)
@@ -126,10 +288,12 @@ class DBTool():
             return cls.readSQLCachedFile(file)
         return cls._readSQLFile(file)
     
-    # executeSQL(sql, vars, commit, closeConn): Execute some SQL query
+    # executeSQL(sql, vars, commit, closeConn, connData, raiseException, castUUIDs, statement): Execute some SQL query.
+    #   'statement' is the registered statement that the SQL runs, if any
     def executeSQL(self, sql: Union[str, psycopg2.sql.SQL], vars: Optional[Union[List[Any], Dict[str, Any]]] = None, commit: bool = False, 
                    closeConn: bool = True, connData: Optional[DBConnData] = None, 
-                   raiseException: bool = True) -> Tuple[DBConnData, Optional[psycopg2.extensions.cursor], Optional[Exception]]:
+                   raiseException: bool = True, castUUIDs: bool = False,
+                   statement: Optional[SQLStatement] = None) -> Tuple[DBConnData, Optional[psycopg2.extensions.cursor], Optional[Exception]]:
         
         if (connData is None):
             connData = self.getConn()
@@ -141,9 +305,13 @@ class DBTool():
 
         cursor = None
         error = None
+        startTime = time.perf_counter()
 
         try:
             cursor = conn.cursor()
+            if (castUUIDs):
+                psycopg2.extensions.register_type(self.UUIDType, cursor)
+
             cursor.execute(sql, vars = vars)
 
             if (commit):
@@ -153,6 +321,13 @@ class DBTool():
             if (commit):
                 conn.rollback()
         finally:
+            if (self._executeListeners):
+                duration = time.perf_counter() - startTime
+                sqlText = sql if (isinstance(sql, str)) else sql.as_string(conn)
+                rowCount = -1 if (cursor is None) else cursor.rowcount
+                self._notifyExecute(QueryRecord(sqlText, vars = vars, duration = duration, rowCount = rowCount, error = error,
+                                                statement = statement, database = self.database))
+
             if (closeConn):
                 connData.putConn()
 
@@ -160,6 +335,93 @@ class DBTool():
             raise error
 
         return (connData, cursor, error)
+
+    # executeStatement(name, vars, commit, closeConn, connData, raiseException, castUUIDs): Execute some statement registered in the SQL registry.
+    #   Connections from the connection pools will have the statement prepared on them, so the statement is only planned once per connection
+    def executeStatement(self, name: Union[str, StatementNames], vars: Optional[Dict[str, Any]] = None, commit: bool = False,
+                         closeConn: bool = True, connData: Optional[DBConnData] = None,
+                         raiseException: bool = True, castUUIDs: bool = False) -> Tuple[DBConnData, Optional[psycopg2.extensions.cursor], Optional[Exception]]:
+
+        statement = self.sqlRegistry.get(name)
+        self.sqlRegistry.recordHit(statement)
+
+        # the filters skipped on NULL parameters are only planned with the parameters that are given
+        statement = self.sqlRegistry.getVariant(statement, vars)
+
+        if (connData is None):
+            connData = self.getConn()
+
+        # single use connections are not worth preparing
+        if (connData.pool is None):
+            namedValues = statement.toNamedValues(vars) if (statement.paramNames) else None
+            return self.executeSQL(statement.sql, vars = namedValues, commit = commit, closeConn = closeConn, connData = connData, 
+                                   raiseException = raiseException, castUUIDs = castUUIDs, statement = statement)
+
+        conn = connData.getConn()
+        values = statement.toValues(vars)
+        inTransaction = conn.info.transaction_status != psycopg2.extensions.TRANSACTION_STATUS_IDLE
+
+        try:
+            self.sqlRegistry.prepare(conn, statement)
+        except Exception as e:
+            self.sqlRegistry.forget(conn)
+            if (commit):
+                conn.rollback()
+            if (closeConn):
+                connData.putConn()
+            if (raiseException):
+                raise e
+            return (connData, None, e)
+
+        result = self.executeSQL(statement.executeSQL, vars = values, commit = commit, closeConn = False, connData = connData, 
+                                 raiseException = False, castUUIDs = castUUIDs, statement = statement)
+        error = result[2]
+
+        # the session lost its prepared statements (eg. the server reset the session), so prepare again
+        if (isinstance(error, psycopg2.errors.InvalidSqlStatementName) and not inTransaction):
+            self.sqlRegistry.forget(conn)
+            conn.rollback()
+            self.sqlRegistry.prepare(conn, statement)
+            result = self.executeSQL(statement.executeSQL, vars = values, commit = commit, closeConn = False, connData = connData, 
+                                     raiseException = False, castUUIDs = castUUIDs, statement = statement)
+            error = result[2]
+
+        if (closeConn):
+            connData.putConn()
+
+        if (error is not None and raiseException):
+            raise error
+
+        return result
+
+    # toRecords(columns, rows): Turns the rows from a cursor into records that map each column name to its value
+    @classmethod
+    def toRecords(cls, columns: Tuple[str, ...], rows: List[Tuple[Any, ...]]) -> List[Dict[str, Any]]:
+        return [dict(zip(columns, row)) for row in rows]
+
+    # fetchRecords(name, vars, connData): Runs some statement registered in the SQL registry and retrieves
+    #   its resulting rows as records, without going through a dataframe
+    def fetchRecords(self, name: Union[str, StatementNames], vars: Optional[Dict[str, Any]] = None, 
+                     connData: Optional[DBConnData] = None) -> List[Dict[str, Any]]:
+        statement = self.sqlRegistry.get(name)
+        connData, cursor, error = self.executeStatement(statement.name, vars = vars, closeConn = False, connData = connData, 
+                                                        raiseException = False, castUUIDs = True)
+
+        try:
+            if (error is not None):
+                raise error
+
+            rows = cursor.fetchall()
+
+            # the columns of a statement do not change, so only look them up once
+            columns = statement.columns
+            if (columns is None):
+                columns = tuple(map(lambda column: column.name, cursor.description))
+                statement.columns = columns
+        finally:
+            connData.putConn()
+
+        return self.toRecords(columns, rows)
     
     # insert(data, tableName): Inserts data from a CSV file to a table
     def insert(self, data: Union[str, pd.DataFrame], tableName: str, returnCols: Optional[List[str]] = None) -> Optional[pd.DataFrame]:
@@ -214,4 +476,114 @@ class DBTool():
             connData.putConn()
 
         result = pd.DataFrame(returnVals, columns = returnCols)
-        return result
\ No newline at end of file
+        return result
+
+    # _getConnForWrite(): Retrieves an open connection for writing data
+    def _getConnForWrite(self) -> DBConnData:
+        connData = self.getConn()
+        conn = connData.getConn()
+
+        if (conn.closed != 0 and connData.pool is None):
+            conn = self.connectDB()
+            connData.conn = conn
+
+        return connData
+
+    # toCopyBuffer(data): Writes a dataframe to an in-memory CSV in the format read by COPY
+    @classmethod
+    def toCopyBuffer(cls, data: pd.DataFrame) -> io.StringIO:
+        data = data.copy(deep = False)
+
+        # integer columns with missing values get read as floats by pandas,
+        #   but Postgres does not accept '12.0' for an integer column
+        for col in data.columns:
+            colData = data[col]
+            if (pd.api.types.is_float_dtype(colData) and colData.dropna().mod(1).eq(0).all()):
+                data[col] = colData.astype("Int64")
+
+        buffer = io.StringIO()
+        data.to_csv(buffer, index = False, header = False, na_rep = cls.CopyNull, quoting = csv.QUOTE_MINIMAL)
+        buffer.seek(0)
+        return buffer
+
+    # _copySQL(tableName, cols, header, null): Builds the COPY ... FROM STDIN query for some columns of a table.
+    #   By default, NULLs are marked the same way as in toCopyBuffer(...)
+    @classmethod
+    def _copySQL(cls, tableName: str, cols: List[str], header: bool = False, null: Optional[str] = CopyNull) -> psycopg2.sql.Composed:
+        options = ["FORMAT csv"]
+        if (null is not None):
+            options.append("NULL {null}")
+        if (header):
+            options.append("HEADER true")
+
+        options = ", ".join(options)
+        return psycopg2.sql.SQL(f"COPY {{table}} ({{cols}}) FROM STDIN WITH ({options})").format(
+            table = psycopg2.sql.Identifier(tableName),
+            cols = psycopg2.sql.SQL(",").join(map(psycopg2.sql.Identifier, cols)),
+            null = psycopg2.sql.Literal(null))
+
+    # _copyCSVFile(file, tableName, cursor): Streams a CSV file with a header row straight into a table.
+    #   Like pandas, the empty values in the file are loaded as NULL
+    def _copyCSVFile(self, file: str, tableName: str, cursor: psycopg2.extensions.cursor) -> int:
+        with open(file, "r", encoding = FileEncodings.UTF8.value, newline = "") as f:
+            cols = next(csv.reader(f))
+            f.seek(0)
+            cursor.copy_expert(self._copySQL(tableName, cols, header = True, null = None), f)
+
+        return cursor.rowcount
+
+    # _copyAndReturn(data, tableName, returnCols, cursor): Bulk loads a dataframe into a table and retrieves the values of some
+    #   generated columns, in the same order as the rows of the dataframe.
+    #
+    #   COPY cannot return anything, so the rows first go into a temporary table that has the same defaults
+    #   as the actual table. The generated values are then copied over with the rest of the row and read back by row number
+    def _copyAndReturn(self, data: pd.DataFrame, tableName: str, returnCols: List[str], cursor: psycopg2.extensions.cursor) -> pd.DataFrame:
+        stageTableName = f"copy_{tableName}"
+        cols = list(data.columns)
+        stageCols = cols + [self.CopyRowNumCol]
+        insertCols = cols + [col for col in returnCols if (col not in cols)]
+
+        identifiers = {"table": psycopg2.sql.Identifier(tableName),
+                       "stage": psycopg2.sql.Identifier(stageTableName),
+                       "rowNum": psycopg2.sql.Identifier(self.CopyRowNumCol),
+                       "insertCols": psycopg2.sql.SQL(",").join(map(psycopg2.sql.Identifier, insertCols)),
+                       "returnCols": psycopg2.sql.SQL(",").join(map(psycopg2.sql.Identifier, returnCols))}
+
+        cursor.execute(psycopg2.sql.SQL("CREATE TEMP TABLE {stage} (LIKE {table} INCLUDING DEFAULTS) ON COMMIT DROP").format(**identifiers))
+        cursor.execute(psycopg2.sql.SQL("ALTER TABLE {stage} ADD COLUMN {rowNum} BIGINT").format(**identifiers))
+
+        stageData = data.assign(**{self.CopyRowNumCol: np.arange(len(data), dtype = np.int64)})
+        cursor.copy_expert(self._copySQL(stageTableName, stageCols), self.toCopyBuffer(stageData))
+
+        cursor.execute(psycopg2.sql.SQL("INSERT INTO {table} ({insertCols}) SELECT {insertCols} FROM {stage} ORDER BY {rowNum}").format(**identifiers))
+        cursor.execute(psycopg2.sql.SQL("SELECT {returnCols} FROM {stage} ORDER BY {rowNum}").format(**identifiers))
+
+        return pd.DataFrame(cursor.fetchall(), columns = returnCols)
+
+    # copyFrom(data, tableName, returnCols): Bulk loads data from a CSV file or a dataframe into a table with COPY ... FROM STDIN.
+    #   Works the same as insert(...), but sends all the rows in a single stream instead of in batches of INSERT statements
+    def copyFrom(self, data: Union[str, pd.DataFrame], tableName: str, returnCols: Optional[List[str]] = None) -> Optional[pd.DataFrame]:
+        if (isinstance(data, str) and returnCols):
+            data = pd.read_csv(data)
+
+        result = None
+        connData = self._getConnForWrite()
+        conn = connData.getConn()
+        cursor = conn.cursor()
+
+        try:
+            if (isinstance(data, str)):
+                self._copyCSVFile(data, tableName, cursor)
+            elif (returnCols):
+                result = self._copyAndReturn(data, tableName, returnCols, cursor)
+            else:
+                cursor.copy_expert(self._copySQL(tableName, list(data.columns)), self.toCopyBuffer(data))
+
+            conn.commit()
+        except Exception as e:
+            conn.rollback()
+            raise e
+        finally:
+            connData.putConn()
+
+        return result
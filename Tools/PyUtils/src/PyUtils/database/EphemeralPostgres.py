@@ -0,0 +1,192 @@
+import os
+import glob
+import shutil
+import socket
+import secrets
+import tempfile
+import subprocess
+from typing import Optional, Dict, List
+
+from .DBSecrets import DBSecrets
+from ..exceptions.PostgresLaunchError import PostgresLaunchError
+
+
+# EphemeralPostgres: A throwaway Postgres server on a temporary data folder, to run the tests and the benchmarks
+#   against an isolated database server without any setup.
+#
+#   The server trades away the durability of its data for speed (eg. no fsync), so it is only meant for data that
+#   can be rebuilt. The data folder of the server is deleted once the server is stopped
+class EphemeralPostgres():
+    Host = "localhost"
+    BinFolderEnvVar = "POSTGRES_BIN_FOLDER"
+
+    # the folders the Postgres binaries are installed to by the Linux packages, when they are not on the PATH
+    PackageBinFolders = ["/usr/lib/postgresql/*/bin", "/usr/pgsql-*/bin"]
+
+    DefaultSettings = {"fsync": "off",
+                       "synchronous_commit": "off",
+                       "full_page_writes": "off",
+                       "wal_level": "minimal",
+                       "max_wal_senders": "0",
+                       "checkpoint_timeout": "1h",
+                       "max_wal_size": "4GB"}
+
+    def __init__(self, binFolder: Optional[str] = None, port: Optional[int] = None, username: str = "postgres", password: Optional[str] = None,
+                 settings: Optional[Dict[str, str]] = None, startTimeout: int = 60):
+        if (settings is None):
+            settings = {}
+
+        self.binFolder = binFolder
+        self.port = port
+        self.username = username
+        self.password = password if (password is not None) else secrets.token_hex(16)
+        self.settings = {**self.DefaultSettings, **settings}
+        self.startTimeout = startTimeout
+
+        self._folder: Optional[str] = None
+        self._isRunning = False
+
+    def __enter__(self) -> "EphemeralPostgres":
+        self.start()
+        return self
+
+    def __exit__(self, excType, excValue, traceback):
+        self.stop()
+
+    @property
+    def isRunning(self) -> bool:
+        return self._isRunning
+
+    @property
+    def dataFolder(self) -> Optional[str]:
+        return None if (self._folder is None) else os.path.join(self._folder, "data")
+
+    @property
+    def logFile(self) -> Optional[str]:
+        return None if (self._folder is None) else os.path.join(self._folder, "postgres.log")
+
+    @property
+    def secrets(self) -> DBSecrets:
+        return DBSecrets(username = self.username, password = self.password, host = self.Host, port = str(self.port))
+
+    # getEnv(): Retrieves the environment variables for the secrets of the server. Since the .env files do not override the
+    #   environment variables that are already set, a program started with these variables connects to the server
+    def getEnv(self) -> Dict[str, str]:
+        dbSecrets = self.secrets
+        return {"DB_USERNAME": dbSecrets.username, "DB_PASSWORD": dbSecrets.password, "DB_HOST": dbSecrets.host, "DB_PORT": dbSecrets.port}
+
+    # findBinFolder(): Retrieves the folder with the Postgres binaries (eg. initdb and pg_ctl)
+    @classmethod
+    def findBinFolder(cls) -> str:
+        binFolder = os.getenv(cls.BinFolderEnvVar)
+        if (binFolder):
+            return binFolder
+
+        pgCtl = shutil.which("pg_ctl")
+        if (pgCtl is not None):
+            return os.path.dirname(pgCtl)
+
+        pgConfig = shutil.which("pg_config")
+        if (pgConfig is not None):
+            result = subprocess.run([pgConfig, "--bindir"], capture_output = True, text = True)
+            if (result.returncode == 0 and os.path.isfile(os.path.join(result.stdout.strip(), "pg_ctl"))):
+                return result.stdout.strip()
+
+        for pattern in cls.PackageBinFolders:
+            binFolders = sorted(filter(lambda folder: os.path.isfile(os.path.join(folder, "pg_ctl")), glob.glob(pattern)))
+            if (binFolders):
+                return binFolders[-1]
+
+        raise PostgresLaunchError(f"Cannot find the Postgres binaries (initdb and pg_ctl). Add them to the PATH or set the {cls.BinFolderEnvVar} environment variable")
+
+    # findFreePort(): Retrieves a port that is not used on the local machine
+    @classmethod
+    def findFreePort(cls) -> int:
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+            sock.bind((cls.Host, 0))
+            return sock.getsockname()[1]
+
+    # _runBin(name, args): Runs some Postgres binary
+    def _runBin(self, name: str, args: List[str]):
+        result = subprocess.run([os.path.join(self.binFolder, name), *args], capture_output = True, text = True)
+        if (result.returncode != 0):
+            raise PostgresLaunchError(f"{name} failed with exit code {result.returncode}:\n{result.stderr or result.stdout}")
+
+    # _readLog(): Retrieves the log of the server
+    def _readLog(self) -> str:
+        if (self.logFile is None or not os.path.isfile(self.logFile)):
+            return ""
+
+        with open(self.logFile, "r", encoding = "utf-8", errors = "replace") as f:
+            return f.read()
+
+    # _writeSettings(): Adds the settings of the server to its configuration file
+    def _writeSettings(self):
+        settings = {**self.settings, "port": str(self.port), "listen_addresses": self.Host, "unix_socket_directories": self._folder}
+
+        with open(os.path.join(self.dataFolder, "postgresql.conf"), "a", encoding = "utf-8") as f:
+            f.write("\n")
+            for name, value in settings.items():
+                value = str(value).replace("'", "''")
+                f.write(f"{name} = '{value}'\n")
+
+    # _initDB(): Creates the data folder of the server
+    def _initDB(self):
+        passwordFile = os.path.join(self._folder, "password")
+        with open(passwordFile, "w", encoding = "utf-8") as f:
+            f.write(self.password)
+
+        try:
+            self._runBin("initdb", ["-D", self.dataFolder, "-U", self.username, f"--pwfile={passwordFile}", "-A", "scram-sha-256", "-E", "UTF8", "--no-sync"])
+        finally:
+            os.remove(passwordFile)
+
+    # start(): Creates and starts the server, then retrieves the secrets to connect to the server
+    def start(self) -> DBSecrets:
+        if (self._isRunning):
+            return self.secrets
+
+        if (hasattr(os, "geteuid") and os.geteuid() == 0):
+            raise PostgresLaunchError("Postgres cannot be ran as the root user. Run the program as a different user")
+
+        if (self.binFolder is None):
+            self.binFolder = self.findBinFolder()
+
+        if (self.port is None):
+            self.port = self.findFreePort()
+
+        self._folder = tempfile.mkdtemp(prefix = "ephemeral_postgres_")
+
+        try:
+            self._initDB()
+            self._writeSettings()
+            self._runBin("pg_ctl", ["start", "-D", self.dataFolder, "-l", self.logFile, "-w", "-t", str(self.startTimeout)])
+        except PostgresLaunchError as e:
+            log = self._readLog()
+
+            # the server can still be running when it did not start in time
+            self._isRunning = os.path.isfile(os.path.join(self.dataFolder, "postmaster.pid"))
+            self.stop()
+            raise PostgresLaunchError(f"{e}\n{log}" if (log) else str(e)) from e
+        except Exception:
+            self.stop()
+            raise
+
+        self._isRunning = True
+        return self.secrets
+
+    # _removeFolder(): Deletes the data folder and the log of the server
+    def _removeFolder(self):
+        if (self._folder is not None):
+            shutil.rmtree(self._folder, ignore_errors = True)
+            self._folder = None
+
+    # stop(): Stops the server and deletes all of its data
+    def stop(self):
+        # the data is thrown away, so the server does not need to write out its data before stopping
+        try:
+            if (self._isRunning):
+                self._runBin("pg_ctl", ["stop", "-D", self.dataFolder, "-m", "immediate", "-w"])
+        finally:
+            self._isRunning = False
+            self._removeFolder()
@@ -0,0 +1,355 @@
+import re
+import time
+import logging
+import threading
+import collections
+import logging.handlers
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, List, Any, Dict, Deque, Set
+
+from .DBTool import DBTool
+from .QueryRecord import QueryRecord
+
+
+# QueryStats: The latency and row count statistics of a single normalized SQL query
+class QueryStats():
+    def __init__(self, latencyWindow: int):
+        self.count = 0
+        self.errors = 0
+        self.totalTime = 0.0
+        self.maxTime = 0.0
+        self.totalRows = 0
+        self.slowCount = 0
+        self.latencies: Deque[float] = collections.deque(maxlen = latencyWindow)
+
+    # add(record, isSlow): Adds a query that finished running to the statistics
+    def add(self, record: QueryRecord, isSlow: bool):
+        self.count += 1
+        self.totalTime += record.duration
+        self.maxTime = max(self.maxTime, record.duration)
+        self.latencies.append(record.duration)
+
+        if (record.rowCount > 0):
+            self.totalRows += record.rowCount
+
+        if (record.error is not None):
+            self.errors += 1
+
+        if (isSlow):
+            self.slowCount += 1
+
+    # toSnapshot(): Retrieves the raw statistics, in a form that can be saved as JSON and merged with the statistics of other processes
+    def toSnapshot(self) -> Dict[str, Any]:
+        return {"count": self.count,
+                "errors": self.errors,
+                "totalTime": self.totalTime,
+                "maxTime": self.maxTime,
+                "totalRows": self.totalRows,
+                "slow": self.slowCount,
+                "latencies": list(self.latencies)}
+
+    # addSnapshot(snapshot): Adds the raw statistics of the same query from some other process
+    def addSnapshot(self, snapshot: Dict[str, Any]):
+        self.count += snapshot["count"]
+        self.errors += snapshot["errors"]
+        self.totalTime += snapshot["totalTime"]
+        self.maxTime = max(self.maxTime, snapshot["maxTime"])
+        self.totalRows += snapshot["totalRows"]
+        self.slowCount += snapshot["slow"]
+        self.latencies.extend(snapshot["latencies"])
+
+    # toDict(): Retrieves the statistics as a dictionary
+    def toDict(self) -> Dict[str, Any]:
+        latencies = sorted(self.latencies)
+        latencyCount = len(latencies)
+        percentile = lambda fraction: latencies[int(fraction * (latencyCount - 1))] if (latencyCount > 0) else 0.0
+
+        return {"count": self.count,
+                "errors": self.errors,
+                "slow": self.slowCount,
+                "totalTime": self.totalTime,
+                "avgTime": self.totalTime / self.count if (self.count > 0) else 0.0,
+                "p50Time": percentile(0.5),
+                "p95Time": percentile(0.95),
+                "p99Time": percentile(0.99),
+                "maxTime": self.maxTime,
+                "totalRows": self.totalRows,
+                "avgRows": self.totalRows / self.count if (self.count > 0) else 0.0}
+
+
+# QueryMonitor: Opt-in instrumentation for the SQL queries ran by a database tool.
+#   Keeps the latency and row count statistics of each query, logs the queries slower than some threshold
+#   with their parameters (without the values of the sensitive parameters, like passwords) and captures the plans of the
+#   slow queries in the background
+class QueryMonitor():
+    LatencyWindow = 1024
+
+    # the longest the parameters of a slow query can be in the log
+    MaxParamLength = 1000
+
+    # only these queries can be explained. They are ran again inside a transaction that gets rolled back
+    ExplainableKeywords = {"SELECT", "WITH", "INSERT", "UPDATE", "DELETE", "VALUES", "TABLE"}
+
+    # queries that change data or lock rows are only planned with EXPLAIN, never ran again with EXPLAIN ANALYZE
+    WritePattern = re.compile(r"\b(?:INSERT|UPDATE|DELETE|MERGE|SHARE)\b", flags = re.IGNORECASE)
+
+    # parameters whose values never go into the logs (eg. the 'passwrd' of R10 or the 'newPassword' of AF5)
+    SensitiveParamPattern = re.compile(r"pass|pwd|secret|token", flags = re.IGNORECASE)
+    RedactedValue = "<redacted>"
+
+    LiteralPattern = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+    ParamPattern = re.compile(r"%\(\w+\)s|%s|\$\d+")
+    WhitespacePattern = re.compile(r"\s+")
+    CommentPattern = re.compile(r"--[^\n]*")
+
+    # lists of values of different lengths (eg. 'IN (?, ?)' and 'IN (?, ?, ?)') are grouped together as 'IN (?)'
+    InListPattern = re.compile(r"\bIN\s*\(\s*\?(?:\s*,\s*\?)*\s*\)", flags = re.IGNORECASE)
+
+    def __init__(self, slowThreshold: float = 0.5, slowLogFile: Optional[str] = None, planLogFile: Optional[str] = None,
+                 explain: bool = True, explainTimeout: float = 30, explainCooldown: float = 300,
+                 maxLogBytes: int = 10 * 1024 * 1024, logBackups: int = 5):
+        self.slowThreshold = slowThreshold
+        self.explain = explain
+        self.explainTimeout = explainTimeout
+        self.explainCooldown = explainCooldown
+
+        self._lock = threading.Lock()
+        self._stats: Dict[str, QueryStats] = {}
+        self._lastExplained: Dict[str, float] = {}
+        self._pendingExplains: Set[str] = set()
+        self._dbTools: List[DBTool] = []
+        self._explainExecutor: Optional[ThreadPoolExecutor] = None
+
+        self._slowLogger = self._createLogger("slowQueries", slowLogFile, maxLogBytes, logBackups)
+        self._planLogger = self._createLogger("queryPlans", planLogFile, maxLogBytes, logBackups)
+
+    # _createLogger(name, file, maxBytes, backups): Creates the logger for the slow queries or the query plans.
+    #   The logs go to a rotating file if a file is given, otherwise they go to the standard error
+    def _createLogger(self, name: str, file: Optional[str], maxBytes: int, backups: int) -> logging.Logger:
+        logger = logging.getLogger(f"{__name__}.{name}.{id(self)}")
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+
+        if (file is not None):
+            handler = logging.handlers.RotatingFileHandler(file, maxBytes = maxBytes, backupCount = backups, encoding = "utf-8")
+        else:
+            handler = logging.StreamHandler()
+
+        handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+        logger.addHandler(handler)
+        return logger
+
+    # normalizeSQL(sql): Removes the comments, literals and parameters from some SQL, so queries that only differ by their values are grouped together
+    @classmethod
+    @lru_cache(maxsize = 1024)
+    def normalizeSQL(cls, sql: str) -> str:
+        sql = cls.CommentPattern.sub(" ", sql)
+
+        # the parameters go first, so the number of a positional parameter (eg. '$1') is not taken as a literal
+        sql = cls.ParamPattern.sub("?", sql)
+        sql = cls.LiteralPattern.sub("?", sql)
+        sql = cls.InListPattern.sub("IN (?)", sql)
+        sql = cls.WhitespacePattern.sub(" ", sql)
+        return sql.strip()
+
+    # getKey(record): Retrieves the key the statistics of some query are kept under
+    @classmethod
+    def getKey(cls, record: QueryRecord) -> str:
+        if (record.statement is not None):
+            return record.statement.name
+
+        return cls.normalizeSQL(record.sql)
+
+    # isExplainable(sql): Whether some query can be explained
+    @classmethod
+    def isExplainable(cls, sql: str) -> bool:
+        sql = cls.normalizeSQL(sql).rstrip(";").strip()
+        if (";" in sql or not sql):
+            return False
+
+        return sql.split(" ", 1)[0].upper() in cls.ExplainableKeywords
+
+    # canAnalyze(sql): Whether some explainable query can be ran again with EXPLAIN ANALYZE.
+    #   Running a write again would take row locks, fire the triggers and use up sequence values even though it gets rolled back,
+    #   so only the queries that do not change data (eg. a SELECT, or a WITH without an INSERT, UPDATE or DELETE) are analyzed
+    @classmethod
+    def canAnalyze(cls, sql: str) -> bool:
+        sql = cls.normalizeSQL(sql)
+        keyword = sql.split(" ", 1)[0].upper()
+        return keyword in {"SELECT", "WITH", "VALUES", "TABLE"} and cls.WritePattern.search(sql) is None
+
+    # redactVars(vars): Hides the values of the sensitive parameters of some query.
+    #   Positional parameters have no names to tell whether they are sensitive, so only their types are kept
+    @classmethod
+    def redactVars(cls, vars: Any) -> Any:
+        if (isinstance(vars, dict)):
+            return {name: cls.RedactedValue if (cls.SensitiveParamPattern.search(f"{name}")) else value for name, value in vars.items()}
+        elif (isinstance(vars, (list, tuple))):
+            return [type(value).__name__ for value in vars]
+
+        return vars
+
+    # formatVars(vars): Formats the parameters of some query for the log, without the values of the sensitive parameters
+    @classmethod
+    def formatVars(cls, vars: Any) -> str:
+        result = f"{cls.redactVars(vars)!r}"
+        if (len(result) > cls.MaxParamLength):
+            result = f"{result[:cls.MaxParamLength]}... ({len(result)} characters)"
+
+        return result
+
+    # attach(dbTool): Starts recording the queries ran by some database tool
+    def attach(self, dbTool: DBTool):
+        dbTool.addExecuteListener(self.record)
+        with self._lock:
+            self._dbTools.append(dbTool)
+
+    # detach(dbTool): Stops recording the queries ran by some database tool
+    def detach(self, dbTool: DBTool):
+        dbTool.removeExecuteListener(self.record)
+        with self._lock:
+            if (dbTool in self._dbTools):
+                self._dbTools.remove(dbTool)
+
+    # record(record): Adds a query that finished running to the statistics. Meant to be used as an execute listener of the database tool
+    def record(self, record: QueryRecord):
+        key = self.getKey(record)
+        isSlow = self.slowThreshold is not None and record.duration >= self.slowThreshold
+
+        with self._lock:
+            stats = self._stats.get(key)
+            if (stats is None):
+                stats = QueryStats(self.LatencyWindow)
+                self._stats[key] = stats
+
+            stats.add(record, isSlow)
+
+        if (not isSlow):
+            return
+
+        self._slowLogger.info(f"[SLOW QUERY] {record.duration * 1000:.1f}ms, {record.rowCount} rows, database: {record.database}, query: {key}, "
+                              f"params: {self.formatVars(record.namedVars())}" + ("" if (record.error is None) else f", error: {record.error}"))
+
+        if (self.explain and record.error is None):
+            self._scheduleExplain(key, record)
+
+    # _scheduleExplain(key, record): Captures the plan of some slow query in the background,
+    #   unless the plan of the query was already captured recently
+    def _scheduleExplain(self, key: str, record: QueryRecord):
+        sql = record.sourceSQL()
+        if (not self.isExplainable(sql)):
+            return
+
+        dbTool = self._findDBTool(record.database)
+        if (dbTool is None):
+            return
+
+        now = time.monotonic()
+        with self._lock:
+            lastExplained = self._lastExplained.get(key)
+            if (key in self._pendingExplains or (lastExplained is not None and now - lastExplained < self.explainCooldown)):
+                return
+
+            self._pendingExplains.add(key)
+            self._lastExplained[key] = now
+
+            if (self._explainExecutor is None):
+                self._explainExecutor = ThreadPoolExecutor(max_workers = 1, thread_name_prefix = "QueryMonitorExplain")
+
+            executor = self._explainExecutor
+
+        executor.submit(self._explain, dbTool, key, sql, record.namedVars())
+
+    # _findDBTool(database): Retrieves the attached database tool for some database
+    def _findDBTool(self, database: Optional[str]) -> Optional[DBTool]:
+        with self._lock:
+            for dbTool in self._dbTools:
+                if (dbTool.database == database):
+                    return dbTool
+
+        return None
+
+    # _explain(dbTool, key, sql, vars): Runs EXPLAIN (ANALYZE, BUFFERS) on some query that does not change data, or a plain EXPLAIN on
+    #   a query that does (see 'canAnalyze'), and writes the plan to the plan log.
+    #
+    #   The query is ran inside a transaction that is always rolled back. The plan is captured on its own connection instead of a connection
+    #   from the pool of the database tool, so the queries being served do not wait on the pool while the database is already slow
+    def _explain(self, dbTool: DBTool, key: str, sql: str, vars: Any):
+        explainOptions = "(ANALYZE, BUFFERS) " if (self.canAnalyze(sql)) else ""
+
+        try:
+            conn = dbTool.connectDB()
+
+            try:
+                cursor = conn.cursor()
+                cursor.execute("SET LOCAL statement_timeout = %s", [int(self.explainTimeout * 1000)])
+                cursor.execute(f"EXPLAIN {explainOptions}{sql}", vars = vars)
+                plan = "\n".join(map(lambda row: row[0], cursor.fetchall()))
+            finally:
+                conn.rollback()
+                conn.close()
+        except Exception as e:
+            plan = f"Unable to explain the query: {e}"
+
+        self._planLogger.info(f"[QUERY PLAN] query: {key}, params: {self.formatVars(vars)}, explain: EXPLAIN {explainOptions.strip()}\n{plan}\n")
+
+        with self._lock:
+            self._pendingExplains.discard(key)
+
+    # stats(): Retrieves the statistics of all the queries, slowest total time first
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            result = {key: stats.toDict() for key, stats in self._stats.items()}
+
+        return dict(sorted(result.items(), key = lambda item: item[1]["totalTime"], reverse = True))
+
+    # snapshot(): Retrieves the raw statistics of all the queries, in a form that can be saved as JSON and merged
+    #   with the statistics of the monitors of other processes (see 'mergeStats')
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return {key: stats.toSnapshot() for key, stats in self._stats.items()}
+
+    # mergeStats(snapshots): Retrieves the statistics of all the queries from the snapshots of many monitors, slowest total time first.
+    #   The percentiles are taken over the recent latencies of all the monitors
+    @classmethod
+    def mergeStats(cls, snapshots: List[Dict[str, Dict[str, Any]]]) -> Dict[str, Dict[str, Any]]:
+        merged: Dict[str, QueryStats] = {}
+        latencyWindow = cls.LatencyWindow * max(len(snapshots), 1)
+
+        for snapshot in snapshots:
+            for key, statsSnapshot in snapshot.items():
+                stats = merged.get(key)
+                if (stats is None):
+                    stats = QueryStats(latencyWindow)
+                    merged[key] = stats
+
+                stats.addSnapshot(statsSnapshot)
+
+        result = {key: stats.toDict() for key, stats in merged.items()}
+        return dict(sorted(result.items(), key = lambda item: item[1]["totalTime"], reverse = True))
+
+    # reset(): Clears all the statistics
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+            self._lastExplained.clear()
+
+    # stopExplains(): Waits for the plans being captured and stops the thread that captures the plans.
+    #   A new thread is started for the next slow query (eg. in a process forked after this call, since threads are not copied by a fork)
+    def stopExplains(self):
+        with self._lock:
+            executor = self._explainExecutor
+            self._explainExecutor = None
+
+        if (executor is not None):
+            executor.shutdown(wait = True)
+
+    # close(): Waits for the plans being captured and stops capturing plans
+    def close(self):
+        self.stopExplains()
+
+        for logger in [self._slowLogger, self._planLogger]:
+            for handler in list(logger.handlers):
+                handler.close()
+                logger.removeHandler(handler)
@@ -0,0 +1,27 @@
+from typing import Optional, List, Any, Dict, Union
+
+from .SQLRegistry import SQLStatement
+
+
+# QueryRecord: Information about some SQL query that finished running
+class QueryRecord():
+    def __init__(self, sql: str, vars: Optional[Union[List[Any], Dict[str, Any]]] = None, duration: float = 0, rowCount: int = -1,
+                 error: Optional[Exception] = None, statement: Optional[SQLStatement] = None, database: Optional[str] = None):
+        self.sql = sql
+        self.vars = vars
+        self.duration = duration
+        self.rowCount = rowCount
+        self.error = error
+        self.statement = statement
+        self.database = database
+
+    # namedVars(): Retrieves the values of the query with the names of their parameters, if the query came from a registered statement
+    def namedVars(self) -> Optional[Union[List[Any], Dict[str, Any]]]:
+        if (self.statement is None or isinstance(self.vars, dict) or self.vars is None):
+            return self.vars
+
+        return dict(zip(self.statement.paramNames, self.vars))
+
+    # sourceSQL(): Retrieves the SQL that can be ran again by itself with 'namedVars', instead of the EXECUTE of a prepared statement
+    def sourceSQL(self) -> str:
+        return self.sql if (self.statement is None) else self.statement.sql
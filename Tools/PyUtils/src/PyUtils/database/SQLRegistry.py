@@ -0,0 +1,287 @@
+import os
+import re
+import uuid
+import threading
+import weakref
+from psycopg2.extensions import connection
+from typing import Optional, List, Dict, Any, Tuple, Union
+
+from ..constants.FileEncodings import FileEncodings
+from ..constants.Paths import Paths
+from ..constants.StatementNames import StatementNames
+
+
+# SQLStatement: A named SQL statement that can be prepared on a connection.
+#
+#   Filters that are skipped when their parameter is NULL (eg. (%(name)s::TEXT IS NULL OR "roomName" = %(name)s))
+#   cannot use any index in the generic plan that Postgres switches to after a few executions of a prepared statement.
+#   So each combination of the given and missing parameters of these filters runs as its own variant of the statement
+#   (see 'SQLRegistry.getVariant'), with the filters of the missing parameters removed
+class SQLStatement():
+    ParamPattern = re.compile(r"%\((\w+)\)s")
+    CatchAllPattern = re.compile(r"\(\s*%\((\w+)\)s(?:::\w+)?\s+IS\s+NULL\s+OR\s+((?:[^()]|%\(\w+\)s)+?)\s*\)", flags = re.IGNORECASE)
+
+    def __init__(self, name: str, sql: str, version: int = 0, base: Optional["SQLStatement"] = None):
+        self.name = name
+        self.sql = sql
+        self.version = version
+        self.base = base
+        self.paramNames, self.positionalSQL = self.toPositional(sql)
+
+        # parameters of the filters that are skipped when the parameter is NULL
+        self.catchAllParams = list(dict.fromkeys(map(lambda match: match.group(1), self.CatchAllPattern.finditer(sql))))
+
+        executeParams = ", ".join(["%s"] * len(self.paramNames))
+        self.prepareSQL = f'PREPARE "{name}" AS {self.positionalSQL}'
+        self.executeSQL = f'EXECUTE "{name}"({executeParams})' if (self.paramNames) else f'EXECUTE "{name}"'
+        self.deallocateSQL = f'DEALLOCATE "{name}"'
+
+        self.hits = 0
+        self.prepares = 0
+
+        # names of the columns returned by the statement, found on its first fetch
+        self.columns: Optional[Tuple[str, ...]] = None
+
+    # toPositional(sql): Converts the psycopg2 named parameters (eg. %(name)s) of some SQL
+    #   to the $1, $2, ... positional parameters used by Postgres
+    @classmethod
+    def toPositional(cls, sql: str) -> Tuple[List[str], str]:
+        paramNames = []
+        paramInds = {}
+
+        def replaceParam(match: re.Match) -> str:
+            paramName = match.group(1)
+            paramInd = paramInds.get(paramName)
+
+            if (paramInd is None):
+                paramNames.append(paramName)
+                paramInd = len(paramNames)
+                paramInds[paramName] = paramInd
+
+            return f"${paramInd}"
+
+        positionalSQL = cls.ParamPattern.sub(replaceParam, sql)
+        positionalSQL = positionalSQL.replace("%%", "%").strip()
+        return (paramNames, positionalSQL)
+
+    # getVariantKey(vars): Retrieves which of the filters skipped on NULL parameters are used by some values.
+    #   Each filter is marked by '1' if its parameter is given or '0' if its parameter is NULL
+    def getVariantKey(self, vars: Optional[Dict[str, Any]] = None) -> str:
+        if (vars is None):
+            vars = {}
+
+        return "".join(map(lambda paramName: "0" if (vars.get(paramName) is None) else "1", self.catchAllParams))
+
+    # toVariantSQL(vars): Retrieves the SQL of the statement with the filters of the NULL parameters removed
+    #   and the filters of the given parameters always applied
+    def toVariantSQL(self, vars: Optional[Dict[str, Any]] = None) -> str:
+        if (vars is None):
+            vars = {}
+
+        def replaceFilter(match: re.Match) -> str:
+            return "TRUE" if (vars.get(match.group(1)) is None) else f"({match.group(2)})"
+
+        return self.CatchAllPattern.sub(replaceFilter, self.sql)
+
+    # adaptValue(value): Converts some value to a type psycopg2 can pass to Postgres
+    @classmethod
+    def adaptValue(cls, value: Any) -> Any:
+        if (isinstance(value, uuid.UUID)):
+            return str(value)
+        return value
+
+    # toValues(vars): Orders the named values to be used for the positional parameters
+    def toValues(self, vars: Optional[Dict[str, Any]] = None) -> Tuple[Any, ...]:
+        if (vars is None):
+            vars = {}
+
+        return tuple(map(lambda paramName: self.adaptValue(vars[paramName]), self.paramNames))
+
+    # toNamedValues(vars): Retrieves the named values to be used for the named parameters
+    def toNamedValues(self, vars: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        if (vars is None):
+            vars = {}
+
+        return {paramName: self.adaptValue(vars[paramName]) for paramName in self.paramNames}
+
+
+# SQLRegistry: Registry of all the SQL statements used by the features of the app.
+#   The SQL files are only read once and each statement is prepared lazily on
+#   the connections that executes it.
+#
+#   Re-registering a name bumps the version of the statement. Connections that still
+#   have an older version prepared will deallocate it the next time the statement runs on them
+class SQLRegistry():
+    FeatureFiles = {StatementNames.GetBuildings: os.path.join("GetBuildings", "GetBuildings.sql"),
+                    StatementNames.GetRoomsByBuildingID: os.path.join("R6", "GetRoomsByBuildingID.sql"),
+                    StatementNames.R6: os.path.join("R6", "R6.sql"),
+                    StatementNames.ActiveBookings: os.path.join("R6", "ActiveBookings.sql"),
+                    StatementNames.R7: os.path.join("R7", "R7.sql"),
+                    StatementNames.R8i: os.path.join("R8", "R8i.sql"),
+                    StatementNames.R8ii: os.path.join("R8", "R8ii.sql"),
+                    StatementNames.R9: os.path.join("R9", "R9.sql"),
+                    StatementNames.R10a: os.path.join("R10", "R10a.sql"),
+                    StatementNames.R10b: os.path.join("R10", "R10b.sql"),
+                    StatementNames.AF1: os.path.join("AF1", "AF1.sql"),
+                    StatementNames.AF2: os.path.join("AF2", "AF2.sql"),
+                    StatementNames.AF3AddRoom: os.path.join("AF3", "AddRoom.sql"),
+                    StatementNames.AF3EditRoom: os.path.join("AF3", "EditRoom.sql"),
+                    StatementNames.AF3DeleteRoom: os.path.join("AF3", "DeleteRoom.sql"),
+                    StatementNames.AF4AdminLog: os.path.join("AF4", "AdminLog.sql"),
+                    StatementNames.AF5a: os.path.join("AF5", "AF5a.sql"),
+                    StatementNames.AF5b: os.path.join("AF5", "AF5b.sql")}
+
+    DefaultRegistry: Optional["SQLRegistry"] = None
+
+    def __init__(self, featuresFolder: Optional[str] = None):
+        if (featuresFolder is None):
+            featuresFolder = Paths.SQLFeaturesFolder.value
+
+        self._featuresFolder = featuresFolder
+        self._statements: Dict[str, SQLStatement] = {}
+        self._variants: Dict[Tuple[str, str], SQLStatement] = {}
+        self._preparedConns: "weakref.WeakKeyDictionary[connection, Dict[str, int]]" = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    @property
+    def statements(self) -> Dict[str, SQLStatement]:
+        return self._statements
+
+    # getDefault(): Retrieves the registry shared by all tools that were not given their own registry
+    @classmethod
+    def getDefault(cls) -> "SQLRegistry":
+        if (cls.DefaultRegistry is None):
+            cls.DefaultRegistry = cls()
+            cls.DefaultRegistry.load()
+
+        return cls.DefaultRegistry
+
+    # _readFile(file): Reads the SQL from some file
+    def _readFile(self, file: str) -> str:
+        with open(file, mode = "r", encoding = FileEncodings.UTF8.value) as f:
+            return f.read()
+
+    # load(): Reads and registers all the SQL statements for the features
+    def load(self):
+        for statementName, file in self.FeatureFiles.items():
+            sql = self._readFile(os.path.join(self._featuresFolder, file))
+            self.register(statementName.value, sql)
+
+        # AF1 with a limit on the number of rooms returned
+        af1SQL = self._statements[StatementNames.AF1.value].sql.rstrip().rstrip(";")
+        self.register(StatementNames.AF1Limited.value, f"{af1SQL} LIMIT %(queryLimit)s;")
+
+    # register(name, sql): Registers some SQL statement by some name
+    def register(self, name: str, sql: str) -> SQLStatement:
+        with self._lock:
+            oldStatement = self._statements.get(name)
+            version = 0 if (oldStatement is None) else oldStatement.version + 1
+
+            statement = SQLStatement(name, sql, version = version)
+            self._statements[name] = statement
+
+        return statement
+
+    # get(name): Retrieves a registered statement
+    def get(self, name: Union[str, StatementNames]) -> SQLStatement:
+        if (isinstance(name, StatementNames)):
+            name = name.value
+
+        statement = self._statements.get(name)
+        if (statement is None):
+            raise KeyError(f"No SQL statement has been registered by the name '{name}'")
+
+        return statement
+
+    # getVariant(statement, vars): Retrieves the variant of a statement to run for some values. Statements without any filters
+    #   that are skipped on NULL parameters are their own variant
+    def getVariant(self, statement: SQLStatement, vars: Optional[Dict[str, Any]] = None) -> SQLStatement:
+        if (not statement.catchAllParams):
+            return statement
+
+        variantKey = (statement.name, statement.getVariantKey(vars))
+        with self._lock:
+            variant = self._variants.get(variantKey)
+            if (variant is None or variant.base is not statement):
+                variant = SQLStatement(f"{statement.name}:{variantKey[1]}", statement.toVariantSQL(vars), version = statement.version, base = statement)
+                self._variants[variantKey] = variant
+
+        return variant
+
+    # getSQL(name): Retrieves the SQL text of a registered statement
+    def getSQL(self, name: Union[str, StatementNames]) -> str:
+        return self.get(name).sql
+
+    # getPreparedVersion(conn, name): Retrieves the version of a statement that is prepared on some connection
+    def getPreparedVersion(self, conn: connection, name: str) -> Optional[int]:
+        with self._lock:
+            preparedVersions = self._preparedConns.get(conn)
+            return None if (preparedVersions is None) else preparedVersions.get(name)
+
+    # isPrepared(conn, statement): Whether the current version of a statement has already been prepared on some connection
+    def isPrepared(self, conn: connection, statement: SQLStatement) -> bool:
+        return self.getPreparedVersion(conn, statement.name) == statement.version
+
+    # isStale(conn, statement): Whether an older version of a statement is still prepared on some connection
+    def isStale(self, conn: connection, statement: SQLStatement) -> bool:
+        preparedVersion = self.getPreparedVersion(conn, statement.name)
+        return preparedVersion is not None and preparedVersion != statement.version
+
+    # prepare(conn, statement): Prepares a statement on some connection, if it has not been prepared already.
+    #   An older version of the statement on the connection gets deallocated first
+    def prepare(self, conn: connection, statement: SQLStatement):
+        if (self.isPrepared(conn, statement)):
+            return
+
+        cursor = conn.cursor()
+        if (self.isStale(conn, statement)):
+            cursor.execute(statement.deallocateSQL)
+            self.markDeallocated(conn, statement)
+
+        cursor.execute(statement.prepareSQL)
+        cursor.close()
+
+        self.markPrepared(conn, statement)
+
+    # markPrepared(conn, statement): Records that a statement got prepared on some connection
+    def markPrepared(self, conn: connection, statement: SQLStatement):
+        with self._lock:
+            preparedVersions = self._preparedConns.get(conn)
+            if (preparedVersions is None):
+                preparedVersions = {}
+                self._preparedConns[conn] = preparedVersions
+
+            preparedVersions[statement.name] = statement.version
+
+            # the prepares of the variants are counted for the statement they came from
+            baseStatement = statement if (statement.base is None) else statement.base
+            baseStatement.prepares += 1
+
+    # markDeallocated(conn, statement): Records that a statement is no longer prepared on some connection
+    def markDeallocated(self, conn: connection, statement: SQLStatement):
+        with self._lock:
+            preparedVersions = self._preparedConns.get(conn)
+            if (preparedVersions is not None):
+                preparedVersions.pop(statement.name, None)
+
+    # forget(conn): Forgets about all the statements prepared on some connection
+    def forget(self, conn: connection):
+        with self._lock:
+            self._preparedConns.pop(conn, None)
+
+    # recordHit(statement): Records that a statement was executed
+    def recordHit(self, statement: SQLStatement):
+        with self._lock:
+            statement.hits += 1
+
+    # getStats(): Retrieves the number of executions and prepares for each statement
+    def getStats(self) -> Dict[str, Dict[str, int]]:
+        with self._lock:
+            return {name: {"hits": statement.hits, "prepares": statement.prepares} for name, statement in self._statements.items()}
+
+    # resetStats(): Resets the execution and prepare counters of each statement
+    def resetStats(self):
+        with self._lock:
+            for statement in self._statements.values():
+                statement.hits = 0
+                statement.prepares = 0
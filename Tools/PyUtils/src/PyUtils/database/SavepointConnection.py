@@ -0,0 +1,62 @@
+import psycopg2.extensions
+from psycopg2.extensions import connection
+
+
+# SavepointConnection: Connection that can run inside an outer transaction that is never committed.
+#
+#   Once the outer transaction begins, 'commit' only releases a savepoint and 'rollback' only goes back to the last savepoint,
+#   so the code using the connection works the same as before, but all its changes are thrown away when the outer transaction ends.
+#   Make the connection with 'DBTool.connectDB(connectionFactory = SavepointConnection)'
+class SavepointConnection(connection):
+    SavepointName = "outer_transaction"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._inOuterTransaction = False
+
+    @property
+    def inOuterTransaction(self) -> bool:
+        return self._inOuterTransaction
+
+    # _runSQL(sql): Runs some SQL on the connection that gives back no rows
+    def _runSQL(self, sql: str):
+        cursor = self.cursor()
+        try:
+            cursor.execute(sql)
+        finally:
+            cursor.close()
+
+    # begin(): Begins the outer transaction
+    def begin(self):
+        if (self._inOuterTransaction):
+            raise psycopg2.ProgrammingError("The outer transaction of the connection has already begun")
+
+        if (self.info.transaction_status != psycopg2.extensions.TRANSACTION_STATUS_IDLE):
+            super().rollback()
+
+        self._runSQL(f"SAVEPOINT {self.SavepointName}")
+        self._inOuterTransaction = True
+
+    # end(): Ends the outer transaction by rolling back everything done since it began
+    def end(self):
+        self._inOuterTransaction = False
+        super().rollback()
+
+    def commit(self):
+        if (not self._inOuterTransaction):
+            super().commit()
+            return
+
+        # like Postgres, committing a failed transaction only rolls it back
+        if (self.info.transaction_status == psycopg2.extensions.TRANSACTION_STATUS_INERROR):
+            self.rollback()
+            return
+
+        self._runSQL(f"RELEASE SAVEPOINT {self.SavepointName}; SAVEPOINT {self.SavepointName}")
+
+    def rollback(self):
+        if (not self._inOuterTransaction):
+            super().rollback()
+            return
+
+        self._runSQL(f"ROLLBACK TO SAVEPOINT {self.SavepointName}")
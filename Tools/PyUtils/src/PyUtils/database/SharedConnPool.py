@@ -0,0 +1,34 @@
+import psycopg2.extensions
+from psycopg2.extensions import connection
+from psycopg2.pool import AbstractConnectionPool, PoolError
+
+
+# SharedConnPool: Pool that hands out the same connection to every caller, used by 'DBTool.shareConn' to run all the queries
+#   of a DBTool on a connection owned by someone else (eg. a test wrapped in a transaction).
+#
+#   Putting the connection back rolls back anything not committed, the same as DBConnPool, but never closes the connection
+class SharedConnPool(AbstractConnectionPool):
+    def __init__(self, conn: connection):
+        super().__init__(0, 1)
+        self._conn = conn
+
+    @property
+    def conn(self) -> connection:
+        return self._conn
+
+    def getconn(self, key = None) -> connection:
+        if (self.closed):
+            raise PoolError("connection pool is closed")
+
+        return self._conn
+
+    def putconn(self, conn: connection, key = None, close: bool = False):
+        if (conn is not self._conn):
+            raise PoolError("trying to put a connection that is not the shared connection")
+
+        if (conn.closed == 0 and conn.info.transaction_status != psycopg2.extensions.TRANSACTION_STATUS_IDLE):
+            conn.rollback()
+
+    # closeall(): Stops handing out the shared connection. The connection itself is closed by its owner
+    def closeall(self):
+        self.closed = True
@@ -0,0 +1,7 @@
+from psycopg2.pool import PoolError
+
+
+# PoolTimeout: Exception when a connection could not be retrieved from a connection pool in time
+class PoolTimeout(PoolError):
+    def __init__(self, message: str):
+        super().__init__(message)
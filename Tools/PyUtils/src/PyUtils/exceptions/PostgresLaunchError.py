@@ -0,0 +1,4 @@
+# PostgresLaunchError: Exception when a local Postgres server could not be set up, started or stopped
+class PostgresLaunchError(Exception):
+    def __init__(self, message: str):
+        super().__init__(message)
@@ -0,0 +1,141 @@
+import json
+import asyncio
+from typing import Optional, Dict, Any
+
+
+# HTTPResponse: The status, headers and body of a response to a HTTP request
+class HTTPResponse():
+    def __init__(self, status: int, headers: Dict[str, str], body: bytes):
+        self.status = status
+        self.headers = headers
+        self.body = body
+
+    # json(): Retrieves the body of the response as JSON
+    def json(self) -> Any:
+        return json.loads(self.body)
+
+
+# AsyncHTTPClient: A small asyncio HTTP/1.1 client that keeps a single connection to some server open,
+#   sending its requests one after the other through the connection.
+#
+#   Meant for generating load against the backend: it has no dependencies and is light enough for
+#   a single process to run thousands of clients at the same time
+class AsyncHTTPClient():
+    def __init__(self, host: str, port: int, timeout: float = 30):
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+
+    @property
+    def connected(self) -> bool:
+        return self._writer is not None
+
+    # connect(): Opens the connection to the server
+    async def connect(self):
+        self._reader, self._writer = await asyncio.wait_for(asyncio.open_connection(self.host, self.port), self.timeout)
+
+    # close(): Closes the connection to the server
+    def close(self):
+        if (self._writer is not None):
+            self._writer.close()
+
+        self._reader, self._writer = None, None
+
+    # readResponse(reader): Reads the status code, the headers and the body of a HTTP/1.1 response
+    @classmethod
+    async def readResponse(cls, reader: asyncio.StreamReader) -> HTTPResponse:
+        statusLine = await reader.readline()
+        if (not statusLine):
+            raise ConnectionError("The server closed the connection")
+
+        status = int(statusLine.split(b" ", 2)[1])
+        headers = {}
+
+        while (True):
+            line = await reader.readline()
+            if (line in (b"\r\n", b"\n", b"")):
+                break
+
+            name, value = line.decode("latin-1").split(":", 1)
+            headers[name.strip().lower()] = value.strip()
+
+        if (headers.get("transfer-encoding", "").lower() == "chunked"):
+            body = bytearray()
+            while (True):
+                chunkSize = int((await reader.readline()).split(b";", 1)[0], 16)
+                if (chunkSize == 0):
+                    await reader.readline()
+                    break
+
+                body += await reader.readexactly(chunkSize)
+                await reader.readline()
+
+            return HTTPResponse(status, headers, bytes(body))
+
+        return HTTPResponse(status, headers, await reader.readexactly(int(headers.get("content-length", 0))))
+
+    # _buildRequest(method, path, body, headers): Builds the bytes of a HTTP/1.1 request
+    def _buildRequest(self, method: str, path: str, body: bytes, headers: Dict[str, str]) -> bytes:
+        headerLines = [f"{method} {path} HTTP/1.1", f"Host: {self.host}:{self.port}", "Connection: keep-alive"]
+
+        if (body or method not in ("GET", "HEAD")):
+            headerLines.append(f"Content-Length: {len(body)}")
+
+        headerLines += map(lambda header: f"{header[0]}: {header[1]}", headers.items())
+        return ("\r\n".join(headerLines) + "\r\n\r\n").encode("latin-1") + body
+
+    # _send(request): Sends a request through the current connection and reads its response
+    async def _send(self, request: bytes) -> HTTPResponse:
+        self._writer.write(request)
+        response = await asyncio.wait_for(self.readResponse(self._reader), self.timeout)
+
+        if (response.headers.get("connection", "").lower() == "close"):
+            self.close()
+
+        return response
+
+    # request(method, path, body, jsonBody, headers): Sends a request to the server and retrieves its response.
+    #   The connection is opened again if the server closed the kept alive connection before the request could be sent.
+    #   The connection is closed on any error, so the next request starts on a new connection
+    async def request(self, method: str, path: str, body: Optional[bytes] = None, jsonBody: Any = None,
+                      headers: Optional[Dict[str, str]] = None) -> HTTPResponse:
+        headers = {} if (headers is None) else dict(headers)
+        if (jsonBody is not None):
+            body = json.dumps(jsonBody).encode("utf-8")
+            headers["Content-Type"] = "application/json"
+
+        request = self._buildRequest(method, path, b"" if (body is None) else body, headers)
+        reused = self.connected
+
+        try:
+            if (not reused):
+                await self.connect()
+
+            return await self._send(request)
+        except (ConnectionError, asyncio.IncompleteReadError) as e:
+            self.close()
+
+            # an idle kept alive connection may have been closed by the server
+            if (not reused or (isinstance(e, asyncio.IncompleteReadError) and e.partial)):
+                raise e
+        except BaseException:
+            self.close()
+            raise
+
+        try:
+            await self.connect()
+            return await self._send(request)
+        except BaseException:
+            self.close()
+            raise
+
+    # get(path, headers): Sends a GET request to the server
+    async def get(self, path: str, headers: Optional[Dict[str, str]] = None) -> HTTPResponse:
+        return await self.request("GET", path, headers = headers)
+
+    # post(path, jsonBody, headers): Sends a POST request with a JSON body to the server
+    async def post(self, path: str, jsonBody: Any = None, headers: Optional[Dict[str, str]] = None) -> HTTPResponse:
+        return await self.request("POST", path, jsonBody = jsonBody, headers = headers)
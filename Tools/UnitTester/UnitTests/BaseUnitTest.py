@@ -3,10 +3,11 @@ import os
 import json
 from pathlib import Path
 from unittest import mock
-from typing import Dict, TypeVar, Optional, Tuple, List, Any
+from typing import Dict, TypeVar, Optional, Tuple, List, Any, Callable
 
 import PyUtils as PU
 import UnitTester as UT
+import DataImporter as DI
 
 
 T = TypeVar("T")
@@ -36,11 +37,72 @@ class BaseUnitTest(unittest.TestCase, PatchService):
         UT.EnvironmentModes.Prod: "-production"
     }
 
+    # Whether each test runs in its own transaction that is rolled back at the end of the test.
+    #   The commits of the services under test only release a savepoint of the transaction, so the tests do not need to clean up after themselves
+    RollbackTests = False
+
+    BenchCommands = {UT.Commands.Bench, UT.Commands.ProduceBudgets}
+    PlanCommands = {UT.Commands.ProduceOutputs, UT.Commands.RunSuite}
+
     @classmethod
     def setUpClass(cls):
         cls.patches: Dict[str, mock.Mock] = {}
         cls.testFolder = ""
-        cls.dbTool = UT.Config[UT.ConfigKeys.DbTool]
+        cls.dbTool = cls.getDbTool()
+        cls.testConn: Optional[PU.SavepointConnection] = None
+
+        if (cls.RollbackTests):
+            cls.testConn = cls.dbTool.connectDB(connectionFactory = PU.SavepointConnection)
+
+    # getDbTool(): Retrieves the tool to the database that the tests of the class run against
+    @classmethod
+    def getDbTool(cls) -> PU.DBTool:
+        return UT.Config[UT.ConfigKeys.DbTool]
+
+    # importDbTool(suffix, sqlRegistry, **importKwargs): Imports the Toy Dataset into a new database named after the unit test database
+    #   (eg. unittest_toy_exclusion) and retrieves the tool to the database. For the test classes that need the database built differently.
+    #   The keyword arguments are passed to 'Importer.importData'. The ids are not random unless 'randomIDs' is set
+    @classmethod
+    def importDbTool(cls, suffix: str, sqlRegistry: Optional[PU.SQLRegistry] = None, **importKwargs) -> PU.DBTool:
+        unitTestDbTool = UT.Config[UT.ConfigKeys.DbTool]
+        secrets = unitTestDbTool._secrets
+        database = f"{unitTestDbTool.database}_{suffix}"
+
+        importer = DI.Importer(secrets, database = database)
+        PU.DBCleaner(importer).deleteDB(isSure = True, ifExists = True)
+        importKwargs.setdefault("randomIDs", False)
+        importer.importData(PU.Paths.ToyDatasetFolder.value, buildLevel = DI.ImportLevel.Database, **importKwargs)
+
+        return PU.DBTool(secrets, database = database, sqlRegistry = sqlRegistry)
+
+    # dropDbTool(): Deletes the database made by 'importDbTool'
+    @classmethod
+    def dropDbTool(cls):
+        PU.DBCleaner(cls.dbTool).deleteDB(isSure = True, ifExists = True)
+
+    @classmethod
+    def tearDownClass(cls):
+        if (cls.testConn is not None):
+            cls.testConn.close()
+            cls.testConn = None
+
+    def setUp(self):
+        if (self.testConn is None):
+            return
+
+        self.testConn.begin()
+        self.dbTool.shareConn(self.testConn)
+        self.addCleanup(self.rollbackTest)
+
+    # rollbackTest(): Rolls back all the changes made by a test
+    def rollbackTest(self):
+        self.dbTool.shareConn(None)
+        self.testConn.end()
+
+    # resetTest(): Rolls back all the changes made by a test so far, without ending the test
+    def resetTest(self):
+        self.testConn.end()
+        self.testConn.begin()
 
     # getTestFile(testName, fileExt, testFolder): Retrieves the 
     def getTestFile(self, testName: str, fileExt: str, testFolder: str) -> str:
@@ -116,6 +178,128 @@ class BaseUnitTest(unittest.TestCase, PatchService):
 
         print(result)
 
+    # getBudgetKey(testName, testFolder): Retrieves the key of a test in the budget file of its feature
+    def getBudgetKey(self, testName: str, testFolder: str) -> str:
+        return os.path.relpath(os.path.join(testFolder, testName), self.testFolder).replace(os.sep, "/")
+
+    # evalBudget(stats, testName, testFolder, command): Writes the statistics of the statements ran by a test to the budget file of its feature
+    #   or checks the statistics against the budget of the test
+    def evalBudget(self, stats: Dict[str, Dict[str, Any]], testName: str, testFolder: Optional[str] = None, command: Optional[UT.Commands] = None):
+        if (command is None):
+            command = UT.Config[UT.ConfigKeys.Command]
+
+        if (testFolder is None):
+            testFolder = self.testFolder
+
+        envMode = UT.Config[UT.ConfigKeys.EnvironmentMode]
+        budgetFile = UT.QueryBudgets.getFile(self.testFolder, self.FileSuffixes[envMode])
+        budgetKey = self.getBudgetKey(testName, testFolder)
+        budgets = UT.QueryBudgets.load(budgetFile)
+
+        print(UT.QueryBudgets.format(budgetKey, stats))
+
+        if (command == UT.Commands.ProduceBudgets):
+            budgets["tests"][budgetKey] = UT.QueryBudgets.toBudget(stats)
+            UT.QueryBudgets.save(budgetFile, budgets)
+            return
+
+        budget = budgets["tests"].get(budgetKey)
+        if (budget is None):
+            self.fail(f"No budget for the test, '{budgetKey}' in: {budgetFile}\nRun the '{UT.Commands.ProduceBudgets}' command to create the budget")
+
+        regressions = UT.QueryBudgets.compare(stats, budget, budgets.get("tolerances", {}))
+        if (regressions):
+            self.fail(f"The SQL of the test, '{budgetKey}' went over its budget:\n" + "\n".join(regressions))
+
+    # evalPlanFile(records, testName, testFolder, command): Writes the shapes of the plans of the SQL statements ran by a test to the .plan file
+    #   or checks the plans for regressions from the shapes in the .plan file
+    def evalPlanFile(self, records: Dict[str, PU.QueryRecord], testName: str, testFolder: Optional[str] = None, command: Optional[UT.Commands] = None):
+        if (command is None):
+            command = UT.Config[UT.ConfigKeys.Command]
+
+        if (testFolder is None):
+            testFolder = self.testFolder
+
+        planFile = self.getTestFile(testName, PU.FileExts.Plan.value, testFolder)
+        expectedShapes = {}
+        if (os.path.isfile(planFile)):
+            with open(planFile, "r", encoding = PU.FileEncodings.UTF8.value) as f:
+                expectedShapes = UT.PlanShapes.parseFile(f.read())
+
+        nodes = {}
+        explainErrors = []
+        for name, record in records.items():
+            try:
+                plan = UT.PlanShapes.explain(self.dbTool, record)
+            except Exception as e:
+                print(f"Unable to explain the plan of {name} for the test, '{testName}': {e}")
+                if (name in expectedShapes):
+                    explainErrors.append(f"{name}: unable to explain the plan ({e})")
+                continue
+
+            nodes[name] = UT.PlanShapes.toNodes(plan)
+
+        shapes = {name: UT.PlanShapes.toShape(planNodes) for name, planNodes in nodes.items()}
+
+        if (command == UT.Commands.ProduceOutputs):
+            if (shapes):
+                self.writeOutput(UT.PlanShapes.toFile(shapes), planFile)
+            return
+
+        # plans are only checked for the tests that have their shapes captured
+        if (command != UT.Commands.RunSuite or not expectedShapes):
+            return
+
+        seqScans = set()
+        for planNodes in nodes.values():
+            seqScans.update(UT.PlanShapes.getSeqScans(planNodes))
+
+        relationRows = UT.PlanShapes.getRelationRows(self.dbTool, seqScans)
+
+        regressions = explainErrors
+        for name, planNodes in nodes.items():
+            expectedShape = expectedShapes.get(name)
+            if (expectedShape is None):
+                continue
+
+            regressions += map(lambda regression: f"{name}: {regression}", UT.PlanShapes.compare(expectedShape, planNodes, relationRows = relationRows))
+            if (shapes[name] != expectedShape):
+                print(f"The plan of {name} for the test, '{testName}' changed from the plan in: {planFile}\n{shapes[name]}")
+
+        if (regressions):
+            self.fail(f"The plans of the test, '{testName}' regressed from the plans in: {planFile}\n" + "\n".join(regressions))
+
+    # runFeature(testName, func, *args, testFolder, **kwargs): Runs the call to a service tested by some test.
+    #   For the bench commands, the call is ran many times and the statistics of its SQL statements are evaluated against their budget.
+    #   Otherwise, the plans of its SQL statements are evaluated against the .plan file of the test
+    def runFeature(self, testName: str, func: Callable[..., T], *args, testFolder: Optional[str] = None, **kwargs) -> T:
+        command = UT.Config[UT.ConfigKeys.Command]
+
+        if (command in self.BenchCommands):
+            # only the tests that get rolled back can run a call that changes the database many times
+            reset = self.resetTest if (self.testConn is not None) else None
+
+            queryBench = UT.QueryBench(self.dbTool, iterations = UT.Config[UT.ConfigKeys.Iterations])
+            result, stats = queryBench.run(func, args = list(args), kwargs = kwargs, reset = reset)
+
+            self.evalBudget(stats, testName, testFolder = testFolder, command = command)
+            return result
+
+        elif (command not in self.PlanCommands):
+            return func(*args, **kwargs)
+
+        records: Dict[str, PU.QueryRecord] = {}
+        recordStatement = lambda record: records.update({record.statement.name: record}) if (record.statement is not None) else None
+
+        self.dbTool.addExecuteListener(recordStatement)
+        try:
+            result = func(*args, **kwargs)
+        finally:
+            self.dbTool.removeExecuteListener(recordStatement)
+
+        self.evalPlanFile(records, testName, testFolder = testFolder, command = command)
+        return result
+
     # evalOutFile(result, testName, testFolder, command): Evaluates an output file
     def evalOutFile(self, result: str, testName: str, testFolder: Optional[str] = None, command: Optional[UT.Commands] = None):
         if (command is None):
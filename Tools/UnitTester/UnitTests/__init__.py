@@ -1,9 +1,17 @@
 from .test_R6 import R6Test
-from .test_R7 import R7Test
+from .test_R7 import R7Test, R7ExclusionTest
 from .test_R8 import R8Test
 from .test_AF1 import AF1Test
 from .test_AF2 import AF2Test
 from .test_AF5 import AF5Test
+from .test_Partitions import PartitionTest
+from .test_Import import ClientIDsImportTest
+from .test_Migration import MigrationTest
+from .test_DateTimeParser import DateTimeParserTest
+from .test_DBConnPool import DBConnPoolTest
+from .test_RequestMetrics import RequestMetricsTest
+from .test_QueryMonitor import QueryMonitorTest
+from .test_SQLRegistry import SQLRegistryTest
 
 
-__all__ = ["R6Test", "R7Test", "R8Test", "AF1Test", "AF2Test", "AF5Test"]
\ No newline at end of file
+__all__ = ["R6Test", "R7Test", "R7ExclusionTest", "R8Test", "AF1Test", "AF2Test", "AF5Test", "PartitionTest", "ClientIDsImportTest", "MigrationTest", "DateTimeParserTest", "DBConnPoolTest", "RequestMetricsTest", "QueryMonitorTest", "SQLRegistryTest"]
\ No newline at end of file
@@ -31,7 +31,7 @@ class AF1Test(BaseUnitTest):
         if (args[2] is not None):
             args[2] = PU.DateTimeTool.strToDateTime(args[2], tzinfo = pytz.utc)
 
-        success, result = self.dashboardService.getBookingFrequency(*args, **kwargs)
+        success, result = self.runFeature(testName, self.dashboardService.getBookingFrequency, *args, **kwargs)
         resultStr = result
 
         if (success):
@@ -21,7 +21,7 @@ class AF2Test(BaseUnitTest):
     def runTest(self, testName: str):
         args, kwargs = self.parseArgs(testName)
 
-        success, result = self.dashboardService.getDashboardMetrics(*args, **kwargs)
+        success, result = self.runFeature(testName, self.dashboardService.getDashboardMetrics, *args, **kwargs)
         self.evalOutFile(f"{result}", testName)
 
     # ======================================================
@@ -11,6 +11,8 @@ from .BaseUnitTest import BaseUnitTest
 
 
 class AF5Test(BaseUnitTest):
+    RollbackTests = True
+
     @classmethod
     def setUpClass(cls):
         super().setUpClass()
@@ -20,63 +22,18 @@ class AF5Test(BaseUnitTest):
 
         cls.userService = BK.UserService(cls.dbTool)
 
-    def setUp(self):
-        self.userId: Optional[uuid.UUID] = None
-        self.oldUsername: Optional[str] = None
-        self.oldPassword: Optional[str] = None
-
-    def tearDown(self):
-        if (self.userId is None):
-            return
-        
-        if (self.oldUsername is not None):
-            self.revertUsernameChange()
-
-        if (self.oldPassword is not None):
-            self.revertPasswordChange()
-    
-    def revertUsernameChange(self):
-        sql = 'UPDATE "User" SET "username" = %(oldUsername)s WHERE "userID" = %(userID)s;'
-        self.dbTool.executeSQL(sql, vars = {"oldUsername": self.oldUsername, "userID": str(self.userId)}, commit = True)
-
-    def revertPasswordChange(self):
-        sql = 'UPDATE "User" SET "password" = %(oldPassword)s WHERE "userID" = %(userID)s;'
-        self.dbTool.executeSQL(sql, vars = {"oldPassword": self.oldPassword, "userID": str(self.userId)}, commit = True)
-
-    def getUsername(self, userId: uuid.UUID) -> Optional[str]:
-        sql = 'SELECT "username" FROM "User" WHERE "userID" = %(userID)s;'
-        connData, cursor, error = self.dbTool.executeSQL(sql, vars = {"userID": str(userId)})
-
-        if (cursor.rowcount == 0):
-            return None
-        return cursor.fetchone()[0]
-    
-    def getPassword(self, userId: uuid.UUID) -> Optional[str]:
-        sql = 'SELECT "password" FROM "User" WHERE "userID" = %(userID)s;'
-        connData, cursor, error = self.dbTool.executeSQL(sql, vars = {"userID": str(userId)})
-
-        if (cursor.rowcount == 0):
-            return None
-        return cursor.fetchone()[0]
-
     def runUsernameTest(self, testName: str):
         args, kwargs = self.loadArgs(testName, testFolder = self.usernameTestFolder)
         args[0] = uuid.UUID(args[0])
 
-        self.userId = args[0]
-        self.oldUsername = self.getUsername(self.userId)
-
-        success, msg = self.userService.updateUsername(*args, **kwargs)
+        success, msg = self.runFeature(testName, self.userService.updateUsername, *args, testFolder = self.usernameTestFolder, **kwargs)
         self.evalOutFile(msg, testName, testFolder = self.usernameTestFolder)
 
     def runPasswordTest(self, testName: str):
         args, kwargs = self.loadArgs(testName, testFolder = self.passwordTestFolder)
         args[0] = uuid.UUID(args[0])
 
-        self.userId = args[0]
-        self.oldPassword = self.getPassword(self.userId)
-
-        success, msg = self.userService.updatePassword(*args, **kwargs)
+        success, msg = self.runFeature(testName, self.userService.updatePassword, *args, testFolder = self.passwordTestFolder, **kwargs)
         self.evalOutFile(msg, testName, testFolder = self.passwordTestFolder)
 
     # ======================================================
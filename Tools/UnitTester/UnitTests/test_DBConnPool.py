@@ -0,0 +1,181 @@
+import time
+import threading
+import psycopg2.extensions
+from typing import Callable
+
+import PyUtils as PU
+
+from .BaseUnitTest import BaseUnitTest
+
+
+# FakeConnInfo: The connection info of some fake connection
+class FakeConnInfo():
+    transaction_status = psycopg2.extensions.TRANSACTION_STATUS_IDLE
+
+
+# FakeConnection: Connection that stands in for a connection to the database, so the pools can be tested without opening any real connections
+class FakeConnection():
+    def __init__(self, *args, **kwargs):
+        self.kwargs = kwargs
+        self.closed = 0
+        self.info = FakeConnInfo()
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        self.closed = 1
+
+
+# DBConnPoolTest: Tests the waiting, the limits and the resizing of the connection pools
+class DBConnPoolTest(BaseUnitTest):
+    Secrets = PU.DBSecrets(username = "unittest", password = "unittest", host = "localhost", port = "5432")
+
+    def setUp(self):
+        super().setUp()
+        self.patch("psycopg2.connect", side_effect = FakeConnection)
+
+    # createPool(minConn, maxConn, **poolKwargs): Creates a pool of fake connections
+    def createPool(self, minConn: int, maxConn: int, **poolKwargs) -> PU.DBConnPool:
+        pool = PU.DBConnPool(minConn, maxConn, **poolKwargs)
+        self.addCleanup(lambda: None if (pool.closed) else pool.closeall())
+        return pool
+
+    # startThread(func): Runs some function on another thread
+    def startThread(self, func: Callable[[], None]) -> threading.Thread:
+        thread = threading.Thread(target = func, daemon = True)
+        thread.start()
+        self.addCleanup(thread.join, 5)
+        return thread
+
+    # waitFor(condition, timeout): Waits until some condition is true
+    def waitFor(self, condition: Callable[[], bool], timeout: float = 5):
+        deadline = time.monotonic() + timeout
+        while (not condition()):
+            if (time.monotonic() > deadline):
+                self.fail("timed out waiting for the pool")
+
+            time.sleep(0.01)
+
+    # ======================================================
+
+    def test_getconn_timeout(self):
+        pool = self.createPool(0, 1, acquireTimeout = 0.1)
+        conn = pool.getconn()
+
+        startTime = time.monotonic()
+        with self.assertRaises(PU.PoolTimeout):
+            pool.getconn()
+
+        self.assertGreaterEqual(time.monotonic() - startTime, 0.1)
+        self.assertEqual(pool.stats()["timeouts"], 1)
+        self.assertEqual(pool.stats()["waiting"], 0)
+
+        pool.putconn(conn)
+        self.assertIs(pool.getconn(), conn)
+
+    def test_getconn_waitsForPutconn(self):
+        pool = self.createPool(0, 1, acquireTimeout = 5)
+        conn = pool.getconn()
+        result = {}
+
+        self.startThread(lambda: result.update(conn = pool.getconn()))
+        self.waitFor(lambda: pool.stats()["waiting"] == 1)
+        pool.putconn(conn)
+
+        self.waitFor(lambda: "conn" in result)
+        self.assertIs(result["conn"], conn)
+        self.assertEqual(pool.stats()["timeouts"], 0)
+
+    def test_getconn_maxWaitingRejected(self):
+        pool = self.createPool(0, 1, maxWaiting = 1, acquireTimeout = 5)
+        conn = pool.getconn()
+        result = {}
+
+        self.startThread(lambda: result.update(conn = pool.getconn()))
+        self.waitFor(lambda: pool.stats()["waiting"] == 1)
+
+        # the caller over the limit is rejected right away instead of waiting for the timeout
+        startTime = time.monotonic()
+        with self.assertRaises(PU.PoolTimeout):
+            pool.getconn()
+
+        self.assertLess(time.monotonic() - startTime, 1)
+        self.assertEqual(pool.stats()["rejected"], 1)
+
+        pool.putconn(conn)
+        self.waitFor(lambda: "conn" in result)
+        self.assertIs(result["conn"], conn)
+
+    def test_resize_growsAndShrinks(self):
+        pool = self.createPool(2, 4)
+        self.assertEqual(pool.stats()["idle"], 2)
+
+        pool.resize(minConn = 3)
+        self.assertEqual(pool.stats()["idle"], 3)
+
+        idleConns = list(pool._pool)
+        pool.resize(minConn = 0, maxConn = 1)
+
+        stats = pool.stats()
+        self.assertEqual((stats["idle"], stats["minConn"], stats["maxConn"]), (1, 0, 1))
+        self.assertEqual(sum(map(lambda conn: conn.closed, idleConns)), 2)
+
+    def test_resize_closesConnInUseOncePutBack(self):
+        pool = self.createPool(0, 2)
+        conns = [pool.getconn(), pool.getconn()]
+
+        pool.resize(maxConn = 1)
+        self.assertEqual(pool.stats()["inUse"], 2)
+
+        pool.putconn(conns[0])
+        pool.putconn(conns[1])
+
+        self.assertEqual(conns[0].closed, 1)
+        self.assertEqual(conns[1].closed, 0)
+        self.assertEqual(pool.stats()["idle"], 1)
+
+    def test_resize_wakesWaiters(self):
+        pool = self.createPool(0, 1, acquireTimeout = 5)
+        pool.getconn()
+        result = {}
+
+        self.startThread(lambda: result.update(conn = pool.getconn()))
+        self.waitFor(lambda: pool.stats()["waiting"] == 1)
+
+        pool.resize(maxConn = 2)
+        self.waitFor(lambda: "conn" in result)
+        self.assertEqual(pool.stats()["inUse"], 2)
+
+    # the pool settings reloaded on a SIGHUP are applied with 'resizeConnPools'
+    def test_resizeConnPools_appliesConfig(self):
+        dbTool = PU.DBTool(self.Secrets, useConnPool = True, poolConfig = PU.DBPoolConfig(minConn = 1, maxConn = 2))
+        self.addCleanup(dbTool.closeDBPools)
+        pool = dbTool.connPools[dbTool.database]
+
+        dbTool.resizeConnPools(PU.DBPoolConfig(minConn = 2, maxConn = 5, maxWaiting = 3, acquireTimeout = 1, maxAge = 60, prePing = True))
+
+        self.assertIs(dbTool.connPools[dbTool.database], pool)
+        self.assertEqual((pool.minconn, pool.maxconn, pool.maxWaiting, pool.acquireTimeout, pool.maxAge, pool.prePing), (2, 5, 3, 1, 60, True))
+        self.assertEqual(pool.stats()["idle"], 2)
+
+        defaultPool = dbTool.connPools[PU.DBNames.Default.value]
+        self.assertEqual((defaultPool.minconn, defaultPool.maxconn), (0, 5))
+
+    def test_resetAfterFork_newPools(self):
+        dbTool = PU.DBTool(self.Secrets, useConnPool = True, poolConfig = PU.DBPoolConfig(minConn = 1, maxConn = 4))
+        oldPools = dict(dbTool.connPools)
+        oldConn = dbTool.getConn().conn
+
+        dbTool.resetAfterFork(PU.DBPoolConfig(minConn = 1, maxConn = 2))
+        self.addCleanup(dbTool.closeDBPools)
+
+        for database, pool in dbTool.connPools.items():
+            self.assertIsNot(pool, oldPools[database])
+            self.assertEqual(pool.maxconn, 2)
+            self.assertEqual(pool.stats()["inUse"], 0)
+
+        # the connections copied from the parent process are left for the parent process to close
+        self.assertEqual(oldConn.closed, 0)
+        self.assertFalse(oldPools[dbTool.database].closed)
+        self.assertIsNot(dbTool.getConn().conn, oldConn)
@@ -0,0 +1,81 @@
+import numpy as np
+import pandas as pd
+from datetime import datetime
+from typing import List
+
+import PyUtils as PU
+
+from .BaseUnitTest import BaseUnitTest
+
+
+# DateTimeParserTest: Tests that the columns parsed by the DateTimeParser are the same as the columns parsed by trying each format
+#   over the whole column
+class DateTimeParserTest(BaseUnitTest):
+    Formats = PU.DateTimeTool.StrFormats
+    DateTimes = [datetime(2025, 7, 1, 9, 5, 0), datetime(2025, 12, 31, 23, 59, 59), datetime(2024, 2, 29, 0, 0, 0), datetime(2025, 7, 1, 9, 5, 0)]
+
+    # parseColumnByFormats(column): Converts a column of strings to datetimes with the first format that fits the whole column,
+    #   the way the columns were parsed before the DateTimeParser
+    @classmethod
+    def parseColumnByFormats(cls, column: pd.Series) -> pd.Series:
+        for format in cls.Formats:
+            try:
+                return pd.to_datetime(column, format = format)
+            except ValueError:
+                continue
+
+        return column
+
+    # toColumn(values, dtype): Makes a column of strings
+    @classmethod
+    def toColumn(cls, values: List[str], dtype = object) -> pd.Series:
+        return pd.Series(values, dtype = dtype, name = "dateTime")
+
+    # assertParsedSame(column, checkDtype): Checks that the DateTimeParser parses some column the same as trying each format over the whole column
+    def assertParsedSame(self, column: pd.Series, checkDtype: bool = True):
+        parser = PU.DateTimeParser(self.Formats)
+        expected = self.parseColumnByFormats(column)
+        pd.testing.assert_series_equal(parser.parseColumn(column), expected, check_dtype = checkDtype)
+
+        # the second time the format is already cached
+        pd.testing.assert_series_equal(parser.parseColumn(column), expected, check_dtype = checkDtype)
+
+    # ======================================================
+
+    def test_parseColumn_eachFormat(self):
+        for format in self.Formats:
+            with self.subTest(format = format):
+                self.assertParsedSame(self.toColumn([dateTime.strftime(format) for dateTime in self.DateTimes]))
+
+    def test_parseColumn_eachFormatWithNaN(self):
+        for format in self.Formats:
+            with self.subTest(format = format):
+                values = [dateTime.strftime(format) for dateTime in self.DateTimes]
+                self.assertParsedSame(self.toColumn([None] + values[:2] + [np.nan] + values[2:]))
+
+    def test_parseColumn_mixedFormats(self):
+        for format in self.Formats:
+            for otherFormat in self.Formats:
+                if (format == otherFormat):
+                    continue
+
+                with self.subTest(format = format, otherFormat = otherFormat):
+                    values = [dateTime.strftime(format) for dateTime in self.DateTimes[:2]] + [dateTime.strftime(otherFormat) for dateTime in self.DateTimes[2:]]
+                    self.assertParsedSame(self.toColumn(values))
+
+    def test_parseColumn_invalidValues(self):
+        for format in self.Formats:
+            with self.subTest(format = format):
+                values = [dateTime.strftime(format) for dateTime in self.DateTimes]
+                self.assertParsedSame(self.toColumn(values[:2] + ["not a datetime"] + values[2:]))
+                self.assertParsedSame(self.toColumn(values[:2] + ["2025-13-45 10:00:00"] + values[2:]))
+
+        self.assertParsedSame(self.toColumn(["not a datetime", "2025-07-01 10:00:00"]))
+
+    # the columns of Arrow strings are parsed by Arrow, which gives back datetimes in seconds instead of the unit of pandas
+    def test_parseColumn_arrowStrings(self):
+        for format in self.Formats:
+            with self.subTest(format = format):
+                values = [dateTime.strftime(format) for dateTime in self.DateTimes]
+                self.assertParsedSame(self.toColumn(values, dtype = "string[pyarrow]"), checkDtype = False)
+                self.assertParsedSame(self.toColumn(values[:2] + ["not a datetime"] + values[2:], dtype = "string[pyarrow]"), checkDtype = False)
@@ -0,0 +1,74 @@
+import numpy as np
+import pandas as pd
+from psycopg2.sql import SQL, Identifier
+from typing import Optional, Tuple
+
+import PyUtils as PU
+import DataImporter as DI
+
+from .BaseUnitTest import BaseUnitTest
+
+
+# ClientIDsImportTest: Tests a copy of the Toy Dataset imported with the random ids generated in Python (see 'clientIDs' of 'Importer.importData')
+class ClientIDsImportTest(BaseUnitTest):
+    Tables = [PU.TableNames.User.value, PU.TableNames.Buiding.value, PU.TableNames.Room.value,
+              PU.TableNames.Booking.value, PU.TableNames.Cancellation.value]
+
+    @classmethod
+    def getDbTool(cls) -> PU.DBTool:
+        return cls.importDbTool("clientids", randomIDs = True, clientIDs = True)
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.importer = DI.Importer(cls.dbTool._secrets, database = cls.dbTool.database)
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        cls.dropDbTool()
+
+    # fetchOne(sql, vars): Runs some SQL and retrieves its first row
+    def fetchOne(self, sql: str, vars: Optional[dict] = None) -> Optional[Tuple]:
+        connData, cursor, error = self.dbTool.executeSQL(sql, vars = vars, closeConn = False)
+        try:
+            return cursor.fetchone()
+        finally:
+            connData.putConn()
+
+    # countRows(table): Counts the rows in some table
+    def countRows(self, table: str) -> int:
+        sql = SQL("SELECT COUNT(*) FROM {table};").format(table = Identifier(table))
+        return self.fetchOne(sql)[0]
+
+    # ======================================================
+
+    def test_import_allRowsInserted(self):
+        for table in self.Tables:
+            with self.subTest(table = table):
+                expected = len(self.importer.readTable(PU.Paths.ToyDatasetFolder.value, table))
+                self.assertEqual(self.countRows(table), expected)
+
+    def test_import_idsGeneratedInPython(self):
+        sql = """SELECT COUNT(*) FROM "Booking" WHERE "bookingID"::TEXT LIKE '00000000-0000-0000-0000-%';"""
+        self.assertEqual(self.fetchOne(sql)[0], 0)
+
+    def test_import_cancellationsMatchBookings(self):
+        sql = """SELECT COUNT(*) FROM "Cancellation" AS ca
+                 JOIN "Booking" AS b ON b."bookingID" = ca."bookingID"
+                 WHERE b."isCancelled" AND b."bookStartDateTime" = ca."bookStartDateTime";"""
+
+        cancellations = self.countRows(PU.TableNames.Cancellation.value)
+        self.assertGreater(cancellations, 0)
+        self.assertEqual(self.fetchOne(sql)[0], cancellations)
+        self.assertEqual(self.fetchOne("""SELECT COUNT(*) FROM "Booking" WHERE "isCancelled";""")[0], cancellations)
+
+    def test_fillExistingBookingStartTimes_onlyExistingBookings(self):
+        bookingId, startTime = self.fetchOne("""SELECT "bookingID"::TEXT, "bookStartDateTime" FROM "Booking" ORDER BY "bookStartDateTime" LIMIT 1;""")
+        newStartTime = pd.Timestamp(2030, 1, 1, 9)
+
+        cancellationData = pd.DataFrame({PU.ColNames.BookingId.value: [bookingId, "new booking"],
+                                         PU.ColNames.BookingStartTime.value: pd.to_datetime([pd.NaT, newStartTime])})
+        cancellationData = self.importer.fillExistingBookingStartTimes(cancellationData, np.array([True, False]))
+
+        self.assertEqual(list(cancellationData[PU.ColNames.BookingStartTime.value]), [pd.Timestamp(startTime), newStartTime])
@@ -0,0 +1,66 @@
+from typing import Optional, Tuple
+
+import PyUtils as PU
+
+from .BaseUnitTest import BaseUnitTest
+
+
+# MigrationTest: Tests the migration of a database built before the bookings kept whether they are cancelled (see 'DBBuilder.migrate'),
+#   on a copy of the Toy Dataset with the migrated columns, indexes and triggers removed
+class MigrationTest(BaseUnitTest):
+    OldSchemaSQL = """DROP TRIGGER IF EXISTS syncBookingCancelled ON "Cancellation";
+                      ALTER TABLE "Booking" DROP COLUMN "isCancelled";
+                      ALTER TABLE "Cancellation" DROP COLUMN "bookStartDateTime";"""
+
+    @classmethod
+    def getDbTool(cls) -> PU.DBTool:
+        return cls.importDbTool("migration")
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.dbTool.executeSQL(cls.OldSchemaSQL, commit = True)
+        cls.dbBuilder = PU.DBBuilder(cls.dbTool)
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        cls.dropDbTool()
+
+    # fetchOne(sql, vars): Runs some SQL and retrieves its first row
+    def fetchOne(self, sql: str, vars: Optional[dict] = None) -> Optional[Tuple]:
+        connData, cursor, error = self.dbTool.executeSQL(sql, vars = vars, commit = True, closeConn = False)
+        try:
+            return cursor.fetchone()
+        finally:
+            connData.putConn()
+
+    # assertMigrated(): Checks that the columns of the migration are filled in and the indexes and triggers of the migration exist
+    def assertMigrated(self):
+        cancellations = self.fetchOne("""SELECT COUNT(*) FROM "Cancellation";""")[0]
+        self.assertGreater(cancellations, 0)
+        self.assertEqual(self.fetchOne("""SELECT COUNT(*) FROM "Booking" WHERE "isCancelled";""")[0], cancellations)
+
+        sql = """SELECT COUNT(*) FROM "Cancellation" AS c
+                 JOIN "Booking" AS b ON b."bookingID" = c."bookingID"
+                 WHERE b."isCancelled" AND c."bookStartDateTime" = b."bookStartDateTime";"""
+        self.assertEqual(self.fetchOne(sql)[0], cancellations)
+
+        sql = """SELECT COUNT(*) FROM pg_indexes WHERE tablename = 'Booking' AND indexname IN ('idx_active_room_time', 'idx_active_user_time');"""
+        self.assertEqual(self.fetchOne(sql)[0], 2)
+
+        sql = """SELECT COUNT(*) FROM pg_trigger WHERE NOT tgisinternal AND tgname IN ('syncbookingcancelled', 'validbooking', 'preventuseroverlap');"""
+        self.assertEqual(self.fetchOne(sql)[0], 3)
+
+    # ======================================================
+
+    def test_migrate_ranTwice(self):
+        self.dbBuilder.migrate()
+        self.assertMigrated()
+
+        self.dbBuilder.migrate()
+        self.assertMigrated()
+
+        # the rebuilt trigger keeps the bookings in sync with the cancellations
+        self.fetchOne("""DELETE FROM "Cancellation" RETURNING "bookingID";""")
+        self.assertEqual(self.fetchOne("""SELECT COUNT(*) FROM "Booking" WHERE "isCancelled";""")[0], 0)
@@ -0,0 +1,168 @@
+from datetime import datetime
+from psycopg2.sql import SQL, Identifier
+from typing import Optional, Tuple
+
+import PyUtils as PU
+
+from .BaseUnitTest import BaseUnitTest
+
+
+# PartitionTest: Tests the monthly partitions of the bookings and the cancellations on a copy of the Toy Dataset
+#   imported into the partitioned tables
+class PartitionTest(BaseUnitTest):
+    RollbackTests = True
+
+    UserId = "00000000-0000-0000-0000-000000000002"
+    RoomId = "00000000-0000-0000-0000-000000000001"
+
+    BookingTable = PU.TableNames.Booking.value
+    CancellationTable = PU.TableNames.Cancellation.value
+
+    @classmethod
+    def getDbTool(cls) -> PU.DBTool:
+        return cls.importDbTool("partitioned", partitioned = True)
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.partitioner = PU.DBPartitioner(cls.dbTool)
+        cls.dbCleaner = PU.DBCleaner(cls.dbTool)
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        cls.dropDbTool()
+
+    # fetchOne(sql, vars): Runs some SQL and retrieves its first row
+    def fetchOne(self, sql: str, vars: Optional[dict] = None) -> Optional[Tuple]:
+        connData, cursor, error = self.dbTool.executeSQL(sql, vars = vars, commit = True, closeConn = False)
+        try:
+            return cursor.fetchone()
+        finally:
+            connData.putConn()
+
+    # insertBooking(startTime, endTime): Inserts a booking and retrieves its id
+    def insertBooking(self, startTime: datetime, endTime: datetime) -> str:
+        sql = """INSERT INTO "Booking" ("userID", "roomID", "bookDateTime", "bookStartDateTime", "bookEndDateTime", "participants")
+                 VALUES (%(userID)s, %(roomID)s, %(bookDateTime)s, %(startTime)s, %(endTime)s, 3)
+                 RETURNING "bookingID"::TEXT;"""
+
+        vars = {"userID": self.UserId, "roomID": self.RoomId, "bookDateTime": datetime(2020, 1, 1), "startTime": startTime, "endTime": endTime}
+        return self.fetchOne(sql, vars = vars)[0]
+
+    # cancelBooking(bookingId): Inserts the cancellation of some booking
+    def cancelBooking(self, bookingId: str):
+        sql = """INSERT INTO "Cancellation" ("bookingID", "userID", "cancelDateTime", "bookStartDateTime")
+                 SELECT "bookingID", "userID", %(cancelDateTime)s, "bookStartDateTime" FROM "Booking" WHERE "bookingID" = %(bookingID)s
+                 RETURNING "bookingID";"""
+
+        self.fetchOne(sql, vars = {"bookingID": bookingId, "cancelDateTime": datetime(2020, 1, 2)})
+
+    # getPartitionOf(table, bookingId): Retrieves the name of the partition that holds the row of some booking in some table,
+    #   or None if the row does not exist
+    def getPartitionOf(self, table: str, bookingId: str) -> Optional[str]:
+        sql = SQL("""SELECT c.relname FROM {table} AS t
+                        JOIN pg_class AS c ON c.oid = t.tableoid
+                        WHERE t."bookingID" = %(bookingID)s;""").format(table = Identifier(table))
+
+        row = self.fetchOne(sql, vars = {"bookingID": bookingId})
+        return None if (row is None) else row[0]
+
+    # countRows(table): Counts the rows in some table or partition
+    def countRows(self, table: str) -> int:
+        sql = SQL("SELECT COUNT(*) FROM {table};").format(table = Identifier(table))
+        return self.fetchOne(sql)[0]
+
+    # ======================================================
+
+    def test_import_rowsInMonthPartitions(self):
+        sql = """SELECT COUNT(*) FROM "Booking" AS b
+                 JOIN pg_class AS c ON c.oid = b.tableoid
+                 WHERE c.relname <> 'Booking_' || to_char(b."bookStartDateTime", 'YYYY_MM');"""
+
+        self.assertGreater(self.countRows(self.BookingTable), 0)
+        self.assertEqual(self.fetchOne(sql)[0], 0)
+        self.assertEqual(self.countRows(self.partitioner.defaultPartitionName(self.BookingTable)), 0)
+
+        sql = """SELECT COUNT(*) FROM "Cancellation" AS ca
+                 JOIN pg_class AS c ON c.oid = ca.tableoid
+                 WHERE c.relname <> 'Cancellation_' || to_char(ca."bookStartDateTime", 'YYYY_MM');"""
+
+        self.assertGreater(self.countRows(self.CancellationTable), 0)
+        self.assertEqual(self.fetchOne(sql)[0], 0)
+        self.assertEqual(self.countRows(self.partitioner.defaultPartitionName(self.CancellationTable)), 0)
+
+    def test_createPartitions_acrossMonthBoundary(self):
+        createdMonths = self.partitioner.createPartitions(datetime(2035, 1, 15), datetime(2035, 2, 3))
+        self.assertEqual(createdMonths, [datetime(2035, 1, 1), datetime(2035, 2, 1)])
+        self.assertEqual(self.partitioner.createPartitions(datetime(2035, 1, 1), datetime(2035, 2, 1)), [])
+
+        januaryId = self.insertBooking(datetime(2035, 1, 31, 22, 0), datetime(2035, 1, 31, 22, 59))
+        februaryId = self.insertBooking(datetime(2035, 2, 1, 7, 0), datetime(2035, 2, 1, 8, 0))
+        self.cancelBooking(februaryId)
+
+        self.assertEqual(self.getPartitionOf(self.BookingTable, januaryId), "Booking_2035_01")
+        self.assertEqual(self.getPartitionOf(self.BookingTable, februaryId), "Booking_2035_02")
+        self.assertEqual(self.getPartitionOf(self.CancellationTable, februaryId), "Cancellation_2035_02")
+
+    def test_createPartitions_movesRowsFromDefault(self):
+        bookingId = self.insertBooking(datetime(2036, 3, 4, 9, 0), datetime(2036, 3, 4, 10, 0))
+        self.cancelBooking(bookingId)
+
+        self.assertEqual(self.getPartitionOf(self.BookingTable, bookingId), self.partitioner.defaultPartitionName(self.BookingTable))
+        self.assertEqual(self.getPartitionOf(self.CancellationTable, bookingId), self.partitioner.defaultPartitionName(self.CancellationTable))
+
+        self.partitioner.createPartitions(datetime(2036, 3, 1), datetime(2036, 3, 1))
+
+        self.assertEqual(self.getPartitionOf(self.BookingTable, bookingId), "Booking_2036_03")
+        self.assertEqual(self.getPartitionOf(self.CancellationTable, bookingId), "Cancellation_2036_03")
+
+    def test_ensureFuturePartitions_createsMonthsAhead(self):
+        createdMonths = self.partitioner.ensureFuturePartitions(monthsAhead = 2, now = datetime(2040, 11, 17))
+        self.assertEqual(createdMonths, [datetime(2040, 11, 1), datetime(2040, 12, 1), datetime(2041, 1, 1)])
+
+        bookingPartitions = self.partitioner.getPartitions(self.BookingTable)
+        cancellationPartitions = self.partitioner.getPartitions(self.CancellationTable)
+        for month in createdMonths:
+            self.assertIn(month, bookingPartitions)
+            self.assertIn(month, cancellationPartitions)
+
+        self.assertEqual(self.partitioner.ensureFuturePartitions(monthsAhead = 2, now = datetime(2040, 11, 30)), [])
+
+    def test_dropPartition_onlyDropsItsMonth(self):
+        self.partitioner.createPartitions(datetime(2035, 1, 1), datetime(2035, 2, 1))
+        januaryId = self.insertBooking(datetime(2035, 1, 31, 22, 0), datetime(2035, 1, 31, 22, 59))
+        februaryId = self.insertBooking(datetime(2035, 2, 1, 7, 0), datetime(2035, 2, 1, 8, 0))
+        self.cancelBooking(januaryId)
+
+        self.partitioner.dropPartition(datetime(2035, 1, 1))
+
+        self.assertNotIn(datetime(2035, 1, 1), self.partitioner.getPartitions(self.BookingTable))
+        self.assertNotIn(datetime(2035, 1, 1), self.partitioner.getPartitions(self.CancellationTable))
+        self.assertIsNone(self.getPartitionOf(self.BookingTable, januaryId))
+        self.assertIsNone(self.getPartitionOf(self.CancellationTable, januaryId))
+        self.assertEqual(self.getPartitionOf(self.BookingTable, februaryId), "Booking_2035_02")
+
+    def test_dropPartitionsBefore_dropsEndedMonths(self):
+        self.partitioner.createPartitions(datetime(2035, 1, 1), datetime(2035, 2, 1))
+        januaryId = self.insertBooking(datetime(2035, 1, 31, 22, 0), datetime(2035, 1, 31, 22, 59))
+        februaryId = self.insertBooking(datetime(2035, 2, 1, 7, 0), datetime(2035, 2, 1, 8, 0))
+        self.cancelBooking(februaryId)
+
+        monthsBefore = [month for month in self.partitioner.getPartitions(self.BookingTable) if (month < datetime(2035, 2, 1))]
+        droppedMonths = self.dbCleaner.dropPartitionsBefore(datetime(2035, 2, 1, 12, 0), isSure = True)
+
+        # February has not ended yet, so it is kept
+        self.assertEqual(droppedMonths, sorted(monthsBefore))
+        self.assertIn(datetime(2035, 1, 1), droppedMonths)
+        self.assertEqual(list(self.partitioner.getPartitions(self.BookingTable).keys()), [datetime(2035, 2, 1)])
+        self.assertEqual(list(self.partitioner.getPartitions(self.CancellationTable).keys()), [datetime(2035, 2, 1)])
+
+        self.assertIsNone(self.getPartitionOf(self.BookingTable, januaryId))
+        self.assertEqual(self.getPartitionOf(self.BookingTable, februaryId), "Booking_2035_02")
+        self.assertEqual(self.getPartitionOf(self.CancellationTable, februaryId), "Cancellation_2035_02")
+        self.assertEqual(self.countRows(self.BookingTable), 1)
+
+    def test_dropPartitionsBefore_notSure_raises(self):
+        with self.assertRaises(PU.AreYouSureError):
+            self.dbCleaner.dropPartitionsBefore(datetime(2035, 2, 1))
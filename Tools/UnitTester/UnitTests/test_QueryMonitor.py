@@ -0,0 +1,135 @@
+import os
+import json
+import tempfile
+
+import PyUtils as PU
+
+from .BaseUnitTest import BaseUnitTest
+
+
+# QueryMonitorTest: Tests the grouping of the queries by their normalized SQL, the hiding of the values of the queries in the logs
+#   and the merging of the statistics of many worker processes
+class QueryMonitorTest(BaseUnitTest):
+    # getTempFile(): Retrieves the path to a file in a temporary folder that is removed at the end of the test
+    def getTempFile(self) -> str:
+        folder = tempfile.TemporaryDirectory()
+        self.addCleanup(folder.cleanup)
+        return os.path.join(folder.name, "slow.log")
+
+    # createMonitor(**monitorKwargs): Creates a monitor that does not capture any plans and logs its slow queries into a temporary folder
+    def createMonitor(self, **monitorKwargs) -> PU.QueryMonitor:
+        if ("slowLogFile" not in monitorKwargs):
+            monitorKwargs["slowLogFile"] = self.getTempFile()
+
+        monitor = PU.QueryMonitor(explain = False, **monitorKwargs)
+        self.addCleanup(monitor.close)
+        return monitor
+
+    # ======================================================
+
+    def test_normalizeSQL_stringLiterals(self):
+        self.assertEqual(PU.QueryMonitor.normalizeSQL("""SELECT * FROM "User" WHERE "username" = 'Remilia' AND "email" = 'it''s@me.ca';"""),
+                         """SELECT * FROM "User" WHERE "username" = ? AND "email" = ?;""")
+
+    def test_normalizeSQL_numericLiterals(self):
+        self.assertEqual(PU.QueryMonitor.normalizeSQL('SELECT "capacity" * 1.5 FROM "Room" WHERE "capacity" > 10 LIMIT -5;'),
+                         'SELECT "capacity" * ? FROM "Room" WHERE "capacity" > ? LIMIT -?;')
+
+        # digits that are part of some name are kept
+        self.assertEqual(PU.QueryMonitor.normalizeSQL('SELECT "addressLine1" FROM "Booking_2025_07" AS b1;'),
+                         'SELECT "addressLine1" FROM "Booking_2025_07" AS b1;')
+
+    def test_normalizeSQL_uuidLiterals(self):
+        sql = """SELECT * FROM "Booking" WHERE "bookingID" = '{bookingId}'::UUID AND "userID" = '{userId}';"""
+        expected = """SELECT * FROM "Booking" WHERE "bookingID" = ?::UUID AND "userID" = ?;"""
+
+        self.assertEqual(PU.QueryMonitor.normalizeSQL(sql.format(bookingId = "00000000-0000-0000-0000-000000000001", userId = "deaddead-dead-dead-dead-deaddeaddead")),
+                         expected)
+        self.assertEqual(PU.QueryMonitor.normalizeSQL(sql.format(bookingId = "9f1c1a2e-3b4d-4c5e-8f60-718293a4b5c6", userId = "00000000-0000-0000-0000-000000000052")),
+                         expected)
+
+    def test_normalizeSQL_inLists(self):
+        expected = """SELECT * FROM "Room" WHERE "roomID" IN (?) AND "capacity" IN (?);"""
+
+        self.assertEqual(PU.QueryMonitor.normalizeSQL("""SELECT * FROM "Room" WHERE "roomID" IN ('a') AND "capacity" IN (1, 2, 3);"""), expected)
+        self.assertEqual(PU.QueryMonitor.normalizeSQL("""SELECT * FROM "Room" WHERE "roomID" in ( 'a', 'b' ) AND "capacity" IN (%s,%s);"""), expected)
+
+        # subqueries are not lists of values
+        self.assertEqual(PU.QueryMonitor.normalizeSQL('SELECT * FROM "Room" WHERE "roomID" IN (SELECT "roomID" FROM "Booking" LIMIT 3);'),
+                         'SELECT * FROM "Room" WHERE "roomID" IN (SELECT "roomID" FROM "Booking" LIMIT ?);')
+
+    def test_normalizeSQL_paramsAndComments(self):
+        sql = """-- find the bookings of a user
+                 SELECT *   FROM "Booking"
+                 WHERE "userID" = %(user_id)s AND "roomID" = %s AND "participants" > $12; -- over some number"""
+
+        self.assertEqual(PU.QueryMonitor.normalizeSQL(sql), 'SELECT * FROM "Booking" WHERE "userID" = ? AND "roomID" = ? AND "participants" > ?;')
+
+    def test_getKey_groupsSameQueries(self):
+        firstRecord = PU.QueryRecord("""SELECT * FROM "User" WHERE "userID" = '00000000-0000-0000-0000-000000000001' AND "permissionLevel" IN (1, 2);""")
+        secondRecord = PU.QueryRecord("""SELECT * FROM "User" WHERE "userID" = '00000000-0000-0000-0000-000000000002' AND "permissionLevel" IN (1);""")
+        self.assertEqual(PU.QueryMonitor.getKey(firstRecord), PU.QueryMonitor.getKey(secondRecord))
+
+        statement = PU.SQLStatement("R6", """SELECT * FROM "Room" WHERE "roomName" = %(roomName)s;""")
+        self.assertEqual(PU.QueryMonitor.getKey(PU.QueryRecord(statement.executeSQL, vars = ["PR1 1"], statement = statement)), "R6")
+
+    def test_redactVars(self):
+        vars = {"user_id": "00000000-0000-0000-0000-000000000001", "oldPassword": "hunter2", "passwrd": "hunter3", "apiToken": "abc"}
+        self.assertEqual(PU.QueryMonitor.redactVars(vars), {"user_id": "00000000-0000-0000-0000-000000000001", "oldPassword": PU.QueryMonitor.RedactedValue,
+                                                           "passwrd": PU.QueryMonitor.RedactedValue, "apiToken": PU.QueryMonitor.RedactedValue})
+
+        self.assertEqual(PU.QueryMonitor.redactVars(["hunter2", 3, None]), ["str", "int", "NoneType"])
+        self.assertEqual(PU.QueryMonitor.redactVars(None), None)
+
+        formattedVars = PU.QueryMonitor.formatVars({"roomName": "x" * 2 * PU.QueryMonitor.MaxParamLength})
+        self.assertTrue(formattedVars.endswith(f"... ({2 * PU.QueryMonitor.MaxParamLength + 16} characters)"))
+
+    def test_record_slowLogHidesValues(self):
+        slowLogFile = self.getTempFile()
+        monitor = self.createMonitor(slowThreshold = 0.1, slowLogFile = slowLogFile)
+        monitor.record(PU.QueryRecord("""SELECT * FROM "User" WHERE "username" = 'Remilia' AND "passwrd" = %(passwrd)s;""",
+                                      vars = {"passwrd": "hunter2"}, duration = 0.2, rowCount = 1, database = "toy"))
+        monitor.record(PU.QueryRecord("SELECT 1;", duration = 0.01))
+        monitor.close()
+
+        with open(slowLogFile, "r", encoding = "utf-8") as f:
+            log = f.read()
+
+        self.assertEqual(log.count("[SLOW QUERY]"), 1)
+        self.assertIn("""query: SELECT * FROM "User" WHERE "username" = ? AND "passwrd" = ?;""", log)
+        self.assertIn(PU.QueryMonitor.RedactedValue, log)
+        self.assertNotIn("Remilia", log)
+        self.assertNotIn("hunter2", log)
+
+    def test_mergeStats_workerSnapshots(self):
+        monitors = [self.createMonitor(slowThreshold = 0.5) for i in range(3)]
+        selectSQL = """SELECT * FROM "Room" WHERE "capacity" > {capacity};"""
+        insertSQL = """INSERT INTO "Cancellation" VALUES ('{bookingId}');"""
+
+        for i, duration in enumerate([0.1, 0.2, 0.3, 0.4]):
+            monitors[0].record(PU.QueryRecord(selectSQL.format(capacity = i), duration = duration, rowCount = 2))
+
+        monitors[1].record(PU.QueryRecord(selectSQL.format(capacity = 100), duration = 0.9, rowCount = 4))
+        monitors[1].record(PU.QueryRecord(insertSQL.format(bookingId = "00000000-0000-0000-0000-000000000001"), duration = 0.05, error = ValueError("failed")))
+        monitors[2].record(PU.QueryRecord(insertSQL.format(bookingId = "00000000-0000-0000-0000-000000000002"), duration = 0.05, rowCount = 1))
+
+        # the snapshots of the other workers are read back from JSON files
+        snapshots = list(map(lambda monitor: json.loads(json.dumps(monitor.snapshot())), monitors))
+        result = PU.QueryMonitor.mergeStats(snapshots)
+
+        selectKey = PU.QueryMonitor.normalizeSQL(selectSQL.format(capacity = 0))
+        insertKey = PU.QueryMonitor.normalizeSQL(insertSQL.format(bookingId = "x"))
+        self.assertEqual(list(result.keys()), [selectKey, insertKey])
+
+        selectStats = result[selectKey]
+        self.assertEqual((selectStats["count"], selectStats["errors"], selectStats["slow"], selectStats["totalRows"]), (5, 0, 1, 12))
+        self.assertAlmostEqual(selectStats["totalTime"], 1.9)
+        self.assertAlmostEqual(selectStats["avgTime"], 1.9 / 5)
+        self.assertEqual((selectStats["p50Time"], selectStats["maxTime"]), (0.3, 0.9))
+
+        insertStats = result[insertKey]
+        self.assertEqual((insertStats["count"], insertStats["errors"], insertStats["totalRows"]), (2, 1, 1))
+
+        # a single snapshot gives back the same statistics as the monitor itself
+        self.assertEqual(PU.QueryMonitor.mergeStats([monitors[0].snapshot()]), monitors[0].stats())
+        self.assertEqual(PU.QueryMonitor.mergeStats([]), {})
@@ -1,4 +1,5 @@
 import os
+import pytz
 from typing import Optional, Tuple, List, Dict, Any
 
 import PyUtils as PU
@@ -14,6 +15,10 @@ class R6Test(BaseUnitTest):
         cls.testFolder = os.path.join(PU.Paths.SQLFeaturesFolder.value, "R6", "tests")
         cls.roomService = BK.RoomService(cls.dbTool)
 
+        cls.availabilityIndex = BK.RoomAvailabilityIndex()
+        cls.availabilityIndex.load(cls.dbTool)
+        cls.indexedRoomService = BK.RoomService(cls.dbTool, availabilityIndex = cls.availabilityIndex)
+
     def parseArgs(self, testName: str, testFolder: Optional[str] = None) -> Tuple[List[Any], Dict[str, Any]]:
         args, kwargs = self.loadArgs(testName, testFolder = testFolder)
         return (args, kwargs)
@@ -21,7 +26,7 @@ class R6Test(BaseUnitTest):
     def runTest(self, testName: str):
         args, kwargs = self.parseArgs(testName)
 
-        availableRooms = self.roomService.fetchAvailableRooms(*args, **kwargs)
+        availableRooms = self.runFeature(testName, self.roomService.fetchAvailableRooms, *args, **kwargs)
 
         availableRoomsStr = []
         for roomData in availableRooms:
@@ -30,7 +35,23 @@ class R6Test(BaseUnitTest):
         availableRoomsStr = "\n".join(availableRoomsStr)
         self.evalOutFile(availableRoomsStr, testName)
 
+    def runIndexTest(self, testName: str):
+        args, kwargs = self.parseArgs(testName)
+
+        sqlRooms = self.roomService.fetchAvailableRooms(*args, **kwargs)
+        indexRooms = self.indexedRoomService.fetchAvailableRooms(*args, **kwargs)
+
+        sortKey = lambda roomData: f"{roomData['roomID']}"
+        self.assertEqual(sorted(indexRooms, key = sortKey), sorted(sqlRooms, key = sortKey))
+
+        startTime = PU.DateTimeTool.strToDateTime(kwargs["startTimeStr"], tzinfo = pytz.utc)
+        endTime = PU.DateTimeTool.strToDateTime(kwargs["endTimeStr"], tzinfo = pytz.utc)
+        self.assertEqual(self.availabilityIndex.findInconsistencies(self.dbTool, startTime, endTime), [])
+
     # ======================================================
 
     def test_allParametersSpecified_filteredRooms(self):
-        self.runTest("Public")
\ No newline at end of file
+        self.runTest("Public")
+
+    def test_availabilityIndex_sameRoomsAsSQL(self):
+        self.runIndexTest("Public")
\ No newline at end of file
@@ -9,35 +9,25 @@ from .BaseUnitTest import BaseUnitTest
 
 
 class R7Test(BaseUnitTest):
+    RollbackTests = True
+
     @classmethod
     def setUpClass(cls):
         super().setUpClass()
         cls.testFolder = os.path.join(PU.Paths.SQLFeaturesFolder.value, "R7", "tests")
         cls.bookingService = BK.BookingService(cls.dbTool)
 
-    def setUp(self):
-        self.bookingId = None
-
-    def tearDown(self):
-        if (self.bookingId is not None):
-            self.removeBooking(self.bookingId)
-
     def parseArgs(self, testName: str, testFolder: Optional[str] = None) -> Tuple[List[Any], Dict[str, Any]]:
         args, kwargs = self.loadArgs(testName, testFolder = testFolder)
         args[2] = PU.DateTimeTool.strToDateTime(args[2], tzinfo = pytz.utc)
         args[3] = PU.DateTimeTool.strToDateTime(args[3], tzinfo = pytz.utc)
 
         return (args, kwargs)
-    
-    def removeBooking(self, bookingId: str):
-        sql = 'DELETE FROM "Booking" WHERE "bookingID" = %(bookingID)s;'
-        self.dbTool.executeSQL(sql, vars = {"bookingID": bookingId}, commit = True)
 
     def runBookingTest(self, testName: str, convertUser: bool = True, convertRoom: bool = True):
         args, kwargs = self.parseArgs(testName)
 
-        success, msg, bookingId = self.bookingService.bookRoom(*args, **kwargs)
-        self.bookingId = bookingId
+        success, msg, bookingId = self.runFeature(testName, self.bookingService.bookRoom, *args, **kwargs)
 
         result = "Booking Successful!" if (success) else msg
         self.evalOutFile(result, testName)
@@ -69,4 +59,82 @@ class R7Test(BaseUnitTest):
         self.runBookingTest("BookingAlreadyPast")
 
     def test_roomOverCapacity_bookFailed(self):
-        self.runBookingTest("OverCapacity")
\ No newline at end of file
+        self.runBookingTest("OverCapacity")
+
+
+# R7ExclusionTest: Tests booking a room on a copy of the Toy Dataset whose bookings table has the
+#   exclusion constraint against overlapping bookings of the same room
+class R7ExclusionTest(BaseUnitTest):
+    RollbackTests = True
+
+    UserId = "00000000-0000-0000-0000-000000000002"
+    OtherUserId = "00000000-0000-0000-0000-000000000004"
+    RoomId = "00000000-0000-0000-0000-000000000003"
+    OtherRoomId = "00000000-0000-0000-0000-000000000004"
+
+    RoomNotAvailableMsg = "Room not available at this time"
+
+    # R7 without its own check for overlapping bookings, like a booking that raced another booking
+    #   of the same room, so only the exclusion constraint can stop the overlap
+    RaceCheck = "  AND NOT EXISTS (SELECT 1 FROM valid_booking)\n"
+
+    @classmethod
+    def getDbTool(cls) -> PU.DBTool:
+        sqlRegistry = PU.SQLRegistry()
+        sqlRegistry.load()
+
+        r7SQL = sqlRegistry.getSQL(PU.StatementNames.R7)
+        if (cls.RaceCheck not in r7SQL):
+            raise ValueError(f"The check for overlapping bookings is missing from R7: {r7SQL}")
+
+        sqlRegistry.register(PU.StatementNames.R7.value, r7SQL.replace(cls.RaceCheck, ""))
+        return cls.importDbTool("exclusion", sqlRegistry = sqlRegistry, bookingExclusion = True)
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.bookingService = BK.BookingService(cls.dbTool)
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        cls.dropDbTool()
+
+    def bookRoom(self, userId: str, roomId: str, startTime: str, endTime: str) -> Tuple[bool, str, Optional[str]]:
+        startTime = PU.DateTimeTool.strToDateTime(startTime, tzinfo = pytz.utc)
+        endTime = PU.DateTimeTool.strToDateTime(endTime, tzinfo = pytz.utc)
+        return self.bookingService.bookRoom(userId, roomId, startTime, endTime, 3)
+
+    # ======================================================
+
+    def test_overlappingBooking_roomNotAvailable(self):
+        success, msg, bookingId = self.bookRoom(self.UserId, self.RoomId, "2031-03-10 10:00:00", "2031-03-10 12:00:00")
+        self.assertTrue(success, msg)
+
+        success, msg, bookingId = self.bookRoom(self.OtherUserId, self.RoomId, "2031-03-10 11:00:00", "2031-03-10 13:00:00")
+        self.assertFalse(success)
+        self.assertEqual(msg, self.RoomNotAvailableMsg)
+
+    def test_adjacentBooking_bookSuccess(self):
+        success, msg, bookingId = self.bookRoom(self.UserId, self.RoomId, "2031-03-10 10:00:00", "2031-03-10 12:00:00")
+        self.assertTrue(success, msg)
+
+        success, msg, bookingId = self.bookRoom(self.OtherUserId, self.RoomId, "2031-03-10 12:00:00", "2031-03-10 13:00:00")
+        self.assertTrue(success, msg)
+
+    def test_overlappingBookingOtherRoom_bookSuccess(self):
+        success, msg, bookingId = self.bookRoom(self.UserId, self.RoomId, "2031-03-10 10:00:00", "2031-03-10 12:00:00")
+        self.assertTrue(success, msg)
+
+        success, msg, bookingId = self.bookRoom(self.OtherUserId, self.OtherRoomId, "2031-03-10 11:00:00", "2031-03-10 13:00:00")
+        self.assertTrue(success, msg)
+
+    def test_cancelledBooking_doesNotBlock(self):
+        success, msg, bookingId = self.bookRoom(self.UserId, self.RoomId, "2031-03-10 10:00:00", "2031-03-10 12:00:00")
+        self.assertTrue(success, msg)
+
+        success, msg = self.bookingService.cancelBooking(f"{bookingId}", self.UserId)
+        self.assertTrue(success, msg)
+
+        success, msg, bookingId = self.bookRoom(self.OtherUserId, self.RoomId, "2031-03-10 11:00:00", "2031-03-10 13:00:00")
+        self.assertTrue(success, msg)
@@ -7,28 +7,18 @@ from .BaseUnitTest import BaseUnitTest
 
 
 class R8Test(BaseUnitTest):
+    RollbackTests = True
+
     @classmethod
     def setUpClass(cls):
         super().setUpClass()
         cls.testFolder = os.path.join(PU.Paths.SQLFeaturesFolder.value, "R8", "tests")
         cls.bookingService = BK.BookingService(cls.dbTool)
 
-    def setUp(self):
-        self.bookingId = None
-
-    def tearDown(self):
-        if (self.bookingId is not None):
-            self.removeCancellation(self.bookingId)
-
-    def removeCancellation(self, bookingId: str):
-        sql = 'DELETE FROM "Cancellation" WHERE "bookingID" = %(bookingID)s;'
-        self.dbTool.executeSQL(sql, vars = {"bookingID": bookingId}, commit = True)
-
     def runCancelTest(self, testName: str):
         args, kwargs = self.loadArgs(testName)
 
-        success, msg = self.bookingService.cancelBooking(*args, **kwargs)
-        self.bookingId = args[0]
+        success, msg = self.runFeature(testName, self.bookingService.cancelBooking, *args, **kwargs)
 
         self.evalOutFile(msg, testName)
 
@@ -0,0 +1,163 @@
+import json
+import tempfile
+from unittest import mock
+from typing import Dict, Any, List
+
+import PyUtils as PU
+import Backend as BK
+
+from .BaseUnitTest import BaseUnitTest
+
+
+# RequestMetricsTest: Tests the '/metrics' text of the requests recorded by the metrics and the merging of the metrics of many worker processes
+class RequestMetricsTest(BaseUnitTest):
+    Route = ("/viewBuildings", "GET")
+    OtherRoute = ("/bookRoom", "POST")
+
+    # recordRequest(metrics, routeLabels, duration, dbDurations, status, responseSize): Records a request that took some number of seconds
+    #   and ran some database queries
+    def recordRequest(self, metrics: BK.RequestMetrics, routeLabels, duration: float, dbDurations: List[float], status: int = 200,
+                      responseSize: int = 100):
+        with mock.patch("time.perf_counter", side_effect = [0.0, duration]):
+            timer = metrics.startRequest(routeLabels)
+            for dbDuration in dbDurations:
+                metrics.recordQuery(PU.QueryRecord("SELECT 1", duration = dbDuration))
+
+            metrics.finishRequest(timer, status, responseSize = responseSize)
+            metrics.endRequest(timer)
+
+    # getPoolStats(inUse, acquires, latencyAvg, latencyP95): Makes the stats of a connection pool
+    @classmethod
+    def getPoolStats(cls, inUse: int, acquires: int, latencyAvg: float, latencyP95: float) -> Dict[str, Any]:
+        return {"inUse": inUse, "idle": 1, "waiting": 0, "pending": 0, "minConn": 1, "maxConn": 5, "acquires": acquires, "timeouts": 1,
+                "rejected": 0, "recycled": 0, "acquireLatencyAvg": latencyAvg, "acquireLatencyP95": latencyP95, "acquireLatencyMax": latencyP95 * 2}
+
+    # ======================================================
+
+    def test_histogram_toText(self):
+        histogram = BK.Histogram("test_seconds", "Some test histogram", ("route",), (0.1, 1, 0.5))
+        histogram.observe(0.05, ("/b",))
+        histogram.observe(0.5, ("/b",))
+        histogram.observe(3, ("/b",))
+        histogram.observe(0.1, ('/a"\\',))
+
+        expected = ['# HELP test_seconds Some test histogram',
+                    '# TYPE test_seconds histogram',
+                    'test_seconds_bucket{route="/a\\"\\\\",le="0.1"} 1',
+                    'test_seconds_bucket{route="/a\\"\\\\",le="0.5"} 1',
+                    'test_seconds_bucket{route="/a\\"\\\\",le="1.0"} 1',
+                    'test_seconds_bucket{route="/a\\"\\\\",le="+Inf"} 1',
+                    'test_seconds_sum{route="/a\\"\\\\"} 0.1',
+                    'test_seconds_count{route="/a\\"\\\\"} 1',
+                    'test_seconds_bucket{route="/b",le="0.1"} 1',
+                    'test_seconds_bucket{route="/b",le="0.5"} 2',
+                    'test_seconds_bucket{route="/b",le="1.0"} 2',
+                    'test_seconds_bucket{route="/b",le="+Inf"} 3',
+                    'test_seconds_sum{route="/b"} 3.55',
+                    'test_seconds_count{route="/b"} 3']
+
+        self.assertEqual(histogram.toText(), expected)
+
+    def test_toText_recordedRequests(self):
+        metrics = BK.RequestMetrics()
+        self.recordRequest(metrics, self.Route, 0.02, [0.005, 0.005])
+        self.recordRequest(metrics, self.Route, 0.3, [0.25], responseSize = 5000)
+        self.recordRequest(metrics, self.OtherRoute, 0.004, [], status = 400)
+        metrics.recordQuery(PU.QueryRecord("SELECT 1", error = ValueError("failed")))
+
+        lines = metrics.toText().splitlines()
+        labels = 'route="/viewBuildings",method="GET"'
+
+        expected = ['http_requests_total{route="/bookRoom",method="POST",status="400"} 1',
+                    f'http_requests_total{{{labels},status="200"}} 2',
+                    f'http_requests_in_flight{{{labels}}} 0',
+
+                    f'http_request_duration_seconds_bucket{{{labels},le="0.01"}} 0',
+                    f'http_request_duration_seconds_bucket{{{labels},le="0.025"}} 1',
+                    f'http_request_duration_seconds_bucket{{{labels},le="0.25"}} 1',
+                    f'http_request_duration_seconds_bucket{{{labels},le="0.5"}} 2',
+                    f'http_request_duration_seconds_bucket{{{labels},le="+Inf"}} 2',
+                    f'http_request_duration_seconds_sum{{{labels}}} {0.02 + 0.3!r}',
+                    f'http_request_duration_seconds_count{{{labels}}} 2',
+
+                    f'http_request_db_duration_seconds_bucket{{{labels},le="0.005"}} 0',
+                    f'http_request_db_duration_seconds_bucket{{{labels},le="0.01"}} 1',
+                    f'http_request_db_duration_seconds_bucket{{{labels},le="0.25"}} 2',
+
+                    f'http_request_db_queries_bucket{{{labels},le="0.0"}} 0',
+                    f'http_request_db_queries_bucket{{{labels},le="1.0"}} 1',
+                    f'http_request_db_queries_bucket{{{labels},le="2.0"}} 2',
+                    'http_request_db_queries_bucket{route="/bookRoom",method="POST",le="0.0"} 1',
+
+                    f'http_response_size_bytes_bucket{{{labels},le="256.0"}} 1',
+                    f'http_response_size_bytes_bucket{{{labels},le="4096.0"}} 1',
+                    f'http_response_size_bytes_bucket{{{labels},le="16384.0"}} 2',
+
+                    'db_query_errors_total 1']
+
+        for line in expected:
+            self.assertIn(line, lines)
+
+        # no pool stats are given, so no pool metrics are written
+        self.assertFalse(any(map(lambda line: line.startswith("db_pool_"), lines)))
+
+    def test_mergePoolStats(self):
+        poolStats = [{"toy": self.getPoolStats(2, 10, 0.1, 0.3), "postgres": self.getPoolStats(0, 0, 0, 0)},
+                     {"toy": self.getPoolStats(3, 30, 0.2, 0.4)},
+                     {"toy": self.getPoolStats(0, 0, 0, 0)}]
+
+        result = BK.RequestMetrics.mergePoolStats(poolStats)
+
+        self.assertEqual(set(result.keys()), {"toy", "postgres"})
+        self.assertEqual(result["postgres"], poolStats[0]["postgres"])
+
+        toyStats = result["toy"]
+        self.assertEqual((toyStats["inUse"], toyStats["idle"], toyStats["maxConn"], toyStats["acquires"], toyStats["timeouts"]), (5, 3, 15, 40, 3))
+        self.assertAlmostEqual(toyStats["acquireLatencyAvg"], (0.1 * 10 + 0.2 * 30) / 40)
+        self.assertEqual(toyStats["acquireLatencyP95"], 0.4)
+        self.assertEqual(toyStats["acquireLatencyMax"], 0.8)
+
+        # the stats given in are not changed
+        self.assertEqual(poolStats[0]["toy"]["inUse"], 2)
+
+    def test_toText_workerSnapshots(self):
+        workers = [BK.RequestMetrics(poolStats = lambda: {"toy": self.getPoolStats(1, 10, 0.1, 0.2)}),
+                   BK.RequestMetrics(poolStats = lambda: {"toy": self.getPoolStats(2, 30, 0.3, 0.5)})]
+
+        self.recordRequest(workers[0], self.Route, 0.02, [0.005])
+        self.recordRequest(workers[1], self.Route, 0.3, [0.25])
+        self.recordRequest(workers[1], self.OtherRoute, 0.004, [], status = 400)
+
+        # the snapshots of the other workers are read back from JSON files
+        workers[0].workerSnapshots = lambda: list(map(lambda worker: json.loads(json.dumps(worker.snapshot())), workers))
+        lines = workers[0].toText().splitlines()
+        labels = 'route="/viewBuildings",method="GET"'
+
+        expected = ['http_requests_total{route="/bookRoom",method="POST",status="400"} 1',
+                    f'http_requests_total{{{labels},status="200"}} 2',
+                    f'http_request_duration_seconds_bucket{{{labels},le="0.025"}} 1',
+                    f'http_request_duration_seconds_bucket{{{labels},le="0.5"}} 2',
+                    f'http_request_duration_seconds_count{{{labels}}} 2',
+                    'db_pool_in_use{database="toy"} 3',
+                    'db_pool_max_connections{database="toy"} 10',
+                    'db_pool_acquires_total{database="toy"} 40',
+                    'db_pool_timeouts_total{database="toy"} 2']
+
+        for line in expected:
+            self.assertIn(line, lines)
+
+    def test_workerMetrics_collect(self):
+        folder = tempfile.TemporaryDirectory()
+        self.addCleanup(folder.cleanup)
+
+        workers = [BK.RequestMetrics(), BK.RequestMetrics()]
+        self.recordRequest(workers[0], self.Route, 0.02, [])
+        self.recordRequest(workers[1], self.Route, 0.3, [])
+
+        workerMetrics = [BK.WorkerMetrics(folder.name, workerNum, lambda metrics = metrics: {"requests": metrics.snapshot()})
+                         for workerNum, metrics in enumerate(workers)]
+        workerMetrics[1].publish()
+
+        snapshots = workerMetrics[0].collect()
+        self.assertEqual(list(map(lambda snapshot: snapshot["requests"]["requests"], snapshots)),
+                         [[[*self.Route, "200", 1]], [[*self.Route, "200", 1]]])
@@ -0,0 +1,76 @@
+from unittest import mock
+
+import PyUtils as PU
+
+from .BaseUnitTest import BaseUnitTest
+
+
+# SQLRegistryTest: Tests the variants of the statements whose filters are skipped on NULL parameters
+class SQLRegistryTest(BaseUnitTest):
+    R6Vars = {"start_time": "2025-07-01 10:00:00", "end_time": "2025-07-01 12:00:00", "room_name": None, "min_capacity": 3, "max_capacity": None}
+
+    def setUp(self):
+        super().setUp()
+        self.sqlRegistry = PU.SQLRegistry()
+        self.sqlRegistry.load()
+
+    # ======================================================
+
+    def test_catchAllParams(self):
+        self.assertEqual(self.sqlRegistry.get(PU.StatementNames.R6).catchAllParams, ["room_name", "min_capacity", "max_capacity"])
+        self.assertEqual(self.sqlRegistry.get(PU.StatementNames.AF1).catchAllParams, ["startDateTime", "endDateTime"])
+        self.assertEqual(self.sqlRegistry.get(PU.StatementNames.AF1Limited).catchAllParams, ["startDateTime", "endDateTime"])
+        self.assertEqual(self.sqlRegistry.get(PU.StatementNames.GetRoomsByBuildingID).catchAllParams, ["building_id"])
+        self.assertEqual(len(self.sqlRegistry.get(PU.StatementNames.GetBuildings).catchAllParams), 7)
+
+        # statements without any of these filters are run as they are
+        r7Statement = self.sqlRegistry.get(PU.StatementNames.R7)
+        self.assertEqual(r7Statement.catchAllParams, [])
+        self.assertIs(self.sqlRegistry.getVariant(r7Statement, {}), r7Statement)
+
+    def test_getVariant_removesNullFilters(self):
+        statement = self.sqlRegistry.get(PU.StatementNames.R6)
+        variant = self.sqlRegistry.getVariant(statement, self.R6Vars)
+
+        self.assertEqual(variant.name, "R6:010")
+        self.assertIs(variant.base, statement)
+        self.assertNotIn("IS NULL", variant.sql)
+        self.assertIn('AND TRUE\n    AND (r."capacity" >= %(min_capacity)s)\n    AND TRUE;', variant.sql)
+        self.assertEqual(variant.paramNames, ["end_time", "start_time", "min_capacity"])
+        self.assertEqual(variant.toValues(self.R6Vars), ("2025-07-01 12:00:00", "2025-07-01 10:00:00", 3))
+
+        # the same parameters given reuse the same variant
+        self.assertIs(self.sqlRegistry.getVariant(statement, dict(self.R6Vars, min_capacity = 10)), variant)
+        self.assertEqual(self.sqlRegistry.getVariant(statement, dict(self.R6Vars, room_name = "PR%")).name, "R6:110")
+        self.assertEqual(self.sqlRegistry.getVariant(statement, dict(self.R6Vars, min_capacity = None)).name, "R6:000")
+
+    def test_getVariant_filtersWithCasts(self):
+        statement = self.sqlRegistry.get(PU.StatementNames.AF1)
+        variant = self.sqlRegistry.getVariant(statement, {"userId": "00000000-0000-0000-0000-000000000001", "startDateTime": None,
+                                                          "endDateTime": "2025-07-01 12:00:00"})
+
+        self.assertEqual(variant.name, "AF1:01")
+        self.assertIn('TRUE AND\n              (B1."bookStartDateTime" <= %(endDateTime)s)\n', variant.sql)
+        self.assertEqual(variant.paramNames, ["userId", "endDateTime"])
+
+    def test_getVariant_reregisteredStatement(self):
+        conn = mock.MagicMock()
+        cursor = conn.cursor.return_value
+
+        statement = self.sqlRegistry.get(PU.StatementNames.R6)
+        variant = self.sqlRegistry.getVariant(statement, self.R6Vars)
+        self.sqlRegistry.prepare(conn, variant)
+        self.sqlRegistry.prepare(conn, variant)
+        self.assertEqual(self.sqlRegistry.getStats()[statement.name]["prepares"], 1)
+
+        # the older variant prepared on the connection is deallocated before the new variant is prepared
+        newStatement = self.sqlRegistry.register(statement.name, statement.sql.replace(">=", ">"))
+        newVariant = self.sqlRegistry.getVariant(newStatement, self.R6Vars)
+        self.assertIsNot(newVariant, variant)
+        self.assertEqual((newVariant.name, newVariant.version), (variant.name, 1))
+        self.assertIn('(r."capacity" > %(min_capacity)s)', newVariant.sql)
+
+        cursor.reset_mock()
+        self.sqlRegistry.prepare(conn, newVariant)
+        self.assertEqual(cursor.execute.call_args_list, [mock.call('DEALLOCATE "R6:010"'), mock.call(newVariant.prepareSQL)])
+        self.assertEqual(self.sqlRegistry.getStats()[statement.name]["prepares"], 1)
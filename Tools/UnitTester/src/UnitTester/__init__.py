@@ -8,14 +8,17 @@ from .constants.GenericTypes import GenericTypes
 from .exceptions.InvalidCommand import InvalidCommand
 
 from .tools.TestFileTools import TestFileTools
+from .tools.QueryBench import QueryBench, QueryBudgets
+from .tools.PlanShapes import PlanShapes, PlanNode
 
 from .unitTester import UnitTester
 from .commandBuilder import CommandBuilder
 from .config import Config
 from .unitTestProgram import UnitTestProgram
+from .parallelTestRunner import ParallelTestRunner, WorkerTestResult
 
 
 __all__ = ["Commands", "ConfigKeys", "CommandOpts", "EnvironmentModes", "ShortCommandOpts", "GenericTypes",
            "InvalidCommand",
-           "TestFileTools",
-           "UnitTester", "CommandBuilder", "Config", "UnitTester", "UnitTestProgram"]
\ No newline at end of file
+           "TestFileTools", "QueryBench", "QueryBudgets", "PlanShapes", "PlanNode",
+           "UnitTester", "CommandBuilder", "Config", "UnitTester", "UnitTestProgram", "ParallelTestRunner", "WorkerTestResult"]
\ No newline at end of file
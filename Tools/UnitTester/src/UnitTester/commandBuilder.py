@@ -38,6 +38,9 @@ class CommandBuilder(PU.BaseCommandBuilder, Generic[GenericTypes.ConfigKey.value
         self._argParser.add_argument(ShortCommandOpts.DBPassword.value, CommandOpts.DBPassword.value, action='store', type=str, help=f"Override the password to the database")
         self._argParser.add_argument(ShortCommandOpts.DBHost.value, CommandOpts.DBHost.value, action='store', type=str, help=f"Override the host to the database")
         self._argParser.add_argument(ShortCommandOpts.DBPort.value, CommandOpts.DBPort.value, action='store', type=str, help=f"Override the port to the database")
+        self._argParser.add_argument(ShortCommandOpts.Workers.value, CommandOpts.Workers.value, action='store', type=int, help=f"The number of worker processes to run the test classes in parallel.\nEach worker runs against its own copy of the unit test database (default: 1)")
+        self._argParser.add_argument(ShortCommandOpts.Iterations.value, CommandOpts.Iterations.value, action='store', type=int, help=f"The number of times the '{Commands.Bench}' and '{Commands.ProduceBudgets}' commands run each test (default: 50)")
+        self._argParser.add_argument(ShortCommandOpts.Ephemeral.value, CommandOpts.Ephemeral.value, action='store_true', help=f"Run the tests against a new temporary Postgres server instead of the database in the secrets.\nThe unit test databases are imported into the server, and the server is deleted once the tests finish")
         
         self._argParser.add_argument("command", type=str, help=f"The command to run the unit tester.\n\nThe available commands are:\n{allCommands}")
         super()._addArguments()
@@ -86,9 +89,35 @@ class CommandBuilder(PU.BaseCommandBuilder, Generic[GenericTypes.ConfigKey.value
         secrets.host = host
         secrets.port = port
 
+    def _parseWorkers(self):
+        workers = self._args.workers
+        if (workers is None):
+            return
+
+        if (workers < 1):
+            raise ValueError(f"The number of workers, '{workers}' needs to be at least 1")
+        else:
+            self._configs[ConfigKeys.Workers] = workers
+
+    def _parseIterations(self):
+        iterations = self._args.iterations
+        if (iterations is None):
+            return
+
+        if (iterations < 1):
+            raise ValueError(f"The number of iterations, '{iterations}' needs to be at least 1")
+        else:
+            self._configs[ConfigKeys.Iterations] = iterations
+
+    def _parseEphemeral(self):
+        self._configs[ConfigKeys.Ephemeral] = self._args.ephemeral
+
     def parseArgs(self) -> argparse.Namespace:
         super().parseArgs()
         self._parseCommand()
         self._parseEnvironment()
         self._parseDBSecrets()
+        self._parseWorkers()
+        self._parseIterations()
+        self._parseEphemeral()
         return self._args
@@ -11,4 +11,7 @@ Config = {ConfigKeys.Command: Commands.RunSuite,
           ConfigKeys.DbTool: None,
           ConfigKeys.DbCleaner: None,
           ConfigKeys.EnvironmentMode: None,
-          ConfigKeys.UserDBSecrets: PU.DBSecrets()}
+          ConfigKeys.UserDBSecrets: PU.DBSecrets(),
+          ConfigKeys.Workers: 1,
+          ConfigKeys.Iterations: 50,
+          ConfigKeys.Ephemeral: False}
@@ -6,4 +6,7 @@ class CommandOpts(Enum):
     DBUserName = "--username"
     DBPassword = "--password"
     DBHost = "--host"
-    DBPort = "--port"
\ No newline at end of file
+    DBPort = "--port"
+    Workers = "--workers"
+    Iterations = "--iterations"
+    Ephemeral = "--ephemeral"
\ No newline at end of file
@@ -4,4 +4,6 @@ import PyUtils as PU
 class Commands(PU.StrEnum):
     RunSuite = "runSuite"
     ProduceOutputs = "produceOutputs"
-    PrintOutputs = "printOutputs"
\ No newline at end of file
+    PrintOutputs = "printOutputs"
+    Bench = "bench"
+    ProduceBudgets = "produceBudgets"
\ No newline at end of file
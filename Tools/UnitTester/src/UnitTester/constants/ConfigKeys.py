@@ -6,4 +6,7 @@ class ConfigKeys(PU.StrEnum):
     DbTool = "dbTool"
     DbCleaner = "dbCleaner"
     EnvironmentMode = "environmentMode"
-    UserDBSecrets = "userDBSecrets"
\ No newline at end of file
+    UserDBSecrets = "userDBSecrets"
+    Workers = "workers"
+    Iterations = "iterations"
+    Ephemeral = "ephemeral"
\ No newline at end of file
@@ -6,4 +6,7 @@ class ShortCommandOpts(Enum):
     DBUserName = "-u"
     DBPassword = "-p"
     DBHost = "-ho"
-    DBPort = "-po"
\ No newline at end of file
+    DBPort = "-po"
+    Workers = "-w"
+    Iterations = "-n"
+    Ephemeral = "-eph"
\ No newline at end of file
@@ -0,0 +1,210 @@
+import unittest
+import time
+import traceback
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Any, TextIO
+
+import PyUtils as PU
+
+from .config import Config
+from .constants.ConfigKeys import ConfigKeys
+from .constants.EnvironmentModes import EnvironmentModes
+
+
+# WorkerTestResult: The results of the tests ran by a worker, kept as strings so they can be sent back to the main process
+class WorkerTestResult(unittest.TestResult):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.statuses: List[str] = []
+        self.errorReports: List[List[str]] = []
+
+    def _addReport(self, flavour: str, test: unittest.TestCase, err):
+        self.errorReports.append([flavour, str(test), self._exc_info_to_string(err, test)])
+
+    def addSuccess(self, test: unittest.TestCase):
+        super().addSuccess(test)
+        self.statuses.append(".")
+
+    def addFailure(self, test: unittest.TestCase, err):
+        super().addFailure(test, err)
+        self.statuses.append("F")
+        self._addReport("FAIL", test, err)
+
+    def addError(self, test: unittest.TestCase, err):
+        super().addError(test, err)
+        self.statuses.append("E")
+        self._addReport("ERROR", test, err)
+
+    def addSubTest(self, test: unittest.TestCase, subtest: unittest.TestCase, err):
+        super().addSubTest(test, subtest, err)
+        if (err is None):
+            return
+
+        isFailure = issubclass(err[0], test.failureException)
+        self.statuses.append("F" if (isFailure) else "E")
+        self._addReport("FAIL" if (isFailure) else "ERROR", subtest, err)
+
+    def addSkip(self, test: unittest.TestCase, reason: str):
+        super().addSkip(test, reason)
+        self.statuses.append("s")
+
+    def addExpectedFailure(self, test: unittest.TestCase, err):
+        super().addExpectedFailure(test, err)
+        self.statuses.append("x")
+
+    def addUnexpectedSuccess(self, test: unittest.TestCase):
+        super().addUnexpectedSuccess(test)
+        self.statuses.append("u")
+
+    # toDict(): Retrieves the results that are sent back to the main process
+    def toDict(self) -> Dict[str, Any]:
+        return {"statuses": "".join(self.statuses),
+                "errorReports": self.errorReports,
+                "testsRun": self.testsRun,
+                "failures": len(self.failures),
+                "errors": len(self.errors),
+                "skipped": len(self.skipped),
+                "expectedFailures": len(self.expectedFailures),
+                "unexpectedSuccesses": len(self.unexpectedSuccesses)}
+
+
+# ParallelTestRunner: Runs the test classes of a suite across worker processes.
+#
+#   The unit test database of the environment is used as a template: each worker gets its own copy of the database made with
+#   'CREATE DATABASE ... TEMPLATE', so the tests that change the data of one worker never see the changes of another worker.
+#   A test class always runs whole in a single worker, so its 'setUpClass' only runs once. The copies are dropped after the run
+class ParallelTestRunner():
+    Separator1 = "=" * 70
+    Separator2 = "-" * 70
+
+    def __init__(self, secrets: PU.DBSecrets, workers: int, stream: TextIO, failfast: bool = False, buffer: bool = False):
+        self.secrets = secrets
+        self.workers = workers
+        self.stream = stream
+        self.failfast = failfast
+        self.buffer = buffer
+
+        self._dbTool = PU.DBTool(secrets, database = PU.DBNames.Default.value, useConnPool = False)
+
+    # getTestIds(suite): Retrieves the ids of all the tests in a suite
+    @classmethod
+    def getTestIds(cls, suite: unittest.TestSuite) -> List[str]:
+        result = []
+        for test in suite:
+            if (isinstance(test, unittest.TestSuite)):
+                result += cls.getTestIds(test)
+            else:
+                result.append(test.id())
+
+        return result
+
+    # splitTests(testIds, workers): Splits the tests into groups for each worker, by their test classes.
+    #   The largest classes are given out first, each to the worker with the least tests so far
+    @classmethod
+    def splitTests(cls, testIds: List[str], workers: int) -> List[List[str]]:
+        classes: Dict[str, List[str]] = {}
+        for testId in testIds:
+            classes.setdefault(testId.rsplit(".", 1)[0], []).append(testId)
+
+        groups = [[] for i in range(min(workers, len(classes)))]
+        for classTestIds in sorted(classes.values(), key = len, reverse = True):
+            min(groups, key = len).extend(classTestIds)
+
+        return groups
+
+    # getWorkerDBName(database, worker): Retrieves the name of the copy of the database for some worker
+    @classmethod
+    def getWorkerDBName(cls, database: str, worker: int) -> str:
+        return f"{database}_worker{worker}"
+
+    # createWorkerDBs(database, workers): Copies the unit test database for each worker
+    def createWorkerDBs(self, database: str, workers: int) -> List[str]:
+        dbBuilder = PU.DBBuilder(self._dbTool)
+        dbCleaner = PU.DBCleaner(self._dbTool)
+        workerDBs = []
+
+        for worker in range(workers):
+            workerDB = self.getWorkerDBName(database, worker)
+            dbCleaner.deleteDB(workerDB, isSure = True, ifExists = True)
+            dbBuilder.buildDB(workerDB, template = database)
+            workerDBs.append(workerDB)
+
+        return workerDBs
+
+    # dropWorkerDBs(workerDBs): Drops the copies of the unit test database
+    def dropWorkerDBs(self, workerDBs: List[str]):
+        dbCleaner = PU.DBCleaner(self._dbTool)
+        for workerDB in workerDBs:
+            dbCleaner.deleteDB(workerDB, isSure = True, ifExists = True)
+
+    # runWorker(secrets, database, configs, testIds, failfast, buffer): Runs some tests against a copy of the database in a worker process
+    @classmethod
+    def runWorker(cls, secrets: PU.DBSecrets, database: str, configs: Dict[ConfigKeys, Any], testIds: List[str],
+                  failfast: bool = False, buffer: bool = False) -> Dict[str, Any]:
+        dbTool = PU.DBTool(secrets, database = database, useConnPool = True)
+
+        Config.update(configs)
+        Config[ConfigKeys.DbTool] = dbTool
+        Config[ConfigKeys.DbCleaner] = PU.DBCleaner(dbTool)
+
+        result = WorkerTestResult()
+        result.failfast = failfast
+        result.buffer = buffer
+
+        try:
+            suite = unittest.TestLoader().loadTestsFromNames(testIds)
+            suite.run(result)
+        finally:
+            dbTool.closeDBPools()
+
+        return result.toDict()
+
+    # writeResults(results, duration): Writes out the results of all the workers in the same layout as unittest.TextTestRunner
+    def writeResults(self, results: List[Dict[str, Any]], duration: float):
+        self.stream.write("".join(result["statuses"] for result in results) + "\n")
+
+        for result in results:
+            for flavour, description, error in result["errorReports"]:
+                self.stream.write(f"{self.Separator1}\n{flavour}: {description}\n{self.Separator2}\n{error}\n")
+
+        testsRun = sum(result["testsRun"] for result in results)
+        self.stream.write(f"{self.Separator2}\nRan {testsRun} test{'s' if (testsRun != 1) else ''} in {duration:.3f}s "
+                          f"({len(results)} worker{'s' if (len(results) != 1) else ''})\n\n")
+
+        counts = {name: sum(result[name] for result in results) for name in ["failures", "errors", "skipped", "expectedFailures", "unexpectedSuccesses"]}
+        infos = [f"{name}={count}" for name, count in [("failures", counts["failures"]), ("errors", counts["errors"]), ("skipped", counts["skipped"]),
+                                                       ("expected failures", counts["expectedFailures"]),
+                                                       ("unexpected successes", counts["unexpectedSuccesses"])] if (count)]
+
+        wasSuccessful = counts["failures"] == 0 and counts["errors"] == 0 and counts["unexpectedSuccesses"] == 0
+        status = "OK" if (wasSuccessful) else "FAILED"
+        self.stream.write(f"{status} ({', '.join(infos)})\n" if (infos) else f"{status}\n")
+        self.stream.flush()
+
+    # run(suite, database, env): Runs the tests of a suite across the workers, against copies of some unit test database
+    def run(self, suite: unittest.TestSuite, database: str, env: EnvironmentModes):
+        groups = self.splitTests(self.getTestIds(suite), self.workers)
+        startTime = time.perf_counter()
+        results = []
+        workerDBs = []
+        configs = {ConfigKeys.Command: Config[ConfigKeys.Command], ConfigKeys.EnvironmentMode: env, ConfigKeys.Iterations: Config[ConfigKeys.Iterations]}
+
+        try:
+            workerDBs = self.createWorkerDBs(database, len(groups))
+
+            # the workers are spawned instead of forked, so they do not share the connections of the main process
+            with ProcessPoolExecutor(max_workers = len(groups), mp_context = multiprocessing.get_context("spawn")) as executor:
+                futures = [executor.submit(self.runWorker, self.secrets, workerDB, configs, testIds, self.failfast, self.buffer)
+                           for workerDB, testIds in zip(workerDBs, groups)]
+
+                for future, testIds in zip(futures, groups):
+                    try:
+                        results.append(future.result())
+                    except Exception as e:
+                        results.append({"statuses": "E", "errorReports": [["ERROR", f"worker running {', '.join(testIds)}", traceback.format_exc()]],
+                                        "testsRun": 1, "failures": 0, "errors": 1, "skipped": 0, "expectedFailures": 0, "unexpectedSuccesses": 0})
+        finally:
+            self.dropWorkerDBs(workerDBs)
+
+        self.writeResults(results, time.perf_counter() - startTime)
@@ -0,0 +1,202 @@
+import re
+from typing import Dict, List, Any, Optional, Set, Tuple, FrozenSet
+
+import PyUtils as PU
+
+
+# PlanNode: A single node in the shape of a query plan
+class PlanNode():
+    def __init__(self, depth: int, nodeType: str, joinType: Optional[str] = None, relation: Optional[str] = None,
+                 index: Optional[str] = None, rows: Optional[float] = None):
+        self.depth = depth
+        self.nodeType = nodeType
+        self.joinType = joinType
+        self.relation = relation
+        self.index = index
+        self.rows = rows
+
+    def __str__(self) -> str:
+        result = self.nodeType
+        if (self.joinType is not None and self.nodeType in PlanShapes.JoinNodeTypes):
+            result = f"{result} ({self.joinType})"
+        if (self.index is not None):
+            result = f"{result} using {self.index}"
+        if (self.relation is not None):
+            result = f"{result} on {self.relation}"
+
+        return f"{'  ' * self.depth}{result}"
+
+
+# PlanShapes: Tools for the shapes of the query plans of the SQL statements ran by a test.
+#
+#   The shape of a plan is the tree of its node types with the relations and indices they use, without any costs or row counts,
+#   so the shape only changes when Postgres picks a different plan. The shapes of a test are kept in the 'test-[dataset].plan' file of the test
+class PlanShapes():
+    JoinNodeTypes = {"Nested Loop", "Hash Join", "Merge Join"}
+
+    # the fewest estimated rows of a side of a nested loop for the nested loop to be over a large relation,
+    #   and the fewest rows of a relation for any sequential scan on the relation to be a regression
+    LargeRelationRows = 10000
+
+    NodePattern = re.compile(r"^(?P<indent>(?:  )*)(?P<nodeType>.+?)(?: \((?P<joinType>\w+)\))?(?: using (?P<index>\S+))?(?: on (?P<relation>\S+))?$")
+    SectionPattern = re.compile(r"^\[(?P<name>.+)\]$")
+
+    # explain(dbTool, record): Retrieves the JSON plan of some statement that was ran, without running the statement again.
+    #   Raises the error of the database if the statement could not be explained
+    @classmethod
+    def explain(cls, dbTool: PU.DBTool, record: PU.QueryRecord) -> Dict[str, Any]:
+        connData = dbTool.getConn()
+        conn = connData.getConn()
+
+        try:
+            cursor = conn.cursor()
+            cursor.execute(f"EXPLAIN (FORMAT JSON) {record.sourceSQL()}", vars = record.namedVars())
+            return cursor.fetchone()[0][0]["Plan"]
+        finally:
+            conn.rollback()
+            connData.putConn()
+
+    # getRelationRows(dbTool, relations): Retrieves the estimated number of rows in some relations.
+    #   Relations that were never analyzed by the database are left out
+    @classmethod
+    def getRelationRows(cls, dbTool: PU.DBTool, relations: Set[str]) -> Dict[str, float]:
+        if (not relations):
+            return {}
+
+        connData = dbTool.getConn()
+        conn = connData.getConn()
+
+        try:
+            cursor = conn.cursor()
+            cursor.execute("SELECT relname, reltuples FROM pg_class WHERE relname = ANY(%(relations)s) AND reltuples >= 0",
+                           vars = {"relations": sorted(relations)})
+            return {relation: float(rows) for relation, rows in cursor.fetchall()}
+        finally:
+            conn.rollback()
+            connData.putConn()
+
+    # toNodes(plan, depth): Retrieves all the nodes of a JSON plan, in the order they are printed
+    @classmethod
+    def toNodes(cls, plan: Dict[str, Any], depth: int = 0) -> List[PlanNode]:
+        result = [PlanNode(depth, plan["Node Type"], joinType = plan.get("Join Type"), relation = plan.get("Relation Name"),
+                           index = plan.get("Index Name"), rows = plan.get("Plan Rows"))]
+
+        for child in plan.get("Plans", []):
+            result += cls.toNodes(child, depth = depth + 1)
+
+        return result
+
+    # toShape(nodes): Retrieves the text of the shape of a plan
+    @classmethod
+    def toShape(cls, nodes: List[PlanNode]) -> str:
+        return "\n".join(map(str, nodes))
+
+    # parseShape(shape): Retrieves the nodes of the text of the shape of a plan
+    @classmethod
+    def parseShape(cls, shape: str) -> List[PlanNode]:
+        result = []
+        for line in shape.split("\n"):
+            match = cls.NodePattern.match(line)
+            if (not line.strip() or match is None):
+                continue
+
+            result.append(PlanNode(len(match.group("indent")) // 2, match.group("nodeType"), joinType = match.group("joinType"),
+                                   relation = match.group("relation"), index = match.group("index")))
+
+        return result
+
+    # toFile(shapes): Retrieves the text of a plan file for the shapes of the plans of each statement
+    @classmethod
+    def toFile(cls, shapes: Dict[str, str]) -> str:
+        return "\n\n".join(map(lambda item: f"[{item[0]}]\n{item[1]}", sorted(shapes.items()))) + "\n"
+
+    # parseFile(text): Retrieves the shapes of the plans of each statement in the text of a plan file
+    @classmethod
+    def parseFile(cls, text: str) -> Dict[str, str]:
+        result = {}
+        name = None
+        lines: List[str] = []
+
+        for line in text.split("\n"):
+            match = cls.SectionPattern.match(line)
+            if (match is None):
+                lines.append(line)
+                continue
+
+            if (name is not None):
+                result[name] = "\n".join(lines).strip("\n")
+
+            name = match.group("name")
+            lines = []
+
+        if (name is not None):
+            result[name] = "\n".join(lines).strip("\n")
+
+        return result
+
+    # getSeqScans(nodes): Retrieves the relations read by sequential scans
+    @classmethod
+    def getSeqScans(cls, nodes: List[PlanNode]) -> Set[str]:
+        return set(map(lambda node: node.relation, filter(lambda node: node.nodeType == "Seq Scan" and node.relation is not None, nodes)))
+
+    # _getIndices(nodes): Retrieves the indices used by the plan
+    @classmethod
+    def _getIndices(cls, nodes: List[PlanNode]) -> Set[str]:
+        return set(map(lambda node: node.index, filter(lambda node: node.index is not None, nodes)))
+
+    # _getSubtree(nodes, ind): Retrieves the nodes under some node
+    @classmethod
+    def _getSubtree(cls, nodes: List[PlanNode], ind: int) -> List[PlanNode]:
+        result = []
+        for node in nodes[ind + 1:]:
+            if (node.depth <= nodes[ind].depth):
+                break
+            result.append(node)
+
+        return result
+
+    # _getNestedLoops(nodes): Retrieves the relations under each nested loop, with the most estimated rows of the direct children of the loop
+    @classmethod
+    def _getNestedLoops(cls, nodes: List[PlanNode]) -> List[Tuple[FrozenSet[str], float]]:
+        result = []
+        for ind, node in enumerate(nodes):
+            if (node.nodeType != "Nested Loop"):
+                continue
+
+            subtree = cls._getSubtree(nodes, ind)
+            relations = frozenset(map(lambda child: child.relation, filter(lambda child: child.relation is not None, subtree)))
+            childRows = [child.rows for child in subtree if (child.depth == node.depth + 1 and child.rows is not None)]
+            result.append((relations, max(childRows, default = 0)))
+
+        return result
+
+    # compare(expectedShape, nodes, relationRows): Retrieves the descriptions of the regressions of a plan from its expected shape:
+    #   new sequential scans, sequential scans on large relations, new nested loops over large relations and indices that are not used anymore.
+    #
+    #   'relationRows' has the number of rows in the relations of the plan. A sequential scan on a large relation is a regression
+    #   even when the expected shape also has the scan, since the shape could have been captured on a dataset with small tables
+    @classmethod
+    def compare(cls, expectedShape: str, nodes: List[PlanNode], relationRows: Optional[Dict[str, float]] = None) -> List[str]:
+        if (relationRows is None):
+            relationRows = {}
+
+        expectedNodes = cls.parseShape(expectedShape)
+        expectedSeqScans = cls.getSeqScans(expectedNodes)
+        result = []
+
+        for relation in sorted(cls.getSeqScans(nodes)):
+            rows = relationRows.get(relation, 0)
+            if (rows >= cls.LargeRelationRows):
+                result.append(f"sequential scan on {relation} (about {rows:.0f} rows)")
+            elif (relation not in expectedSeqScans):
+                result.append(f"new sequential scan on {relation}")
+
+        expectedLoops = set(map(lambda loop: loop[0], cls._getNestedLoops(expectedNodes)))
+        for relations, rows in cls._getNestedLoops(nodes):
+            if (relations not in expectedLoops and rows >= cls.LargeRelationRows):
+                result.append(f"new nested loop over {', '.join(sorted(relations))} (about {rows:.0f} rows)")
+
+        for index in sorted(cls._getIndices(expectedNodes) - cls._getIndices(nodes)):
+            result.append(f"index {index} is not used anymore")
+
+        return result
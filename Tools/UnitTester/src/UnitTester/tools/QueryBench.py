@@ -0,0 +1,191 @@
+import os
+import json
+import statistics
+from typing import Dict, List, Any, Callable, Optional, Tuple
+
+import PyUtils as PU
+
+
+# QueryBench: Times the registered SQL statements ran by some call to a service, over many runs of the call.
+#
+#   Every statement ran by the call gets the median and p95 of its latency and the number of shared buffers it touched
+#   (the buffers hit in the cache plus the buffers read, so the number does not depend on how warm the cache is)
+class QueryBench():
+    def __init__(self, dbTool: PU.DBTool, iterations: int = 50, warmups: int = 5):
+        self.dbTool = dbTool
+        self.iterations = iterations
+        self.warmups = warmups
+
+        self._records: List[PU.QueryRecord] = []
+
+    # _record(record): Keeps the record of a registered statement that finished running
+    def _record(self, record: PU.QueryRecord):
+        if (record.statement is not None):
+            self._records.append(record)
+
+    # _runCall(func, reset, args, kwargs): Runs the call once, with the database put back to how it was before the call
+    def _runCall(self, func: Callable[..., Any], reset: Optional[Callable[[], None]], args: List[Any], kwargs: Dict[str, Any]) -> Any:
+        if (reset is not None):
+            reset()
+
+        return func(*args, **kwargs)
+
+    # explain(record, reset): Retrieves the number of shared buffers touched by a statement from its EXPLAIN (ANALYZE, BUFFERS) plan.
+    #   The statement is ran inside a transaction that gets rolled back, so any changes made by the statement are undone.
+    #
+    #   A statement that raised an error when it ran has no plan to measure, so its number of buffers is None.
+    #   Any other statement that cannot be explained raises the error of the database
+    def explain(self, record: PU.QueryRecord, reset: Optional[Callable[[], None]] = None) -> Optional[int]:
+        if (record.error is not None):
+            return None
+
+        if (reset is not None):
+            reset()
+
+        connData = self.dbTool.getConn()
+        conn = connData.getConn()
+
+        try:
+            cursor = conn.cursor()
+            cursor.execute(f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {record.sourceSQL()}", vars = record.namedVars())
+            plan = cursor.fetchone()[0][0]["Plan"]
+        finally:
+            conn.rollback()
+            connData.putConn()
+
+        return plan.get("Shared Hit Blocks", 0) + plan.get("Shared Read Blocks", 0)
+
+    # run(func, args, kwargs, reset): Runs some call to a service many times and retrieves the result of the last run with
+    #   the statistics of each statement ran by the call. 'reset' puts back the database to how it was before the call
+    def run(self, func: Callable[..., Any], args: Optional[List[Any]] = None, kwargs: Optional[Dict[str, Any]] = None,
+            reset: Optional[Callable[[], None]] = None) -> Tuple[Any, Dict[str, Dict[str, Any]]]:
+        if (args is None):
+            args = []
+
+        if (kwargs is None):
+            kwargs = {}
+
+        result = None
+        for i in range(self.warmups):
+            result = self._runCall(func, reset, args, kwargs)
+
+        self._records = []
+        self.dbTool.addExecuteListener(self._record)
+
+        try:
+            for i in range(self.iterations):
+                result = self._runCall(func, reset, args, kwargs)
+        finally:
+            self.dbTool.removeExecuteListener(self._record)
+
+        latencies: Dict[str, List[float]] = {}
+        lastRecords: Dict[str, PU.QueryRecord] = {}
+        for record in self._records:
+            latencies.setdefault(record.statement.name, []).append(record.duration)
+            lastRecords[record.statement.name] = record
+
+        stats = {}
+        for name, durations in latencies.items():
+            durations.sort()
+            stats[name] = {"runs": len(durations),
+                           "medianTime": statistics.median(durations),
+                           "p95Time": durations[int(0.95 * (len(durations) - 1))],
+                           "buffers": self.explain(lastRecords[name], reset = reset)}
+
+        if (reset is not None):
+            reset()
+
+        return (result, stats)
+
+
+# QueryBudgets: The committed timing budgets of the statements ran by the tests of a feature.
+#
+#   Each feature has a budget file for each dataset, next to the folders of its tests. The file keeps the budget of each test
+#   and the tolerances the statements of the tests can go over their budgets before they are considered to have regressed
+class QueryBudgets():
+    # the statistics can go up to 'timeTolerance' times their budgeted time plus 'minTimeSlackMs' milliseconds,
+    #   and up to 'bufferTolerance' times their budgeted number of buffers plus 'minBufferSlack' buffers
+    DefaultTolerances = {"timeTolerance": 2.0, "minTimeSlackMs": 2, "bufferTolerance": 1.25, "minBufferSlack": 10}
+
+    # the names of the times in the budget files (in milliseconds) for the names of the times in the statistics (in seconds)
+    TimeNames = {"medianTime": "medianMs", "p95Time": "p95Ms"}
+
+    # getFile(testFolder, fileSuffix): Retrieves the budget file of a feature for some dataset
+    @classmethod
+    def getFile(cls, testFolder: str, fileSuffix: str) -> str:
+        return os.path.join(testFolder, f"budget{fileSuffix}.json")
+
+    # load(file): Loads a budget file
+    @classmethod
+    def load(cls, file: str) -> Dict[str, Any]:
+        if (not os.path.isfile(file)):
+            return {"tolerances": dict(cls.DefaultTolerances), "tests": {}}
+
+        with open(file, "r", encoding = PU.FileEncodings.UTF8.value) as f:
+            return json.load(f)
+
+    # save(file, budgets): Writes a budget file
+    @classmethod
+    def save(cls, file: str, budgets: Dict[str, Any]):
+        budgets["tests"] = dict(sorted(budgets["tests"].items()))
+        with open(file, "w", encoding = PU.FileEncodings.UTF8.value) as f:
+            json.dump(budgets, f, indent = 4)
+            f.write("\n")
+
+    # toBudget(stats): Turns the statistics of the statements of a test into their budgets
+    @classmethod
+    def toBudget(cls, stats: Dict[str, Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        return {name: {**{budgetName: round(statementStats[stat] * 1000, 3) for stat, budgetName in cls.TimeNames.items()},
+                       "buffers": statementStats["buffers"]} for name, statementStats in sorted(stats.items())}
+
+    # compare(stats, budget, tolerances): Retrieves the descriptions of all the statistics of a test that went over their budgets
+    @classmethod
+    def compare(cls, stats: Dict[str, Dict[str, Any]], budget: Dict[str, Dict[str, Any]], tolerances: Dict[str, float]) -> List[str]:
+        tolerances = {**cls.DefaultTolerances, **tolerances}
+        result = []
+
+        for name in sorted(set(stats.keys()) | set(budget.keys())):
+            statementStats = stats.get(name)
+            statementBudget = budget.get(name)
+
+            if (statementBudget is None):
+                result.append(f"{name}: ran, but has no budget")
+                continue
+            elif (statementStats is None):
+                result.append(f"{name}: has a budget, but did not run")
+                continue
+
+            for stat, budgetName in cls.TimeNames.items():
+                time = statementStats[stat] * 1000
+                limit = statementBudget[budgetName] * tolerances["timeTolerance"] + tolerances["minTimeSlackMs"]
+                if (time > limit):
+                    result.append(f"{name}: {stat} of {time:.3f}ms is over the limit of {limit:.3f}ms (budget: {statementBudget[budgetName]:.3f}ms)")
+
+            # the statements that raise an error have no buffers, so their budget has no buffers either
+            buffers = statementStats["buffers"]
+            budgetBuffers = statementBudget["buffers"]
+            if (buffers is None and budgetBuffers is None):
+                continue
+            elif (budgetBuffers is None):
+                result.append(f"{name}: touched {buffers} buffers, but has no budget for its buffers")
+                continue
+            elif (buffers is None):
+                result.append(f"{name}: has a budget of {budgetBuffers} buffers, but raised an error when it ran")
+                continue
+
+            limit = budgetBuffers * tolerances["bufferTolerance"] + tolerances["minBufferSlack"]
+            if (buffers > limit):
+                result.append(f"{name}: touched {buffers} buffers, over the limit of {limit:.0f} buffers (budget: {budgetBuffers} buffers)")
+
+        return result
+
+    # format(testName, stats): Formats the statistics of the statements of a test for printing
+    @classmethod
+    def format(cls, testName: str, stats: Dict[str, Dict[str, Any]]) -> str:
+        lines = []
+        for name, statementStats in sorted(stats.items()):
+            buffers = "N/A" if (statementStats["buffers"] is None) else statementStats["buffers"]
+            lines.append(f"{testName} [{name}]: median: {statementStats['medianTime'] * 1000:.3f}ms, p95: {statementStats['p95Time'] * 1000:.3f}ms, "
+                         f"buffers: {buffers}, runs: {statementStats['runs']}")
+
+        return "\n".join(lines)
@@ -4,15 +4,17 @@ import os
 import signal
 import traceback
 import psycopg2
-from typing import Optional
+from typing import Optional, List
 
 import PyUtils as PU
+import DataImporter as DI
 
 from .config import Config
 from .constants.ConfigKeys import ConfigKeys
 from .constants.EnvironmentModes import EnvironmentModes
 from .tools.TestFileTools import TestFileTools
 from .unitTestProgram import UnitTestProgram
+from .parallelTestRunner import ParallelTestRunner
 
 
 class UnitTester():
@@ -25,6 +27,12 @@ class UnitTester():
         EnvironmentModes.Prod: PU.DBNames.ProdUnitTest.value
     }
 
+    DatasetFolders = {
+        EnvironmentModes.Toy: PU.Paths.ToyDatasetFolder.value,
+        EnvironmentModes.Dev: PU.Paths.SampleDatasetFolder.value,
+        EnvironmentModes.Prod: PU.Paths.ProdDatasetFolder.value
+    }
+
     def __init__(self):
         envPath = os.path.join(PU.Paths.ProjectFolder.value, ".env")
         self._secrets = PU.DBSecrets.load() if (os.path.isfile(envPath)) else PU.DBSecrets()
@@ -35,6 +43,7 @@ class UnitTester():
         self._dbCleaner = PU.DBCleaner(self.DbTool)
 
         self._testLoader = unittest.TestLoader()
+        self._ephemeralDB: Optional[PU.EphemeralPostgres] = None
 
         Config[ConfigKeys.DbCleaner] = self._dbCleaner
         Config[ConfigKeys.DbTool] = self.DbTool
@@ -64,12 +73,31 @@ class UnitTester():
         if (newSecrets.port != ""):
             self._secrets.port = newSecrets.port
 
+    # _startEphemeralDB(envs): Starts a temporary Postgres server with the unit test databases of some environment modes
+    def _startEphemeralDB(self, envs: List[EnvironmentModes]):
+        self._ephemeralDB = PU.EphemeralPostgres()
+        self._secrets = self._ephemeralDB.start()
+        print(f"Started a temporary Postgres server at port {self._secrets.port}")
+
+        for env in envs:
+            importer = DI.Importer(self._secrets, database = self.DBNames[env])
+            importer.importData(self.DatasetFolders[env], buildLevel = DI.ImportLevel.Database, randomIDs = False)
+
     def _runEnv(self, unitTester: UnitTestProgram, env: EnvironmentModes, fileWriteMode: str = "w"):
         with open(TestFileTools.UnitTestResultsFile, fileWriteMode, encoding = PU.FileEncodings.UTF8.value) as f:
             f.write(f"===== Environment Mode: {env.value} =====\n")
 
         with open(TestFileTools.UnitTestResultsFile, "a", encoding = PU.FileEncodings.UTF8.value) as f:
             self._dbname = self.DBNames[env]
+            workers = Config[ConfigKeys.Workers]
+
+            # the unit test database is only copied by the workers, since a template database cannot have any open connections
+            if (workers > 1):
+                unitTester.parseArgs(sys.argv)
+                testRunner = ParallelTestRunner(self._secrets, workers, f, failfast = bool(unitTester.failfast), buffer = bool(unitTester.buffer))
+                testRunner.run(unitTester.test, self._dbname, env)
+                return
+
             self.DbTool.database = self._dbname
             self.DbTool.useConnPool = True
 
@@ -81,11 +109,15 @@ class UnitTester():
         unitTester.testCommandBuilder.parse()
 
         self._updateDBSecrets()
-        self.DbTool._secrets = self._secrets
 
         environmentMode = Config[ConfigKeys.EnvironmentMode]
         runAllEnv = environmentMode is None
 
+        if (Config[ConfigKeys.Ephemeral]):
+            self._startEphemeralDB(list(EnvironmentModes) if (runAllEnv) else [environmentMode])
+
+        self.DbTool._secrets = self._secrets
+
         if (runAllEnv):
             unitTestResultCleared = False
             for env in EnvironmentModes:
@@ -112,6 +144,10 @@ class UnitTester():
         except psycopg2.pool.PoolError:
             pass
 
+        if (self._ephemeralDB is not None):
+            self._ephemeralDB.stop()
+            self._ephemeralDB = None
+
     def shutdown(self, sig: Optional[int] = None, frame: Optional[int] = None):
         self.tearDown()
         sys.exit(0)
@@ -1,16 +1,30 @@
 from waitress import serve
-from Backend import App, CommandBuilder
+from Backend import App, AsyncApp, CommandBuilder, PreforkServer, ServerModes
 
 
 def main():
     command = CommandBuilder()
     args = command.parse()
 
-    app = App(args.env, isDebug = args.debug)
+    if (args.server == ServerModes.Async):
+        app = AsyncApp(args.env, isDebug = args.debug)
+        app.initialize()
+
+        print(f"Serving at port {app.port} on the asyncio server...")
+        app.run()
+        return
+
+    # the debug server of Flask always runs in a single process
+    workers = 1 if (args.debug) else args.workers
+
+    app = App(args.env, isDebug = args.debug, workers = workers)
     flaskApp = app.initialize()
 
     if (args.debug):
         app.run()
+    elif (workers > 1):
+        print(f"Serving at port {app.port} with {workers} workers...")
+        PreforkServer(app, workers).run()
     else:
         print(f"Serving at port {app.port}...")
         serve(app, port = app.port)
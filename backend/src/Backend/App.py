@@ -1,10 +1,8 @@
 import sys
 import signal
-import uuid
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify
 from flask_cors import CORS
-from typing import Optional, Iterable, List, Dict, Any, Tuple, Union
-from datetime import datetime
+from typing import Optional, Iterable, Dict, Any, Tuple, Callable
 
 import PyUtils as PU
 
@@ -15,28 +13,67 @@ from .model.BuildingService import BuildingService
 from .model.BookingService import BookingService
 from .model.UserService import UserService
 from .model.DashboardService import DashboardService
+from .model.RoomAvailabilityIndex import RoomAvailabilityIndex
+from .metrics.RequestMetrics import RequestMetrics
+from .metrics.WorkerMetrics import WorkerMetrics
+from .routes.APIRoutes import APIRoutes, APIRequest, RouteHandler
 from .view.LogView import LogView
 
 class App():
-    def __init__(self, env: EnvironmentModes, isDebug: bool = False):
+    def __init__(self, env: EnvironmentModes, isDebug: bool = False, workers: int = 1):
         self._isInitalized = False
         self._env = env
         self._app: Optional[Flask] = None
         self._config = Config.load(env)
         self._isDebug = isDebug
+        self._workers = workers
+        self._workerNum = 0
+        self._metricsFolder: Optional[str] = None
+        self._workerMetrics: Optional[WorkerMetrics] = None
 
-        self._dbTool = PU.DBTool(self._config.dbSecrets, database = self._config.database, useConnPool = True)
+        self._sqlRegistry = PU.SQLRegistry()
+        self._sqlRegistry.load()
+
+        self._dbTool = self._createDBTool()
+
+        self._requestMetrics = RequestMetrics(poolStats = self.getPoolStats)
+        self._dbTool.addExecuteListener(self._requestMetrics.recordQuery)
+
+        self._queryMonitor: Optional[PU.QueryMonitor] = None
+        if (self._config.slowQueryThreshold is not None):
+            self._queryMonitor = PU.QueryMonitor(slowThreshold = self._config.slowQueryThreshold, slowLogFile = self._config.slowQueryLog,
+                                                 planLogFile = self._config.queryPlanLog)
+            self._queryMonitor.attach(self._dbTool)
 
         self._logView = LogView(verbose = isDebug)
         self._logView.includePrefix = False
 
+        # the index of a worker would not see the bookings made through the other workers.
+        #   'workers' is the number of processes that actually serve the app, so the debug server always gives 1
+        useAvailabilityIndex = self._config.useAvailabilityIndex
+        if (useAvailabilityIndex and workers > 1):
+            useAvailabilityIndex = False
+            self.print(f"The availability index is turned off, since the server has {workers} workers", prefix = "[INDEX]")
+
+        self._availabilityIndex = RoomAvailabilityIndex() if (useAvailabilityIndex) else None
+
+        self._createServices()
+        self._routes = APIRoutes(self._buildingService, self._roomService, self._bookingService, self._userService, self._dashService,
+                                 poolStats = self.collectPoolStats, queryStats = self.collectQueryStats, view = self._logView)
+
+    # _createDBTool(): Creates the database tool used for the work done at startup and used by the services to answer the requests
+    def _createDBTool(self) -> PU.DBTool:
+        return PU.DBTool(self._config.dbSecrets, database = self._config.database, useConnPool = True, sqlRegistry = self._sqlRegistry,
+                         poolConfig = self._config.poolConfig)
+
+    # _createServices(): Creates the services that answer the requests
+    def _createServices(self):
         self._buildingService = BuildingService(self._dbTool, view = self._logView)
-        self._roomService = RoomService(self._dbTool, view = self._logView)
-        self._bookingService = BookingService(self._dbTool, view = self._logView)
+        self._roomService = RoomService(self._dbTool, view = self._logView, availabilityIndex = self._availabilityIndex)
+        self._bookingService = BookingService(self._dbTool, view = self._logView, availabilityIndex = self._availabilityIndex)
         self._userService = UserService(self._dbTool, view = self._logView)
         self._dashService = DashboardService(self._dbTool, view = self._logView)
 
-
     # Reference: See the __call__ operator in app.py of Flask's source code
     #   Needed to be served by some WSGI server
     def __call__(self, environ, start_response) -> Iterable[bytes]:
@@ -50,10 +87,18 @@ class App():
     def env(self):
         return self._env
     
+    @property
+    def sqlRegistry(self) -> PU.SQLRegistry:
+        return self._sqlRegistry
+    
     @property
     def port(self):
         return self._config.port
     
+    @property
+    def workers(self) -> int:
+        return self._workers
+
     @property
     def isDebug(self) -> bool:
         return self._isDebug
@@ -66,254 +111,136 @@ class App():
     def print(self, *args, **kwargs):
         self._logView.print(*args, **kwargs)
 
+    # getPoolStats(): Retrieves the live gauges of the connection pools used to answer the requests
+    def getPoolStats(self) -> Dict[str, Dict[str, Any]]:
+        return self._dbTool.getPoolStats()
+
+    # getMetricsSnapshot(): Retrieves the snapshot of the request metrics and the query stats of this process
+    def getMetricsSnapshot(self) -> Dict[str, Any]:
+        return {"requests": self._requestMetrics.snapshot(),
+                "queries": None if (self._queryMonitor is None) else self._queryMonitor.snapshot()}
+
+    # collectPoolStats(): Retrieves the live gauges of the connection pools of all the workers of the server
+    def collectPoolStats(self) -> Dict[str, Dict[str, Any]]:
+        if (self._workerMetrics is None):
+            return self.getPoolStats()
+
+        return RequestMetrics.mergePoolStats(list(map(lambda snapshot: snapshot["requests"]["pools"], self._workerMetrics.collect())))
+
+    # collectQueryStats(): Retrieves the stats of the queries ran by all the workers of the server to answer the requests
+    def collectQueryStats(self) -> Dict[str, Dict[str, Any]]:
+        if (self._queryMonitor is None):
+            return {}
+        elif (self._workerMetrics is None):
+            return self._queryMonitor.stats()
+
+        snapshots = map(lambda snapshot: snapshot["queries"], self._workerMetrics.collect())
+        return PU.QueryMonitor.mergeStats(list(filter(lambda snapshot: snapshot is not None, snapshots)))
+
+    # _toFlaskView(handler): Wraps some route of the API into a Flask view
+    def _toFlaskView(self, handler: Callable[[APIRequest], RouteHandler]) -> Callable[[], Tuple[Response, int]]:
+        def view() -> Tuple[Response, int]:
+            data = request.get_json() if (request.method == "POST") else None
+            response = APIRoutes.run(handler(APIRequest(request.args, data)))
+            return jsonify(response.body), response.status
+
+        return view
+
     def initialize(self):
         if (self._isInitalized):
             return
         
         self._isInitalized = True
         self.registerShutdown()
+        self.registerReload()
+        self.buildPartitions()
+        self.loadAvailabilityIndex()
 
         app = Flask(__name__)
         cors = CORS(app, resources={r"/*": {"origins": "*"}}, supports_credentials=True)
         app.config['CORS_HEADERS'] = 'Content-Type'
+        self._requestMetrics.register(app)
 
         @app.route('/')
         def index():
             return 'This is the backend server for the room booking app.'
-        
-        @app.route("/viewBuildings", methods=["GET"])
-        def viewBuildings() -> List[Dict[str, Any]]:
-            queryParams = {}
-            db_operation = request.args.get("db_operation")
-            
-            if db_operation == "filter":
-                buildingName = request.args.get("buildingName")
-                addressLine1 = request.args.get("addressLine1")
-                addressLine2 = request.args.get("addressLine2")
-                city = request.args.get("city")
-                province = request.args.get("province")
-                country = request.args.get("country")
-                postalCode = request.args.get("postalCode")
-                response = self._buildingService.fetchBuildings(buildingName, addressLine1, addressLine2, 
-                    city, province, country, postalCode)
-            else:
-                response = self._buildingService.fetchBuildings()
-            
-            return response
-        
-        @app.route("/viewAvailableRooms", methods=["GET"])
-        def viewAvailableRooms() -> List[Dict[str, Any]]:
-            
-            response = []
-            db_operation = request.args.get("db_operation")
-
-            if db_operation == "filter":
-                buildingId = request.args.get("building_id")
-                roomName = request.args.get("room_name")
-                minCapacity = request.args.get("min_capacity")
-                maxCapacity = request.args.get("max_capacity")
-                startTime = request.args.get("start_time")
-                endTime = request.args.get("end_time")
-                response = self._roomService.fetchAvailableRooms(buildingId, roomName, minCapacity, maxCapacity, startTime, endTime)
-            else:
-                response = self._roomService.fetchAvailableRooms()
-
-            return response
-    
-        @app.route("/viewRoomsByBuildingID", methods=["GET"])
-        def getRoomsByBuildingID() -> List[Dict[str, Any]]:
-            response = []
-            buildingId = request.args.get("building_id")
-            print(buildingId)
-            response = self._roomService.fetchRoomsByBuildingID(buildingId)
-            print("INTERCEPT", response)
-            return response
-        
-        @app.route("/addRoom", methods=["POST"])
-        def addRoom():
-            data = request.get_json()
-            print("RECEIVED IN ADD", data)
-            return self._roomService.addRoom(data["roomName"], data["capacity"], data["buildingID"], data["userID"])
-        
-        @app.route("/editRoom", methods=["POST"])
-        def editRoom():
-            data = request.get_json()
-            print("RECEIVED IN EDIT", data)
-            return self._roomService.editRoom(data["roomID"], data["roomName"], data["capacity"], data["userID"])
-        
-        @app.route("/deleteRoom", methods=["POST"])
-        def deleteRoom():
-            data = request.get_json()
-            print("RECEIVED IN DELETE", data)
-            return self._roomService.deleteRoom(data["roomID"], data["userID"] )
-    
-        @app.route("/viewAdminLog", methods=["POST"])
-        def viewAdminLog():
-            data = request.get_json()
-            print("RECEIVED IN VIEWADMINLOG", data)
-            return self._userService.viewAdminLog(data["userID"] )
-        
-        @app.route("/bookRoom", methods=["POST"])
-        def bookRoom():
-            data = request.get_json()
-
-            if not data:
-                return jsonify({ "success": False, "message": "No JSON data received" }), 400
-
-            try:
-                userId = data.get("user_id")
-                roomId = data.get("room_id")
-                startDateTimeStr = data.get("start_time")
-                endDateTimeStr = data.get("end_time")
-                participants = data.get("participants")
-
-                if not all([userId, roomId, startDateTimeStr, endDateTimeStr]):
-                    return jsonify({ "success": False, "message": "Missing required fields" }), 400
-
-                start_dt = datetime.fromisoformat(startDateTimeStr)
-                end_dt = datetime.fromisoformat(endDateTimeStr)
-
 
-                # Call booking service
-                success, message, bookingId = self._bookingService.bookRoom(userId, roomId, start_dt, end_dt, participants)
-                # self.print(" BookingService.bookRoom returned ->", success, message, bookingId)
+        for method, path, name, handler in self._routes.getHandlers():
+            app.add_url_rule(path, name, self._toFlaskView(handler), methods = [method])
 
-                return jsonify({
-                    "success": success,
-                    "message": message,
-                    "booking_id": bookingId
-                }), 200 if success else 400
-
-            except Exception as e:
-                self.print(f" Booking validation failed: {str(e)}")
-                return jsonify({
-                    "success": False,
-                    "message": str(e) or "Booking failed due to an unknown error."
-                }), 400
-
-        
-        @app.route("/cancelBooking", methods=["POST"])
-        def cancelBooking():
-            data = request.get_json()
-            if not data:
-                return jsonify({ "success": False, "message": "No JSON data received" })
-
-            bookingId = data.get("booking_id")
-            userId = data.get("user_id")
-
-            try:
-                success, message = self._bookingService.cancelBooking(bookingId, userId)
-                return jsonify({ "success": success, "message": message })
-            except Exception as e:
-                self.print(f"CancelBooking error: {str(e)}")
-                return jsonify({ "success": False, "message": "Cancellation failed due to server error." })
-
-        
-        @app.route("/getFutureBookings", methods=["GET"])
-        def getFutureBookings():
-            userId = request.args.get("userId")
-            self.print(f"[GET] /getFutureBookings - userId: {userId}")
-            return self._bookingService.getFutureBookings(userId)
-
-        @app.route("/getBookingsAndCancellations", methods=["GET"])
-        def getBookingsAndCancellations():
-            userId = request.args.get("userId")
-            self.print(f"/getBookingsAndCancellations - userId: {userId}", prefix = "[GET]")
-            return self._bookingService.getBookingsAndCancellations(userId)
-
-        @app.route("/signup", methods=["POST"])
-        def signup():
-            data = request.get_json()
-            self.print(f"RECEIVED IN SIGNUP {data}")
-                    
-            return self._userService.signup(data["username"], data["email"], data["password"])
-      
-        @app.route("/login", methods=["POST"])
-        def login():
-            data = request.get_json()
-            self.print(f"RECEIVED IN LOGIN {data}")
-                    
-            return self._userService.login(data["username"], data["password"])
-        
-        @app.route("/getDashboardMetrics", methods=["GET"])
-        def getDashboardMetrics():
-            userId = request.args.get("userId")
-            self.print(f"/getDashboardMetrics - userId: {userId}", prefix = "[GET]")
-            success, result = self._dashService.getDashboardMetrics(userId)
-            return jsonify(result), 200 if success else 400
-        
-        @app.route("/getBookingFrequency", methods=["POST"])
-        def getBookingFrequency() -> Tuple[bool, Union[str, List[Dict[str, Any]]]]:
-            data = request.get_json()
-
-            userId = data.get("userId")
-            startDateTime = data.get("startDateTime")
-            endDateTime = data.get("endDateTime")
-            queryLimit = data.get("queryLimit")
-
-            try:
-                userId  = uuid.UUID(userId)
-            except ValueError:
-                return [False, "Invalid UUID format for user ID"]
-            
-            if (startDateTime is not None):
-                startDateTime = PU.DateTimeTool.strToDateTime(startDateTime)
-
-            if (endDateTime is not None):
-                endDateTime = PU.DateTimeTool.strToDateTime(endDateTime)
-
-            if (queryLimit is not None):
-                queryLimit = int(queryLimit)
-            
-            return self._dashService.getBookingFrequency(userId, startDateTime, endDateTime, queryLimit = queryLimit)
-
-
-        @app.route("/updateUsername", methods=["POST"])
-        def updateUsername() -> Tuple[bool, str]:
-            data = request.get_json()
-            
-            userId = data.get("userId")
-            newUsername = data.get("newUsername")
+        self._app = app
+        return app
 
-            try:
-                userId  = uuid.UUID(userId)
-            except ValueError:
-                return [False, "Invalid UUID format for user ID"]
+    def shutdown(self, sig: Optional[int] = None, frame: Optional[int] = None):
+        if (self._workerMetrics is not None):
+            self._workerMetrics.stop()
 
-            if (not newUsername):
-                return [False, "Missing old or new username."]
+        if (self._queryMonitor is not None):
+            self._queryMonitor.close()
 
-            return self._userService.updateUsername(userId, newUsername)
+        self._dbTool.closeDBPools()
+        sys.exit(0)
 
-        @app.route("/updatePassword", methods=["POST"])
-        def updatePassword() -> Tuple[bool, str]:
-            data = request.get_json()
+    def registerShutdown(self):
+        signal.signal(signal.SIGTERM, self.shutdown)
+        signal.signal(signal.SIGINT, self.shutdown)
 
-            userId = data.get("userId")
-            newPassword = data.get("newPassword")
-            oldPassword = data.get("oldPassword")
+    # getWorkerPoolConfig(): Retrieves the pool settings of the worker process of this app, with its share of the max connections
+    def getWorkerPoolConfig(self) -> PU.DBPoolConfig:
+        return self._config.poolConfig.split(self._workers, self._workerNum)
 
-            try:
-                userId  = uuid.UUID(userId)
-            except ValueError:
-                return [False, "Invalid UUID format for user ID"]
+    # prepareFork(metricsFolder): Closes all the connections of the app before the worker processes are forked from the process that preloaded the app.
+    #   The workers share their metrics through 'metricsFolder', if given
+    def prepareFork(self, metricsFolder: Optional[str] = None):
+        self._metricsFolder = metricsFolder
 
-            if (newPassword is None or oldPassword is None):
-                return [False, "Missing required fields."]
+        if (self._queryMonitor is not None):
+            self._queryMonitor.stopExplains()
 
-            return self._userService.updatePassword(userId, oldPassword, newPassword)
+        self._dbTool.closeDBPools()
+        self._dbTool.closeSQLEngine()
 
+    # initializeWorker(workerNum): Sets up a worker process forked from the process that preloaded the app.
+    #   The worker opens its own connection pools with its share of the max connections
+    def initializeWorker(self, workerNum: int):
+        self._workerNum = workerNum
+        self.registerShutdown()
+        self.registerReload()
+        self._dbTool.resetAfterFork(self.getWorkerPoolConfig())
+
+        if (self._metricsFolder is not None):
+            self._workerMetrics = WorkerMetrics(self._metricsFolder, workerNum, self.getMetricsSnapshot)
+            self._workerMetrics.start()
+            self._requestMetrics.workerSnapshots = lambda: list(map(lambda snapshot: snapshot["requests"], self._workerMetrics.collect()))
+
+    # reloadPoolConfig(): Resizes the connection pools based off the pool settings in the environment file
+    def reloadPoolConfig(self, sig: Optional[int] = None, frame: Optional[int] = None):
+        self._config.reloadPoolConfig()
+        poolConfig = self.getWorkerPoolConfig()
+        self._dbTool.resizeConnPools(poolConfig)
+        self.print(f"Connection pools resized to min: {poolConfig.minConn}, max: {poolConfig.maxConn}", prefix = "[POOL]")
+
+    # registerReload(): Reloads the pool settings when the server receives a SIGHUP
+    def registerReload(self):
+        if (hasattr(signal, "SIGHUP")):
+            signal.signal(signal.SIGHUP, self.reloadPoolConfig)
+
+    # buildPartitions(): Creates the monthly partitions for the upcoming bookings, if the bookings table is partitioned
+    def buildPartitions(self):
+        partitioner = PU.DBPartitioner(self._dbTool)
+        if (not partitioner.isPartitioned()):
+            return
 
-        self._app = app
-        return app
+        createdMonths = partitioner.ensureFuturePartitions()
+        self.print(f"Created {len(createdMonths)} monthly partitions for the upcoming bookings", prefix = "[PARTITION]")
 
-    def shutdown(self, sig: Optional[int] = None, frame: Optional[int] = None):
-        self._dbTool.closeDBPools()
-        sys.exit(0)
+    # loadAvailabilityIndex(): Loads the active bookings of all the rooms into the availability index
+    def loadAvailabilityIndex(self):
+        if (self._availabilityIndex is None):
+            return
 
-    def registerShutdown(self):
-        signal.signal(signal.SIGTERM, self.shutdown)
-        signal.signal(signal.SIGINT, self.shutdown)
+        self._availabilityIndex.load(self._dbTool)
+        self.print(f"Loaded {self._availabilityIndex.bookingCount()} active bookings into the availability index", prefix = "[INDEX]")
 
     def run(self, *args, **kwargs):
         self._app.run(port = self.port, *args, debug = self._isDebug, **kwargs)
\ No newline at end of file
@@ -0,0 +1,199 @@
+import json
+import signal
+import asyncio
+from flask.json.provider import DefaultJSONProvider
+from typing import Optional, List, Dict, Any, Callable, Awaitable
+
+import PyUtils as PU
+
+try:
+    from aiohttp import web
+except ImportError:
+    web = None
+
+from .constants.EnvironmentModes import EnvironmentModes
+from .App import App
+from .routes.APIRoutes import APIRoutes, APIRequest, RouteHandler
+from .model.AsyncRoomService import AsyncRoomService
+from .model.AsyncBuildingService import AsyncBuildingService
+from .model.AsyncBookingService import AsyncBookingService
+from .model.AsyncUserService import AsyncUserService
+from .model.AsyncDashboardService import AsyncDashboardService
+
+
+# AsyncApp: Serves the same routes as App on an asyncio server (aiohttp), with the queries of the requests ran through an AsyncDBTool.
+#   A synchronous database tool without any connection pool is still used for the work done at startup
+#   (eg. creating the partitions and loading the availability index)
+class AsyncApp(App):
+    # the number of connections waiting to be accepted by the server
+    Backlog = 2048
+
+    def __init__(self, env: EnvironmentModes, isDebug: bool = False):
+        if (web is None):
+            raise ModuleNotFoundError("The async server needs aiohttp. Install it with: poetry install --extras async")
+
+        self._webApp: Optional["web.Application"] = None
+        super().__init__(env, isDebug = isDebug)
+
+    # _createDBTool(): Creates the synchronous database tool used for the work done at startup.
+    #   The tool has no connection pool, since none of the requests are answered through it
+    def _createDBTool(self) -> PU.DBTool:
+        return PU.DBTool(self._config.dbSecrets, database = self._config.database, useConnPool = False, sqlRegistry = self._sqlRegistry,
+                         poolConfig = self._config.poolConfig)
+
+    # _createServices(): Creates the asynchronous services that answer the requests
+    def _createServices(self):
+        self._asyncDBTool = PU.AsyncDBTool(self._config.dbSecrets, database = self._config.database, sqlRegistry = self._sqlRegistry,
+                                           poolConfig = self._config.poolConfig)
+        self._asyncDBTool.addExecuteListener(self._requestMetrics.recordQuery)
+
+        # the plans of the slow queries are captured on their own connections opened by the synchronous database tool of the same database
+        if (self._queryMonitor is not None):
+            self._asyncDBTool.addExecuteListener(self._queryMonitor.record)
+
+        self._buildingService = AsyncBuildingService(self._asyncDBTool, view = self._logView)
+        self._roomService = AsyncRoomService(self._asyncDBTool, view = self._logView, availabilityIndex = self._availabilityIndex)
+        self._bookingService = AsyncBookingService(self._asyncDBTool, view = self._logView, availabilityIndex = self._availabilityIndex)
+        self._userService = AsyncUserService(self._asyncDBTool, view = self._logView)
+        self._dashService = AsyncDashboardService(self._asyncDBTool, view = self._logView)
+
+    @property
+    def app(self):
+        return self._webApp
+
+    # getPoolStats(): Retrieves the live gauges of the connection pools used to answer the requests
+    def getPoolStats(self) -> Dict[str, Dict[str, Any]]:
+        return self._asyncDBTool.getPoolStats()
+
+    # toJSON(data, status): Creates a JSON response the same way as Flask, so both servers give back the same values
+    #   (eg. datetimes in the HTTP date format)
+    @classmethod
+    def toJSON(cls, data: Any, status: int = 200) -> "web.Response":
+        body = json.dumps(data, default = DefaultJSONProvider.default, ensure_ascii = DefaultJSONProvider.ensure_ascii,
+                          sort_keys = DefaultJSONProvider.sort_keys, separators = (",", ":"))
+        return web.Response(text = f"{body}\n", status = status, content_type = "application/json")
+
+    # readJSON(request): Reads the JSON body of some request, or None if the request has no body
+    @classmethod
+    async def readJSON(cls, request: "web.Request") -> Any:
+        body = await request.text()
+        if (not body):
+            return None
+
+        return json.loads(body)
+
+    # _toAsyncHandler(handler): Wraps some route of the API into an aiohttp handler
+    def _toAsyncHandler(self, handler: Callable[[APIRequest], RouteHandler]) -> Callable[["web.Request"], Awaitable["web.Response"]]:
+        async def asyncHandler(request: "web.Request") -> "web.Response":
+            data = await self.readJSON(request) if (request.method == "POST") else None
+            response = await APIRoutes.runAsync(handler(APIRequest(request.query, data)))
+            return self.toJSON(response.body, status = response.status)
+
+        return asyncHandler
+
+    # _buildMiddlewares(): Builds the middlewares for the request metrics and for CORS
+    def _buildMiddlewares(self) -> List[Callable[["web.Request", Callable[["web.Request"], Awaitable["web.StreamResponse"]]], Awaitable["web.StreamResponse"]]]:
+        requestMetrics = self._requestMetrics
+
+        @web.middleware
+        async def metricsMiddleware(request: "web.Request", handler) -> "web.StreamResponse":
+            resource = request.match_info.route.resource
+            route = requestMetrics.UnmatchedRoute if (resource is None) else resource.canonical
+            timer = requestMetrics.startRequest((route, request.method))
+
+            try:
+                response = await handler(request)
+
+                # streamed responses do not know their size ahead of time
+                body = getattr(response, "body", None)
+                requestMetrics.finishRequest(timer, response.status, responseSize = len(body) if (isinstance(body, (bytes, bytearray))) else None)
+                return response
+            except web.HTTPException as e:
+                requestMetrics.finishRequest(timer, e.status)
+                raise
+            except Exception:
+                requestMetrics.finishRequest(timer, 500)
+                raise
+            finally:
+                requestMetrics.endRequest(timer)
+
+        # same as flask-cors with all origins and credentials allowed
+        @web.middleware
+        async def corsMiddleware(request: "web.Request", handler) -> "web.StreamResponse":
+            origin = request.headers.get("Origin")
+
+            if (request.method == "OPTIONS" and "Access-Control-Request-Method" in request.headers):
+                response = web.Response()
+                response.headers["Access-Control-Allow-Methods"] = request.headers["Access-Control-Request-Method"]
+
+                requestHeaders = request.headers.get("Access-Control-Request-Headers")
+                if (requestHeaders is not None):
+                    response.headers["Access-Control-Allow-Headers"] = requestHeaders
+            else:
+                response = await handler(request)
+
+            if (origin is not None):
+                response.headers["Access-Control-Allow-Origin"] = origin
+                response.headers["Access-Control-Allow-Credentials"] = "true"
+                response.headers["Vary"] = "Origin"
+
+            return response
+
+        return [metricsMiddleware, corsMiddleware]
+
+    # initialize(): Creates the asyncio server with all of the routes
+    def initialize(self):
+        if (self._isInitalized):
+            return
+
+        self._isInitalized = True
+        self.buildPartitions()
+        self.loadAvailabilityIndex()
+
+        webApp = web.Application(middlewares = self._buildMiddlewares())
+        webApp.on_startup.append(self._onStartup)
+        webApp.on_cleanup.append(self._onCleanup)
+
+        routes = [("GET", "/", self.index),
+                  ("GET", "/metrics", self.metrics)]
+        routes += list(map(lambda route: (route[0], route[1], self._toAsyncHandler(route[3])), self._routes.getHandlers()))
+
+
+        for method, path, handler in routes:
+            webApp.router.add_route(method, path, handler)
+            if (method == "GET"):
+                webApp.router.add_route("HEAD", path, handler)
+
+        self._webApp = webApp
+        return webApp
+
+    # _onStartup(webApp): Opens the connections of the asynchronous pool once the event loop of the server is running
+    async def _onStartup(self, webApp: "web.Application"):
+        await self._asyncDBTool.open()
+
+        if (hasattr(signal, "SIGHUP")):
+            loop = asyncio.get_running_loop()
+            loop.add_signal_handler(signal.SIGHUP, lambda: asyncio.ensure_future(self.reloadAsyncPoolConfig()))
+
+    # _onCleanup(webApp): Closes all the connections when the server stops
+    async def _onCleanup(self, webApp: "web.Application"):
+        if (self._queryMonitor is not None):
+            self._queryMonitor.close()
+
+        self._asyncDBTool.close()
+        self._dbTool.closeSQLEngine()
+
+    # reloadAsyncPoolConfig(): Resizes the connection pools based off the pool settings in the environment file
+    async def reloadAsyncPoolConfig(self):
+        poolConfig = self._config.reloadPoolConfig()
+        await self._asyncDBTool.resizeConnPool(poolConfig)
+        self.print(f"Connection pools resized to min: {poolConfig.minConn}, max: {poolConfig.maxConn}", prefix = "[POOL]")
+
+    def run(self, *args, **kwargs):
+        web.run_app(self._webApp, *args, port = self.port, backlog = self.Backlog, access_log = None, **kwargs)
+
+    async def index(self, request: "web.Request") -> "web.Response":
+        return web.Response(text = "This is the backend server for the room booking app.", content_type = "text/html")
+
+    async def metrics(self, request: "web.Request") -> "web.Response":
+        return web.Response(text = self._requestMetrics.toText(), headers = {"Content-Type": self._requestMetrics.ContentType})
@@ -3,6 +3,7 @@ import argparse
 import PyUtils as PU
 
 from .constants.EnvironmentModes import EnvironmentModes
+from .constants.ServerModes import ServerModes
 
 
 class CommandBuilder(PU.BaseCommandBuilder):
@@ -22,8 +23,26 @@ class CommandBuilder(PU.BaseCommandBuilder):
             
             self._args.env = foundEnv
 
+        if (self._args.server is None):
+            self._args.server = ServerModes.Waitress
+        else:
+            foundServer = ServerModes.find(self._args.server)
+            if (foundServer is None):
+                raise KeyError(f"No server mode available for the name ({self._args.server})")
+            
+            self._args.server = foundServer
+
+        if (self._args.workers is None):
+            self._args.workers = 1
+        elif (self._args.workers < 1):
+            raise ValueError(f"The number of workers ({self._args.workers}) needs to be at least 1")
+        elif (self._args.workers > 1 and self._args.server != ServerModes.Waitress):
+            raise ValueError(f"Only the '{ServerModes.Waitress.value}' server can be served with more than 1 worker")
+
         return self._args
 
     def _addArguments(self):
         self._argParser.add_argument("-e", "--env", action='store', type=str, help="What environment mode we want to run the backend")
-        self._argParser.add_argument("-d", "--debug", action='store_true', help="Whether to turn on debugging mode")
\ No newline at end of file
+        self._argParser.add_argument("-d", "--debug", action='store_true', help="Whether to turn on debugging mode")
+        self._argParser.add_argument("-s", "--server", action='store', type=str, help="What server to serve the backend with: 'waitress' or 'async'")
+        self._argParser.add_argument("-w", "--workers", action='store', type=int, help="The number of worker processes to serve the backend with. Only works with the 'waitress' server")
\ No newline at end of file
@@ -14,10 +14,18 @@ class Config():
         EnvironmentModes.Prod: "loadProd"
     }
 
-    def __init__(self, dbSecrets: PU.DBSecrets, database: str, port: int):
+    def __init__(self, dbSecrets: PU.DBSecrets, database: str, port: int, poolConfig: Optional[PU.DBPoolConfig] = None,
+                 envPublicConfigsFile: Optional[str] = None, useAvailabilityIndex: bool = False, slowQueryThreshold: Optional[float] = None,
+                 slowQueryLog: Optional[str] = None, queryPlanLog: Optional[str] = None):
         self.dbSecrets = dbSecrets
         self.database = database
         self.port = port
+        self.poolConfig = poolConfig if (poolConfig is not None) else PU.DBPoolConfig()
+        self.envPublicConfigsFile = envPublicConfigsFile
+        self.useAvailabilityIndex = useAvailabilityIndex
+        self.slowQueryThreshold = slowQueryThreshold
+        self.slowQueryLog = slowQueryLog
+        self.queryPlanLog = queryPlanLog
 
     @classmethod
     def loadFromFiles(cls, envPublicConfigsFile: str, globalSecretsFile: Optional[str] = None) -> "Config":
@@ -30,8 +38,26 @@ class Config():
         database = os.getenv("DATABASE")
         port = os.getenv("APP_PORT")
         port = int(port)
+
+        poolConfig = PU.DBPoolConfig.load()
+        useAvailabilityIndex = os.getenv("USE_AVAILABILITY_INDEX", "false").strip().lower() in {"1", "true", "yes", "on"}
+
+        # the query instrumentation is only turned on when the threshold for the slow queries is set
+        slowQueryThreshold = os.getenv("SLOW_QUERY_THRESHOLD", "").strip()
+        slowQueryThreshold = float(slowQueryThreshold) if (slowQueryThreshold) else None
+        slowQueryLog = os.getenv("SLOW_QUERY_LOG", "").strip() or None
+        queryPlanLog = os.getenv("QUERY_PLAN_LOG", "").strip() or None
         
-        return cls(dbSecrets, database, port)
+        return cls(dbSecrets, database, port, poolConfig = poolConfig, envPublicConfigsFile = envPublicConfigsFile,
+                   useAvailabilityIndex = useAvailabilityIndex, slowQueryThreshold = slowQueryThreshold,
+                   slowQueryLog = slowQueryLog, queryPlanLog = queryPlanLog)
+    
+    # reloadPoolConfig(): Reads the connection pool settings again from the environment file
+    def reloadPoolConfig(self) -> PU.DBPoolConfig:
+        if (self.envPublicConfigsFile is not None):
+            self.poolConfig = PU.DBPoolConfig.load(envPath = self.envPublicConfigsFile, override = True)
+
+        return self.poolConfig
     
     @classmethod
     def loadDev(cls) -> "Config":
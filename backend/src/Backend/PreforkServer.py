@@ -0,0 +1,178 @@
+import os
+import sys
+import time
+import signal
+import shutil
+import socket
+import tempfile
+import traceback
+from waitress import serve
+from typing import Optional, Dict
+
+from .App import App
+
+
+# PreforkServer: Serves a preloaded app with many waitress worker processes forked from the main process,
+#   so the CPU bound work of the requests (eg. encoding the JSON responses) is not limited to a single core by the GIL.
+#
+#   All the workers accept the connections of the same listening socket. The main process only watches over the workers:
+#   a worker that exits is replaced by a new worker, and stopping the main process stops all the workers.
+#   The workers share their metrics through a temporary folder, so any worker can answer the metrics of the whole server
+class PreforkServer():
+    Host = "0.0.0.0"
+    Backlog = 1024
+
+    # the seconds the workers have to stop before they are killed
+    StopTimeout = 10
+
+    # a worker that exits sooner than 'MinWorkerLifetime' seconds after it started is only restarted after 'RestartDelay' seconds,
+    #   so a worker that always crashes at startup is not restarted in a busy loop
+    MinWorkerLifetime = 1
+    RestartDelay = 1
+
+    PollInterval = 0.2
+
+    def __init__(self, app: App, workers: int, host: Optional[str] = None, port: Optional[int] = None):
+        self.app = app
+        self.workers = workers
+        self.host = self.Host if (host is None) else host
+        self.port = app.port if (port is None) else port
+
+        self._socket: Optional[socket.socket] = None
+        self._workerNums: Dict[int, int] = {}
+        self._startTimes: Dict[int, float] = {}
+        self._restartTimes: Dict[int, float] = {}
+        self._isStopping = False
+
+    # _listen(): Opens the listening socket shared by all the workers
+    def _listen(self) -> socket.socket:
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.bind((self.host, self.port))
+        sock.listen(self.Backlog)
+        return sock
+
+    # _runWorker(workerNum): Serves the app in a forked worker process. Never returns
+    def _runWorker(self, workerNum: int):
+        exitCode = 0
+
+        try:
+            # the signal handlers of the main process are replaced by the handlers of the app
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            signal.signal(signal.SIGINT, signal.SIG_DFL)
+            if (hasattr(signal, "SIGHUP")):
+                signal.signal(signal.SIGHUP, signal.SIG_IGN)
+
+            self.app.initializeWorker(workerNum)
+            serve(self.app, sockets = [self._socket])
+        except SystemExit as e:
+            exitCode = e.code if (isinstance(e.code, int)) else 0
+        except BaseException:
+            traceback.print_exc()
+            exitCode = 1
+        finally:
+            sys.stdout.flush()
+            sys.stderr.flush()
+            os._exit(exitCode)
+
+    # _startWorker(workerNum): Forks a new worker process
+    def _startWorker(self, workerNum: int):
+        pid = os.fork()
+        if (pid == 0):
+            self._runWorker(workerNum)
+
+        self._workerNums[pid] = workerNum
+        self._startTimes[workerNum] = time.monotonic()
+        print(f"[WORKER] Started worker {workerNum} (pid: {pid})", flush = True)
+
+    # _onWorkerExit(pid, status): Schedules the restart of a worker that exited
+    def _onWorkerExit(self, pid: int, status: int):
+        workerNum = self._workerNums.pop(pid, None)
+        if (workerNum is None or self._isStopping):
+            return
+
+        exitCode = os.waitstatus_to_exitcode(status)
+        lifetime = time.monotonic() - self._startTimes[workerNum]
+        delay = self.RestartDelay if (lifetime < self.MinWorkerLifetime) else 0
+
+        print(f"[WORKER] Worker {workerNum} (pid: {pid}) exited with code {exitCode}. Restarting the worker in {delay}s...", flush = True)
+        self._restartTimes[workerNum] = time.monotonic() + delay
+
+    # _sendToWorkers(sig): Sends a signal to all the workers
+    def _sendToWorkers(self, sig: int):
+        for pid in list(self._workerNums.keys()):
+            try:
+                os.kill(pid, sig)
+            except ProcessLookupError:
+                pass
+
+    # stop(): Stops all the workers
+    def stop(self, sig: Optional[int] = None, frame: Optional[int] = None):
+        if (self._isStopping):
+            return
+
+        self._isStopping = True
+        self._restartTimes.clear()
+        self._sendToWorkers(signal.SIGTERM)
+
+    # reload(): Makes all the workers reload their pool settings
+    def reload(self, sig: Optional[int] = None, frame: Optional[int] = None):
+        self._sendToWorkers(signal.SIGHUP)
+
+    # registerSignals(): Stops the workers when the main process is stopped and passes a SIGHUP on to the workers
+    def registerSignals(self):
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, self.stop)
+
+        if (hasattr(signal, "SIGHUP")):
+            signal.signal(signal.SIGHUP, self.reload)
+
+    # _supervise(): Restarts the workers that exit until the server is stopped, then waits for all the workers to stop
+    def _supervise(self):
+        stopDeadline = None
+
+        while (self._workerNums or self._restartTimes):
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                pid, status = 0, 0
+                self._workerNums.clear()
+
+            if (pid != 0):
+                self._onWorkerExit(pid, status)
+                continue
+
+            now = time.monotonic()
+            for workerNum, restartTime in list(self._restartTimes.items()):
+                if (now >= restartTime):
+                    self._restartTimes.pop(workerNum)
+                    self._startWorker(workerNum)
+
+            if (self._isStopping and stopDeadline is None):
+                stopDeadline = now + self.StopTimeout
+            elif (stopDeadline is not None and now > stopDeadline):
+                print(f"[WORKER] Killing the workers that did not stop within {self.StopTimeout}s", flush = True)
+                self._sendToWorkers(signal.SIGKILL)
+                stopDeadline = float("inf")
+
+            time.sleep(self.PollInterval)
+
+    def run(self):
+        if (not hasattr(os, "fork")):
+            raise OSError("Serving with more than 1 worker needs os.fork, which is not available on this platform")
+
+        self._socket = self._listen()
+        metricsFolder = tempfile.mkdtemp(prefix = "backendMetrics")
+
+        try:
+            # the workers open their own connections
+            self.app.prepareFork(metricsFolder = metricsFolder)
+            self.registerSignals()
+
+            for workerNum in range(self.workers):
+                self._startWorker(workerNum)
+
+            self._supervise()
+        finally:
+            self._socket.close()
+            shutil.rmtree(metricsFolder, ignore_errors = True)
@@ -1,17 +1,32 @@
 from .constants.EnvironmentModes import EnvironmentModes
+from .constants.ServerModes import ServerModes
 
+from .model.AsyncBookingService import AsyncBookingService
+from .model.AsyncBuildingService import AsyncBuildingService
+from .model.AsyncDashboardService import AsyncDashboardService
+from .model.AsyncRoomService import AsyncRoomService
+from .model.AsyncUserService import AsyncUserService
 from .model.BookingService import BookingService
+from .model.BuildingService import BuildingService
 from .model.DashboardService import DashboardService
 from .model.RoomService import RoomService
+from .model.RoomAvailabilityIndex import RoomAvailabilityIndex
 from .model.UserService import UserService
 
+from .metrics.RequestMetrics import Histogram, RequestMetrics
+from .metrics.WorkerMetrics import WorkerMetrics
+
 from .view.BaseView import BaseView
 from .view.LogView import LogView
 
 from .CommandBuilder import CommandBuilder
 from .App import App
+from .AsyncApp import AsyncApp
+from .PreforkServer import PreforkServer
 
-__all__ = ["EnvironmentModes", 
-           "BookingService", "DashboardService", "RoomService", "UserService",
+__all__ = ["EnvironmentModes", "ServerModes",
+           "AsyncBookingService", "AsyncBuildingService", "AsyncDashboardService", "AsyncRoomService", "AsyncUserService",
+           "BookingService", "BuildingService", "DashboardService", "RoomService", "RoomAvailabilityIndex", "UserService",
+           "Histogram", "RequestMetrics", "WorkerMetrics",
            "BaseView", "LogView",
-           "App", "CommandBuilder"]
\ No newline at end of file
+           "App", "AsyncApp", "CommandBuilder", "PreforkServer"]
\ No newline at end of file
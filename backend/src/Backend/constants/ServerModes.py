@@ -0,0 +1,15 @@
+from enum import Enum
+from typing import Optional
+
+
+class ServerModes(Enum):
+    Waitress = "waitress"
+    Async = "async"
+
+    @classmethod
+    def find(cls, search: str) -> Optional["ServerModes"]:
+        for mode in cls:
+            if (search == mode.value):
+                return mode
+
+        return None
\ No newline at end of file
@@ -0,0 +1,325 @@
+import time
+import bisect
+import threading
+import contextvars
+from flask import Flask, Response, request, g
+from typing import Optional, Dict, Any, List, Tuple, Sequence, Callable
+
+import PyUtils as PU
+
+
+# Histogram: Thread-safe Prometheus histogram, with a separate set of cumulative buckets for each combination of labels
+class Histogram():
+    def __init__(self, name: str, description: str, labelNames: Sequence[str], buckets: Sequence[float]):
+        self.name = name
+        self.description = description
+        self.labelNames = tuple(labelNames)
+        self.buckets = tuple(sorted(buckets))
+
+        self._lock = threading.Lock()
+        self._counts: Dict[Tuple[str, ...], List[int]] = {}
+        self._sums: Dict[Tuple[str, ...], float] = {}
+
+    # toLabelText(labelNames, labels): Formats the labels of some metric in the Prometheus text format
+    @classmethod
+    def toLabelText(cls, labelNames: Sequence[str], labels: Sequence[str]) -> str:
+        if (not labelNames):
+            return ""
+
+        labelTexts = []
+        for name, value in zip(labelNames, labels):
+            value = f"{value}".replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+            labelTexts.append(f'{name}="{value}"')
+
+        return "{" + ",".join(labelTexts) + "}"
+
+    # observe(value, labels): Records some value for a combination of labels
+    def observe(self, value: float, labels: Tuple[str, ...]):
+        ind = bisect.bisect_left(self.buckets, value)
+
+        with self._lock:
+            counts = self._counts.get(labels)
+            if (counts is None):
+                counts = [0] * (len(self.buckets) + 1)
+                self._counts[labels] = counts
+                self._sums[labels] = 0.0
+
+            counts[ind] += 1
+            self._sums[labels] += value
+
+    # snapshot(): Retrieves the bucket counts and the sum of each combination of labels, in a form that can be saved as JSON
+    def snapshot(self) -> List[List[Any]]:
+        with self._lock:
+            return [[list(labels), list(counts), self._sums[labels]] for labels, counts in self._counts.items()]
+
+    # addSnapshot(snapshot): Adds the bucket counts and the sums from the snapshot of a histogram with the same buckets
+    def addSnapshot(self, snapshot: List[List[Any]]):
+        with self._lock:
+            for labels, counts, total in snapshot:
+                labels = tuple(labels)
+                currentCounts = self._counts.get(labels)
+                if (currentCounts is None):
+                    currentCounts = [0] * (len(self.buckets) + 1)
+                    self._counts[labels] = currentCounts
+                    self._sums[labels] = 0.0
+
+                for ind, count in enumerate(counts):
+                    currentCounts[ind] += count
+                self._sums[labels] += total
+
+    # toText(): Retrieves the histogram in the Prometheus text format
+    def toText(self) -> List[str]:
+        result = [f"# HELP {self.name} {self.description}", f"# TYPE {self.name} histogram"]
+
+        with self._lock:
+            series = [(labels, list(counts), self._sums[labels]) for labels, counts in self._counts.items()]
+
+        for labels, counts, total in sorted(series):
+            labelText = self.toLabelText(self.labelNames, labels)
+            labelPrefix = f"{labelText[:-1]}," if (labelText) else "{"
+
+            cumulativeCount = 0
+            for bucket, count in zip(self.buckets, counts):
+                cumulativeCount += count
+                result.append(f'{self.name}_bucket{labelPrefix}le="{float(bucket)!r}"}} {cumulativeCount}')
+
+            cumulativeCount += counts[-1]
+            result.append(f'{self.name}_bucket{labelPrefix}le="+Inf"}} {cumulativeCount}')
+            result.append(f"{self.name}_sum{labelText} {total!r}")
+            result.append(f"{self.name}_count{labelText} {cumulativeCount}")
+
+        return result
+
+
+# RequestTimer: The timing of a single request being answered
+class RequestTimer():
+    def __init__(self, routeLabels: Tuple[str, str]):
+        self.routeLabels = routeLabels
+        self.startTime = time.perf_counter()
+        self.dbTime = 0.0
+        self.dbQueries = 0
+
+
+# RequestMetrics: Records the latency, status codes, in-flight counts and response sizes of each route of the server,
+#   with the time spent waiting on the database split out from the time spent in Python.
+#
+#   When the server has many worker processes, set 'workerSnapshots' to retrieve the snapshots of the metrics of all the workers,
+#   so the metrics of the whole server are given back instead of the metrics of a single worker
+class RequestMetrics():
+    LatencyBuckets = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+    SizeBuckets = (64, 256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+    QueryBuckets = (0, 1, 2, 3, 5, 10, 25, 50)
+
+    # label for the requests that did not match any route, so unknown urls do not each get their own metrics
+    UnmatchedRoute = "<unmatched>"
+    ContentType = "text/plain; version=0.0.4; charset=utf-8"
+
+    def __init__(self, poolStats: Optional[Callable[[], Dict[str, Dict[str, Any]]]] = None):
+        self._poolStats = poolStats
+        self._lock = threading.Lock()
+
+        # the request being answered by the current thread or asyncio task
+        self._currentRequest: contextvars.ContextVar[Optional[RequestTimer]] = contextvars.ContextVar(f"currentRequest{id(self)}", default = None)
+
+        self._requests: Dict[Tuple[str, str, str], int] = {}
+        self._inFlight: Dict[Tuple[str, str], int] = {}
+        self._dbErrors = 0
+
+        routeLabels = ("route", "method")
+        self.latency = Histogram("http_request_duration_seconds", "Total time taken to answer the requests", routeLabels, self.LatencyBuckets)
+        self.dbLatency = Histogram("http_request_db_duration_seconds", "Time the requests spent waiting on the database", routeLabels, self.LatencyBuckets)
+        self.appLatency = Histogram("http_request_app_duration_seconds", "Time the requests spent in Python, outside of the database", routeLabels, self.LatencyBuckets)
+        self.dbQueries = Histogram("http_request_db_queries", "Number of database queries ran by the requests", routeLabels, self.QueryBuckets)
+        self.responseSize = Histogram("http_response_size_bytes", "Size of the response bodies", routeLabels, self.SizeBuckets)
+
+        self.workerSnapshots: Optional[Callable[[], List[Dict[str, Any]]]] = None
+
+    @property
+    def histograms(self) -> List[Histogram]:
+        return [self.latency, self.dbLatency, self.appLatency, self.dbQueries, self.responseSize]
+
+    # _getRouteLabels(): Retrieves the labels of the route for the current request
+    @classmethod
+    def _getRouteLabels(cls) -> Tuple[str, str]:
+        route = cls.UnmatchedRoute if (request.url_rule is None) else request.url_rule.rule
+        return (route, request.method)
+
+    # recordQuery(record): Adds the time of some database query to the request being answered by the current thread or asyncio task.
+    #   Meant to be used as an execute listener of the database tool
+    def recordQuery(self, record: PU.QueryRecord):
+        if (record.error is not None):
+            with self._lock:
+                self._dbErrors += 1
+
+        timer = self._currentRequest.get()
+        if (timer is None):
+            return
+
+        timer.dbTime += record.duration
+        timer.dbQueries += 1
+
+    # startRequest(routeLabels): Starts timing a request for the current thread or asyncio task
+    def startRequest(self, routeLabels: Tuple[str, str]) -> RequestTimer:
+        timer = RequestTimer(routeLabels)
+        self._currentRequest.set(timer)
+
+        with self._lock:
+            self._inFlight[routeLabels] = self._inFlight.get(routeLabels, 0) + 1
+
+        return timer
+
+    # finishRequest(timer, status, responseSize): Records the metrics of a request that got answered.
+    #   'responseSize' is None when the size of the response is not known ahead of time (eg. streamed responses)
+    def finishRequest(self, timer: RequestTimer, status: int, responseSize: Optional[int] = None):
+        duration = time.perf_counter() - timer.startTime
+        routeLabels = timer.routeLabels
+        dbTime = min(timer.dbTime, duration)
+
+        self.latency.observe(duration, routeLabels)
+        self.dbLatency.observe(dbTime, routeLabels)
+        self.appLatency.observe(duration - dbTime, routeLabels)
+        self.dbQueries.observe(timer.dbQueries, routeLabels)
+
+        if (responseSize is not None):
+            self.responseSize.observe(responseSize, routeLabels)
+
+        requestLabels = routeLabels + (f"{status}",)
+        with self._lock:
+            self._requests[requestLabels] = self._requests.get(requestLabels, 0) + 1
+
+    # endRequest(timer): Stops timing a request, even when the request failed before it could be answered
+    def endRequest(self, timer: RequestTimer):
+        self._currentRequest.set(None)
+
+        with self._lock:
+            self._inFlight[timer.routeLabels] -= 1
+
+    # _beforeRequest(): Starts timing a request
+    def _beforeRequest(self):
+        g.metricsTimer = self.startRequest(self._getRouteLabels())
+
+    # _afterRequest(response): Records the metrics of a request that got answered
+    def _afterRequest(self, response: Response) -> Response:
+        timer = g.get("metricsTimer")
+        if (timer is None):
+            return response
+
+        self.finishRequest(timer, response.status_code, responseSize = response.calculate_content_length())
+        return response
+
+    # _teardownRequest(error): Finishes a request, even when the request failed before it could be answered
+    def _teardownRequest(self, error: Optional[BaseException] = None):
+        timer = g.pop("metricsTimer", None)
+        if (timer is not None):
+            self.endRequest(timer)
+
+    # register(app): Adds the hooks for timing the requests and the '/metrics' endpoint to a Flask app
+    def register(self, app: Flask):
+        app.before_request(self._beforeRequest)
+        app.after_request(self._afterRequest)
+        app.teardown_request(self._teardownRequest)
+        app.add_url_rule("/metrics", "metrics", self.toResponse, methods = ["GET"])
+
+    # _counterToText(name, description, labelNames, values, metricType): Formats some counter or gauge in the Prometheus text format
+    @classmethod
+    def _counterToText(cls, name: str, description: str, labelNames: Sequence[str], values: Dict[Tuple[str, ...], float],
+                       metricType: str = "counter") -> List[str]:
+        result = [f"# HELP {name} {description}", f"# TYPE {name} {metricType}"]
+        for labels, value in sorted(values.items()):
+            result.append(f"{name}{Histogram.toLabelText(labelNames, labels)} {value}")
+
+        return result
+
+    # _poolStatsToText(poolStats): Formats the live gauges and counters of the connection pools in the Prometheus text format
+    def _poolStatsToText(self, poolStats: Dict[str, Dict[str, Any]]) -> List[str]:
+        if (self._poolStats is None):
+            return []
+
+        # (stat, metric name, description, metric type)
+        metrics = [("inUse", "db_pool_in_use", "Number of connections in use", "gauge"),
+                   ("idle", "db_pool_idle", "Number of idle connections", "gauge"),
+                   ("waiting", "db_pool_waiting", "Number of callers waiting for a connection", "gauge"),
+                   ("maxConn", "db_pool_max_connections", "Maximum number of connections", "gauge"),
+                   ("acquires", "db_pool_acquires_total", "Number of connections handed out", "counter"),
+                   ("timeouts", "db_pool_timeouts_total", "Number of callers that timed out waiting for a connection", "counter")]
+
+        result = []
+        for stat, name, description, metricType in metrics:
+            values = {(database,): stats[stat] for database, stats in poolStats.items()}
+            result += self._counterToText(name, description, ("database",), values, metricType = metricType)
+
+        return result
+
+    # snapshot(): Retrieves all the metrics of this process, in a form that can be saved as JSON and merged with the metrics of other processes
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            requests = [[*labels, count] for labels, count in self._requests.items()]
+            inFlight = [[*labels, count] for labels, count in self._inFlight.items()]
+            dbErrors = self._dbErrors
+
+        return {"requests": requests,
+                "inFlight": inFlight,
+                "dbErrors": dbErrors,
+                "histograms": {histogram.name: histogram.snapshot() for histogram in self.histograms},
+                "pools": {} if (self._poolStats is None) else self._poolStats()}
+
+    # _sumValues(rows): Adds up the values of the rows with the same labels. The value is the last column of each row
+    @classmethod
+    def _sumValues(cls, rows: List[List[Any]]) -> Dict[Tuple[str, ...], float]:
+        result = {}
+        for row in rows:
+            labels = tuple(row[:-1])
+            result[labels] = result.get(labels, 0) + row[-1]
+
+        return result
+
+    # mergePoolStats(poolStats): Adds up the stats of the connection pools of many processes, for each database.
+    #   The latencies of the pools cannot be added up, so the average latency is weighted by the number of connections handed out
+    #   and the p95 latency is the highest p95 latency of the pools
+    @classmethod
+    def mergePoolStats(cls, poolStats: List[Dict[str, Dict[str, Any]]]) -> Dict[str, Dict[str, Any]]:
+        result = {}
+        for processStats in poolStats:
+            for database, stats in processStats.items():
+                merged = result.get(database)
+                if (merged is None):
+                    result[database] = dict(stats)
+                    continue
+
+                acquires = merged["acquires"] + stats["acquires"]
+                if (acquires > 0):
+                    merged["acquireLatencyAvg"] = (merged["acquireLatencyAvg"] * merged["acquires"] + stats["acquireLatencyAvg"] * stats["acquires"]) / acquires
+
+                for stat, value in stats.items():
+                    if (stat in {"acquireLatencyP95", "acquireLatencyMax"}):
+                        merged[stat] = max(merged[stat], value)
+                    elif (stat != "acquireLatencyAvg"):
+                        merged[stat] += value
+
+        return result
+
+    # toText(): Retrieves all the metrics in the Prometheus text format
+    def toText(self) -> str:
+        snapshots = [self.snapshot()] if (self.workerSnapshots is None) else self.workerSnapshots()
+
+        requests = self._sumValues([row for snapshot in snapshots for row in snapshot["requests"]])
+        inFlight = self._sumValues([row for snapshot in snapshots for row in snapshot["inFlight"]])
+        dbErrors = sum(map(lambda snapshot: snapshot["dbErrors"], snapshots))
+
+        result = self._counterToText("http_requests_total", "Number of answered requests", ("route", "method", "status"), requests)
+        result += self._counterToText("http_requests_in_flight", "Number of requests being answered", ("route", "method"), inFlight, metricType = "gauge")
+
+        for histogram in self.histograms:
+            merged = Histogram(histogram.name, histogram.description, histogram.labelNames, histogram.buckets)
+            for snapshot in snapshots:
+                merged.addSnapshot(snapshot["histograms"].get(histogram.name, []))
+
+            result += merged.toText()
+
+        result += self._counterToText("db_query_errors_total", "Number of database queries that failed", (), {(): dbErrors})
+        result += self._poolStatsToText(self.mergePoolStats(list(map(lambda snapshot: snapshot["pools"], snapshots))))
+        return "\n".join(result) + "\n"
+
+    # toResponse(): Retrieves all the metrics as the response for the '/metrics' endpoint
+    def toResponse(self) -> Response:
+        return Response(self.toText(), content_type = self.ContentType)
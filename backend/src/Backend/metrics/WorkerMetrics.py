@@ -0,0 +1,85 @@
+import os
+import json
+import threading
+from typing import Optional, Dict, Any, List, Callable
+
+import PyUtils as PU
+
+
+# WorkerMetrics: Shares the metrics of the worker processes of a pre-forked server through a folder,
+#   so that any worker can answer '/metrics', '/poolStats' and '/queryStats' for the whole server.
+#
+#   Each worker writes the snapshot of its metrics to its own file in the folder every 'PublishInterval' seconds.
+#   A worker that collects the snapshots writes its own snapshot first, so only the snapshots of the other workers can be out of date.
+#   A worker that gets restarted takes over the file of the worker it replaced
+class WorkerMetrics():
+    PublishInterval = 1
+    FilePrefix = "worker-"
+    FileExt = ".json"
+
+    def __init__(self, folder: str, workerNum: int, snapshot: Callable[[], Dict[str, Any]]):
+        self.folder = folder
+        self.workerNum = workerNum
+        self._snapshot = snapshot
+
+        self._publishLock = threading.Lock()
+        self._stopEvent = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def file(self) -> str:
+        return os.path.join(self.folder, f"{self.FilePrefix}{self.workerNum}{self.FileExt}")
+
+    # publish(): Writes the snapshot of the metrics of this worker to its file.
+    #   The snapshot is written to a temporary file that replaces the file, so the other workers never read a partial snapshot
+    def publish(self):
+        snapshot = self._snapshot()
+        tempFile = f"{self.file}.{os.getpid()}.tmp"
+
+        with self._publishLock:
+            with open(tempFile, "w", encoding = PU.FileEncodings.UTF8.value) as f:
+                json.dump(snapshot, f)
+
+            os.replace(tempFile, self.file)
+
+    # collect(): Retrieves the snapshots of the metrics of all the workers
+    def collect(self) -> List[Dict[str, Any]]:
+        self.publish()
+
+        result = []
+        for file in sorted(os.listdir(self.folder)):
+            if (not file.startswith(self.FilePrefix) or not file.endswith(self.FileExt)):
+                continue
+
+            try:
+                with open(os.path.join(self.folder, file), "r", encoding = PU.FileEncodings.UTF8.value) as f:
+                    result.append(json.load(f))
+            except (OSError, ValueError):
+                continue
+
+        return result
+
+    def _run(self):
+        while (not self._stopEvent.wait(self.PublishInterval)):
+            try:
+                self.publish()
+            except OSError:
+                pass
+
+    # start(): Starts writing the snapshots of the metrics of this worker in the background
+    def start(self):
+        if (self._thread is not None):
+            return
+
+        self._stopEvent.clear()
+        self._thread = threading.Thread(target = self._run, name = f"WorkerMetrics{self.workerNum}", daemon = True)
+        self._thread.start()
+
+    # stop(): Stops writing the snapshots of the metrics of this worker
+    def stop(self):
+        if (self._thread is None):
+            return
+
+        self._stopEvent.set()
+        self._thread.join()
+        self._thread = None
@@ -0,0 +1,70 @@
+import uuid
+from datetime import datetime, timezone, timedelta
+from typing import Optional, Tuple
+
+import PyUtils as PU
+
+from .BookingService import BookingService
+from .RoomAvailabilityIndex import RoomAvailabilityIndex
+from ..view.BaseView import BaseView
+
+
+# AsyncBookingService: The counterpart of BookingService for the asyncio server
+class AsyncBookingService(BookingService):
+    def __init__(self, dbTool: PU.AsyncDBTool, view: Optional[BaseView] = None, availabilityIndex: Optional[RoomAvailabilityIndex] = None):
+        super().__init__(dbTool, view = view, availabilityIndex = availabilityIndex)
+
+    # bookRoom(userId, roomId, startTime, endTime, participants): Creates a new booking
+    async def bookRoom(self, userId: Optional[str], roomId: Optional[str], startTime: datetime, 
+                       endTime: datetime, participants: Optional[str]) -> Tuple[bool, str, Optional[str]]:
+        vars = self._getBookRoomVars(userId, roomId, startTime, endTime, participants)
+        if (vars is None):
+            return [False, "Invalid UUID format for user ID or room ID.", None]
+
+        cursor, error = await self._dbTool.executeStatement(PU.StatementNames.R7.value, vars = vars, raiseException = False)
+        if (error is not None):
+            return self._onBookRoomError(error)
+
+        return self._onBookRoomResult(cursor.fetchone())
+
+    # cancelBooking(booking_id, user_id): Cancels a booking
+    async def cancelBooking(self, booking_id: Optional[str], user_id: Optional[str]) -> Tuple[bool, str]:
+        vars = self._getCancelVars(booking_id, user_id)
+        if (vars is None):
+            return [False, "Invalid UUID format for booking ID or user ID."]
+
+        cursor, error = await self._dbTool.executeStatement(PU.StatementNames.R8i.value, vars = vars, raiseException = False)
+        if (error is not None):
+            errorMsg = self._getCancelErrorMsg(f"{error}")
+            return [False, errorMsg]
+
+        cancelledRows = cursor.fetchall() if (self._availabilityIndex is not None) else []
+        return self._onCancelResult(cursor.rowcount, cancelledRows)
+
+    # _fetchUserRows(statementName, vars): Runs some query on the bookings of a user and retrieves all of its rows
+    async def _fetchUserRows(self, statementName: str, vars: dict) -> Tuple[bool, list]:
+        try:
+            cursor, _ = await self._dbTool.executeStatement(statementName, vars = vars)
+            return [True, cursor.fetchall()]
+        except Exception as e:
+            return [False, f"SQL execution error: {e}"]
+
+    # getFutureBookings(user_id): Retrieves the upcoming bookings of a user
+    async def getFutureBookings(self, user_id: str) -> Tuple[bool, list]:
+        try:
+            userUUID = uuid.UUID(user_id)
+        except ValueError:
+            return [False, "Invalid UUID format for user ID."]
+
+        utc_now = datetime.now(timezone.utc)
+        fake_utc_est_now = utc_now - timedelta(hours=4)
+        return await self._fetchUserRows(PU.StatementNames.R8ii.value, {"user_id": str(userUUID), "now": fake_utc_est_now})
+
+    # getBookingsAndCancellations(user_id): Retrieves all the bookings of a user along with whether they got cancelled
+    async def getBookingsAndCancellations(self, user_id: str) -> Tuple[bool, list]:
+        try:
+            userUUID = uuid.UUID(user_id)
+        except ValueError:
+            return [False, "Invalid UUID format for user ID."]
+
+        return await self._fetchUserRows(PU.StatementNames.R9.value, {"user_id": str(userUUID)})
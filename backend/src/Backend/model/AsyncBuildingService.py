@@ -0,0 +1,18 @@
+from typing import Optional, Dict, Any, List
+
+import PyUtils as PU
+
+from .BuildingService import BuildingService
+from ..view.BaseView import BaseView
+
+
+# AsyncBuildingService: The counterpart of BuildingService for the asyncio server
+class AsyncBuildingService(BuildingService):
+    def __init__(self, dbTool: PU.AsyncDBTool, view: Optional[BaseView] = None):
+        super().__init__(dbTool, view = view)
+
+    # fetchBuildings(buildingName, addressLine1, addressLine2, city, province, country, postalCode): Retrieves the buildings that match some filters
+    async def fetchBuildings(self, buildingName: Optional[str] = None, addressLine1: Optional[str] = None, addressLine2: Optional[str] = None, 
+                             city: Optional[str] = None, province: Optional[str] = None, country: Optional[str] = None, postalCode: Optional[str] = None) -> List[Dict[str, Any]]:
+        params = self._getFetchBuildingsVars(buildingName, addressLine1, addressLine2, city, province, country, postalCode)
+        return await self._dbTool.fetchRecords(PU.StatementNames.GetBuildings.value, vars = params)
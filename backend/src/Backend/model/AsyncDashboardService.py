@@ -0,0 +1,43 @@
+import uuid
+from datetime import datetime
+from typing import Optional, Tuple, List, Dict, Any, Union
+
+import PyUtils as PU
+
+from .DashboardService import DashboardService
+from ..view.BaseView import BaseView
+
+
+# AsyncDashboardService: The counterpart of DashboardService for the asyncio server
+class AsyncDashboardService(DashboardService):
+    def __init__(self, dbTool: PU.AsyncDBTool, view: Optional[BaseView] = None):
+        super().__init__(dbTool, view = view)
+
+    # getDashboardMetrics(user_id): Retrieves the average booking duration and the most booked hour of some user
+    async def getDashboardMetrics(self, user_id: Optional[str]) -> Tuple[bool, dict]:
+        try:
+            userUUID = uuid.UUID(user_id)
+        except:
+            return [False, "Invalid UUID format for user ID."]
+
+        self.print(f"Running getDashboardMetrics for {user_id}")
+
+        try:
+            cursor, _ = await self._dbTool.executeStatement(PU.StatementNames.AF2.value, vars = {"user_id": str(userUUID)})
+            result = cursor.fetchone()
+        except Exception as e:
+            self.printError(f"{e}")
+            return [False, f"SQL execution error: {e}"]
+
+        self.print(f"Query result: {result}")
+        return self._getDashboardMetricsResult(result)
+
+    # getBookingFrequency(userId, startDateTime, endDateTime, queryLimit): Retrieves how often the rooms got booked by some user
+    async def getBookingFrequency(self, userId: uuid.UUID, startDateTime: Optional[datetime], endDateTime: Optional[datetime], queryLimit: Optional[int]) -> Tuple[bool, Union[str, List[Dict[str, Any]]]]:
+        errorMsg = self._checkBookingFrequencyArgs(startDateTime, endDateTime, queryLimit)
+        if (errorMsg is not None):
+            return [False, errorMsg]
+
+        statementName, params = self._getBookingFrequencyQuery(userId, startDateTime, endDateTime, queryLimit)
+        result = await self._dbTool.fetchRecords(statementName, vars = params)
+        return [True, result]
@@ -0,0 +1,84 @@
+from typing import Optional, Dict, Any, List
+
+import PyUtils as PU
+
+from .RoomService import RoomService
+from .RoomAvailabilityIndex import RoomAvailabilityIndex
+from ..view.BaseView import BaseView
+
+
+# AsyncRoomService: The counterpart of RoomService for the asyncio server
+class AsyncRoomService(RoomService):
+    def __init__(self, dbTool: PU.AsyncDBTool, view: Optional[BaseView] = None, availabilityIndex: Optional[RoomAvailabilityIndex] = None):
+        super().__init__(dbTool, view = view, availabilityIndex = availabilityIndex)
+
+    # _reloadIndexRooms(): Reloads the data of the rooms in the availability index after some room got changed
+    async def _reloadIndexRooms(self):
+        if (self._availabilityIndex is not None and self._availabilityIndex.isLoaded):
+            rooms = await self._dbTool.fetchRecords(PU.StatementNames.GetRoomsByBuildingID.value, vars = {"building_id": None})
+            self._availabilityIndex.setRooms(rooms)
+
+    # fetchRoomsByBuildingID(buildingId): Retrieves the rooms of some building, or all the rooms if no building is given
+    async def fetchRoomsByBuildingID(self, buildingId: Optional[str]) -> List[Dict[str, Any]]:
+        params = {
+            'building_id': RoomService._safe_uuid(buildingId),
+        }
+
+        return await self._dbTool.fetchRecords(PU.StatementNames.GetRoomsByBuildingID.value, vars = params)
+
+    # fetchAvailableRooms(roomName, minCapacity, maxCapacity, startTimeStr, endTimeStr): Retrieves all the available rooms
+    async def fetchAvailableRooms(self, buildingId: Optional[str] = None, roomName: Optional[str] = None, minCapacity:Optional[str] = None, maxCapacity: Optional[str] = None, 
+                                  startTimeStr: Optional[str] = None, endTimeStr: Optional[str] = None) -> List[Dict[str, Any]]:
+        params = self._getAvailableRoomsVars(roomName, minCapacity, maxCapacity, startTimeStr, endTimeStr)
+
+        indexResult = self._fetchIndexAvailableRooms(params)
+        if (indexResult is not None):
+            return indexResult
+
+        return await self._dbTool.fetchRecords(PU.StatementNames.R6.value, vars = params)
+
+    # addRoom(roomName, capacity, buildingID, userID): Adds a new room to some building
+    async def addRoom(self, roomName, capacity, buildingID, userID) -> Dict[str, Any]:
+        _, error = await self._dbTool.executeStatement(PU.StatementNames.AF3AddRoom.value, 
+                                                       vars = {
+                                                               "roomName": roomName,
+                                                               "capacity": capacity,
+                                                               "buildingID": buildingID,
+                                                               "userID": userID
+                                                               },
+                                                       raiseException = False)
+
+        if (error is None):
+            await self._reloadIndexRooms()
+
+        return self._getModifyRoomResult("addStatus", error)
+
+    # editRoom(roomID, roomName, capacity, userID): Changes the name and capacity of some room
+    async def editRoom(self, roomID, roomName, capacity, userID) -> Dict[str, Any]:
+        _, error = await self._dbTool.executeStatement(PU.StatementNames.AF3EditRoom.value, 
+                                                       vars = {
+                                                               "roomID": roomID,
+                                                               "roomName": roomName,
+                                                               "capacity": capacity,
+                                                               "userID": userID
+                                                               },
+                                                       raiseException = False)
+
+        if (error is None):
+            await self._reloadIndexRooms()
+
+        return self._getModifyRoomResult("editStatus", error)
+
+    # deleteRoom(roomID, userID): Deletes some room
+    async def deleteRoom(self, roomID, userID) -> Dict[str, Any]:
+        _, error = await self._dbTool.executeStatement(PU.StatementNames.AF3DeleteRoom.value, 
+                                                       vars = {
+                                                               "roomID": roomID,
+                                                               "userID": userID
+                                                               },
+                                                       raiseException = False)
+
+        if (error is None and self._availabilityIndex is not None):
+            self._availabilityIndex.removeRoom(roomID)
+
+        return self._getModifyRoomResult("deleteStatus", error)
@@ -0,0 +1,99 @@
+import uuid
+from typing import Optional, Tuple, Dict, Any, List
+
+import PyUtils as PU
+
+from .UserService import UserService
+from ..view.BaseView import BaseView
+
+
+# AsyncUserService: The counterpart of UserService for the asyncio server
+class AsyncUserService(UserService):
+    def __init__(self, dbTool: PU.AsyncDBTool, view: Optional[BaseView] = None):
+        super().__init__(dbTool, view = view)
+
+    # signup(username, email, password): Creates a new user
+    async def signup(self, username, email, password) -> Dict[str, Any]:
+        cursor, error = await self._dbTool.executeStatement(PU.StatementNames.R10a.value, 
+                                                            vars = {
+                                                                    "username": username,
+                                                                    "email": email,
+                                                                    "passwrd": password
+                                                                    },
+                                                            raiseException = False)
+
+        if (error is not None):
+            errorMsg = self._getSignupErrorMsg(f"{error}")
+            self.print(errorMsg)
+            return {
+              "signupStatus": False,
+              "errorMessage": errorMsg
+            }
+
+        return self._getSignupResult(cursor.fetchone())
+
+    # login(username, password): Checks the credentials of some user
+    async def login(self, username, password) -> Dict[str, Any]:
+        cursor, error = await self._dbTool.executeStatement(PU.StatementNames.R10b.value, 
+                                                            vars = {
+                                                                    "username": username,
+                                                                    "passwrd": password
+                                                                    },
+                                                            raiseException = False)
+
+        if (error is not None):
+            return {
+              "loginStatus": False,
+              "errorMessage": "Invalid credentials"
+            }
+
+        return self._getLoginResult(cursor.fetchone())
+
+    # viewAdminLog(userID): Retrieves the changes made by the admins
+    async def viewAdminLog(self, userID) -> List[Dict[str, Any]]:
+        params = {
+            'userID': userID
+        }
+
+        return await self._dbTool.fetchRecords(PU.StatementNames.AF4AdminLog.value, vars = params)
+
+    # updateUsername(userId, newUsername): Changes the username of some user
+    async def updateUsername(self, userId: uuid.UUID, newUsername: str) -> Tuple[bool, str]:
+        vars = {
+            "newUsername": newUsername,
+            "userId": f"{userId}"
+        }
+
+        try:
+            await self._dbTool.executeStatement(PU.StatementNames.AF5a.value, vars = vars)
+            return [True, "Username updated successfully."]
+        except Exception as e:
+            self.print(e)
+            return [False, str(e)]
+
+    # updatePassword(userId, oldPassword, newPassword): Changes the password of some user, if the old password is correct.
+    #   The check and the update run in the same transaction
+    async def updatePassword(self, userId: uuid.UUID, oldPassword: str, newPassword: str) -> Tuple[bool, str]:
+        vars = {
+            "oldPassword": oldPassword,
+            "newPassword": newPassword,
+            "userId": str(userId)
+        }
+
+        async with self._dbTool.transaction() as conn:
+            cursor, error = await self._dbTool.executeSQL(self.PasswordCheckSQL, vars = vars, conn = conn, raiseException = False)
+
+            if (error is not None):
+                self.print(error)
+                return [False, "Password check failed."]
+
+            row = cursor.fetchone()
+            if (row is None or row[0] == 0):
+                return [False, "Old password incorrect."]
+
+            _, updateError = await self._dbTool.executeStatement(PU.StatementNames.AF5b.value, vars = vars, conn = conn, raiseException = False)
+
+        if (updateError is not None):
+            self.print(updateError)
+            return [False, "Password update failed."]
+        return [True, "Password updated successfully."]
@@ -1,17 +1,22 @@
 import uuid
-import os
 import FixRaidenBoss2 as FRB
 from datetime import datetime, timezone, timedelta
-from typing import Optional, Tuple, Callable
+from typing import Optional, Tuple, Callable, Dict, Any, List
 import pytz
 
 import PyUtils as PU
 
 from .BaseAPIService import BaseAPIService
+from .RoomAvailabilityIndex import RoomAvailabilityIndex
+from ..view.BaseView import BaseView
 
 
 class BookingService(BaseAPIService):
     ErrorSearchDFA = {}
+
+    def __init__(self, dbTool: PU.DBTool, view: Optional[BaseView] = None, availabilityIndex: Optional[RoomAvailabilityIndex] = None):
+        super().__init__(dbTool, view = view)
+        self._availabilityIndex = availabilityIndex
     
     def _getErrorMsg(self, dfaID: str, errorMsg: str, errorNotFoundMsg: str, dfaBuildFunc: Callable[[], FRB.BaseAhoCorasickDFA]) -> str:
         searchDFA = self.ErrorSearchDFA.get(dfaID)
@@ -40,7 +45,8 @@ class BookingService(BaseAPIService):
             "Booking_roomID_fkey": "Room does not exist",
             "Booking time overlaps with your own booking": "You already have a booking at a similar time!",
             "User already has an overlapping booking on this day.": "You already have a booking at a similar time!",
-            "Room is already booked": "Room not available at this time"
+            "Room is already booked": "Room not available at this time",
+            "noroomdoublebooking": "Room not available at this time"
         }
 
         return FRB.AhoCorasickBuilder().build(data = data)
@@ -49,45 +55,58 @@ class BookingService(BaseAPIService):
         return self._getErrorMsg("booking", errorMsg, "Booking encountered an unknown error!", self._buildBookingErrorSearchDFA)
 
     
-    # bookRoom(userId, roomId, startTime, endTime, participants): Creates a new booking
-    def bookRoom(self, userId: Optional[str], roomId: Optional[str], startTime: datetime, 
-                 endTime: datetime, participants: Optional[str]) -> Tuple[bool, str, Optional[str]]:
+    # _getBookRoomVars(userId, roomId, startTime, endTime, participants): Retrieves the parameters of the query for booking a room,
+    #   or None if the ids are not valid UUIDs
+    def _getBookRoomVars(self, userId: Optional[str], roomId: Optional[str], startTime: datetime, 
+                         endTime: datetime, participants: Optional[str]) -> Optional[Dict[str, Any]]:
         try:
             userUUID = uuid.UUID(userId)
             roomUUID = uuid.UUID(roomId)
         except ValueError:
-            return [False, "Invalid UUID format for user ID or room ID.", None]
+            return None
         
-        sqlPath = os.path.join(PU.Paths.SQLFeaturesFolder.value, "R7/R7.sql")
-        try:
-            with open(sqlPath, 'r') as f:
-                bookingSQL = f.read()
-        except FileNotFoundError:
-            return [False, f"Booking SQL file not found at {sqlPath}", None]
+        return {"userID": str(userUUID),
+                "roomID": str(roomUUID),
+                "bookDateTime": datetime.now(pytz.timezone("US/Eastern")).replace(tzinfo=None).replace(tzinfo=timezone.utc),
+                "startTime": startTime,
+                "endTime": endTime,
+                "participants": participants}
+    
+    # _onBookRoomError(error): Retrieves the result for a booking that failed in the database
+    def _onBookRoomError(self, error: Exception) -> Tuple[bool, str, Optional[str]]:
+        errorMsg = self._getBookingErrorMsg(f"{error}")
+        self.print(errorMsg)
+        return [False, errorMsg, None]
+    
+    # _onBookRoomResult(row): Retrieves the result for the row returned by the query for booking a room
+    def _onBookRoomResult(self, row: Optional[Tuple[Any, ...]]) -> Tuple[bool, str, Optional[str]]:
+        if row:
+            bookingId, bookedRoomId, bookStartTime, bookEndTime = row
+            if (self._availabilityIndex is not None):
+                self._availabilityIndex.addBooking(bookedRoomId, bookStartTime, bookEndTime)
+
+            return [True, f"Booking successful! Booking ID: {bookingId}", bookingId]
+        else:
+            return [False, "Booking failed: room is already booked.", None]
+    
+    # bookRoom(userId, roomId, startTime, endTime, participants): Creates a new booking
+    def bookRoom(self, userId: Optional[str], roomId: Optional[str], startTime: datetime, 
+                 endTime: datetime, participants: Optional[str]) -> Tuple[bool, str, Optional[str]]:
+        vars = self._getBookRoomVars(userId, roomId, startTime, endTime, participants)
+        if (vars is None):
+            return [False, "Invalid UUID format for user ID or room ID.", None]
         
-        connData, cursor, error = self._dbTool.executeSQL(bookingSQL, 
-                                                          vars = {"userID": str(userUUID),
-                                                                  "roomID": str(roomUUID),
-                                                                  "bookDateTime": datetime.now(pytz.timezone("US/Eastern")).replace(tzinfo=None).replace(tzinfo=timezone.utc),
-                                                                  "startTime": startTime,
-                                                                  "endTime": endTime,
-                                                                  "participants": participants}, 
-                                                          commit = True, closeConn = False,
-                                                          raiseException = False)
+        connData, cursor, error = self._dbTool.executeStatement(PU.StatementNames.R7.value, vars = vars,
+                                                                commit = True, closeConn = False,
+                                                                raiseException = False)
         
         if (error is not None):
-            errorMsg = self._getBookingErrorMsg(f"{error}")
-            self.print(errorMsg)
-            return [False, errorMsg, None]
+            connData.putConn()
+            return self._onBookRoomError(error)
         
         row = cursor.fetchone()
         connData.putConn()
-
-        if row:
-            bookingId = row[0]
-            return [True, f"Booking successful! Booking ID: {bookingId}", bookingId]
-        else:
-            return [False, "Booking failed: room is already booked.", None]
+        return self._onBookRoomResult(row)
         
     def _buildCancelErrorSearchDFA(self) -> FRB.BaseAhoCorasickDFA:
         data = {
@@ -100,42 +119,52 @@ class BookingService(BaseAPIService):
     def _getCancelErrorMsg(self, errorMsg: str) -> str:
         return self._getErrorMsg("cancel", errorMsg, "Cancellation encountered an unknown error!", self._buildCancelErrorSearchDFA)
 
-    # cancelBooking(booking_id, user_id): Cancels a booking
-    def cancelBooking(self, booking_id: Optional[str], user_id: Optional[str]) -> Tuple[bool, str]:
+    # _getCancelVars(booking_id, user_id): Retrieves the parameters of the query for cancelling a booking,
+    #   or None if the ids are not valid UUIDs
+    def _getCancelVars(self, booking_id: Optional[str], user_id: Optional[str]) -> Optional[Dict[str, Any]]:
         try:
             bookingUUID = uuid.UUID(booking_id)
             userUUID = uuid.UUID(user_id)
         except ValueError:
-            return [False, "Invalid UUID format for booking ID or user ID."]
-        
-        sqlPath = os.path.join(PU.Paths.SQLFeaturesFolder.value, "R8/R8i.sql")
-        try:
-            cancelSQL = PU.DBTool.readSQLFile(sqlPath)
-        except FileNotFoundError:
-            return [False, f"Cancel SQL file not found at {sqlPath}"]
+            return None
         
         # temporary fake
         cancelDate = datetime.now(timezone.utc)
         cancelDate = cancelDate.replace(year=cancelDate.year + 2)
+
+        return {"booking_id": str(bookingUUID), 
+                "user_id": str(userUUID),
+                "cancel_date": cancelDate}
+    
+    # _onCancelResult(cancelledResultLen, cancelledRows): Retrieves the result for the rows returned by the query for cancelling a booking
+    def _onCancelResult(self, cancelledResultLen: int, cancelledRows: List[Tuple[Any, ...]]) -> Tuple[bool, str]:
+        for _, roomId, bookStartTime, bookEndTime in cancelledRows:
+            self._availabilityIndex.removeBooking(roomId, bookStartTime, bookEndTime)
+
+        if cancelledResultLen > 0:
+            return [True, "Booking successfully cancelled."]
+        else:
+            return [False, "Booking already cancelled or not found."]
+
+    # cancelBooking(booking_id, user_id): Cancels a booking
+    def cancelBooking(self, booking_id: Optional[str], user_id: Optional[str]) -> Tuple[bool, str]:
+        vars = self._getCancelVars(booking_id, user_id)
+        if (vars is None):
+            return [False, "Invalid UUID format for booking ID or user ID."]
         
-        connData, cursor, error = self._dbTool.executeSQL(cancelSQL, 
-                                                          vars = {"booking_id": str(bookingUUID), 
-                                                                  "user_id": str(userUUID),
-                                                                  "cancel_date": cancelDate}, 
-                                                          commit = True, closeConn = False,
-                                                          raiseException = False)
+        connData, cursor, error = self._dbTool.executeStatement(PU.StatementNames.R8i.value, vars = vars,
+                                                                commit = True, closeConn = False,
+                                                                raiseException = False)
         
         if (error is not None):
+            connData.putConn()
             errorMsg = self._getCancelErrorMsg(f"{error}")
             return [False, errorMsg]
 
         cancelledResultLen = cursor.rowcount
+        cancelledRows = cursor.fetchall() if (self._availabilityIndex is not None) else []
         connData.putConn()
-
-        if cancelledResultLen > 0:
-            return [True, "Booking successfully cancelled."]
-        else:
-            return [False, "Booking already cancelled or not found."]
+        return self._onCancelResult(cancelledResultLen, cancelledRows)
         
 
     def getFutureBookings(self, user_id: str) -> Tuple[bool, list]:
@@ -145,26 +174,19 @@ class BookingService(BaseAPIService):
         except ValueError as e:
             return [False, "Invalid UUID format for user ID."]
     
-        sqlPath = os.path.join(PU.Paths.SQLFeaturesFolder.value, "R8/R8ii.sql")
-        
-    
-        if not os.path.exists(sqlPath):
-            return [False, f"SQL file not found at {sqlPath}"]
-    
-        try:
-            query = PU.DBTool.readSQLFile(sqlPath)
-        except Exception as e:
-            return [False, f"Error reading SQL file: {e}"]
-    
         try:
             utc_now = datetime.now(timezone.utc)
             fake_utc_est_now = utc_now - timedelta(hours=4)
             now = fake_utc_est_now
-            connData, cursor, error = self._dbTool.executeSQL(query,
-                                                              vars={"user_id": str(userUUID), "now": now},
-                                                              commit=False, closeConn=False)
-            result = cursor.fetchall()
-            connData.putConn()
+            connData, cursor, error = self._dbTool.executeStatement(PU.StatementNames.R8ii.value,
+                                                                    vars={"user_id": str(userUUID), "now": now},
+                                                                    commit=False, closeConn=False, raiseException=False)
+            try:
+                if (error is not None):
+                    raise error
+                result = cursor.fetchall()
+            finally:
+                connData.putConn()
             return [True, result]
         except Exception as e:
             return [False, f"SQL execution error: {e}"]
@@ -175,22 +197,16 @@ class BookingService(BaseAPIService):
         except ValueError as e:
             return [False, "Invalid UUID format for user ID."]
     
-        sqlPath = os.path.join(PU.Paths.SQLFeaturesFolder.value, "R9/R9.sql")
-        
-        if not os.path.exists(sqlPath):
-            return [False, f"SQL file not found at {sqlPath}"]
-    
         try:
-            query = PU.DBTool.readSQLFile(sqlPath)
-        except Exception as e:
-            return [False, f"Error reading SQL file: {e}"]
-    
-        try:
-            connData, cursor, error = self._dbTool.executeSQL(query,
-                                                              vars={"user_id": str(userUUID)},
-                                                              commit=False, closeConn=False)
-            result = cursor.fetchall()
-            connData.putConn()
+            connData, cursor, error = self._dbTool.executeStatement(PU.StatementNames.R9.value,
+                                                                    vars={"user_id": str(userUUID)},
+                                                                    commit=False, closeConn=False, raiseException=False)
+            try:
+                if (error is not None):
+                    raise error
+                result = cursor.fetchall()
+            finally:
+                connData.putConn()
             return [True, result]
         except Exception as e:
             return [False, f"SQL execution error: {e}"]
\ No newline at end of file
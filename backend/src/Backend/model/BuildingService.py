@@ -1,6 +1,4 @@
-import os
 from datetime import datetime, timezone
-import pandas as pd
 import pytz
 from typing import Optional, Dict, Any, List
 
@@ -10,13 +8,11 @@ from .BaseAPIService import BaseAPIService
 
 
 class BuildingService(BaseAPIService):
-    def fetchBuildings(self, buildingName: Optional[str] = None, addressLine1: Optional[str] = None, addressLine2: Optional[str] = None, 
-                            city: Optional[str] = None, province: Optional[str] = None, country: Optional[str] = None, postalCode: Optional[str] = None) -> List[Dict[str, Any]]:
-        
-        sqlFile = os.path.join(PU.Paths.SQLFeaturesFolder.value, "GetBuildings/GetBuildings.sql")
-        sql = PU.DBTool.readSQLFile(sqlFile)
-                
-        params = {
+    # _getFetchBuildingsVars(buildingName, addressLine1, addressLine2, city, province, country, postalCode): Retrieves the parameters
+    #   of the query for filtering the buildings
+    def _getFetchBuildingsVars(self, buildingName: Optional[str] = None, addressLine1: Optional[str] = None, addressLine2: Optional[str] = None, 
+                               city: Optional[str] = None, province: Optional[str] = None, country: Optional[str] = None, postalCode: Optional[str] = None) -> Dict[str, Any]:
+        return {
             'buildingName': f'%{buildingName}%' if buildingName and buildingName.strip() != '' else None,
             'addressLine1': f'%{addressLine1}%' if addressLine1 and addressLine1.strip() != '' else None,
             'addressLine2': f'%{addressLine2}%' if addressLine2 and addressLine2.strip() != '' else None,
@@ -25,8 +21,9 @@ class BuildingService(BaseAPIService):
             'country': f'%{country}%' if country and country.strip() != '' else None,
             'postalCode': f'%{postalCode}%' if postalCode and postalCode.strip() != '' else None,
         }
-            
-        sqlEngine = self._dbTool.getSQLEngine()
-        result = pd.read_sql(sql, sqlEngine, params = params)
 
-        return result.to_dict('records')
+    def fetchBuildings(self, buildingName: Optional[str] = None, addressLine1: Optional[str] = None, addressLine2: Optional[str] = None, 
+                            city: Optional[str] = None, province: Optional[str] = None, country: Optional[str] = None, postalCode: Optional[str] = None) -> List[Dict[str, Any]]:
+        
+        params = self._getFetchBuildingsVars(buildingName, addressLine1, addressLine2, city, province, country, postalCode)
+        return self._dbTool.fetchRecords(PU.StatementNames.GetBuildings.value, vars = params)
\ No newline at end of file
@@ -1,6 +1,4 @@
-import os
 import uuid
-import pandas as pd
 from datetime import datetime
 from typing import Optional, Tuple, List, Dict, Any, Union
 
@@ -24,56 +22,56 @@ class DashboardService(BaseAPIService):
         prefix = self._errorPrefix
         super().print(*args, **kwargs, prefix = prefix)
 
+    # _getDashboardMetricsResult(result): Retrieves the result for the row returned by the query for the dashboard metrics
+    def _getDashboardMetricsResult(self, result: Optional[Tuple[Any, ...]]) -> Tuple[bool, Union[str, Dict[str, Any]]]:
+        if result:
+            return [True, {
+                "avg_duration_mins": result[0],
+                "most_booked_hour": result[1]
+            }]
+        else:
+            return [True, "No booking data found."]
+
     def getDashboardMetrics(self, user_id: Optional[str]) -> Tuple[bool, dict]:
         try:
             userUUID = uuid.UUID(user_id)
         except:
             return [False, "Invalid UUID format for user ID."]
 
-        sqlPath = os.path.join(PU.Paths.SQLFeaturesFolder.value, "AF2/AF2.sql")
-
-        if not os.path.exists(sqlPath):
-            return [False, f"Dashboard SQL file not found at {sqlPath}"]
+        self.print(f"Running getDashboardMetrics for {user_id}")
 
         try:
-            query = PU.DBTool.readSQLFile(sqlPath)
-            self.print(f"Running getDashboardMetrics for {user_id}")
-            self.print(f"SQL Path: {sqlPath}")
-        except Exception as e:
-            return [False, f"Error reading SQL file: {e}"]
+            connData, cursor, error = self._dbTool.executeStatement(PU.StatementNames.AF2.value,
+                                                                    vars={"user_id": str(userUUID)},
+                                                                    commit=False, closeConn=False, raiseException=False)
 
-        try:
-            connData, cursor, error = self._dbTool.executeSQL(query,
-                                                              vars={"user_id": str(userUUID)},
-                                                              commit=False, closeConn=False)
+            try:
+                if (error is not None):
+                    raise error
+                result = cursor.fetchone()
+            finally:
+                connData.putConn()
 
-            result = cursor.fetchone()
             self.print(f"Query result: {result}")
-            connData.putConn()
-
-            if result:
-                return [True, {
-                    "avg_duration_mins": result[0],
-                    "most_booked_hour": result[1]
-                }]
-            else:
-                return [True, "No booking data found."]
+            return self._getDashboardMetricsResult(result)
         except Exception as e:
             self.printError(f"{e}")
             return [False, f"SQL execution error: {e}"]
         
-    def getBookingFrequency(self, userId: uuid.UUID, startDateTime: Optional[datetime], endDateTime: Optional[datetime], queryLimit: Optional[int]) -> Tuple[bool, Union[str, List[Dict[str, Any]]]]:
+    # _checkBookingFrequencyArgs(startDateTime, endDateTime, queryLimit): Retrieves the error message for the arguments of 'getBookingFrequency',
+    #   or None if the arguments are valid
+    def _checkBookingFrequencyArgs(self, startDateTime: Optional[datetime], endDateTime: Optional[datetime], queryLimit: Optional[int]) -> Optional[str]:
         if (startDateTime is not None and endDateTime is not None and startDateTime > endDateTime):
-            return [False, "Query end datetime cannot be earlier than the query start datetime"]
+            return "Query end datetime cannot be earlier than the query start datetime"
         elif (queryLimit is not None and queryLimit < 0):
-            return [False, "Query limit must be non-negative"]
+            return "Query limit must be non-negative"
         
-        sqlFile = os.path.join(PU.Paths.SQLFeaturesFolder.value, "AF1/AF1.sql")
-        sql = PU.DBTool.readSQLFile(sqlFile)
-
-        if (queryLimit is not None):
-            sql = f"{sql[:-1]} LIMIT %(queryLimit)s;"
-
+        return None
+    
+    # _getBookingFrequencyQuery(userId, startDateTime, endDateTime, queryLimit): Retrieves the name and the parameters of the statement for 'getBookingFrequency'
+    def _getBookingFrequencyQuery(self, userId: uuid.UUID, startDateTime: Optional[datetime], endDateTime: Optional[datetime], 
+                                  queryLimit: Optional[int]) -> Tuple[str, Dict[str, Any]]:
+        statementName = PU.StatementNames.AF1.value if (queryLimit is None) else PU.StatementNames.AF1Limited.value
         params = {
             'userId': userId,
             'startDateTime': startDateTime,
@@ -81,8 +79,13 @@ class DashboardService(BaseAPIService):
             'queryLimit': queryLimit
         }
 
-        sqlEngine = self._dbTool.getSQLEngine()
-        result = pd.read_sql(sql, sqlEngine, params = params)
-        result = result.to_dict('records')
-
+        return (statementName, params)
+        
+    def getBookingFrequency(self, userId: uuid.UUID, startDateTime: Optional[datetime], endDateTime: Optional[datetime], queryLimit: Optional[int]) -> Tuple[bool, Union[str, List[Dict[str, Any]]]]:
+        errorMsg = self._checkBookingFrequencyArgs(startDateTime, endDateTime, queryLimit)
+        if (errorMsg is not None):
+            return [False, errorMsg]
+        
+        statementName, params = self._getBookingFrequencyQuery(userId, startDateTime, endDateTime, queryLimit)
+        result = self._dbTool.fetchRecords(statementName, vars = params)
         return [True, result]
\ No newline at end of file
@@ -0,0 +1,296 @@
+import re
+import uuid
+import bisect
+import threading
+from array import array
+from datetime import datetime, timedelta, timezone, tzinfo
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+from typing import Optional, Dict, Any, List, Tuple, Iterable
+
+import PyUtils as PU
+
+
+# RoomTimeline: The time slots of the active bookings for a single room.
+#   The start and end times are kept in 2 separate sorted arrays, so the number of bookings
+#   overlapping some time range can be found with 2 binary searches
+class RoomTimeline():
+    def __init__(self, starts: Optional[Iterable[int]] = None, ends: Optional[Iterable[int]] = None):
+        self.starts = array("q", sorted(starts) if (starts is not None) else [])
+        self.ends = array("q", sorted(ends) if (ends is not None) else [])
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    # add(start, end): Adds the time slot of a booking
+    def add(self, start: int, end: int):
+        self.starts.insert(bisect.bisect_right(self.starts, start), start)
+        self.ends.insert(bisect.bisect_right(self.ends, end), end)
+
+    # _removeValue(values, value): Removes one occurence of some value from a sorted array
+    @classmethod
+    def _removeValue(cls, values: array, value: int) -> bool:
+        ind = bisect.bisect_left(values, value)
+        if (ind >= len(values) or values[ind] != value):
+            return False
+
+        del values[ind]
+        return True
+
+    # remove(start, end): Removes the time slot of a booking
+    def remove(self, start: int, end: int) -> bool:
+        ind = bisect.bisect_left(self.starts, start)
+        if (ind >= len(self.starts) or self.starts[ind] != start or not self._removeValue(self.ends, end)):
+            return False
+
+        del self.starts[ind]
+        return True
+
+    # countOverlaps(start, end): Counts the number of bookings that overlap with [start, end]
+    def countOverlaps(self, start: int, end: int) -> int:
+        # a booking overlaps when it starts before the end of the range and ends after the start of the range.
+        #   Every booking ending before the start of the range also started before the end of the range,
+        #   so those bookings can be subtracted out of the bookings starting before the end of the range
+        if (start <= end):
+            return bisect.bisect_left(self.starts, end) - bisect.bisect_right(self.ends, start)
+
+        # same as the SQL when the range is backwards
+        endInd = bisect.bisect_left(self.starts, end)
+        return sum(1 for bookStart, bookEnd in zip(self.starts, self.ends) if (bookStart < end and bookEnd > start)) if (endInd > 0) else 0
+
+
+# RoomAvailabilityIndex: In-memory index of the active bookings of each room, to find the available rooms
+#   for the /viewAvailableRooms endpoint without going to the database
+class RoomAvailabilityIndex():
+    Epoch = datetime(1970, 1, 1)
+    OneMicrosecond = timedelta(microseconds = 1)
+    LoadChunkSize = 10000
+
+    # columns of the results, in the same order as the results from R6
+    RoomCols = ("roomID", "buildingName", "roomName", "capacity", "addressLine1", "addressLine2", "city", "province", "country", "postalCode")
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._rooms: Dict[uuid.UUID, Dict[str, Any]] = {}
+        self._timelines: Dict[uuid.UUID, RoomTimeline] = {}
+        self._isLoaded = False
+
+        # time zone of the database session, used to convert timezone aware datetimes the same way as the database
+        self._timeZone: tzinfo = timezone.utc
+
+    @property
+    def isLoaded(self) -> bool:
+        return self._isLoaded
+
+    # bookingCount(): The number of active bookings in the index
+    def bookingCount(self) -> int:
+        with self._lock:
+            return sum(map(len, self._timelines.values()))
+
+    @property
+    def timeZone(self) -> tzinfo:
+        return self._timeZone
+
+    @timeZone.setter
+    def timeZone(self, otherTimeZone: tzinfo):
+        self._timeZone = otherTimeZone
+
+    # toKey(dateTime): Converts a datetime to the number of microseconds since the epoch.
+    #   The booking times are stored without a time zone, so like the database, timezone aware datetimes
+    #   are converted to the time zone of the database session before dropping their time zone
+    def toKey(self, dateTime: datetime) -> int:
+        if (dateTime.tzinfo is not None):
+            dateTime = dateTime.astimezone(self._timeZone).replace(tzinfo = None)
+
+        return (dateTime - self.Epoch) // self.OneMicrosecond
+
+    # toUUID(id): Converts some id to a UUID
+    @classmethod
+    def toUUID(cls, id: Any) -> uuid.UUID:
+        return id if (isinstance(id, uuid.UUID)) else uuid.UUID(f"{id}")
+
+    # likeToRegex(pattern): Converts the pattern of an ILIKE to a regex
+    @classmethod
+    def likeToRegex(cls, pattern: str) -> re.Pattern:
+        result = []
+        isEscaped = False
+
+        for char in pattern:
+            if (isEscaped):
+                result.append(re.escape(char))
+                isEscaped = False
+            elif (char == "\\"):
+                isEscaped = True
+            elif (char == "%"):
+                result.append(".*")
+            elif (char == "_"):
+                result.append(".")
+            else:
+                result.append(re.escape(char))
+
+        return re.compile("".join(result), flags = re.IGNORECASE | re.DOTALL)
+
+    # setRooms(rooms): Replaces the data of all the rooms
+    def setRooms(self, rooms: Iterable[Dict[str, Any]]):
+        newRooms = {}
+        for room in rooms:
+            roomId = self.toUUID(room["roomID"])
+            newRooms[roomId] = {col: room[col] for col in self.RoomCols}
+
+        with self._lock:
+            self._rooms = newRooms
+            for roomId in newRooms:
+                if (roomId not in self._timelines):
+                    self._timelines[roomId] = RoomTimeline()
+
+            for roomId in list(self._timelines.keys()):
+                if (roomId not in newRooms):
+                    self._timelines.pop(roomId)
+
+    # setBookings(bookings): Replaces all the bookings with some (roomID, bookStartDateTime, bookEndDateTime) rows
+    def setBookings(self, bookings: Iterable[Tuple[Any, datetime, datetime]]):
+        starts: Dict[uuid.UUID, List[int]] = {}
+        ends: Dict[uuid.UUID, List[int]] = {}
+
+        for roomId, startTime, endTime in bookings:
+            roomId = self.toUUID(roomId)
+            starts.setdefault(roomId, []).append(self.toKey(startTime))
+            ends.setdefault(roomId, []).append(self.toKey(endTime))
+
+        with self._lock:
+            self._timelines = {roomId: RoomTimeline(starts = starts.get(roomId), ends = ends.get(roomId)) for roomId in self._rooms}
+
+    # loadRooms(dbTool): Reloads the data of all the rooms from the database
+    def loadRooms(self, dbTool: PU.DBTool):
+        rooms = dbTool.fetchRecords(PU.StatementNames.GetRoomsByBuildingID.value, vars = {"building_id": None})
+        self.setRooms(rooms)
+
+    # _fetchBookings(dbTool): Retrieves all the active bookings from the database in chunks
+    def _fetchBookings(self, dbTool: PU.DBTool) -> Iterable[Tuple[Any, datetime, datetime]]:
+        connData, cursor, error = dbTool.executeStatement(PU.StatementNames.ActiveBookings.value, closeConn = False, raiseException = False, castUUIDs = True)
+
+        try:
+            if (error is not None):
+                raise error
+
+            while (True):
+                rows = cursor.fetchmany(self.LoadChunkSize)
+                if (not rows):
+                    break
+
+                yield from rows
+        finally:
+            connData.putConn()
+
+    # loadTimeZone(dbTool): Reads the time zone of the database session.
+    #   Time zones that are not in the IANA database (eg. POSIX time zones) fall back to their current UTC offset
+    def loadTimeZone(self, dbTool: PU.DBTool):
+        connData, cursor, error = dbTool.executeSQL("SELECT current_setting('TimeZone'), EXTRACT(TIMEZONE FROM now())", closeConn = False)
+
+        try:
+            timeZoneName, utcOffset = cursor.fetchone()
+        finally:
+            connData.putConn()
+
+        try:
+            self._timeZone = ZoneInfo(timeZoneName)
+        except (ZoneInfoNotFoundError, ValueError):
+            self._timeZone = timezone(timedelta(seconds = int(utcOffset)))
+
+    # load(dbTool): Loads all the rooms and their active bookings from the database
+    def load(self, dbTool: PU.DBTool):
+        with self._lock:
+            self.loadTimeZone(dbTool)
+            self.loadRooms(dbTool)
+            self.setBookings(self._fetchBookings(dbTool))
+            self._isLoaded = True
+
+    # addBooking(roomId, startTime, endTime): Adds a new booking to the index
+    def addBooking(self, roomId: Any, startTime: datetime, endTime: datetime):
+        roomId = self.toUUID(roomId)
+        with self._lock:
+            timeline = self._timelines.get(roomId)
+            if (timeline is None):
+                timeline = RoomTimeline()
+                self._timelines[roomId] = timeline
+
+            timeline.add(self.toKey(startTime), self.toKey(endTime))
+
+    # removeBooking(roomId, startTime, endTime): Removes a booking that got cancelled from the index
+    def removeBooking(self, roomId: Any, startTime: datetime, endTime: datetime) -> bool:
+        roomId = self.toUUID(roomId)
+        with self._lock:
+            timeline = self._timelines.get(roomId)
+            if (timeline is None):
+                return False
+
+            return timeline.remove(self.toKey(startTime), self.toKey(endTime))
+
+    # removeRoom(roomId): Removes a deleted room and all of its bookings from the index
+    def removeRoom(self, roomId: Any):
+        roomId = self.toUUID(roomId)
+        with self._lock:
+            self._rooms.pop(roomId, None)
+            self._timelines.pop(roomId, None)
+
+    # fetchAvailableRooms(startTime, endTime, roomName, minCapacity, maxCapacity): Retrieves the rooms with the number of bookings
+    #   overlapping [startTime, endTime], with the same filters and results as R6
+    def fetchAvailableRooms(self, startTime: datetime, endTime: datetime, roomName: Optional[str] = None,
+                            minCapacity: Optional[int] = None, maxCapacity: Optional[int] = None) -> List[Dict[str, Any]]:
+        start = self.toKey(startTime)
+        end = self.toKey(endTime)
+        roomNameRegex = None if (roomName is None) else self.likeToRegex(roomName)
+
+        result = []
+        with self._lock:
+            for roomId, room in self._rooms.items():
+                capacity = room["capacity"]
+                if (minCapacity is not None and (capacity is None or capacity < minCapacity)):
+                    continue
+                elif (maxCapacity is not None and (capacity is None or capacity > maxCapacity)):
+                    continue
+                elif (roomNameRegex is not None and (room["roomName"] is None or roomNameRegex.fullmatch(room["roomName"]) is None)):
+                    continue
+
+                timeline = self._timelines.get(roomId)
+                overlappingBookings = 0 if (timeline is None) else timeline.countOverlaps(start, end)
+
+                result.append({"roomID": roomId,
+                               "buildingName": room["buildingName"],
+                               "roomName": room["roomName"],
+                               "overlappingBookings": overlappingBookings,
+                               "capacity": capacity,
+                               "addressLine1": room["addressLine1"],
+                               "addressLine2": room["addressLine2"],
+                               "city": room["city"],
+                               "province": room["province"],
+                               "country": room["country"],
+                               "postalCode": room["postalCode"]})
+
+        return result
+
+    # findInconsistencies(dbTool, startTime, endTime, roomName, minCapacity, maxCapacity): Compares the results of the index
+    #   against the results of R6 from the database and retrieves the differences
+    def findInconsistencies(self, dbTool: PU.DBTool, startTime: datetime, endTime: datetime, roomName: Optional[str] = None,
+                            minCapacity: Optional[int] = None, maxCapacity: Optional[int] = None) -> List[str]:
+        params = {"room_name": roomName, "min_capacity": minCapacity, "max_capacity": maxCapacity, "start_time": startTime, "end_time": endTime}
+        sqlResult = {room["roomID"]: room for room in dbTool.fetchRecords(PU.StatementNames.R6.value, vars = params)}
+        indexResult = {room["roomID"]: room for room in self.fetchAvailableRooms(startTime, endTime, roomName = roomName,
+                                                                                   minCapacity = minCapacity, maxCapacity = maxCapacity)}
+
+        result = []
+        for roomId in sqlResult.keys() - indexResult.keys():
+            result.append(f"Room {roomId} is missing from the index")
+
+        for roomId in indexResult.keys() - sqlResult.keys():
+            result.append(f"Room {roomId} is in the index, but not in the database")
+
+        for roomId in sqlResult.keys() & indexResult.keys():
+            sqlRoom = sqlResult[roomId]
+            indexRoom = indexResult[roomId]
+
+            for col, sqlValue in sqlRoom.items():
+                indexValue = indexRoom.get(col)
+                if (sqlValue != indexValue):
+                    result.append(f"Room {roomId} has '{col}' as {indexValue} in the index, but {sqlValue} in the database")
+
+        return result
@@ -1,16 +1,19 @@
-import os
 from datetime import datetime, timezone
-import pandas as pd
 import pytz
 from typing import Optional, Dict, Any, List
 
 import PyUtils as PU
 
 from .BaseAPIService import BaseAPIService
+from .RoomAvailabilityIndex import RoomAvailabilityIndex
+from ..view.BaseView import BaseView
 
 import uuid
 
 class RoomService(BaseAPIService):
+    def __init__(self, dbTool: PU.DBTool, view: Optional[BaseView] = None, availabilityIndex: Optional[RoomAvailabilityIndex] = None):
+        super().__init__(dbTool, view = view)
+        self._availabilityIndex = availabilityIndex
     
     @staticmethod
     def _safe_uuid(value):
@@ -25,22 +28,35 @@ class RoomService(BaseAPIService):
         if ("Non-admin" in errorMsg):
           return "Non-admin attempted to execute restricted query"
     
+    # _getModifyRoomResult(statusKey, error): Retrieves the result for adding, editing or deleting a room
+    def _getModifyRoomResult(self, statusKey: str, error: Optional[Exception]) -> Dict[str, Any]:
+        if (error is not None):
+            errorMsg = self._getModifyRoomError(f"{error}")
+            return {
+              statusKey: False,
+              "errorMessage": errorMsg
+            }
+        
+        return {
+          statusKey: True
+        }
+    
+    # _reloadIndexRooms(): Reloads the data of the rooms in the availability index after some room got changed
+    def _reloadIndexRooms(self):
+        if (self._availabilityIndex is not None and self._availabilityIndex.isLoaded):
+            self._availabilityIndex.loadRooms(self._dbTool)
+
     def fetchRoomsByBuildingID(self, buildingId):
-        sqlFile = os.path.join(PU.Paths.SQLFeaturesFolder.value, "R6/GetRoomsByBuildingID.sql")
-        sql = PU.DBTool.readSQLFile(sqlFile)
         params = {
             'building_id': RoomService._safe_uuid(buildingId),
         }
         
-        sqlEngine = self._dbTool.getSQLEngine()
-        result = pd.read_sql(sql, sqlEngine, params = params)
-        
-        return result.to_dict('records')
+        return self._dbTool.fetchRecords(PU.StatementNames.GetRoomsByBuildingID.value, vars = params)
     
-    # fetchAvailableRooms(roomName, minCapacity, maxCapacity, startTimeStr, endTimeStr): Retrieves all the available rooms
-    def fetchAvailableRooms(self, buildingId: Optional[str] = None, roomName: Optional[str] = None, minCapacity:Optional[str] = None, maxCapacity: Optional[str] = None, 
-                            startTimeStr: Optional[str] = None, endTimeStr: Optional[str] = None) -> List[Dict[str, Any]]:
-        
+    # _getAvailableRoomsVars(roomName, minCapacity, maxCapacity, startTimeStr, endTimeStr): Retrieves the parameters of the query for
+    #   the available rooms. The current time is used if the time slot is not given or not valid
+    def _getAvailableRoomsVars(self, roomName: Optional[str] = None, minCapacity:Optional[str] = None, maxCapacity: Optional[str] = None, 
+                               startTimeStr: Optional[str] = None, endTimeStr: Optional[str] = None) -> Dict[str, Any]:
         useCurrent = True
         current_datetime = datetime.now(timezone.utc)
 
@@ -53,109 +69,77 @@ class RoomService(BaseAPIService):
             except ValueError:
                 useCurrent = True
 
-        sqlFile = os.path.join(PU.Paths.SQLFeaturesFolder.value, "R6/R6.sql")
-        sql = PU.DBTool.readSQLFile(sqlFile)
-        
-        params = {
+        return {
             'room_name': f'%{roomName}%' if roomName and roomName.strip() != '' else None,
             'min_capacity': int(minCapacity) if minCapacity is not None and minCapacity.strip() != "" else None,
             'max_capacity': int(maxCapacity) if maxCapacity is not None and maxCapacity.strip() != "" else None,
             'start_time': current_datetime if useCurrent else dtStartTime,
             'end_time': current_datetime if useCurrent else dtEndTime
         }
+    
+    # _fetchIndexAvailableRooms(params): Retrieves the available rooms from the availability index,
+    #   or None if the index is not being used
+    def _fetchIndexAvailableRooms(self, params: Dict[str, Any]) -> Optional[List[Dict[str, Any]]]:
+        if (self._availabilityIndex is None or not self._availabilityIndex.isLoaded):
+            return None
+
+        return self._availabilityIndex.fetchAvailableRooms(params["start_time"], params["end_time"], roomName = params["room_name"],
+                                                           minCapacity = params["min_capacity"], maxCapacity = params["max_capacity"])
+
+    # fetchAvailableRooms(roomName, minCapacity, maxCapacity, startTimeStr, endTimeStr): Retrieves all the available rooms
+    def fetchAvailableRooms(self, buildingId: Optional[str] = None, roomName: Optional[str] = None, minCapacity:Optional[str] = None, maxCapacity: Optional[str] = None, 
+                            startTimeStr: Optional[str] = None, endTimeStr: Optional[str] = None) -> List[Dict[str, Any]]:
         
-        sqlEngine = self._dbTool.getSQLEngine()
-        result = pd.read_sql(sql, sqlEngine, params = params)
+        params = self._getAvailableRoomsVars(roomName, minCapacity, maxCapacity, startTimeStr, endTimeStr)
 
-        return result.to_dict('records')
+        indexResult = self._fetchIndexAvailableRooms(params)
+        if (indexResult is not None):
+            return indexResult
+        
+        return self._dbTool.fetchRecords(PU.StatementNames.R6.value, vars = params)
 
     def addRoom(self, roomName, capacity, buildingID, userID):
-        sqlPath = os.path.join(PU.Paths.SQLFeaturesFolder.value, "AF3/AddRoom.sql")
-        try:
-            with open(sqlPath, 'r') as f:
-                deleteRoomSQL = f.read()
-        except FileNotFoundError:
-            return {
-              "addStatus": False
-            }
-        
-        connData, cursor, error = self._dbTool.executeSQL(deleteRoomSQL, 
-                                                          vars = {
-                                                                  "roomName": roomName,
-                                                                  "capacity": capacity,
-                                                                  "buildingID": buildingID,
-                                                                  "userID": userID
-                                                                  },
-                                                          commit = True, closeConn = True,
-                                                          raiseException = False)
+        connData, cursor, error = self._dbTool.executeStatement(PU.StatementNames.AF3AddRoom.value, 
+                                                                vars = {
+                                                                        "roomName": roomName,
+                                                                        "capacity": capacity,
+                                                                        "buildingID": buildingID,
+                                                                        "userID": userID
+                                                                        },
+                                                                commit = True, closeConn = True,
+                                                                raiseException = False)
                 
-        if (error is not None):
-            errorMsg = self._getModifyRoomError(f"{error}")
-            return {
-              "addStatus": False,
-              "errorMessage": errorMsg
-            }
-        else:
-            return {
-              "addStatus": True
-            }
+        if (error is None):
+            self._reloadIndexRooms()
+
+        return self._getModifyRoomResult("addStatus", error)
             
     def editRoom(self, roomID, roomName, capacity, userID):
-        sqlPath = os.path.join(PU.Paths.SQLFeaturesFolder.value, "AF3/EditRoom.sql")
-        try:
-            with open(sqlPath, 'r') as f:
-                editRoomSQL = f.read()
-        except FileNotFoundError:
-            return {
-              "editStatus": False
-            }
-        
-        connData, cursor, error = self._dbTool.executeSQL(editRoomSQL, 
-                                                          vars = {
-                                                                  "roomID": roomID,
-                                                                  "roomName": roomName,
-                                                                  "capacity": capacity,
-                                                                  "userID": userID
-                                                                  },
-                                                          commit = True, closeConn = True,
-                                                          raiseException = False)
+        connData, cursor, error = self._dbTool.executeStatement(PU.StatementNames.AF3EditRoom.value, 
+                                                                vars = {
+                                                                        "roomID": roomID,
+                                                                        "roomName": roomName,
+                                                                        "capacity": capacity,
+                                                                        "userID": userID
+                                                                        },
+                                                                commit = True, closeConn = True,
+                                                                raiseException = False)
         
-        if (error is not None):
-            errorMsg = self._getModifyRoomError(f"{error}")
-            return {
-              "editStatus": False,
-              "errorMessage": errorMsg
-            }
-        else:
-            return {
-              "editStatus": True
-            }
+        if (error is None):
+            self._reloadIndexRooms()
+
+        return self._getModifyRoomResult("editStatus", error)
             
     def deleteRoom(self, roomID, userID):
-        sqlPath = os.path.join(PU.Paths.SQLFeaturesFolder.value, "AF3/DeleteRoom.sql")
-        try:
-            with open(sqlPath, 'r') as f:
-                deleteRoomSQL = f.read()
-        except FileNotFoundError:
-            return {
-              "deleteStatus": False
-            }
-        
-        connData, cursor, error = self._dbTool.executeSQL(deleteRoomSQL, 
-                                                          vars = {
-                                                                  "roomID": roomID,
-                                                                  "userID": userID
-                                                                  },
-                                                          commit = True, closeConn = True,
-                                                          raiseException = False)
+        connData, cursor, error = self._dbTool.executeStatement(PU.StatementNames.AF3DeleteRoom.value, 
+                                                                vars = {
+                                                                        "roomID": roomID,
+                                                                        "userID": userID
+                                                                        },
+                                                                commit = True, closeConn = True,
+                                                                raiseException = False)
         
-        if (error is not None):
-            errorMsg = self._getModifyRoomError(f"{error}")
-            return {
-              "deleteStatus": False,
-              "errorMessage": errorMsg
-            }
-        else:
-            return {
-              "deleteStatus": True
-            }
\ No newline at end of file
+        if (error is None and self._availabilityIndex is not None):
+            self._availabilityIndex.removeRoom(roomID)
+
+        return self._getModifyRoomResult("deleteStatus", error)
\ No newline at end of file
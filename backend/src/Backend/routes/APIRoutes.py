@@ -0,0 +1,324 @@
+import uuid
+import inspect
+from datetime import datetime
+from typing import Optional, List, Dict, Any, Callable, Generator, Mapping, Tuple, Union
+
+import PyUtils as PU
+
+from ..view.BaseView import BaseView
+
+
+# APIRequest: The parts of some request that are read by the routes
+class APIRequest():
+    def __init__(self, args: Optional[Mapping[str, str]] = None, data: Any = None):
+        self.args = {} if (args is None) else args
+        self.data = data
+
+
+# APIResponse: The JSON body and the status code of the response to some request
+class APIResponse():
+    def __init__(self, body: Any, status: int = 200):
+        self.body = body
+        self.status = status
+
+
+# ServiceCall: Some call to a method of a service that a route needs the result of.
+#   The method gives back its result directly for App or gives back a coroutine for AsyncApp
+class ServiceCall():
+    def __init__(self, func: Callable[..., Any], *args, **kwargs):
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+
+    def __call__(self) -> Any:
+        return self.func(*self.args, **self.kwargs)
+
+
+RouteHandler = Union[Generator[ServiceCall, Any, APIResponse], APIResponse]
+
+
+# APIRoutes: The routes served by both App and AsyncApp.
+#   Each route reads some request, yields the calls to the services it needs and returns the response.
+#   A route that does not need any service directly gives back its response.
+#   The server running the route decides whether the calls to the services are ran directly or awaited (see 'run' and 'runAsync')
+class APIRoutes():
+    # the method, the path and the name of the handler for each route
+    Routes = [("GET", "/poolStats", "poolStats"),
+              ("GET", "/queryStats", "queryStats"),
+              ("GET", "/viewBuildings", "viewBuildings"),
+              ("GET", "/viewAvailableRooms", "viewAvailableRooms"),
+              ("GET", "/viewRoomsByBuildingID", "getRoomsByBuildingID"),
+              ("POST", "/addRoom", "addRoom"),
+              ("POST", "/editRoom", "editRoom"),
+              ("POST", "/deleteRoom", "deleteRoom"),
+              ("POST", "/viewAdminLog", "viewAdminLog"),
+              ("POST", "/bookRoom", "bookRoom"),
+              ("POST", "/cancelBooking", "cancelBooking"),
+              ("GET", "/getFutureBookings", "getFutureBookings"),
+              ("GET", "/getBookingsAndCancellations", "getBookingsAndCancellations"),
+              ("POST", "/signup", "signup"),
+              ("POST", "/login", "login"),
+              ("GET", "/getDashboardMetrics", "getDashboardMetrics"),
+              ("POST", "/getBookingFrequency", "getBookingFrequency"),
+              ("POST", "/updateUsername", "updateUsername"),
+              ("POST", "/updatePassword", "updatePassword")]
+
+    def __init__(self, buildingService, roomService, bookingService, userService, dashService,
+                 poolStats: Callable[[], Dict[str, Dict[str, Any]]], queryStats: Callable[[], Dict[str, Dict[str, Any]]],
+                 view: Optional[BaseView] = None):
+        self._buildingService = buildingService
+        self._roomService = roomService
+        self._bookingService = bookingService
+        self._userService = userService
+        self._dashService = dashService
+        self._poolStats = poolStats
+        self._queryStats = queryStats
+        self._view = view
+
+    def print(self, *args, **kwargs):
+        if (self._view is not None):
+            self._view.print(*args, **kwargs)
+
+    # getHandlers(): Retrieves the method, the path, the name and the handler of each route
+    def getHandlers(self) -> List[Tuple[str, str, str, Callable[[APIRequest], RouteHandler]]]:
+        return list(map(lambda route: (*route, getattr(self, route[2])), self.Routes))
+
+    # run(route): Runs some route with the calls to the services ran directly
+    @classmethod
+    def run(cls, route: RouteHandler) -> APIResponse:
+        if (isinstance(route, APIResponse)):
+            return route
+
+        result = None
+        error = None
+
+        while (True):
+            try:
+                call = route.send(result) if (error is None) else route.throw(error)
+            except StopIteration as e:
+                return e.value
+
+            result = None
+            error = None
+            try:
+                result = call()
+            except Exception as e:
+                error = e
+
+    # runAsync(route): Runs some route with the calls to the services awaited
+    @classmethod
+    async def runAsync(cls, route: RouteHandler) -> APIResponse:
+        if (isinstance(route, APIResponse)):
+            return route
+
+        result = None
+        error = None
+
+        while (True):
+            try:
+                call = route.send(result) if (error is None) else route.throw(error)
+            except StopIteration as e:
+                return e.value
+
+            result = None
+            error = None
+            try:
+                result = call()
+                if (inspect.isawaitable(result)):
+                    result = await result
+            except Exception as e:
+                error = e
+
+    # _parseUserId(userId): Parses the UUID of some user, or gives back the response for an invalid UUID
+    @classmethod
+    def _parseUserId(cls, userId: Optional[str]) -> Tuple[Optional[uuid.UUID], Optional[APIResponse]]:
+        try:
+            return (uuid.UUID(userId), None)
+        except ValueError:
+            return (None, APIResponse([False, "Invalid UUID format for user ID"]))
+
+    def poolStats(self, request: APIRequest) -> RouteHandler:
+        return APIResponse(self._poolStats())
+
+    def queryStats(self, request: APIRequest) -> RouteHandler:
+        return APIResponse(self._queryStats())
+
+    def viewBuildings(self, request: APIRequest) -> RouteHandler:
+        args = request.args
+
+        if (args.get("db_operation") == "filter"):
+            response = yield ServiceCall(self._buildingService.fetchBuildings, args.get("buildingName"), args.get("addressLine1"), args.get("addressLine2"),
+                                         args.get("city"), args.get("province"), args.get("country"), args.get("postalCode"))
+        else:
+            response = yield ServiceCall(self._buildingService.fetchBuildings)
+
+        return APIResponse(response)
+
+    def viewAvailableRooms(self, request: APIRequest) -> RouteHandler:
+        args = request.args
+
+        if (args.get("db_operation") == "filter"):
+            response = yield ServiceCall(self._roomService.fetchAvailableRooms, args.get("building_id"), args.get("room_name"), args.get("min_capacity"),
+                                         args.get("max_capacity"), args.get("start_time"), args.get("end_time"))
+        else:
+            response = yield ServiceCall(self._roomService.fetchAvailableRooms)
+
+        return APIResponse(response)
+
+    def getRoomsByBuildingID(self, request: APIRequest) -> RouteHandler:
+        response = yield ServiceCall(self._roomService.fetchRoomsByBuildingID, request.args.get("building_id"))
+        return APIResponse(response)
+
+    def addRoom(self, request: APIRequest) -> RouteHandler:
+        data = request.data
+        self.print(f"RECEIVED IN ADD {data}")
+        response = yield ServiceCall(self._roomService.addRoom, data["roomName"], data["capacity"], data["buildingID"], data["userID"])
+        return APIResponse(response)
+
+    def editRoom(self, request: APIRequest) -> RouteHandler:
+        data = request.data
+        self.print(f"RECEIVED IN EDIT {data}")
+        response = yield ServiceCall(self._roomService.editRoom, data["roomID"], data["roomName"], data["capacity"], data["userID"])
+        return APIResponse(response)
+
+    def deleteRoom(self, request: APIRequest) -> RouteHandler:
+        data = request.data
+        self.print(f"RECEIVED IN DELETE {data}")
+        response = yield ServiceCall(self._roomService.deleteRoom, data["roomID"], data["userID"])
+        return APIResponse(response)
+
+    def viewAdminLog(self, request: APIRequest) -> RouteHandler:
+        data = request.data
+        self.print(f"RECEIVED IN VIEWADMINLOG {data}")
+        response = yield ServiceCall(self._userService.viewAdminLog, data["userID"])
+        return APIResponse(response)
+
+    def bookRoom(self, request: APIRequest) -> RouteHandler:
+        data = request.data
+
+        if not data:
+            return APIResponse({ "success": False, "message": "No JSON data received" }, status = 400)
+
+        try:
+            userId = data.get("user_id")
+            roomId = data.get("room_id")
+            startDateTimeStr = data.get("start_time")
+            endDateTimeStr = data.get("end_time")
+            participants = data.get("participants")
+
+            if not all([userId, roomId, startDateTimeStr, endDateTimeStr]):
+                return APIResponse({ "success": False, "message": "Missing required fields" }, status = 400)
+
+            start_dt = datetime.fromisoformat(startDateTimeStr)
+            end_dt = datetime.fromisoformat(endDateTimeStr)
+
+            success, message, bookingId = yield ServiceCall(self._bookingService.bookRoom, userId, roomId, start_dt, end_dt, participants)
+            return APIResponse({
+                "success": success,
+                "message": message,
+                "booking_id": bookingId
+            }, status = 200 if success else 400)
+
+        except Exception as e:
+            self.print(f" Booking validation failed: {str(e)}")
+            return APIResponse({
+                "success": False,
+                "message": str(e) or "Booking failed due to an unknown error."
+            }, status = 400)
+
+    def cancelBooking(self, request: APIRequest) -> RouteHandler:
+        data = request.data
+        if not data:
+            return APIResponse({ "success": False, "message": "No JSON data received" })
+
+        bookingId = data.get("booking_id")
+        userId = data.get("user_id")
+
+        try:
+            success, message = yield ServiceCall(self._bookingService.cancelBooking, bookingId, userId)
+            return APIResponse({ "success": success, "message": message })
+        except Exception as e:
+            self.print(f"CancelBooking error: {str(e)}")
+            return APIResponse({ "success": False, "message": "Cancellation failed due to server error." })
+
+    def getFutureBookings(self, request: APIRequest) -> RouteHandler:
+        userId = request.args.get("userId")
+        self.print(f"[GET] /getFutureBookings - userId: {userId}")
+        response = yield ServiceCall(self._bookingService.getFutureBookings, userId)
+        return APIResponse(response)
+
+    def getBookingsAndCancellations(self, request: APIRequest) -> RouteHandler:
+        userId = request.args.get("userId")
+        self.print(f"/getBookingsAndCancellations - userId: {userId}", prefix = "[GET]")
+        response = yield ServiceCall(self._bookingService.getBookingsAndCancellations, userId)
+        return APIResponse(response)
+
+    def signup(self, request: APIRequest) -> RouteHandler:
+        data = request.data
+        self.print(f"RECEIVED IN SIGNUP {data}")
+        response = yield ServiceCall(self._userService.signup, data["username"], data["email"], data["password"])
+        return APIResponse(response)
+
+    def login(self, request: APIRequest) -> RouteHandler:
+        data = request.data
+        self.print(f"RECEIVED IN LOGIN {data}")
+        response = yield ServiceCall(self._userService.login, data["username"], data["password"])
+        return APIResponse(response)
+
+    def getDashboardMetrics(self, request: APIRequest) -> RouteHandler:
+        userId = request.args.get("userId")
+        self.print(f"/getDashboardMetrics - userId: {userId}", prefix = "[GET]")
+        success, result = yield ServiceCall(self._dashService.getDashboardMetrics, userId)
+        return APIResponse(result, status = 200 if success else 400)
+
+    def getBookingFrequency(self, request: APIRequest) -> RouteHandler:
+        data = request.data
+
+        startDateTime = data.get("startDateTime")
+        endDateTime = data.get("endDateTime")
+        queryLimit = data.get("queryLimit")
+
+        userId, errorResponse = self._parseUserId(data.get("userId"))
+        if (errorResponse is not None):
+            return errorResponse
+
+        if (startDateTime is not None):
+            startDateTime = PU.DateTimeTool.strToDateTime(startDateTime)
+
+        if (endDateTime is not None):
+            endDateTime = PU.DateTimeTool.strToDateTime(endDateTime)
+
+        if (queryLimit is not None):
+            queryLimit = int(queryLimit)
+
+        response = yield ServiceCall(self._dashService.getBookingFrequency, userId, startDateTime, endDateTime, queryLimit = queryLimit)
+        return APIResponse(response)
+
+    def updateUsername(self, request: APIRequest) -> RouteHandler:
+        data = request.data
+        newUsername = data.get("newUsername")
+
+        userId, errorResponse = self._parseUserId(data.get("userId"))
+        if (errorResponse is not None):
+            return errorResponse
+
+        if (not newUsername):
+            return APIResponse([False, "Missing old or new username."])
+
+        response = yield ServiceCall(self._userService.updateUsername, userId, newUsername)
+        return APIResponse(response)
+
+    def updatePassword(self, request: APIRequest) -> RouteHandler:
+        data = request.data
+        newPassword = data.get("newPassword")
+        oldPassword = data.get("oldPassword")
+
+        userId, errorResponse = self._parseUserId(data.get("userId"))
+        if (errorResponse is not None):
+            return errorResponse
+
+        if (newPassword is None or oldPassword is None):
+            return APIResponse([False, "Missing required fields."])
+
+        response = yield ServiceCall(self._userService.updatePassword, userId, oldPassword, newPassword)
+        return APIResponse(response)